@@ -1,29 +1,46 @@
 import copy
-import csv
 import datetime
 import json
 import os
-import shutil
 import subprocess
-import sys
+import time
+import uuid
 import logging
 
 
 from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QPixmap, QColor
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QLineEdit, \
-    QPushButton, QSizePolicy, QComboBox, QDialog, QMessageBox, QGroupBox, QListWidget, QListWidgetItem, QFileDialog
-from ctREFPROP.ctREFPROP import REFPROPFunctionLibrary
+    QPushButton, QSizePolicy, QComboBox, QDialog, QMessageBox, QGroupBox, QListWidget, QListWidgetItem, QFileDialog, \
+    QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView
 
 from datetime import date
-from pptx import Presentation
-# import numpy
-
 
+from job_scheduler import PHASE_COMPLETED, PHASE_STAGES, PhaseProcess, build_starccm_command, discard_job, \
+    split_cores
+from macro_builder import DEFAULT_RENDER_PROFILE, RENDER_PROFILE_LABELS, build_macro
+from stage_markers import StageTimer, format_stage_summary, group_durations
+from run_record import RUN_RECORD_SUFFIX, build_run_record, load_run_record, write_run_record
+from results_index import ResultsIndex
+from monitor_reader import read_last_value
+from monitor_store import store_job as store_monitors
+from live_monitor import IterationParser, LivePlot
+from thumbnail_cache import ThumbnailService
+from model_store import MODEL_STORE_FOLDER, ModelStore
+from report_engine import render_job_report
+from html_report import publish_html
+from report_images import evict_report_images
+from scratch_stage import DEFAULT_QUOTA_GB, ScratchMover, stage_job
+# 配置文件与结果根目录（sim_config.json 中的 sim_root / public_root）
+from sim_settings import CACHE_ROOT, CONFIG_FILE, PUBLIC_ROOT, SIM_ROOT, configured_setting
+from sweep_report import build_sweep_report, sweep_runs
+from admission import ADMISSION_POLL_SECONDS, ADMISSION_TIMEOUT_SECONDS, MemorySampler, ResourceEstimator, \
+    check_resources, folder_size, log_estimate
+from scaling_model import ThreadSelector, is_auto_threads
+from runtime_history import ORDER_POLICIES, RuntimeHistory, RuntimePredictor, format_seconds, make_record, \
+    order_tasks, parse_deadline, queue_eta
+# import numpy
 
-def change_unicode(han):
-    unicode_str = ''.join(f'\\u{ord(char):04x}' if ord(char) > 127 else char for char in han)
-    return unicode_str
 
 
 # 安全计算表达式
@@ -63,9 +80,9 @@ def rename_and_save_step_file(source_path, destination_folder, new_name):
     source_path = os.path.normpath(os.path.abspath(str(source_path)))
     destination_path = os.path.normpath(os.path.abspath(str(destination_path)))
 
-    # 复制并重命名文件
-    shutil.copy2(source_path, destination_path)
-    logging.info(f"临时模型文件已保存完成: {destination_path}")
+    # 从模型库硬链接（同一模型只保存一份），无法链接时复制
+    method = ModelStore(os.path.join(SIM_ROOT, MODEL_STORE_FOLDER)).materialize(source_path, destination_path)
+    logging.info(f"临时模型文件已保存完成: {destination_path}（{'硬链接' if method == 'link' else '复制'}）")
 
 # 示例调用
 # rename_and_save_step_file("C:/Users/owner/Desktop/star/改名模型/CV.STEP", "D:/STARCCM Simulation automation/CacheModels", "new_model_name.STEP")
@@ -91,7 +108,8 @@ def get_fluid_properties(RP_path, T_C, P_MPa,fluname):
     返回：
         density (kg/m³), viscosity (Pa·s)
     """
-    # 初始化REFPROP
+    # 初始化REFPROP（按需导入，50EG 等不需要REFPROP的场景可在无REFPROP环境运行）
+    from ctREFPROP.ctREFPROP import REFPROPFunctionLibrary
     RP = REFPROPFunctionLibrary(RP_path, 'dll')
     # 动态生成fluids目录路径
     fluid_dir = os.path.join(os.path.dirname(RP_path), "fluids")
@@ -132,20 +150,16 @@ def read_last_row_last_column(csv_file_path):
     """
     读取CSV文件并返回最后一行最后一列的数据
 
+    只从文件末尾读取，同一文件未修改时直接返回缓存结果
+
     :param csv_file_path: CSV文件的路径
     :return: 最后一行最后一列的数据
     """
     try:
-        with open(csv_file_path, mode='r', newline='', encoding='utf-8') as file:
-            csv_reader = csv.reader(file)
-            # 读取所有行
-            rows = list(csv_reader)
-            if not rows:
-                logging.error(f"CSV文件为空: {csv_file_path}")
-                return None
-            # 提取最后一行最后一列的数据
-            last_value = rows[-1][-1]
-            return last_value
+        last_value = read_last_value(csv_file_path)
+        if last_value is None:
+            logging.error(f"CSV文件为空: {csv_file_path}")
+        return last_value
     except FileNotFoundError:
         logging.error(f"文件未找到: {csv_file_path}")
         return None
@@ -153,148 +167,167 @@ def read_last_row_last_column(csv_file_path):
         logging.error(f"读取CSV文件时发生错误: {e}")
         return None
 
-def replace_image(slide, original_img_desc, new_img_path, target_index=None):
-    """
-    增强版图片替换函数（支持定位替换）
-    :param original_img_desc: 要匹配的图片特征（支持部分文件名）
-    :param new_img_path: 新图片完整路径
-    :param target_index: 要替换的图片序号（从0开始，None表示替换全部）
-    :return: 替换成功的图片数量
-    """
-    replaced_count = 0
-    # 收集所有匹配图片
-    targets = []
-    for shape in slide.shapes:
-        if shape.shape_type == 13 and original_img_desc in shape.image.filename:
-            targets.append(shape)
-
-    # 处理索引有效性
-    if target_index is not None:
-        if target_index >= len(targets) or target_index < 0:
-            raise IndexError(f"无效索引：{target_index}，共找到{len(targets)}张匹配图片")
-        targets = [targets[target_index]]  # 只保留指定索引的图片
-
-    # 替换目标图片
-    for shape in targets:
-        left = shape.left
-        top = shape.top
-        width = shape.width
-        height = shape.height
-
-        slide.shapes.add_picture(new_img_path, left, top, width, height)
-        slide.shapes._spTree.remove(shape._element)
-        replaced_count += 1
-
-    return replaced_count
-
-def modify_table(slide, row, col, new_text, table_index=0):
+# 本机高速草稿目录（scratch_root，不配置则直接写结果目录）与草稿目录配额，见 scratch_stage
+SCRATCH_ROOT = configured_setting('scratch_root', None)
+SCRATCH_QUOTA_GB = configured_setting('scratch_quota_gb', DEFAULT_QUOTA_GB)
+
+# 网格参数（界面未开放输入，任务参数中可覆盖）
+MESH_SETTINGS = {
+    'base_size': 0.3,
+    'target_surface_ratio': 100,
+    'min_surface_ratio': 25,
+    'prisma_layer_thickness_ratio': 33,
+    'prisma_layer_extension': 2,
+}
+
+def write_macro(job, phase):
     """
-        通用表格修改函数
-        :param slide: 幻灯片对象
-        :param row: 目标行号（从0开始）
-        :param col: 目标列号（从0开始）
-        :param new_text: 要更新的文本内容
-        :param table_index: 表格索引（默认第1个表格）
-        """
-    """增强版表格修改（带颜色安全处理）"""
-    tables = [shape for shape in slide.shapes if shape.has_table]
-    if not tables:
-        raise ValueError("幻灯片中未找到表格")
-    table = tables[table_index].table
-
-    # 行列索引修正（支持1-based索引）
-    adj_row = row - 1
-    adj_col = col - 1
-
-    if adj_row >= len(table.rows) or adj_col >= len(table.columns):
-        raise IndexError(f"无效坐标({row},{col})，表格尺寸{len(table.rows)}x{len(table.columns)}")
-
-    cell = table.cell(adj_row, adj_col)
-
-    # 清空单元格内容但保留格式
-    for paragraph in cell.text_frame.paragraphs:
-        for run in paragraph.runs:
-            run.text = ""
-
-    # 获取基准格式（使用第一个存在的run）
-    base_run = None
-    if cell.text_frame.paragraphs:
-        paragraph = cell.text_frame.paragraphs[0]
-        if paragraph.runs:
-            base_run = paragraph.runs[0]
-        else:
-            base_run = paragraph.add_run()
+    生成指定阶段的宏文件
 
-    # 添加新内容
-    new_run = cell.text_frame.paragraphs[0].add_run()
-    new_run.text = new_text
+    每个任务/阶段单独生成，保存在任务的私有 Log 目录（避免流水线下互相覆盖，也不写入程序目录）
 
-    # 安全继承格式
-    if base_run:
-        new_run.font.bold = base_run.font.bold
-        new_run.font.italic = base_run.font.italic
-        new_run.font.size = base_run.font.size
-        new_run.font.name = base_run.font.name
+    :param job: prepare_job 返回的任务字典
+    :param phase: job_scheduler.PHASE_STAGES 中的阶段组合（'mesh' / 'solve' / 'full'）
+    :return: 宏文件路径
+    """
+    class_name = f"StarCCM_{phase}_{job['uid']}"
+    script_path = os.path.normpath(os.path.join(job['log_folder'], f"{class_name}.java"))
+    os.makedirs(job['log_folder'], exist_ok=True)
+    file_content = build_macro(job, class_name, PHASE_STAGES[phase], PHASE_COMPLETED[phase])
+    # 逐行写入文件
+    with open(script_path, "w", encoding="utf-8") as file:
+        for line in file_content.splitlines():
+            file.write(line + "\n")
+    logging.info(f"宏文件已生成: {script_path}")
+    return script_path
+
+
+class ResultsSearchDialog(QDialog):
+    """历史结果检索对话框：按模型、工质、操作员、日期与工况范围查询结果索引"""
+
+    COLUMNS = [('date', "日期"), ('operator', "操作员"), ('model_name', "模型"), ('sim_index', "序号"),
+               ('fluid', "工质"), ('temperature', "温度(°C)"), ('pressure', "压力(MPa)"),
+               ('mass_flow', "流量(kg/s)"), ('dp_pa', "压降(Pa)"), ('mach', "马赫数"), ('status', "状态")]
+
+    def __init__(self, parent, fluids):
+        super().__init__(parent)
+        self.setWindowTitle("历史结果检索")
+        self.resize(1200, 700)
+        self.rows = []
+        self.index = ResultsIndex()
+
+        self.model_input = QLineEdit()
+        self.model_input.setPlaceholderText("模型名，可用 * 通配")
+        self.fluid_input = QComboBox()
+        self.fluid_input.addItems(["全部"] + fluids)
+        self.operator_input = QLineEdit()
+        self.date_from_input = QLineEdit()
+        self.date_from_input.setPlaceholderText("YYYY-MM-DD")
+        self.date_to_input = QLineEdit()
+        self.date_to_input.setPlaceholderText("YYYY-MM-DD")
+        self.range_inputs = {}
+        form = QFormLayout()
+        form.addRow(QLabel("模型:"), self.model_input)
+        form.addRow(QLabel("工质:"), self.fluid_input)
+        form.addRow(QLabel("操作员:"), self.operator_input)
+        dates = QHBoxLayout()
+        dates.addWidget(self.date_from_input)
+        dates.addWidget(QLabel("至"))
+        dates.addWidget(self.date_to_input)
+        form.addRow(QLabel("日期:"), dates)
+        for key, label in (('temperature', "入口温度（°C）:"), ('pressure', "入口压力（MPa）:"),
+                           ('mass_flow', "质量流量（kg/s）:")):
+            low, high = QLineEdit(), QLineEdit()
+            low.setPlaceholderText("下限")
+            high.setPlaceholderText("上限")
+            bounds = QHBoxLayout()
+            bounds.addWidget(low)
+            bounds.addWidget(QLabel("至"))
+            bounds.addWidget(high)
+            form.addRow(QLabel(label), bounds)
+            self.range_inputs[key] = (low, high)
+
+        search_button = QPushButton("查询")
+        search_button.clicked.connect(self.search)
+        sweep_button = QPushButton("生成汇总报告")
+        sweep_button.setToolTip("把选中的结果（未选中时为全部查询结果）合并为一个PPT")
+        sweep_button.clicked.connect(self.export_sweep_report)
+        buttons = QHBoxLayout()
+        buttons.addWidget(search_button)
+        buttons.addWidget(sweep_button)
+        self.summary_label = QLabel()
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([label for _, label in self.COLUMNS])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.cellDoubleClicked.connect(self.on_row_double_clicked)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(form)
+        layout.addLayout(buttons)
+        layout.addWidget(self.summary_label)
+        layout.addWidget(self.table)
 
-        # 颜色继承处理
         try:
-            if base_run.font.color.rgb:
-                new_run.font.color.rgb = base_run.font.color.rgb
-            elif base_run.font.color.theme_color:
-                new_run.font.color.theme_color = base_run.font.color.theme_color
-            else:
-                new_run.font.color.auto = True
-        except AttributeError:
-            new_run.font.color.auto = True
+            self.index.scan(PUBLIC_ROOT)
+        except Exception as e:
+            logging.error(f"结果索引扫描失败: {str(e)}")
+        self.search()
 
+    def _range(self, key):
+        low, high = self.range_inputs[key]
+        return (float(low.text()) if low.text().strip() else None,
+                float(high.text()) if high.text().strip() else None)
 
-def append_text_to_slide(slide, target_text="压降仿真_", additional_text="（2024年最新数据）"):
-    """
-    安全颜色继承版本（支持所有颜色类型）
-    """
-    for shape in slide.shapes:
-        if not (shape.has_text_frame and target_text in shape.text):
-            continue
-
-        text_frame = shape.text_frame
-        for paragraph in text_frame.paragraphs:
-            if target_text not in paragraph.text:
-                continue
-
-            if paragraph.runs:
-                last_run = paragraph.runs[-1]
-                new_run = paragraph.add_run()
-                new_run.text = additional_text
-
-                # 字体基础属性继承
-                new_run.font.bold = last_run.font.bold
-                new_run.font.italic = last_run.font.italic
-                new_run.font.size = last_run.font.size
-                new_run.font.name = last_run.font.name
-
-                # 安全颜色继承（关键修改部分）
-                try:
-                    # 优先继承RGB颜色
-                    if last_run.font.color.rgb is not None:
-                        new_run.font.color.rgb = last_run.font.color.rgb
-                    # 其次继承主题颜色
-                    elif last_run.font.color.theme_color is not None:
-                        new_run.font.color.theme_color = last_run.font.color.theme_color
-                    # 最后保持自动颜色
-                    else:
-                        new_run.font.color.auto = True
-                except AttributeError as e:
-                    # print(f"颜色继承异常: {str(e)}，已设为自动颜色")
-                    new_run.font.color.auto = True
-            else:
-                new_run = paragraph.add_run()
-                new_run.text = target_text + additional_text
-            break
-        break
+    def search(self):
+        try:
+            ranges = {key: self._range(key) for key in self.range_inputs}
+        except ValueError:
+            QMessageBox.warning(self, "输入错误", "工况范围请输入数字")
+            return
+        fluid = self.fluid_input.currentText()
+        self.rows = self.index.query(
+            model=self.model_input.text().strip() or None,
+            fluid=None if fluid == "全部" else fluid,
+            operator=self.operator_input.text().strip() or None,
+            date_from=self.date_from_input.text().strip() or None,
+            date_to=self.date_to_input.text().strip() or None,
+            **ranges)
+        self.table.setRowCount(len(self.rows))
+        for row_number, row in enumerate(self.rows):
+            for column, (key, _) in enumerate(self.COLUMNS):
+                value = row[key]
+                if isinstance(value, float):
+                    value = f"{value:.0f}" if key == 'dp_pa' else f"{value:.4g}"
+                self.table.setItem(row_number, column, QTableWidgetItem("" if value is None else str(value)))
+        self.summary_label.setText(f"共 {len(self.rows)} 条结果，双击查看")
+
+    def on_row_double_clicked(self, row_number, _column):
+        self.parent().show_indexed_result(self.rows[row_number])
+
+    def export_sweep_report(self):
+        selected = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        runs = sweep_runs([self.rows[i] for i in selected] if selected else self.rows)
+        if not runs:
+            QMessageBox.warning(self, "无法生成", "没有已完成且有压降结果的任务")
+            return
+        default_name = f"{runs[0]['model_name']}_扫描汇总_{len(runs)}个工况.pptx"
+        output_path, _ = QFileDialog.getSaveFileName(self, "保存汇总报告", default_name, "PowerPoint (*.pptx)")
+        if not output_path:
+            return
+        try:
+            build_sweep_report(runs, output_path)
+        except Exception as e:
+            logging.error(f"生成汇总报告失败: {str(e)}")
+            QMessageBox.warning(self, "生成失败", str(e))
+            return
+        QMessageBox.information(self, "完成", f"已生成汇总报告（{len(runs)} 个工况）:\n{output_path}")
 
+    def closeEvent(self, event):
+        self.index.close()
+        super().closeEvent(event)
 
-# 在类定义顶部添加配置路径常量
-CONFIG_FILE = "sim_config.json"
 
 class SimulationConfigWindow(QWidget):
     def __init__(self, validator):#, validator):
@@ -307,6 +340,14 @@ class SimulationConfigWindow(QWidget):
 
         self.task_queue = []  # 新增队列初始化
 
+        # 运行时长历史与预测（用于队列ETA及排序）
+        self.runtime_history = RuntimeHistory()
+        self.thread_selector = ThreadSelector(self.runtime_history)
+        self.resource_estimator = ResourceEstimator(self.runtime_history)
+        self.memory_sampler = MemorySampler()
+        self.runtime_predictor = RuntimePredictor(self.runtime_history, task_estimator=self.estimate_task)
+        self.running_task_start = None
+
         # 新增路径变量初始化
         self.res_sce_path1 = None
         self.res_sce_path2 = None
@@ -341,6 +382,19 @@ class SimulationConfigWindow(QWidget):
         # 初始化状态变量
         self.process_state = None
 
+        # 流水线模式下提前划分网格的下一个任务
+        self.premesh = None
+        self.stage_timer = StageTimer()
+        self.iteration_parser = IterationParser()
+        # 结果图片缩略图（后台生成并缓存，原图只在查看大图时读取）
+        self.thumbnails = ThumbnailService(parent=self)
+        evict_report_images()
+        # 草稿目录模式：求解结果由后台线程转移到结果目录（继续上次退出时未完成的转移）
+        self.scratch_mover = None
+        if SCRATCH_ROOT:
+            self.scratch_mover = ScratchMover(SCRATCH_ROOT, SCRATCH_QUOTA_GB)
+            self.scratch_mover.resume()
+
         # 原初始化代码替换为：
         self.model_import_path_input = QLineEdit()
         self.model_import_path_input.setText(self.config['model_import_path'])
@@ -358,6 +412,11 @@ class SimulationConfigWindow(QWidget):
 
         self.threads_input = QLineEdit()
         self.threads_input.setText(self.config['threads'])
+        self.threads_input.setToolTip("输入 auto 按模型规模和本机历史扩展性自动选择进程数")
+
+        self.mesh_threads_input = QLineEdit()
+        self.mesh_threads_input.setText(self.config['mesh_threads'])
+        self.mesh_threads_input.setToolTip("队列计算时，当前任务求解的同时用这部分核为下一个任务划分网格，0表示不启用")
 
         self.stop_criteria_max_steps_input = QLineEdit()
         self.stop_criteria_max_steps_input.setText(self.config['max_steps'])
@@ -447,12 +506,15 @@ class SimulationConfigWindow(QWidget):
             'starccmview_path': r'D:\starCCM+\16.06.008-R8\STAR-View+16.06.008\bin\starview+.exe',
             'refprp64dll': r'D:\Program Files (x86)\REFPROP\REFPRP64.DLL',
             'threads': "64",
+            'mesh_threads': "8",  # 流水线网格预划分核数，0为关闭
             'max_steps': "3000",
             'temperature': "25",
             'pressure': "0.3",
             'mass_flow': "210/3600",
             'workingfluid_index': 0,
             'operator_name': "",
+            'queue_order': 'fifo',  # 队列执行顺序，见 ORDER_POLICIES
+            'render_profile': DEFAULT_RENDER_PROFILE,  # 新加入队列任务的渲染档位，见 RENDER_PROFILES
             'last_params': {},  # 新增参数存储
             'task_queue': []
         }
@@ -523,12 +585,20 @@ class SimulationConfigWindow(QWidget):
                 'starccmview_path': self.starccmview_path_input.text().strip('"'),
                 'refprp64dll': self.refprp64dll_input.text().strip('"'),
                 'threads': self.threads_input.text(),
+                'mesh_threads': self.mesh_threads_input.text(),
                 'max_steps': self.stop_criteria_max_steps_input.text(),
                 'temperature': self.temperature_input.text(),
                 'pressure': self.pressure_input.text(),
                 'mass_flow': self.inlet_mass_flow_rate_input.text(),
                 'workingfluid_index': self.workingfluid_input.currentIndex(),
                 'operator_name': self.operator_name_input.text(),
+                'queue_order': list(ORDER_POLICIES)[self.queue_order_input.currentIndex()],
+                'render_profile': self.selected_render_profile(),
+                'sim_root': SIM_ROOT,
+                'public_root': PUBLIC_ROOT,
+                'cache_root': CACHE_ROOT,
+                'scratch_root': SCRATCH_ROOT or "",
+                'scratch_quota_gb': SCRATCH_QUOTA_GB,
                 'last_params': self.last_input_params,  # 新增参数存储
                 'task_queue': [
             {k: v.strftime("%Y-%m-%d %H:%M:%S") if isinstance(v, datetime.datetime) else v
@@ -544,6 +614,11 @@ class SimulationConfigWindow(QWidget):
     def closeEvent(self, event):
         """窗口关闭时自动保存"""
         self.save_config()
+        if self.premesh is not None:
+            self.premesh['process'].kill()
+            discard_job(self.premesh['job'])
+        if self.scratch_mover is not None and not self.scratch_mover.wait_idle(timeout=0):
+            logging.warning("结果转移尚未完成，下次启动时继续")
         event.accept()
 
     # 在SimulationConfigWindow类中添加新方法：
@@ -563,7 +638,7 @@ class SimulationConfigWindow(QWidget):
         operator_name = params['operator_name']
         datenow = get_formatted_date()
         return os.path.join(
-            "D:", "仿真自动化结果",
+            PUBLIC_ROOT,
             datenow, operator_name,
             f"{name}_{self.index}",  # 这里会动态获取最新的 self.index
             "Report",
@@ -613,6 +688,8 @@ class SimulationConfigWindow(QWidget):
                 'workingfluid_index': self.workingfluid_input.currentIndex(),
                 'operator_name': self.operator_name_input.text(),
                 'submit_time': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),  # 新增提交时间
+                'deadline': self.deadline_input.text().strip(),  # 可选截止时间
+                'render_profile': self.selected_render_profile(),
                 'simulation_index': None,
                 'simulation_date': None,
                 'Ma': None,
@@ -623,25 +700,15 @@ class SimulationConfigWindow(QWidget):
         if not self.operator_name_input.text().strip():
             QMessageBox.warning(self, "输入错误", "请先输入操作员姓名")
             return
+        if current_params1['deadline'] and parse_deadline(current_params1['deadline']) is None:
+            QMessageBox.warning(self, "输入错误", "截止时间格式应为 2025-05-01 18:00")
+            return
 
-        # 修改后的重复任务检查（忽略status字段）
-        temp_params = current_params1.copy()
-        temp_params.pop('status', None)
-        temp_params.pop('submit_time', None)
-        temp_params.pop('simulation_index', None)
-        temp_params.pop('simulation_date', None)
-        temp_params.pop('Ma', None)
-        temp_params.pop('res_mach_number', None)
+        # 重复任务检查：只比较仿真输入参数（忽略状态、提交时间及运行后写入的计时、网格量等字段）
+        temp_params = self.get_task_params(current_params1)
 
         for idx, task in enumerate(self.task_queue, 1):
-            task_copy = task.copy()
-            task_copy.pop('status', None)
-            task_copy.pop('submit_time', None)
-            task_copy.pop('simulation_index', None)
-            task_copy.pop('simulation_date', None)
-            task_copy.pop('Ma', None)
-            task_copy.pop('res_mach_number', None)
-            if task_copy == temp_params:
+            if self.get_task_params(task) == temp_params:
                 reply = QMessageBox.question(
                     self, "重复任务",
                     f"任务 {idx} 与当前参数完全相同\n\n是否继续添加？",
@@ -653,35 +720,8 @@ class SimulationConfigWindow(QWidget):
 
         # 深度拷贝避免参数被后续修改
         self.task_queue.append(copy.deepcopy(current_params1))
-
-        # 显示在队列列表
-        task_info = (f"任务 {len(self.task_queue)}: "
-                     f'''{extract_model_name(self.model_import_path_input.text().strip('"'))} | '''
-                     f"操作员：{current_params1['operator_name']} | "
-                     f"工质: {self.workingfluid_input.currentText()} | "
-                     f"温度: {current_params1['temperature']}℃ | "
-                     f"绝对压力: {current_params1['pressure']}MPa | "
-                     f"质量流量: {current_params1['mass_flow']}kg/s | "
-                     f"提交时间: {current_params1['submit_time']}")
-        # 使用HTML实现部分文字着色
-        status_bg = self.STATUS_BG_COLOR[current_params1["status"]]
-        status_color = self.STATUS_COLOR[current_params1["status"]]
-        colored_text = (
-            f'<span style="background-color: {status_bg}; color: {status_color}; '
-            f'padding: 2px 5px; border-radius: 3px;">[{current_params1["status"]}]</span>'
-        )
-        full_text = f"{colored_text} {task_info}"
-
-        item = QListWidgetItem()
-        item.setData(Qt.UserRole, current_params1)
-
-        # 创建自定义Widget实现部分着色
-        label = QLabel(full_text)
-        label.setTextFormat(Qt.RichText)
-        item.setSizeHint(QSize(label.sizeHint().width(), label.sizeHint().height() + 10))
-
-        self.queue_list.addItem(item)
-        self.queue_list.setItemWidget(item, label)
+        # 刷新队列列表（同时更新各任务的预计用时）
+        self.update_queue_display()
         self.save_config()
 
     def delete_from_queue(self):
@@ -707,8 +747,27 @@ class SimulationConfigWindow(QWidget):
         # 删除后刷新队列序号
         self.update_queue_display()
 
+    def get_pending_order(self):
+        """按当前排序策略返回待计算任务的执行顺序"""
+        policy = list(ORDER_POLICIES)[self.queue_order_input.currentIndex()]
+        pending_tasks = [t for t in self.task_queue if t['status'] == "等待计算"]
+        return order_tasks(pending_tasks, self.runtime_predictor, policy)
+
     def update_queue_display(self):
         """刷新队列显示序号"""
+        # 按执行顺序（计算中的任务在前）估算每个任务的预计用时与完成时间
+        running_tasks = [t for t in self.task_queue if t['status'] == "计算中"]
+        execution_order = running_tasks + self.get_pending_order()
+        running_elapsed = 0.0
+        if self.running_task_start is not None:
+            running_elapsed = (datetime.datetime.now() - self.running_task_start).total_seconds()
+        etas, total_remaining = queue_eta(execution_order, self.runtime_predictor, running_elapsed=running_elapsed)
+        eta_by_task = {id(task): eta for task, eta in zip(execution_order, etas)}
+        if execution_order:
+            self.queue_title_label.setText(f"仿真队列管理：（预计剩余 {format_seconds(total_remaining)}）")
+        else:
+            self.queue_title_label.setText("仿真队列管理：")
+
         self.queue_list.clear()
         for index, task in enumerate(self.task_queue, 1):
             task_info = (
@@ -721,6 +780,19 @@ class SimulationConfigWindow(QWidget):
                 f"质量流量: {task['mass_flow']}kg/s | "
                 f"提交时间: {task['submit_time']}"
             )
+            render_profile = task.get('render_profile', DEFAULT_RENDER_PROFILE)
+            if render_profile != DEFAULT_RENDER_PROFILE:
+                task_info += f" | 出图: {RENDER_PROFILE_LABELS[render_profile]}"
+            if id(task) in eta_by_task:
+                predicted, finish_time = eta_by_task[id(task)]
+                task_info += f" | 预计用时: {format_seconds(predicted)}"
+                if finish_time is not None:
+                    task_info += f" | 预计完成: {finish_time:%m-%d %H:%M}"
+                deadline = parse_deadline(task.get('deadline'))
+                if deadline is not None:
+                    task_info += f" | 截止: {deadline:%m-%d %H:%M}"
+                    if finish_time is not None and finish_time > deadline:
+                        task_info += ' <span style="color: #e74c3c;">预计超期</span>'
 
             # 新增着色逻辑
             colored_text = (
@@ -958,6 +1030,29 @@ class SimulationConfigWindow(QWidget):
                     QApplication.processEvents()
 
 
+    def open_results_search(self):
+        """打开历史结果检索对话框"""
+        fluids = [self.workingfluid_input.itemText(i) for i in range(self.workingfluid_input.count())]
+        ResultsSearchDialog(self, fluids).exec_()
+
+    def show_indexed_result(self, row):
+        """在结果展示区显示结果索引中的一条历史结果"""
+        record = load_run_record(row['record_path']) if row.get('record_path') else None
+        fluids = [self.workingfluid_input.itemText(i) for i in range(self.workingfluid_input.count())]
+        macro_stages = (record or {}).get('timings', {}).get('macro_stages', {})
+        task = {
+            'model_import_path': row['model_path'] or f"{row['model_name']}.STEP",
+            'operator_name': row['operator'],
+            'simulation_date': row['date_folder'],
+            'simulation_index': row['sim_index'],
+            'Ma': row['mach_level'] or 0,
+            'res_mach_number': row['mach'] if row['mach'] is not None else "N/A",
+            'workingfluid_index': fluids.index(row['fluid']) if row['fluid'] in fluids else -1,
+            'stage_timings': group_durations({stage: entry['seconds'] for stage, entry in macro_stages.items()}),
+            'cell_count': row['cell_count'],
+        }
+        self.display_simulation_results(task)
+
     def display_simulation_results(self, task):
         self.btn_mach_3d.setVisible(False)
     #     """显示仿真结果"""
@@ -970,11 +1065,13 @@ class SimulationConfigWindow(QWidget):
             res_Ma=task['Ma']
             res_mach_number=task['res_mach_number']
             res_workflow = task['workingfluid_index']
+            self.stage_timing_label.setText(
+                f"阶段用时: {format_stage_summary(task.get('stage_timings', {}), task.get('cell_count'))}")
 
 
             # 构建结果路径
             res_report_folder = os.path.join(
-                "D:\\仿真自动化结果",
+                PUBLIC_ROOT,
                 res_datenow,
                 res_operator_name,
                 f"{res_name}_{res_index}",
@@ -984,7 +1081,6 @@ class SimulationConfigWindow(QWidget):
             # 显示压力云图
             res_pressure_img = os.path.join(res_report_folder, f"{res_name}_压力云图.png")
             if os.path.exists(res_pressure_img):
-                pixmap = QPixmap(res_pressure_img).scaled(400, 250, Qt.KeepAspectRatio)
                 self.pressure_label.setStyleSheet("""
                                                    QLabel {
                                                        border: 2px solid #3498DB;
@@ -996,7 +1092,8 @@ class SimulationConfigWindow(QWidget):
                                                        font-weight: bold;
                                                    }
                                                """)
-                self.pressure_label.setPixmap(pixmap)
+                self.pressure_label.setText("加载中...")
+                self.thumbnails.load_into(self.pressure_label, res_pressure_img, (400, 250))
                 self.pressure_label.mouseDoubleClickEvent = lambda e: self.show_image(res_pressure_img)
                 self.btn_pressure_3d.setEnabled(True)
             else:
@@ -1021,7 +1118,6 @@ class SimulationConfigWindow(QWidget):
             # 显示流线图
             res_streamline_img = os.path.join(res_report_folder, f"{res_name}_流线图.png")
             if os.path.exists(res_streamline_img):
-                pixmap = QPixmap(res_streamline_img).scaled(400, 250, Qt.KeepAspectRatio)
                 self.streamline_label.setStyleSheet("""
                                                    QLabel {
                                                        border: 2px solid #27AE60;
@@ -1033,7 +1129,8 @@ class SimulationConfigWindow(QWidget):
                                                        font-weight: bold;
                                                    }
                                                """)
-                self.streamline_label.setPixmap(pixmap)
+                self.streamline_label.setText("加载中...")
+                self.thumbnails.load_into(self.streamline_label, res_streamline_img, (400, 250))
                 self.streamline_label.mouseDoubleClickEvent = lambda e: self.show_image(res_streamline_img)
                 self.btn_streamline_3d.setEnabled(True)
             else:
@@ -1059,7 +1156,7 @@ class SimulationConfigWindow(QWidget):
             # res_last_value = round(float(read_last_row_last_column(res_csv_path)))
             res_last_value = read_last_row_last_column(res_csv_path)
             if res_last_value is not None:
-                res_last_value = round(float(read_last_row_last_column(res_csv_path)))
+                res_last_value = round(float(res_last_value))
                 self.pressure_drop_label.setText(f" {res_last_value} Pa")
                 self.pressure_drop_label.setStyleSheet("font-size: 24px; color: #009900; font-weight: bold;")
             else:
@@ -1189,6 +1286,7 @@ class SimulationConfigWindow(QWidget):
         left_form_layout.addRow(QLabel('STAR-CCM Viewer软件路径:'), self.starccmview_path_input)
         left_form_layout.addRow(QLabel('REFPRP64.DLL路径:'), self.refprp64dll_input)
         left_form_layout.addRow(QLabel('线程数:'), self.threads_input)
+        left_form_layout.addRow(QLabel('网格预处理线程数:'), self.mesh_threads_input)
         left_form_layout.addRow(QLabel('停止准则 最大步数:'), self.stop_criteria_max_steps_input)
 
         # 物性参数设置
@@ -1295,7 +1393,7 @@ class SimulationConfigWindow(QWidget):
         # right_layout.insertWidget(2, self.pressure_drop_label)  # 插入到工况输入下方
 
         # 设置所有其他标签的字体大小为20号
-        for label in [self.model_import_path_input, self.starccm_path_input,self.refprp64dll_input,self.starccmview_path_input, self.threads_input,
+        for label in [self.model_import_path_input, self.starccm_path_input,self.refprp64dll_input,self.starccmview_path_input, self.threads_input, self.mesh_threads_input,
                       self.stop_criteria_max_steps_input, self.workingfluid_input,
                       self.temperature_input, self.pressure_input, self.inlet_mass_flow_rate_input,self.operator_name_input]:
             label.setStyleSheet("font-size: 20px;")
@@ -1331,15 +1429,15 @@ class SimulationConfigWindow(QWidget):
         queue_layout.setContentsMargins(20, 10, 20, 10)  # 统一设置边距
         queue_layout.setSpacing(20)
 
-        # 标题标签
-        queue_title_label = QLabel('仿真队列管理：')
-        queue_title_label.setStyleSheet("""
+        # 标题标签（显示队列预计剩余时间）
+        self.queue_title_label = QLabel('仿真队列管理：')
+        self.queue_title_label.setStyleSheet("""
             font-size: 28px; 
             font-weight: bold;
             color: #2c3e50;
             padding-bottom: 10px;
         """)
-        queue_layout.addWidget(queue_title_label)
+        queue_layout.addWidget(self.queue_title_label)
 
         # 队列列表
         self.queue_list = QListWidget()
@@ -1362,6 +1460,7 @@ class SimulationConfigWindow(QWidget):
         btn_add = QPushButton("＋ 添加任务")
         btn_delete = QPushButton("－ 删除任务")
         btn_clear = QPushButton("× 清空队列")
+        btn_search = QPushButton("历史结果检索")
 
         # 按钮样式
         button_style = """
@@ -1378,17 +1477,49 @@ class SimulationConfigWindow(QWidget):
         btn_add.setStyleSheet(button_style + "background-color: #3498db; color: black;")
         btn_delete.setStyleSheet(button_style + "background-color: #e67e22; color: black;")
         btn_clear.setStyleSheet(button_style + "background-color: #e74c3c; color: black;")
+        btn_search.setStyleSheet(button_style + "background-color: #95a5a6; color: black;")
 
         btn_add.clicked.connect(self.add_to_queue)
         btn_delete.clicked.connect(self.delete_from_queue)
         btn_clear.clicked.connect(self.clear_queue)
+        btn_search.clicked.connect(self.open_results_search)
         self.queue_list.itemDoubleClicked.connect(self.on_task_double_clicked)
 
         button_layout.addWidget(btn_add)
         button_layout.addWidget(btn_delete)
         button_layout.addWidget(btn_clear)
+        button_layout.addWidget(btn_search)
         queue_layout.addWidget(button_container)
 
+        # 执行顺序与截止时间
+        order_container = QWidget()
+        order_layout = QHBoxLayout(order_container)
+        order_layout.setContentsMargins(0, 0, 0, 0)
+        order_layout.setSpacing(10)
+        self.queue_order_input = QComboBox()
+        self.queue_order_input.addItems(list(ORDER_POLICIES.values()))
+        order_keys = list(ORDER_POLICIES)
+        self.queue_order_input.setCurrentIndex(
+            order_keys.index(self.config['queue_order']) if self.config['queue_order'] in order_keys else 0)
+        self.queue_order_input.currentIndexChanged.connect(lambda _: self.update_queue_display())
+        self.deadline_input = QLineEdit()
+        self.deadline_input.setPlaceholderText("截止时间（可选），如 2025-05-01 18:00")
+        # 渲染档位：对之后加入队列的任务生效（扫描工况可先切换为预览再批量加入）
+        self.render_profile_input = QComboBox()
+        self.render_profile_input.addItems(list(RENDER_PROFILE_LABELS.values()))
+        profile_keys = list(RENDER_PROFILE_LABELS)
+        self.render_profile_input.setCurrentIndex(
+            profile_keys.index(self.config['render_profile']) if self.config['render_profile'] in profile_keys else 0)
+        self.render_profile_input.setToolTip("完整：高分辨率结果图与三维场景文件；预览：低分辨率结果图，不导出三维场景；"
+                                             "不出图：只导出CSV结果")
+        order_layout.addWidget(QLabel('执行顺序:'))
+        order_layout.addWidget(self.queue_order_input)
+        order_layout.addWidget(QLabel('截止时间:'))
+        order_layout.addWidget(self.deadline_input)
+        order_layout.addWidget(QLabel('出图:'))
+        order_layout.addWidget(self.render_profile_input)
+        queue_layout.addWidget(order_container)
+
         queue_group.setLayout(queue_layout)
 
         # 创建主布局
@@ -1484,8 +1615,24 @@ class SimulationConfigWindow(QWidget):
         image_layout.addWidget(self.pressure_label)
         image_layout.addWidget(self.streamline_label)
 
+        # 各阶段用时（由宏输出的阶段标记实时更新）
+        self.stage_timing_label = QLabel("阶段用时: --")
+        self.stage_timing_label.setStyleSheet("font-size: 16px; color: #2C3E50; padding: 2px 15px;")
+        self.stage_timing_label.setWordWrap(True)
+
+        # 求解过程实时收敛曲线（由求解日志中的迭代表更新）
+        convergence_container = QWidget()
+        convergence_layout = QHBoxLayout(convergence_container)
+        convergence_layout.setContentsMargins(0, 0, 0, 0)
+        self.dp_plot = LivePlot("压降", "Pa", "#3498DB")
+        self.vmax_plot = LivePlot("最大流速", "m/s", "#27AE60")
+        convergence_layout.addWidget(self.dp_plot)
+        convergence_layout.addWidget(self.vmax_plot)
+
         # 组合底部布局
         bottom_layout.addWidget(pressure_drop_container)
+        bottom_layout.addWidget(self.stage_timing_label)
+        bottom_layout.addWidget(convergence_container)
         bottom_layout.addWidget(image_container)
 
         # ==================== 3D可视化按钮布局 ====================
@@ -1617,33 +1764,24 @@ class SimulationConfigWindow(QWidget):
 
             if reply == QMessageBox.Yes:
                 while True:
-                    # 查找第一个等待计算的任务
-                    pending_tasks = [t for t in self.task_queue if t['status'] == "等待计算"]
+                    # 按执行顺序策略（提交顺序/最短优先/截止时间优先）查找下一个等待计算的任务
+                    pending_tasks = self.get_pending_order()
                     if not pending_tasks:
                         break
                     # 取第一个等待任务
                     task = pending_tasks[0]
-                    params = {
-                        'model_import_path': task['model_import_path'],
-                        'starccm_path': task['starccm_path'],
-                        'starccmview_path': task['starccmview_path'],
-                        'refprp64dll': task['refprp64dll'],
-                        'threads': task['threads'],
-                        'max_steps': task['max_steps'],
-                        'temperature': task['temperature'],
-                        'pressure': task['pressure'],
-                        'mass_flow': task['mass_flow'],
-                        'workingfluid_index': task['workingfluid_index'],
-                        'operator_name': task['operator_name']
-                    }
+                    params = self.get_task_params(task)
+                    # 下一个等待任务，用于在当前任务求解时预划分网格
+                    next_params = self.get_task_params(pending_tasks[1]) if len(pending_tasks) > 1 else None
                     try:
                         # 更新任务状态为计算中
                         task['status'] = "计算中"
+                        self.running_task_start = datetime.datetime.now()
                         self.update_queue_display()
                         QApplication.processEvents()  # 强制UI刷新
 
                         # 执行仿真（需要将原有执行逻辑封装成独立方法）
-                        self.on_run_button_clicked(params,is_queue_task=True)
+                        self.on_run_button_clicked(params,is_queue_task=True,next_params=next_params)
 
                         if self.process_state == 1:
                             # 标记任务完成
@@ -1653,6 +1791,7 @@ class SimulationConfigWindow(QWidget):
                         task['status'] = "失败"
 
                     finally:
+                        self.running_task_start = None
                         self.update_queue_display()
                         self.save_config()
                         QApplication.processEvents()
@@ -1679,168 +1818,25 @@ class SimulationConfigWindow(QWidget):
                     'pressure': self.pressure_input.text(),
                     'mass_flow': self.inlet_mass_flow_rate_input.text(),
                     'workingfluid_index': self.workingfluid_input.currentIndex(),
-                    'operator_name': self.operator_name_input.text()
+                    'operator_name': self.operator_name_input.text(),
+                    'render_profile': self.selected_render_profile(),
                 }
                 self.on_run_button_clicked(params,is_queue_task=False)
         # return params
-    def on_run_button_clicked(self,params,is_queue_task):
-
-        # 移除现有的日志处理器
-        for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
-            handler.close()
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        # 添加处理器
-        self.logger.addHandler(console_handler)
-
-        start_time = datetime.datetime.now()  # 添加在方法开始处
-
-        # ==== 新增校验逻辑 ====
-        if not self.operator_name_input.text().strip():
-            QMessageBox.warning(self, "输入错误", "请先输入操作员姓名")
-            return
-        # ==== 校验结束 ====
-
-        # # ==== 新增参数对比逻辑 ====
-        # current_params = {
-        #     'model_path': self.model_import_path_input.text().strip('"'),
-        #     'threads': self.threads_input.text(),
-        #     'max_steps': self.stop_criteria_max_steps_input.text(),
-        #     'temperature': self.temperature_input.text(),
-        #     'pressure': self.pressure_input.text(),
-        #     'mass_flow': self.inlet_mass_flow_rate_input.text(),
-        #     'workingfluid': self.workingfluid_input.currentText(),
-        #     'operator': self.operator_name_input.text()
-        #     # 'starccm_path': self.starccm_path_input.text().strip('"'),
-        #     # 'starccmview_path': self.starccmview_path_input.text().strip('"'),
-        #     # 'refprp64dll_path': self.refprp64dll_input.text().strip('"'),
-        # }
-        #
-        # if current_params == self.last_input_params and self.last_input_params:
-        #     reply = QMessageBox.question(
-        #         self, '输入确认',
-        #         "输入参数与上次运行完全相同，是否继续？",
-        #         QMessageBox.Yes | QMessageBox.No,
-        #         QMessageBox.No
-        #     )
-        #     if reply == QMessageBox.No:
-        #         return
-
-        # ==== 新增参数对比逻辑 ====
-        current_params = {
-            'model_import_path': self.model_import_path_input.text().strip('"'),
-            'starccm_path': self.starccm_path_input.text().strip('"'),
-            'starccmview_path': self.starccmview_path_input.text().strip('"'),
-            'refprp64dll': self.refprp64dll_input.text().strip('"'),
-            'threads': self.threads_input.text(),
-            'max_steps': self.stop_criteria_max_steps_input.text(),
-            'temperature': self.temperature_input.text(),
-            'pressure': self.pressure_input.text(),
-            'mass_flow': self.inlet_mass_flow_rate_input.text(),
-            'workingfluid': self.workingfluid_input.currentText(),
-            'operator_name': self.operator_name_input.text()
-        }
-
-        # 转换为数值类型进行比较（处理字符串与数值的对比）
-        try:
-            current_params['temperature'] = float(current_params['temperature'])
-            current_params['pressure'] = float(current_params['pressure'])
-            current_params['mass_flow'] = float(current_params['mass_flow'])
-        except ValueError:
-            pass
-        try:
-            self.last_input_params['temperature'] = float(self.last_input_params['temperature'])
-            self.last_input_params['pressure'] = float(self.last_input_params['pressure'])
-            self.last_input_params['mass_flow'] = float(self.last_input_params['mass_flow'])
-        except ValueError:
-            pass
-
-        if current_params == self.last_input_params and self.last_input_params and not is_queue_task:
-            reply = QMessageBox.question(
-                self,
-                '确认输入',
-                "输入参数与上次运行完全相同，是否继续？\n\n",
-                # f"模型路径: {current_params['model_import_path']}\n"
-                # f"工质类型: {current_params['workingfluid']}\n"
-                # f"温度: {current_params['temperature']}℃",
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.No
-            )
-            if reply == QMessageBox.No:
-                return
-
-        # 初始隐藏马赫数按钮
-        self.btn_mach_3d.setVisible(False)
-        self.btn_pressure_3d.setEnabled(False)
-        self.btn_streamline_3d.setEnabled(False)
-        self.btn_mach_3d.setEnabled(False)
-
-        # 重置压降值显示
-        self.pressure_drop_label.setText(" 计算中...")
-        self.pressure_drop_label.setStyleSheet("""
-                font-size: 24px; 
-                color: #FF0000; 
-                font-weight: bold;
-                padding: 5px 15px;
-                background: #FFF3CD;
-                border-radius: 5px;
-            """)
-        # 重置马赫数显示
-        self.mach_number_label.setText(" 计算中...")
-        self.mach_number_label.setStyleSheet("""
-                font-size: 24px; 
-                color: #FF0000; 
-                font-weight: bold;
-                padding: 5px 15px;
-                background: #FFF3CD;
-                border-radius: 5px;
-        """)
-
-        # 重置图片预览区
-        self.pressure_label.clear()
-        self.pressure_label.setText("压力云图预览区")
-        self.pressure_label.setStyleSheet("""
-               QLabel {
-                   border: 2px solid #3498DB;
-                   border-radius: 5px;
-                   background: #F8F9FA;
-                   min-width: 400px;
-                   min-height: 250px;
-                   font-size: 36px;
-                   font-weight: bold;
-               }
-           """)
-
-        self.streamline_label.clear()
-        self.streamline_label.setText("流线图预览区")
-        self.streamline_label.setStyleSheet("""
-               QLabel {
-                   border: 2px solid #27AE60;
-                   border-radius: 5px;
-                   background: #F8F9FA;
-                   min-width: 400px;
-                   min-height: 250px;
-                   font-size: 36px;
-                   font-weight: bold;
-               }
-           """)
-
-        # 移除鼠标事件绑定
-        self.pressure_label.mouseDoubleClickEvent = None
-        self.streamline_label.mouseDoubleClickEvent = None
-
-        # 立即刷新界面
-        QApplication.processEvents()
+    def prepare_job(self, params):
+        """
+        创建任务目录、计算物性并缓存模型，返回任务字典
 
-        # 修改按钮文本和样式
-        self.run_button.setText('运行中请勿点击')
-        self.run_button.setStyleSheet("font-size: 48px; font-weight: bold; background-color: #FFA07A;")  # 浅红色背景
-        self.run_button.setEnabled(False)  # 禁用按钮，防止多次点击
-        QApplication.processEvents()  # 强制刷新UI
+        流水线模式下会提前为下一个任务调用，因此这里不修改 self.index，
+        也不挂载日志文件处理器。
+        :param params: 任务输入参数
+        :return: 任务字典，失败返回None
+        """
+        prepare_start = time.monotonic()
 
         # D盘创建一个仿真文件夹
-        folder_path = "D:\\STARCCM Simulation automation"#加密文件夹
+        datenow = get_formatted_date()
+        folder_path = SIM_ROOT#加密文件夹
 
         # 检查并创建主文件夹
         if not os.path.exists(folder_path):
@@ -1850,7 +1846,7 @@ class SimulationConfigWindow(QWidget):
             logging.info(f"文件夹已存在: {folder_path}")
 
             # 获取当前日期并创建日期文件夹
-        date_folder = os.path.join(folder_path, get_formatted_date())
+        date_folder = os.path.join(folder_path, datenow)
         if not os.path.exists(date_folder):
             os.makedirs(date_folder)
             logging.info(f"日期文件夹已创建: {date_folder}")
@@ -1861,7 +1857,7 @@ class SimulationConfigWindow(QWidget):
         operator_name = params['operator_name']
         if not operator_name:
             QMessageBox.warning(self, "输入错误", "请先输入操作员姓名")
-            return
+            return None
 
         # 创建操作员文件夹
         operator_folder = os.path.join(date_folder, operator_name)
@@ -1873,7 +1869,7 @@ class SimulationConfigWindow(QWidget):
 
 
         ###创建公开文件夹
-        public_folder_path = "D:\\仿真自动化结果"
+        public_folder_path = PUBLIC_ROOT
 
         # 检查并创建主文件夹
         if not os.path.exists(public_folder_path):
@@ -1883,7 +1879,7 @@ class SimulationConfigWindow(QWidget):
             logging.info(f"文件夹已存在: {public_folder_path}")
 
             # 获取当前日期并创建日期文件夹
-        date_folder_public = os.path.join(public_folder_path, get_formatted_date())
+        date_folder_public = os.path.join(public_folder_path, datenow)
         if not os.path.exists(date_folder_public):
             os.makedirs(date_folder_public)
             logging.info(f"日期文件夹已创建: {date_folder_public}")
@@ -1909,7 +1905,6 @@ class SimulationConfigWindow(QWidget):
             model_folder_public = os.path.join(operator_folder_public, f"{name}_{current_index}")
             if not os.path.exists(model_folder):
                 break
-        self.index = current_index  # 保持index与文件夹一致
 
         # 创建模型文件夹
         os.makedirs(model_folder)
@@ -1971,11 +1966,19 @@ class SimulationConfigWindow(QWidget):
         threads=params['threads']
         stop_criteria_max_steps=params['max_steps']
 
-        base_size = 0.3#self.base_size_input.text()
-        target_surface_ratio = 100#self.target_surface_ratio_input.text()
-        min_surface_ratio =25# self.min_surface_ratio_input.text()
-        prisma_layer_thickness_ratio = 33#self.prisma_layer_thickness_ratio_input.text()
-        prisma_layer_extension = 2#self.prisma_layer_extension_input.text()
+        base_size = params.get('base_size', MESH_SETTINGS['base_size'])#self.base_size_input.text()
+        target_surface_ratio = params.get('target_surface_ratio', MESH_SETTINGS['target_surface_ratio'])#self.target_surface_ratio_input.text()
+        min_surface_ratio = params.get('min_surface_ratio', MESH_SETTINGS['min_surface_ratio'])# self.min_surface_ratio_input.text()
+        prisma_layer_thickness_ratio = params.get('prisma_layer_thickness_ratio', MESH_SETTINGS['prisma_layer_thickness_ratio'])#self.prisma_layer_thickness_ratio_input.text()
+        prisma_layer_extension = params.get('prisma_layer_extension', MESH_SETTINGS['prisma_layer_extension'])#self.prisma_layer_extension_input.text()
+
+        # 估算网格规模；线程数为 auto 时按本机扩展性模型选择 -np
+        if is_auto_threads(threads):
+            threads, estimated_cells = self.thread_selector.choose(model_import_path, base_size)
+            threads = str(threads)
+            logging.info(f"自动线程数: 估算网格数 {estimated_cells}，选择 -np {threads}")
+        else:
+            estimated_cells = self.thread_selector.estimate_cells(model_import_path, base_size)
 
         # viscosity = self.viscosity_input.text()
         # density = self.density_input.text()
@@ -2005,7 +2008,7 @@ class SimulationConfigWindow(QWidget):
                 logging.info(f"成功获取 {workingfluid} 物性参数：密度={density} kg/m³，粘度={viscosity} Pa·s, 声速={speed_of_sound} m/s")
             except Exception as e:
                 logging.error(f"物性计算失败: {str(e)}")
-                return
+                return None
         else:
             dp_unit='"Pa"'
             dp_format='"%-6.0f"'
@@ -2145,30 +2148,448 @@ class SimulationConfigWindow(QWidget):
             logging.info(
                 f"工质 {workingfluid} 在{temperature}℃使用{calc_method}计算：密度={density} kg/m³，粘度={viscosity} Pa·s")
 
-
         name = extract_model_name(model_import_path)
-        datenow=get_formatted_date()
-        unicode_operator_name = change_unicode(operator_name)
-        public_unicode=change_unicode('仿真自动化结果')
-
-        # folder_path_report = "D:\\STARCCM Simulation automation\\Report"
-        # # 创建模型专属报告文件夹
-        # report_subfolder = os.path.normpath(os.path.join(folder_path_report, name))
-        # if not os.path.exists(report_subfolder):
-        #     os.makedirs(report_subfolder)
-        #     logging.info(f"已创建模型专属报告文件夹: {report_subfolder}")
-        # else:
-        #     logging.info(f"报告文件夹已存在: {report_subfolder}")
-
-        report_subfolder=f"D:\\STARCCM Simulation automation\\{datenow}\\{operator_name}\\{name}_{self.index}\\Report"
-        report_subfolder_public=f"D:\\仿真自动化结果\\{datenow}\\{operator_name}\\{name}_{self.index}\\Report"
+
+        report_subfolder = os.path.join(model_folder, "Report")
+        report_subfolder_public = os.path.join(model_folder_public, "Report")
+
+        rename_and_save_step_file(model_import_path, models_folder, "CacheModel.STEP")
+
+        if int(stop_criteria_max_steps)>500:
+            x_axis=500
+        else:
+            x_axis=0
+
+        job = {
+            'uid': uuid.uuid4().hex[:8],
+            'prepare_seconds': time.monotonic() - prepare_start,
+            'name': name,
+            'index': current_index,
+            'datenow': datenow,
+            'operator_name': operator_name,
+            'model_import_path': model_import_path,
+            'starccm_path': starccm_path,
+            'refprop_path': refprop_path,
+            'threads': threads,
+            'estimated_cells': estimated_cells,
+            'bbox_volume_mm3': self.thread_selector.geometry_volume(model_import_path),
+            'max_steps': stop_criteria_max_steps,
+            'x_axis': x_axis,
+            'base_size': base_size,
+            'target_surface_ratio': target_surface_ratio,
+            'min_surface_ratio': min_surface_ratio,
+            'prisma_layer_thickness_ratio': prisma_layer_thickness_ratio,
+            'prisma_layer_extension': prisma_layer_extension,
+            'temperature': temperature,
+            'pressure': pressure,
+            'mass_flow': inlet_mass_flow_rate,
+            'mass_flow_value': safe_eval(str(inlet_mass_flow_rate)),
+            'workingfluid': workingfluid,
+            'density': density,
+            'viscosity': viscosity,
+            'speed_of_sound': speed_of_sound,
+            'dp_unit': dp_unit,
+            'dp_format': dp_format,
+            'render_profile': params.get('render_profile', DEFAULT_RENDER_PROFILE),
+            'model_folder': model_folder,
+            'model_folder_public': model_folder_public,
+            'simulation_folder': simulation_folder,
+            'log_folder': log_folder,
+            'sim_path': os.path.join(simulation_folder, f"{name}.sim"),
+            'report_subfolder': report_subfolder,
+            'report_subfolder_public': report_subfolder_public,
+        }
+        if self.scratch_mover is not None:
+            stage_job(job, self.scratch_mover.scratch_root)
+        return job
+
+    def estimate_task(self, params):
+        """
+        估算任务的进程数与网格数（供运行时长预测使用）
+
+        :return: (进程数, 估算网格数)
+        """
+        base_size = params.get('base_size', MESH_SETTINGS['base_size'])
+        if is_auto_threads(params['threads']):
+            return self.thread_selector.choose(params['model_import_path'], base_size)
+        return int(params['threads']), self.thread_selector.estimate_cells(params['model_import_path'], base_size)
+
+    def job_resources(self, job):
+        """任务实际占用的资源（写入运行时长历史，供后续任务估算）"""
+        try:
+            # 草稿目录模式下 .sim 可能仍在后台转移中，取草稿目录中的文件
+            sim_bytes = os.path.getsize(job.get('work_sim_path', job['sim_path']))
+        except OSError:
+            sim_bytes = None
+        return {
+            'sim_bytes': sim_bytes,
+            'report_bytes': folder_size(job['report_subfolder']),
+            'memory_peak_mb': self.memory_sampler.peak_mb,
+        }
+
+    def estimate_resources(self, params):
+        """估算任务的磁盘与内存需求"""
+        try:
+            _, cells = self.estimate_task(params)
+        except Exception as e:
+            logging.warning(f"网格数估算失败: {str(e)}")
+            cells = None
+        return self.resource_estimator.estimate(cells)
+
+    def wait_for_resources(self, params, reserved_memory=0, wait=True):
+        """
+        准入控制：输出分区空闲空间与可用内存满足任务需求后才返回True
+
+        :param reserved_memory: 已启动任务尚未占用的内存预留（字节）
+        :param wait: 不满足时是否等待（每隔 ADMISSION_POLL_SECONDS 秒重新检查，超过 ADMISSION_TIMEOUT_SECONDS 放弃）
+        """
+        estimate = self.estimate_resources(params)
+        log_estimate(estimate)
+        deadline = time.monotonic() + ADMISSION_TIMEOUT_SECONDS
+        last_reasons = None
+        while True:
+            ok, reasons = check_resources(estimate, SIM_ROOT, PUBLIC_ROOT, reserved_memory, SCRATCH_ROOT)
+            if ok:
+                return True
+            if reasons != last_reasons:
+                logging.warning(f"资源不足，任务等待中: {'；'.join(reasons)}")
+                last_reasons = reasons
+            if not wait or time.monotonic() > deadline:
+                return False
+            self.run_button.setText('等待资源...')
+            poll_end = time.monotonic() + ADMISSION_POLL_SECONDS
+            while time.monotonic() < poll_end:
+                QApplication.processEvents()
+                time.sleep(0.2)
+
+    def get_task_params(self, task):
+        """从队列任务字典中提取仿真输入参数"""
+        return {
+            'model_import_path': task['model_import_path'],
+            'starccm_path': task['starccm_path'],
+            'starccmview_path': task['starccmview_path'],
+            'refprp64dll': task['refprp64dll'],
+            'threads': task['threads'],
+            'max_steps': task['max_steps'],
+            'temperature': task['temperature'],
+            'pressure': task['pressure'],
+            'mass_flow': task['mass_flow'],
+            'workingfluid_index': task['workingfluid_index'],
+            'operator_name': task['operator_name'],
+            'render_profile': task.get('render_profile', DEFAULT_RENDER_PROFILE),
+        }
+
+    def selected_render_profile(self):
+        return list(RENDER_PROFILE_LABELS)[self.render_profile_input.currentIndex()]
+
+    def start_premesh(self, params, mesh_np):
+        """
+        为下一个任务提前划分网格（与当前任务的求解并行）
+
+        :param params: 下一个任务的输入参数
+        :param mesh_np: 网格阶段使用的核数
+        """
+        job = self.prepare_job(params)
+        if job is None:
+            logging.warning("下一个任务准备失败，跳过网格预划分")
+            return
+        macro_path = write_macro(job, 'mesh')
+        job['mesh_macro'] = macro_path
+        job['mesh_np'] = mesh_np
+        command = build_starccm_command(job['starccm_path'], mesh_np, macro_path)
+        log_path = os.path.join(job['log_folder'], f"{job['name']}_mesh.log")
+        process = PhaseProcess(command, log_path, phase='网格').start()
+        self.premesh = {'params': params, 'job': job, 'process': process}
+        logging.info(f"已在 {mesh_np} 核上为 {job['name']}_{job['index']} 预划分网格")
+
+    def take_premesh(self, params):
+        """
+        取出与参数匹配的预划分网格任务，不匹配的预划分任务将被作废
+
+        :return: (job, PhaseProcess) 或 None
+        """
+        premesh, self.premesh = self.premesh, None
+        if premesh is None:
+            return None
+        if premesh['params'] == params:
+            return premesh['job'], premesh['process']
+        premesh['process'].kill()
+        logging.warning(f"预划分网格任务已作废: {premesh['job']['model_folder']}")
+        discard_job(premesh['job'])
+        return None
+
+    def wait_phase(self, phase_process):
+        """等待后台阶段进程结束（保持界面响应），返回返回码"""
+        while phase_process.poll() is None:
+            QApplication.processEvents()
+            self.memory_sampler.sample()
+            time.sleep(0.2)
+        logging.info(f"{phase_process.phase}阶段完成，用时 {phase_process.elapsed:.0f} 秒，日志: {phase_process.log_path}")
+        return phase_process.returncode
+
+    def wait_transfer(self, transfer):
+        """等待草稿目录中的结果文件转移完成（保持界面响应）"""
+        transfer_start = time.monotonic()
+        while not transfer.report_done.wait(0.05):
+            QApplication.processEvents()
+        if transfer.errors:
+            logging.error(f"结果文件转移有误: {'；'.join(transfer.errors)}")
+        else:
+            logging.info(f"结果文件已转移，用时 {time.monotonic() - transfer_start:.1f} 秒")
+
+    def run_starccm_phase(self, command):
+        """前台运行STAR-CCM+并实时输出日志，返回进程返回码"""
+        logging.info(f"启动STAR-CCM+: {' '.join(command)}")
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            bufsize=1,
+            encoding='utf-8',
+            errors='replace'
+        )
+        # 实时捕获输出
+        while True:
+            output = process.stdout.readline()
+            if output == '' and process.poll() is not None:
+                break
+            if output:
+                # 同时输出到控制台和文件
+                self.logger.info(output.strip())  # 替换原来的logging.info
+                marker = self.stage_timer.feed(output)
+                if marker is not None and marker['event'] == 'end':
+                    self.update_stage_timing_label()
+                self.memory_sampler.sample()
+                sample = self.iteration_parser.feed(output)
+                if sample is not None:
+                    iteration, values = sample
+                    if 'dp' in values:
+                        self.dp_plot.add_point(iteration, values['dp'])
+                    if 'v_max' in values:
+                        self.vmax_plot.add_point(iteration, values['v_max'])
+                QApplication.processEvents()  # 保持UI响应
+
+        # 获取最终返回码
+        return process.poll()
+
+
+    def update_stage_timing_label(self):
+        """按当前任务的阶段标记刷新阶段用时显示"""
+        timer = self.stage_timer
+        self.stage_timing_label.setText(
+            f"阶段用时: {format_stage_summary(timer.groups(), timer.cell_count, timer.peak_mem_mb)}")
+
+    def on_run_button_clicked(self,params,is_queue_task,next_params=None):
+
+        # 移除现有的日志处理器
+        for handler in self.logger.handlers[:]:
+            self.logger.removeHandler(handler)
+            handler.close()
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        # 添加处理器
+        self.logger.addHandler(console_handler)
+
+        start_time = datetime.datetime.now()  # 添加在方法开始处
+
+        # ==== 新增校验逻辑 ====
+        if not self.operator_name_input.text().strip():
+            QMessageBox.warning(self, "输入错误", "请先输入操作员姓名")
+            return
+        # ==== 校验结束 ====
+
+        # # ==== 新增参数对比逻辑 ====
+        # current_params = {
+        #     'model_path': self.model_import_path_input.text().strip('"'),
+        #     'threads': self.threads_input.text(),
+        #     'max_steps': self.stop_criteria_max_steps_input.text(),
+        #     'temperature': self.temperature_input.text(),
+        #     'pressure': self.pressure_input.text(),
+        #     'mass_flow': self.inlet_mass_flow_rate_input.text(),
+        #     'workingfluid': self.workingfluid_input.currentText(),
+        #     'operator': self.operator_name_input.text()
+        #     # 'starccm_path': self.starccm_path_input.text().strip('"'),
+        #     # 'starccmview_path': self.starccmview_path_input.text().strip('"'),
+        #     # 'refprp64dll_path': self.refprp64dll_input.text().strip('"'),
+        # }
+        #
+        # if current_params == self.last_input_params and self.last_input_params:
+        #     reply = QMessageBox.question(
+        #         self, '输入确认',
+        #         "输入参数与上次运行完全相同，是否继续？",
+        #         QMessageBox.Yes | QMessageBox.No,
+        #         QMessageBox.No
+        #     )
+        #     if reply == QMessageBox.No:
+        #         return
+
+        # ==== 新增参数对比逻辑 ====
+        current_params = {
+            'model_import_path': self.model_import_path_input.text().strip('"'),
+            'starccm_path': self.starccm_path_input.text().strip('"'),
+            'starccmview_path': self.starccmview_path_input.text().strip('"'),
+            'refprp64dll': self.refprp64dll_input.text().strip('"'),
+            'threads': self.threads_input.text(),
+            'max_steps': self.stop_criteria_max_steps_input.text(),
+            'temperature': self.temperature_input.text(),
+            'pressure': self.pressure_input.text(),
+            'mass_flow': self.inlet_mass_flow_rate_input.text(),
+            'workingfluid': self.workingfluid_input.currentText(),
+            'operator_name': self.operator_name_input.text()
+        }
+
+        # 转换为数值类型进行比较（处理字符串与数值的对比）
+        try:
+            current_params['temperature'] = float(current_params['temperature'])
+            current_params['pressure'] = float(current_params['pressure'])
+            current_params['mass_flow'] = float(current_params['mass_flow'])
+        except ValueError:
+            pass
+        try:
+            self.last_input_params['temperature'] = float(self.last_input_params['temperature'])
+            self.last_input_params['pressure'] = float(self.last_input_params['pressure'])
+            self.last_input_params['mass_flow'] = float(self.last_input_params['mass_flow'])
+        except (ValueError, KeyError):  # 首次运行没有上次参数
+            pass
+
+        if current_params == self.last_input_params and self.last_input_params and not is_queue_task:
+            reply = QMessageBox.question(
+                self,
+                '确认输入',
+                "输入参数与上次运行完全相同，是否继续？\n\n",
+                # f"模型路径: {current_params['model_import_path']}\n"
+                # f"工质类型: {current_params['workingfluid']}\n"
+                # f"温度: {current_params['temperature']}℃",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            if reply == QMessageBox.No:
+                return
+
+        # 初始隐藏马赫数按钮
+        self.btn_mach_3d.setVisible(False)
+        self.btn_pressure_3d.setEnabled(False)
+        self.btn_streamline_3d.setEnabled(False)
+        self.btn_mach_3d.setEnabled(False)
+
+        # 重置压降值显示
+        self.pressure_drop_label.setText(" 计算中...")
+        self.pressure_drop_label.setStyleSheet("""
+                font-size: 24px; 
+                color: #FF0000; 
+                font-weight: bold;
+                padding: 5px 15px;
+                background: #FFF3CD;
+                border-radius: 5px;
+            """)
+        # 重置马赫数显示
+        self.mach_number_label.setText(" 计算中...")
+        self.mach_number_label.setStyleSheet("""
+                font-size: 24px; 
+                color: #FF0000; 
+                font-weight: bold;
+                padding: 5px 15px;
+                background: #FFF3CD;
+                border-radius: 5px;
+        """)
+
+        # 重置图片预览区
+        self.pressure_label.clear()
+        self.pressure_label.setText("压力云图预览区")
+        self.pressure_label.setStyleSheet("""
+               QLabel {
+                   border: 2px solid #3498DB;
+                   border-radius: 5px;
+                   background: #F8F9FA;
+                   min-width: 400px;
+                   min-height: 250px;
+                   font-size: 36px;
+                   font-weight: bold;
+               }
+           """)
+
+        self.streamline_label.clear()
+        self.streamline_label.setText("流线图预览区")
+        self.streamline_label.setStyleSheet("""
+               QLabel {
+                   border: 2px solid #27AE60;
+                   border-radius: 5px;
+                   background: #F8F9FA;
+                   min-width: 400px;
+                   min-height: 250px;
+                   font-size: 36px;
+                   font-weight: bold;
+               }
+           """)
+
+        # 移除鼠标事件绑定
+        self.pressure_label.mouseDoubleClickEvent = None
+        self.streamline_label.mouseDoubleClickEvent = None
+
+        # 立即刷新界面
+        QApplication.processEvents()
+
+        # 修改按钮文本和样式
+        self.run_button.setText('运行中请勿点击')
+        self.run_button.setStyleSheet("font-size: 48px; font-weight: bold; background-color: #FFA07A;")  # 浅红色背景
+        self.run_button.setEnabled(False)  # 禁用按钮，防止多次点击
+        QApplication.processEvents()  # 强制刷新UI
+
+        # 流水线模式：若该任务已在上一个任务求解期间完成网格预划分，直接取用
+        premesh = self.take_premesh(params)
+        if premesh is not None:
+            job, mesh_process = premesh
+        elif not self.wait_for_resources(params):
+            logging.error("等待资源超时，任务未启动")
+            job, mesh_process = None, None
+        else:
+            self.run_button.setText('运行中请勿点击')
+            job, mesh_process = self.prepare_job(params), None
+        if job is None:
+            self.process_state = 0
+            self.run_button.setText('开始运行')
+            self.run_button.setStyleSheet("font-size: 48px; font-weight: bold; background-color: #90EE90;")  # 恢复绿色背景
+            self.run_button.setEnabled(True)
+            QApplication.processEvents()
+            return
+        self.index = job['index']  # 保持index与文件夹一致
+        self.stage_timer = StageTimer()
+        self.update_stage_timing_label()
+        self.iteration_parser = IterationParser()
+        self.memory_sampler = MemorySampler()
+        self.dp_plot.reset(int(job['max_steps']))
+        self.vmax_plot.reset(int(job['max_steps']))
+
+        name = job['name']
+        datenow = job['datenow']
+        operator_name = job['operator_name']
+        model_import_path = job['model_import_path']
+        starccm_path = job['starccm_path']
+        refprop_path = job['refprop_path']
+        threads = job['threads']
+        stop_criteria_max_steps = job['max_steps']
+        base_size = job['base_size']
+        target_surface_ratio = job['target_surface_ratio']
+        min_surface_ratio = job['min_surface_ratio']
+        prisma_layer_thickness_ratio = job['prisma_layer_thickness_ratio']
+        prisma_layer_extension = job['prisma_layer_extension']
+        temperature = job['temperature']
+        pressure = job['pressure']
+        inlet_mass_flow_rate = job['mass_flow']
+        workingfluid = job['workingfluid']
+        density = job['density']
+        viscosity = job['viscosity']
+        speed_of_sound = job['speed_of_sound']
+        report_subfolder = job['report_subfolder']
+        report_subfolder_public = job['report_subfolder_public']
 
         # 创建文件处理器（按模型名生成日志文件）
-        log_path = rf"D:\\STARCCM Simulation automation\\{datenow}\\{operator_name}\\{name}_{self.index}\\Log\\{name}.log"
+        log_path = os.path.join(job['log_folder'], f"{name}.log")
         file_handler = logging.FileHandler(log_path, encoding='utf-8')
         file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
 
-        log_path_public = rf"D:\\仿真自动化结果\\{datenow}\\{operator_name}\\{name}_{self.index}\\Log\\{name}.log"
+        log_path_public = os.path.join(os.path.dirname(report_subfolder_public), "Log", f"{name}.log")
         file_handler_public = logging.FileHandler(log_path_public, encoding='utf-8')
         file_handler_public.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
 
@@ -2194,1190 +2615,76 @@ class SimulationConfigWindow(QWidget):
         logging.info(f'动力粘度（Pa·s）: {viscosity}')
         logging.info(f'密度（kg/m³）: {density}')
 
-        rename_and_save_step_file(model_import_path, rf"D:/STARCCM Simulation automation/{datenow}/{operator_name}/{name}_{self.index}/CacheModels", "CacheModel.STEP")
-        # rf"D:/STARCCM Simulation automation/{datenow}/{operator_name}/{name}/CacheModels"
-
-        # #宏文件路径
-        # if getattr(sys, 'frozen', False):
-        #     current_dir = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
-        # else:
-        #     current_dir = os.path.dirname(os.path.abspath(__file__))
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        script_path = os.path.normpath(os.path.join(current_dir, 'StarCCM_script.java'))
-        # 建议添加路径存在性验证：
-        os.makedirs(os.path.dirname(script_path), exist_ok=True)
-        # 检查文件是否存在
-        if os.path.exists(script_path):
-            logging.info(f"文件 {script_path} 存在，将被重写。")
-        else:
-            logging.info(f"文件 {script_path} 不存在，将被创建。")
-
-        if int(stop_criteria_max_steps)>500:
-            x_axis=500
+        # 网格与求解分阶段执行：队列中还有下一个任务时，当前任务求解的同时
+        # 在一小部分核上为下一个任务划分网格，求解器无需等待网格
+        mesh_np, solve_np = 0, int(threads)
+        if next_params is not None:
+            try:
+                mesh_np, solve_np = split_cores(threads, self.mesh_threads_input.text() or 0)
+            except ValueError:
+                logging.warning(f"网格预处理线程数无效: {self.mesh_threads_input.text()}，不启用流水线")
+
+        # 各阶段用时（秒），写入运行时长历史
+        stage_times = {'prepare': job['prepare_seconds']}
+        macro_paths = []
+        if mesh_process is None and mesh_np == 0:
+            # 无需重叠时在一个进程内完成全部阶段
+            macro_paths.append(write_macro(job, 'full'))
+            phase_start = time.monotonic()
+            returncode = self.run_starccm_phase(build_starccm_command(starccm_path, threads, macro_paths[-1]))
+            stage_times['full'] = time.monotonic() - phase_start
+            used_mesh_np, solve_np = int(threads), int(threads)
         else:
-            x_axis=0
-
-        # 写入无后缀名的文件，内容为给定的Java代码
-        file_content = rf"""// Simcenter STAR-CCM+ macro: StarCCM_script.java
-        // Written by Simcenter STAR-CCM+ 16.06.008
-        package macro;
-        
-        import java.util.*;
-        
-        import star.base.neo.*;
-        import star.segregatedflow.*;
-        import star.turbulence.*;
-        import star.flow.*;
-        import star.energy.*;
-        import star.metrics.*;
-        import star.meshing.*;
-        import star.common.*;
-        import star.material.*;
-        import star.keturb.*;
-        import star.base.report.*;
-        import star.prismmesher.*;
-        import star.vis.*;
-        import star.surfacewrapper.*;
-        
-        public class StarCCM_script extends StarMacro {{
-        
-          public void execute() {{
-            execute0();
-            // D:/STARCCM Simulation automation/{datenow}/{unicode_operator_name}/{name}_{self.index}/Simulation/{name}.sim
-            execute1();
-            // D:/STARCCM Simulation automation/{datenow}/{unicode_operator_name}/{name}_{self.index}/Simulation/{name}.sim
-            execute2();
-            // D:/STARCCM Simulation automation/{datenow}/{unicode_operator_name}/{name}_{self.index}/Simulation/{name}.sim
-            execute3();
-            // D:/STARCCM Simulation automation/{datenow}/{unicode_operator_name}/{name}_{self.index}/Simulation/{name}.sim
-            execute4();
-            // D:/STARCCM Simulation automation/{datenow}/{unicode_operator_name}/{name}_{self.index}/Simulation/{name}.sim
-            execute5();
-            // D:/STARCCM Simulation automation/{datenow}/{unicode_operator_name}/{name}_{self.index}/Simulation/{name}.sim
-            execute6();
-            // D:/STARCCM Simulation automation/{datenow}/{unicode_operator_name}/{name}_{self.index}/Simulation/{name}.sim
-            execute7();
-          }}
-        
-          private void execute0() {{
-        
-            Simulation simulation_0 =
-              getActiveSimulation();
-        
-            PartImportManager partImportManager_0 =
-              simulation_0.get(PartImportManager.class);
-        
-            partImportManager_0.importCadPart(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\CacheModels\\CacheModel.STEP"), "SharpEdges", 30.0, 2, true, 1.0E-5, true, false, false, false, true, NeoProperty.fromString("{{\'STEP\': 0, \'NX\': 0, \'CATIAV5\': 0, \'SE\': 0, \'JT\': 0}}"), true, false);
-        
-            simulation_0.getSceneManager().createGeometryScene("\u51E0\u4F55\u573A\u666F", "\u8F6E\u5ED3", "\u8868\u9762", 1);
-        
-            Scene scene_0 =
-              simulation_0.getSceneManager().getScene("\u51E0\u4F55\u573A\u666F 1");
-        
-            scene_0.initializeAndWait();
-        
-            SceneUpdate sceneUpdate_0 =
-              scene_0.getSceneUpdate();
-        
-            HardcopyProperties hardcopyProperties_0 =
-              sceneUpdate_0.getHardcopyProperties();
-        
-            hardcopyProperties_0.setCurrentResolutionWidth(25);
-        
-            hardcopyProperties_0.setCurrentResolutionHeight(25);
-        
-            hardcopyProperties_0.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_0.setCurrentResolutionHeight(1191);
-        
-            scene_0.resetCamera();
-        
-            simulation_0.saveState("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Simulation\\{name}.sim");
-          }}
-        
-          private void execute1() {{
-        
-            Simulation simulation_0 =
-              getActiveSimulation();
-        
-            CadPart cadPart_0 =
-              ((CadPart) simulation_0.get(SimulationPartManager.class).getPart("Fluid"));
-        
-            SurfaceWrapperAutoMeshOperation surfaceWrapperAutoMeshOperation_0 =
-              (SurfaceWrapperAutoMeshOperation) simulation_0.get(MeshOperationManager.class).createSurfaceWrapperAutoMeshOperation(new NeoObjectVector(new Object[] {{cadPart_0}}), "\u5305\u9762");
-        
-            surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(BaseSize.class).setValue(1.0);
-        
-            Units units_0 =
-              ((Units) simulation_0.getUnitsManager().getObject("mm"));
-        
-            surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(BaseSize.class).setUnits(units_0);
-        
-            surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(BaseSize.class).setValue(1.0);
-        
-            surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(BaseSize.class).setUnits(units_0);
-        
-            PartsTargetSurfaceSize partsTargetSurfaceSize_0 =
-              surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(PartsTargetSurfaceSize.class);
-        
-            partsTargetSurfaceSize_0.getRelativeSizeScalar().setValue(25.0);
-        
-            Units units_1 =
-              ((Units) simulation_0.getUnitsManager().getObject(""));
-        
-            partsTargetSurfaceSize_0.getRelativeSizeScalar().setUnits(units_1);
-        
-            PartsMinimumSurfaceSize partsMinimumSurfaceSize_0 =
-              surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(PartsMinimumSurfaceSize.class);
-        
-            partsMinimumSurfaceSize_0.getRelativeSizeScalar().setValue(15.0);
-        
-            partsMinimumSurfaceSize_0.getRelativeSizeScalar().setUnits(units_1);
-        
-            MeshOperationPart meshOperationPart_0 =
-              ((MeshOperationPart) simulation_0.get(SimulationPartManager.class).getPart("\u5305\u9762"));
-        
-            AutoMeshOperation autoMeshOperation_0 =
-              simulation_0.get(MeshOperationManager.class).createAutoMeshOperation(new StringVector(new String[] {{"star.resurfacer.ResurfacerAutoMesher", "star.resurfacer.AutomaticSurfaceRepairAutoMesher", "star.dualmesher.DualAutoMesher", "star.prismmesher.PrismAutoMesher"}}), new NeoObjectVector(new Object[] {{meshOperationPart_0}}));
-        
-            autoMeshOperation_0.getMesherParallelModeOption().setSelected(MesherParallelModeOption.Type.PARALLEL);
-        
-            autoMeshOperation_0.getDefaultValues().get(BaseSize.class).setValue({base_size});
-        
-            autoMeshOperation_0.getDefaultValues().get(BaseSize.class).setUnits(units_0);
-        
-            PartsTargetSurfaceSize partsTargetSurfaceSize_1 =
-              autoMeshOperation_0.getDefaultValues().get(PartsTargetSurfaceSize.class);
-        
-            partsTargetSurfaceSize_1.getRelativeSizeScalar().setValue({target_surface_ratio});
-        
-            partsTargetSurfaceSize_1.getRelativeSizeScalar().setUnits(units_1);
-        
-            PartsMinimumSurfaceSize partsMinimumSurfaceSize_1 =
-              autoMeshOperation_0.getDefaultValues().get(PartsMinimumSurfaceSize.class);
-        
-            partsMinimumSurfaceSize_1.getRelativeSizeScalar().setValue({min_surface_ratio});
-        
-            partsMinimumSurfaceSize_1.getRelativeSizeScalar().setUnits(units_1);
-        
-            NumPrismLayers numPrismLayers_0 =
-              autoMeshOperation_0.getDefaultValues().get(NumPrismLayers.class);
-        
-            IntegerValue integerValue_0 =
-              numPrismLayers_0.getNumLayersValue();
-        
-            integerValue_0.getQuantity().setValue({prisma_layer_extension});
-        
-            PrismLayerStretching prismLayerStretching_0 =
-              autoMeshOperation_0.getDefaultValues().get(PrismLayerStretching.class);
-        
-            prismLayerStretching_0.getStretchingQuantity().setValue(1.3);
-        
-            prismLayerStretching_0.getStretchingQuantity().setUnits(units_1);
-        
-            PrismThickness prismThickness_0 =
-              autoMeshOperation_0.getDefaultValues().get(PrismThickness.class);
-        
-            prismThickness_0.getRelativeSizeScalar().setValue({prisma_layer_thickness_ratio});
-        
-            prismThickness_0.getRelativeSizeScalar().setUnits(units_1);
-        
-            MaximumCellSize maximumCellSize_0 =
-              autoMeshOperation_0.getDefaultValues().get(MaximumCellSize.class);
-        
-            maximumCellSize_0.getRelativeSizeScalar().setValue(100.0);
-        
-            maximumCellSize_0.getRelativeSizeScalar().setUnits(units_1);
-        
-            PhysicsContinuum physicsContinuum_0 =
-              simulation_0.getContinuumManager().createContinuum(PhysicsContinuum.class);
-        
-            physicsContinuum_0.enable(ThreeDimensionalModel.class);
-        
-            physicsContinuum_0.enable(SingleComponentGasModel.class);
-        
-            physicsContinuum_0.enable(SegregatedFlowModel.class);
-        
-            physicsContinuum_0.enable(ConstantDensityModel.class);
-        
-            physicsContinuum_0.enable(SteadyModel.class);
-        
-            physicsContinuum_0.enable(TurbulentModel.class);
-        
-            physicsContinuum_0.enable(RansTurbulenceModel.class);
-        
-            physicsContinuum_0.enable(KEpsilonTurbulence.class);
-        
-            physicsContinuum_0.enable(RkeTwoLayerTurbModel.class);
-        
-            physicsContinuum_0.enable(KeTwoLayerAllYplusWallTreatment.class);
-        
-            SingleComponentGasModel singleComponentGasModel_0 =
-              physicsContinuum_0.getModelManager().getModel(SingleComponentGasModel.class);
-        
-            Gas gas_0 =
-              ((Gas) singleComponentGasModel_0.getMaterial());
-        
-            ConstantMaterialPropertyMethod constantMaterialPropertyMethod_0 =
-              ((ConstantMaterialPropertyMethod) gas_0.getMaterialProperties().getMaterialProperty(DynamicViscosityProperty.class).getMethod());
-        
-            constantMaterialPropertyMethod_0.getQuantity().setValue({viscosity});
-        
-            Units units_2 =
-              ((Units) simulation_0.getUnitsManager().getObject("Pa-s"));
-        
-            constantMaterialPropertyMethod_0.getQuantity().setUnits(units_2);
-        
-            ConstantMaterialPropertyMethod constantMaterialPropertyMethod_1 =
-              ((ConstantMaterialPropertyMethod) gas_0.getMaterialProperties().getMaterialProperty(ConstantDensityProperty.class).getMethod());
-        
-            constantMaterialPropertyMethod_1.getQuantity().setValue({density});
-        
-            Units units_3 =
-              ((Units) simulation_0.getUnitsManager().getObject("kg/m^3"));
-        
-            constantMaterialPropertyMethod_1.getQuantity().setUnits(units_3);
-        
-            physicsContinuum_0.getReferenceValues().get(ReferencePressure.class).setValue(0.0);
-        
-            Units units_4 =
-              ((Units) simulation_0.getUnitsManager().getObject("Pa"));
-        
-            physicsContinuum_0.getReferenceValues().get(ReferencePressure.class).setUnits(units_4);
-        
-            InitialPressureProfile initialPressureProfile_0 =
-              physicsContinuum_0.getInitialConditions().get(InitialPressureProfile.class);
-        
-            initialPressureProfile_0.getMethod(ConstantScalarProfileMethod.class).getQuantity().setValue({pressure});
-        
-            Units units_5 =
-              ((Units) simulation_0.getUnitsManager().getObject("MPa"));
-        
-            initialPressureProfile_0.getMethod(ConstantScalarProfileMethod.class).getQuantity().setUnits(units_5);
-        
-            simulation_0.getRegionManager().newRegionsFromParts(new NeoObjectVector(new Object[] {{meshOperationPart_0}}), "OneRegionPerPart", null, "OneBoundaryPerPartSurface", null, "OneFeatureCurve", null, RegionManager.CreateInterfaceMode.BOUNDARY, "OneEdgeBoundaryPerPart", null);
-        
-            Region region_0 =
-              simulation_0.getRegionManager().getRegion("\u5305\u9762");
-        
-            Boundary boundary_0 =
-              region_0.getBoundaryManager().getBoundary("Fluid.inlet");
-        
-            MassFlowBoundary massFlowBoundary_0 =
-              ((MassFlowBoundary) simulation_0.get(ConditionTypeManager.class).get(MassFlowBoundary.class));
-        
-            boundary_0.setBoundaryType(massFlowBoundary_0);
-        
-            Boundary boundary_1 =
-              region_0.getBoundaryManager().getBoundary("Fluid.outlet");
-        
-            OutletBoundary outletBoundary_0 =
-              ((OutletBoundary) simulation_0.get(ConditionTypeManager.class).get(OutletBoundary.class));
-        
-            boundary_1.setBoundaryType(outletBoundary_0);
-        
-            Units units_6 =
-              simulation_0.getUnitsManager().getInternalUnits(new IntVector(new int[] {{1, 0, -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}}));
-        
-            MassFlowRateProfile massFlowRateProfile_0 =
-              boundary_0.getValues().get(MassFlowRateProfile.class);
-        
-            massFlowRateProfile_0.getMethod(ConstantScalarProfileMethod.class).getQuantity().setDefinition("{inlet_mass_flow_rate}");
-        
-            massFlowRateProfile_0.getMethod(ConstantScalarProfileMethod.class).getQuantity().setUnits(units_6);
-        
-            StepStoppingCriterion stepStoppingCriterion_0 =
-              ((StepStoppingCriterion) simulation_0.getSolverStoppingCriterionManager().getSolverStoppingCriterion("Maximum Steps"));
-        
-            IntegerValue integerValue_1 =
-              stepStoppingCriterion_0.getMaximumNumberStepsObject();
-        
-            integerValue_1.getQuantity().setValue({stop_criteria_max_steps});
-        
-            PressureDropReport pressureDropReport_0 =
-              simulation_0.getReportManager().createReport(PressureDropReport.class);
-        
-            pressureDropReport_0.setPresentationName("Dp");
-        
-            pressureDropReport_0.getParts().setQuery(null);
-        
-            pressureDropReport_0.getParts().setObjects(boundary_0);
-        
-            pressureDropReport_0.getLowPressureParts().setQuery(null);
-        
-            pressureDropReport_0.getLowPressureParts().setObjects(boundary_1);
-        
-            LatestMeshProxyRepresentation latestMeshProxyRepresentation_0 =
-              ((LatestMeshProxyRepresentation) simulation_0.getRepresentationManager().getObject("Latest Surface/Volume"));
-        
-            pressureDropReport_0.setRepresentation(latestMeshProxyRepresentation_0);
-        
-            simulation_0.getMonitorManager().createMonitorAndPlot(new NeoObjectVector(new Object[] {{pressureDropReport_0}}), true, "%1$s \u7ED8\u56FE");
-        
-            ReportMonitor reportMonitor_0 =
-              ((ReportMonitor) simulation_0.getMonitorManager().getMonitor("Dp Monitor"));
-        
-            MonitorPlot monitorPlot_0 =
-              simulation_0.getPlotManager().createMonitorPlot(new NeoObjectVector(new Object[] {{reportMonitor_0}}), "Dp Monitor \u7ED8\u56FE");
-        
-            monitorPlot_0.open();
-        
-            PlotUpdate plotUpdate_0 =
-              monitorPlot_0.getPlotUpdate();
-        
-            HardcopyProperties hardcopyProperties_1 =
-              plotUpdate_0.getHardcopyProperties();
-        
-            hardcopyProperties_1.setCurrentResolutionWidth(25);
-        
-            hardcopyProperties_1.setCurrentResolutionHeight(25);
-        
-            Scene scene_0 =
-              simulation_0.getSceneManager().getScene("\u51E0\u4F55\u573A\u666F 1");
-        
-            SceneUpdate sceneUpdate_0 =
-              scene_0.getSceneUpdate();
-        
-            HardcopyProperties hardcopyProperties_0 =
-              sceneUpdate_0.getHardcopyProperties();
-        
-            hardcopyProperties_0.setCurrentResolutionWidth(760);
-        
-            hardcopyProperties_0.setCurrentResolutionHeight(1192);
-        
-            hardcopyProperties_1.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_1.setCurrentResolutionHeight(1191);
-        
-            StatisticsReport statisticsReport_0 =
-              simulation_0.getReportManager().createReport(StatisticsReport.class);
-        
-            statisticsReport_0.setPresentationName("A_dp");
-        
-            statisticsReport_0.setSampleFilterOption(SampleFilterOption.LastNSamples);
-        
-            statisticsReport_0.setMonitor(reportMonitor_0);
-        
-            LastNSamplesFilter lastNSamplesFilter_0 =
-              ((LastNSamplesFilter) statisticsReport_0.getSampleFilterManager().getObject("\u6700\u540E N \u4E2A\u6837\u672C"));
-        
-            lastNSamplesFilter_0.setNSamples(200);
-        
-            simulation_0.getMonitorManager().createMonitorAndPlot(new NeoObjectVector(new Object[] {{statisticsReport_0}}), true, "%1$s \u7ED8\u56FE");
-        
-            ReportMonitor reportMonitor_1 =
-              ((ReportMonitor) simulation_0.getMonitorManager().getMonitor("A_dp Monitor"));
-        
-            MonitorPlot monitorPlot_1 =
-              simulation_0.getPlotManager().createMonitorPlot(new NeoObjectVector(new Object[] {{reportMonitor_1}}), "A_dp Monitor \u7ED8\u56FE");
-        
-            monitorPlot_1.open();
-        
-            PlotUpdate plotUpdate_1 =
-              monitorPlot_1.getPlotUpdate();
-        
-            HardcopyProperties hardcopyProperties_2 =
-              plotUpdate_1.getHardcopyProperties();
-        
-            hardcopyProperties_2.setCurrentResolutionWidth(25);
-        
-            hardcopyProperties_2.setCurrentResolutionHeight(25);
-        
-            hardcopyProperties_1.setCurrentResolutionWidth(760);
-        
-            hardcopyProperties_1.setCurrentResolutionHeight(1192);
-        
-            hardcopyProperties_2.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_2.setCurrentResolutionHeight(1191);
-            
-            simulation_0.getMonitorManager().createMonitorAndPlot(new NeoObjectVector(new Object[] {{pressureDropReport_0}}), true, "%1$s \u7ED8\u56FE");
-            
-            ReportMonitor reportMonitor_4 = ((ReportMonitor) simulation_0.getMonitorManager().getMonitor("Dp Monitor 2"));
-            
-            MonitorPlot monitorPlot_4 = simulation_0.getPlotManager().createMonitorPlot(new NeoObjectVector(new Object[] {{reportMonitor_4}}), "Dp Monitor 2 \u7ED8\u56FE");
-            
-            monitorPlot_4.open();
-            
-            PlotUpdate plotUpdate_4 = monitorPlot_4.getPlotUpdate();
-            
-            HardcopyProperties hardcopyProperties_9 = plotUpdate_4.getHardcopyProperties();
-                   
-            IterationUpdateFrequency iterationUpdateFrequency_0 = plotUpdate_4.getIterationUpdateFrequency();
-            
-            iterationUpdateFrequency_0.setStart(500);
-            
-            StarUpdate starUpdate_0 = reportMonitor_4.getStarUpdate();
-        
-            IterationUpdateFrequency iterationUpdateFrequency_1 = starUpdate_0.getIterationUpdateFrequency();
-        
-            iterationUpdateFrequency_1.setStart(500);
-        
-            simulation_0.saveState("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Simulation\\{name}.sim");
-          }}
-        
-          private void execute2() {{
-        
-            Simulation simulation_0 =
-              getActiveSimulation();
-        
-            MeshPipelineController meshPipelineController_0 =
-              simulation_0.get(MeshPipelineController.class);
-        
-            meshPipelineController_0.generateVolumeMesh();
-        
-            simulation_0.saveState("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Simulation\\{name}.sim");
-          }}
-        
-          private void execute3() {{
-        
-            Simulation simulation_0 =
-              getActiveSimulation();
-        
-            MaxReport maxReport_0 =
-              simulation_0.getReportManager().createReport(MaxReport.class);
-        
-            maxReport_0.setPresentationName("V_max");
-        
-            PrimitiveFieldFunction primitiveFieldFunction_0 =
-              ((PrimitiveFieldFunction) simulation_0.getFieldFunctionManager().getFunction("Velocity"));
-        
-            VectorMagnitudeFieldFunction vectorMagnitudeFieldFunction_0 =
-              ((VectorMagnitudeFieldFunction) primitiveFieldFunction_0.getMagnitudeFunction());
-        
-            maxReport_0.setFieldFunction(vectorMagnitudeFieldFunction_0);
-        
-            maxReport_0.getParts().setQuery(null);
-        
-            Region region_0 =
-              simulation_0.getRegionManager().getRegion("\u5305\u9762");
-        
-            maxReport_0.getParts().setObjects(region_0);
-        
-            simulation_0.getMonitorManager().createMonitorAndPlot(new NeoObjectVector(new Object[] {{maxReport_0}}), true, "%1$s \u7ED8\u56FE");
-        
-            ReportMonitor reportMonitor_2 =
-              ((ReportMonitor) simulation_0.getMonitorManager().getMonitor("V_max Monitor"));
-        
-            MonitorPlot monitorPlot_2 =
-              simulation_0.getPlotManager().createMonitorPlot(new NeoObjectVector(new Object[] {{reportMonitor_2}}), "V_max Monitor \u7ED8\u56FE");
-        
-            monitorPlot_2.open();
-        
-            PlotUpdate plotUpdate_2 =
-              monitorPlot_2.getPlotUpdate();
-        
-            HardcopyProperties hardcopyProperties_3 =
-              plotUpdate_2.getHardcopyProperties();
-        
-            hardcopyProperties_3.setCurrentResolutionWidth(25);
-        
-            hardcopyProperties_3.setCurrentResolutionHeight(25);
-        
-            MonitorPlot monitorPlot_1 =
-              ((MonitorPlot) simulation_0.getPlotManager().getPlot("A_dp Monitor \u7ED8\u56FE"));
-        
-            PlotUpdate plotUpdate_1 =
-              monitorPlot_1.getPlotUpdate();
-        
-            HardcopyProperties hardcopyProperties_2 =
-              plotUpdate_1.getHardcopyProperties();
-        
-            hardcopyProperties_2.setCurrentResolutionWidth(760);
-        
-            hardcopyProperties_2.setCurrentResolutionHeight(1192);
-        
-            hardcopyProperties_3.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_3.setCurrentResolutionHeight(1191);
-        
-            simulation_0.saveState("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Simulation\\{name}.sim");
-          }}
-        
-          private void execute4() {{
-        
-            Simulation simulation_0 =
-              getActiveSimulation();
-        
-            ResidualPlot residualPlot_0 =
-              ((ResidualPlot) simulation_0.getPlotManager().getPlot("Residuals"));
-        
-            residualPlot_0.open();
-        
-            PlotUpdate plotUpdate_3 =
-              residualPlot_0.getPlotUpdate();
-        
-            HardcopyProperties hardcopyProperties_4 =
-              plotUpdate_3.getHardcopyProperties();
-        
-            hardcopyProperties_4.setCurrentResolutionWidth(25);
-        
-            hardcopyProperties_4.setCurrentResolutionHeight(25);
-        
-            simulation_0.getSimulationIterator().run();
-        
-            MonitorPlot monitorPlot_2 =
-              ((MonitorPlot) simulation_0.getPlotManager().getPlot("V_max Monitor \u7ED8\u56FE"));
-        
-            PlotUpdate plotUpdate_2 =
-              monitorPlot_2.getPlotUpdate();
-        
-            HardcopyProperties hardcopyProperties_3 =
-              plotUpdate_2.getHardcopyProperties();
-        
-            hardcopyProperties_3.setCurrentResolutionWidth(760);
-        
-            hardcopyProperties_3.setCurrentResolutionHeight(1192);
-        
-            hardcopyProperties_4.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_4.setCurrentResolutionHeight(1191);
-        
-            MonitorPlot monitorPlot_0 =
-              ((MonitorPlot) simulation_0.getPlotManager().getPlot("Dp Monitor \u7ED8\u56FE"));
-        
-            PlotUpdate plotUpdate_0 =
-              monitorPlot_0.getPlotUpdate();
-        
-            HardcopyProperties hardcopyProperties_1 =
-              plotUpdate_0.getHardcopyProperties();
-        
-            hardcopyProperties_1.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_1.setCurrentResolutionHeight(1191);
-        
-            simulation_0.saveState("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Simulation\\{name}.sim");
-          }}
-        
-          private void execute5() {{
-        
-            Simulation simulation_0 =
-              getActiveSimulation();
-        
-            MonitorPlot monitorPlot_0 =
-              ((MonitorPlot) simulation_0.getPlotManager().getPlot("Dp Monitor \u7ED8\u56FE"));
-        
-            Cartesian2DAxisManager cartesian2DAxisManager_0 =
-              ((Cartesian2DAxisManager) monitorPlot_0.getAxisManager());
-        
-            cartesian2DAxisManager_0.setAxesBounds(new Vector(Arrays.<AxisManager.AxisBounds>asList(new AxisManager.AxisBounds("Left Axis", -737733.1683996408, false, 102205.11569759721, false), new AxisManager.AxisBounds("Bottom Axis", 1.0, false, {stop_criteria_max_steps}, false))));
-        
-            monitorPlot_0.export(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_pressure.csv"), ",");
-            
-            monitorPlot_0.export(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_pressure.csv"), ",");
-            
-            Cartesian2DAxis cartesian2DAxis_0 = 
-              ((Cartesian2DAxis) cartesian2DAxisManager_0.getAxis("Bottom Axis"));
-        
-            cartesian2DAxis_0.setMinimum({x_axis});
-        
-            cartesian2DAxisManager_0.setAxesBounds(new Vector(Arrays.<AxisManager.AxisBounds>asList(new AxisManager.AxisBounds("Bottom Axis", {x_axis}, true, {stop_criteria_max_steps}, false))));
-        
-            //monitorPlot_0.encode(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u538B\u964D\u6536\u655B\u66F2\u7EBF\u56FE.png"), "png", 3200, 1800, true, false);
-            
-            //monitorPlot_0.encode(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u538B\u964D\u6536\u655B\u66F2\u7EBF\u56FE.png"), "png", 3200, 1800, true, false);            
-        
-            MonitorPlot monitorPlot_4 =
-                  ((MonitorPlot) simulation_0.getPlotManager().getPlot("Dp Monitor 2 \u7ED8\u56FE"));
-                  
-            monitorPlot_4.open();
-
-            PlotUpdate plotUpdate_4 = 
-              monitorPlot_4.getPlotUpdate();
-        
-            HardcopyProperties hardcopyProperties_9 = 
-              plotUpdate_4.getHardcopyProperties();
-              
-            hardcopyProperties_9.setCurrentResolutionWidth(25);
-
-            hardcopyProperties_9.setCurrentResolutionHeight(25);  
-              
-            Cartesian2DAxisManager cartesian2DAxisManager_4 = 
-              ((Cartesian2DAxisManager) monitorPlot_4.getAxisManager());
-        
-            cartesian2DAxisManager_4.setAxesBounds(new Vector(Arrays.<AxisManager.AxisBounds>asList(new AxisManager.AxisBounds("Left Axis", 11820.766587826656, false, 12006.159462910786, false), new AxisManager.AxisBounds("Bottom Axis", {x_axis}, true, {stop_criteria_max_steps}, false))));      
-                          
-            monitorPlot_4.encode(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u538B\u964D\u6536\u655B\u66F2\u7EBF\u56FE.png"), "png", 3200, 1800, true, false);
-            
-            monitorPlot_4.encode(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u538B\u964D\u6536\u655B\u66F2\u7EBF\u56FE.png"), "png", 3200, 1800, true, false);        
-        
-            MonitorPlot monitorPlot_1 =
-              ((MonitorPlot) simulation_0.getPlotManager().getPlot("A_dp Monitor \u7ED8\u56FE"));
-        
-            PlotUpdate plotUpdate_1 =
-              monitorPlot_1.getPlotUpdate();
-        
-            HardcopyProperties hardcopyProperties_2 =
-              plotUpdate_1.getHardcopyProperties();
-        
-            hardcopyProperties_2.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_2.setCurrentResolutionHeight(1191);
-        
-            Cartesian2DAxisManager cartesian2DAxisManager_1 =
-              ((Cartesian2DAxisManager) monitorPlot_1.getAxisManager());
-        
-            cartesian2DAxisManager_1.setAxesBounds(new Vector(Arrays.<AxisManager.AxisBounds>asList(new AxisManager.AxisBounds("Left Axis", -480055.1526588006, false, 31154.726553345095, false), new AxisManager.AxisBounds("Bottom Axis", 1.0, false, {stop_criteria_max_steps}, false))));
-        
-            monitorPlot_1.export(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_average_pressure.csv"), ",");
-            
-            monitorPlot_1.export(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_average_pressure.csv"), ",");
-        
-            MonitorPlot monitorPlot_2 =
-              ((MonitorPlot) simulation_0.getPlotManager().getPlot("V_max Monitor \u7ED8\u56FE"));
-        
-            PlotUpdate plotUpdate_2 =
-              monitorPlot_2.getPlotUpdate();
-        
-            HardcopyProperties hardcopyProperties_3 =
-              plotUpdate_2.getHardcopyProperties();
-        
-            hardcopyProperties_3.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_3.setCurrentResolutionHeight(1191);
-        
-            Cartesian2DAxisManager cartesian2DAxisManager_2 =
-              ((Cartesian2DAxisManager) monitorPlot_2.getAxisManager());
-        
-            cartesian2DAxisManager_2.setAxesBounds(new Vector(Arrays.<AxisManager.AxisBounds>asList(new AxisManager.AxisBounds("Left Axis", 80.78857937401325, false, 1560.7257699953568, false), new AxisManager.AxisBounds("Bottom Axis", 1.0, false, 101.0, false))));
-        
-            monitorPlot_2.export(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_V_max.csv"), ",");
-            
-            monitorPlot_2.export(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_V_max.csv"), ",");
-        
-            simulation_0.getSceneManager().createScalarScene("\u6807\u91CF\u573A\u666F", "\u8F6E\u5ED3", "\u6807\u91CF");
-        
-            Scene scene_1 =
-              simulation_0.getSceneManager().getScene("\u6807\u91CF\u573A\u666F 1");
-        
-            scene_1.initializeAndWait();
-        
-            ScalarDisplayer scalarDisplayer_0 =
-              ((ScalarDisplayer) scene_1.getDisplayerManager().getObject("\u6807\u91CF 1"));
-        
-            Legend legend_0 =
-              scalarDisplayer_0.getLegend();
-        
-            PredefinedLookupTable predefinedLookupTable_0 =
-              ((PredefinedLookupTable) simulation_0.get(LookupTableManager.class).getObject("blue-yellow-red"));
-        
-            legend_0.setLookupTable(predefinedLookupTable_0);
-        
-            SceneUpdate sceneUpdate_1 =
-              scene_1.getSceneUpdate();
-        
-            HardcopyProperties hardcopyProperties_5 =
-              sceneUpdate_1.getHardcopyProperties();
-        
-            hardcopyProperties_5.setCurrentResolutionWidth(25);
-        
-            hardcopyProperties_5.setCurrentResolutionHeight(25);
-        
-            hardcopyProperties_3.setCurrentResolutionWidth(760);
-        
-            hardcopyProperties_3.setCurrentResolutionHeight(1192);
-        
-            ResidualPlot residualPlot_0 =
-              ((ResidualPlot) simulation_0.getPlotManager().getPlot("Residuals"));
-        
-            PlotUpdate plotUpdate_3 =
-              residualPlot_0.getPlotUpdate();
-        
-            HardcopyProperties hardcopyProperties_4 =
-              plotUpdate_3.getHardcopyProperties();
-        
-            hardcopyProperties_4.setCurrentResolutionWidth(760);
-        
-            hardcopyProperties_4.setCurrentResolutionHeight(1192);
-        
-            hardcopyProperties_5.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_5.setCurrentResolutionHeight(1191);
-        
-            scene_1.resetCamera();
-        
-            scene_1.setPresentationName("\u538B\u529B\u4E91\u56FE");
-        
-            LogoAnnotation logoAnnotation_0 =
-              ((LogoAnnotation) simulation_0.getAnnotationManager().getObject("Logo"));
-        
-            logoAnnotation_0.setOpacity(0.0);
-        
-            scalarDisplayer_0.getInputParts().setQuery(null);
-        
-            Region region_0 =
-              simulation_0.getRegionManager().getRegion("\u5305\u9762");
-        
-            Boundary boundary_2 =
-              region_0.getBoundaryManager().getBoundary("Fluid.Faces");
-        
-            Boundary boundary_0 =
-              region_0.getBoundaryManager().getBoundary("Fluid.inlet");
-        
-            Boundary boundary_1 =
-              region_0.getBoundaryManager().getBoundary("Fluid.outlet");
-        
-            scalarDisplayer_0.getInputParts().setObjects(boundary_2, boundary_0, boundary_1);
-        
-            PrimitiveFieldFunction primitiveFieldFunction_1 =
-              ((PrimitiveFieldFunction) simulation_0.getFieldFunctionManager().getFunction("AbsolutePressure"));
-        
-            scalarDisplayer_0.getScalarDisplayQuantity().setFieldFunction(primitiveFieldFunction_1);
-        
-            scalarDisplayer_0.setFillMode(ScalarFillMode.NODE_FILLED);
-        
-            BlueRedLookupTable blueRedLookupTable_0 =
-              ((BlueRedLookupTable) simulation_0.get(LookupTableManager.class).getObject("blue-red"));
-        
-            legend_0.setLookupTable(blueRedLookupTable_0);
-        
-            legend_0.setTitleHeight(0.035);
-        
-            legend_0.setLabelHeight(0.035);
-        
-            legend_0.setWidth(0.35);
-        
-            legend_0.setPositionCoordinate(new DoubleVector(new double[] {{0.4, 0.08}}));
-        
-            legend_0.setLabelFormat({dp_format});
-        
-            legend_0.setNumberOfLabels(5);
-        
-            Units units_7 =
-              ((Units) simulation_0.getUnitsManager().getObject({dp_unit}));
-        
-            scalarDisplayer_0.getScalarDisplayQuantity().setUnits(units_7);
-        
-            CurrentView currentView_0 =
-              scene_1.getCurrentView();
-        
-            currentView_0.setInput(new DoubleVector(new double[] {{0.006064277158636892, 0.005535606369249629, 0.07199999063106509}}), new DoubleVector(new double[] {{0.006064277158636892, 0.005535606369249629, 0.47804024423186187}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 0.10599777638115217, 1, 30.0);
-        
-            scene_1.setViewOrientation(new DoubleVector(new double[] {{1.0, 1.0, 1.0}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}));
-        
-            scene_1.resetCamera();
-        
-            //currentView_0.setInput(new DoubleVector(new double[] {{0.006064277158636892, 0.005535606369249629, 0.07199999063106509}}), new DoubleVector(new double[] {{0.24049172687688083, 0.23996305608749355, 0.306427440349309}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 0.06688408114046082, 1, 30.0);
-        
-            scene_1.printAndWait(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u538B\u529B\u4E91\u56FE.png"), 2, 1600, 900, true, false);
-            
-            scene_1.printAndWait(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u538B\u529B\u4E91\u56FE.png"), 2, 1600, 900, true, false);
-        
-            //currentView_0.setInput(new DoubleVector(new double[] {{0.006064277158636892, 0.005535606369249629, 0.07199999063106509}}), new DoubleVector(new double[] {{0.24049172687688083, 0.23996305608749355, 0.306427440349309}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 0.06688408114046082, 1, 30.0);
-        
-            scene_1.export3DSceneFileAndWait(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u538B\u529B\u4E91\u56FE.sce"), "\u538B\u529B\u4E91\u56FE", "", false, SceneFileCompressionLevel.OFF);
-            
-            scene_1.export3DSceneFileAndWait(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u538B\u529B\u4E91\u56FE.sce"), "\u538B\u529B\u4E91\u56FE", "", false, SceneFileCompressionLevel.OFF);
-        
-            Units units_8 =
-              simulation_0.getUnitsManager().getPreferredUnits(Dimensions.Builder().length(1).build());
-        
-            scene_1.setTransparencyOverrideMode(SceneTransparencyOverride.MAKE_SCENE_TRANSPARENT);
-        
-            scene_1.getCreatorGroup().setQuery(null);
-        
-            scene_1.getCreatorGroup().setObjects(region_0);
-        
-            scene_1.getCreatorGroup().setQuery(null);
-        
-            scene_1.getCreatorGroup().setObjects(region_0);
-        
-            scene_1.getCreatorGroup().setQuery(null);
-        
-            scene_1.getCreatorGroup().setObjects(region_0);
-        
-            PrimitiveFieldFunction primitiveFieldFunction_0 =
-              ((PrimitiveFieldFunction) simulation_0.getFieldFunctionManager().getFunction("Velocity"));
-        
-            StreamPart streamPart_0 =
-              simulation_0.getPartManager().createStreamPart(new NeoObjectVector(new Object[] {{region_0}}), new NeoObjectVector(new Object[] {{boundary_2, boundary_0, boundary_1}}), primitiveFieldFunction_0, 8, 8, 2);
-        
-            scene_1.setTransparencyOverrideMode(SceneTransparencyOverride.USE_DISPLAYER_PROPERTY);
-        
-            simulation_0.getSceneManager().createEmptyScene("\u573A\u666F");
-        
-            Scene scene_2 =
-              simulation_0.getSceneManager().getScene("\u573A\u666F 1");
-        
-            scene_2.initializeAndWait();
-        
-            SceneUpdate sceneUpdate_2 =
-              scene_2.getSceneUpdate();
-        
-            HardcopyProperties hardcopyProperties_6 =
-              sceneUpdate_2.getHardcopyProperties();
-        
-            hardcopyProperties_6.setCurrentResolutionWidth(25);
-        
-            hardcopyProperties_6.setCurrentResolutionHeight(25);
-        
-            hardcopyProperties_5.setCurrentResolutionWidth(760);
-        
-            hardcopyProperties_5.setCurrentResolutionHeight(1192);
-        
-            hardcopyProperties_6.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_6.setCurrentResolutionHeight(1191);
-        
-            scene_2.resetCamera();
-        
-            scene_2.setPresentationName("\u6D41\u7EBF\u56FE");
-        
-            ScalarDisplayer scalarDisplayer_1 =
-              scene_2.getDisplayerManager().createScalarDisplayer("\u6807\u91CF");
-        
-            Legend legend_1 =
-              scalarDisplayer_1.getLegend();
-        
-            legend_1.setLookupTable(predefinedLookupTable_0);
-        
-            simulation_0.getSceneManager().deleteScenes(new NeoObjectVector(new Object[] {{scene_2}}));
-        
-            hardcopyProperties_5.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_5.setCurrentResolutionHeight(1191);
-        
-            simulation_0.getSceneManager().createEmptyScene("\u573A\u666F");
-        
-            Scene scene_3 =
-              simulation_0.getSceneManager().getScene("\u573A\u666F 1");
-        
-            scene_3.initializeAndWait();
-        
-            SceneUpdate sceneUpdate_3 =
-              scene_3.getSceneUpdate();
-        
-            HardcopyProperties hardcopyProperties_7 =
-              sceneUpdate_3.getHardcopyProperties();
-        
-            hardcopyProperties_7.setCurrentResolutionWidth(25);
-        
-            hardcopyProperties_7.setCurrentResolutionHeight(25);
-        
-            hardcopyProperties_5.setCurrentResolutionWidth(760);
-        
-            hardcopyProperties_5.setCurrentResolutionHeight(1192);
-        
-            hardcopyProperties_7.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_7.setCurrentResolutionHeight(1191);
-        
-            scene_3.resetCamera();
-        
-            scene_3.setPresentationName("\u6D41\u7EBF\u56FE");
-        
-            StreamDisplayer streamDisplayer_0 =
-              scene_3.getDisplayerManager().createStreamDisplayer("\u6D41\u7EBF");
-        
-            Legend legend_2 =
-              streamDisplayer_0.getLegend();
-        
-            legend_2.setLookupTable(predefinedLookupTable_0);
-        
-            streamDisplayer_0.getInputParts().setQuery(null);
-        
-            streamDisplayer_0.getInputParts().setObjects(streamPart_0);
-        
-            VectorMagnitudeFieldFunction vectorMagnitudeFieldFunction_0 =
-              ((VectorMagnitudeFieldFunction) primitiveFieldFunction_0.getMagnitudeFunction());
-        
-            streamDisplayer_0.getScalarDisplayQuantity().setFieldFunction(vectorMagnitudeFieldFunction_0);
-        
-            streamDisplayer_0.setMode(StreamDisplayerMode.LINES);
-        
-            legend_2.setLookupTable(blueRedLookupTable_0);
-        
-            legend_2.setTitleHeight(0.035);
-        
-            legend_2.setLabelHeight(0.035);
-        
-            legend_2.setPositionCoordinate(new DoubleVector(new double[] {{0.4, 0.08}}));
-        
-            legend_2.setLabelFormat("%-6.2f");
-        
-            legend_2.setNumberOfLabels(5);
-        
-            legend_2.setWidth(0.35);
-        
-            PartDisplayer partDisplayer_0 =
-              scene_3.getDisplayerManager().createPartDisplayer("\u8868\u9762", -1, 1);
-        
-            partDisplayer_0.getInputParts().setQuery(null);
-        
-            FeatureCurve featureCurve_0 =
-              ((FeatureCurve) region_0.getFeatureCurveManager().getObject("Default Feature Curve"));
-        
-            partDisplayer_0.getInputParts().setObjects(boundary_2, boundary_0, boundary_1, featureCurve_0);
-        
-            partDisplayer_0.setOpacity(0.2);
-        
-            scene_3.setViewOrientation(new DoubleVector(new double[] {{1.0, 1.0, 1.0}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}));
-        
-            CurrentView currentView_1 =
-              scene_3.getCurrentView();
-        
-            currentView_1.setInput(new DoubleVector(new double[] {{0.0, 0.0, 0.0}}), new DoubleVector(new double[] {{3.0354027944862283, 3.0354027944862283, 3.0354027944862283}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 1.3724755655678504, 1, 30.0);
-        
-            scene_3.resetCamera();
-        
-            //currentView_1.setInput(new DoubleVector(new double[] {{0.006064277158636892, 0.005535606369249629, 0.07199999063106509}}), new DoubleVector(new double[] {{0.2404917268768808, 0.23996305608749355, 0.306427440349309}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 0.06688408114046082, 1, 30.0);
-        
-            simulation_0.saveState("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Simulation\\{name}.sim");
-          }}
-        
-          private void execute6() {{
-        
-            Simulation simulation_0 =
-              getActiveSimulation();
-        
-            Scene scene_3 =
-              simulation_0.getSceneManager().getScene("\u6D41\u7EBF\u56FE");
-        
-            CurrentView currentView_1 =
-              scene_3.getCurrentView();
-        
-            currentView_1.setInput(new DoubleVector(new double[] {{0.006064277158636892, 0.005535606369249629, 0.07199999063106509}}), new DoubleVector(new double[] {{0.2404917268768808, 0.23996305608749355, 0.306427440349309}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 0.06688408114046082, 1, 30.0);
-        
-            scene_3.resetCamera();
-        
-            scene_3.printAndWait(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u6D41\u7EBF\u56FE.png"), 2, 1600, 900, true, false);
-            
-            scene_3.printAndWait(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u6D41\u7EBF\u56FE.png"), 2, 1600, 900, true, false);
-        
-            //currentView_1.setInput(new DoubleVector(new double[] {{0.006064277158636892, 0.005535606369249629, 0.07199999063106509}}), new DoubleVector(new double[] {{0.2404917268768808, 0.23996305608749355, 0.306427440349309}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 0.06688408114046082, 1, 30.0);
-        
-            scene_3.export3DSceneFileAndWait(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u6D41\u7EBF\u56FE.sce"), "\u6D41\u7EBF\u56FE", "", false, SceneFileCompressionLevel.OFF);
-            
-            scene_3.export3DSceneFileAndWait(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u6D41\u7EBF\u56FE.sce"), "\u6D41\u7EBF\u56FE", "", false, SceneFileCompressionLevel.OFF);
-        
-            Units units_1 =
-              simulation_0.getUnitsManager().getPreferredUnits(Dimensions.Builder().build());
-        
-            scene_3.setTransparencyOverrideMode(SceneTransparencyOverride.MAKE_SCENE_TRANSPARENT);
-        
-            scene_3.getCreatorGroup().setQuery(null);
-        
-            Region region_0 =
-              simulation_0.getRegionManager().getRegion("\u5305\u9762");
-        
-            scene_3.getCreatorGroup().setObjects(region_0);
-        
-            Units units_9 =
-              simulation_0.getUnitsManager().getPreferredUnits(Dimensions.Builder().velocity(1).build());
-        
-            scene_3.getCreatorGroup().setQuery(null);
-        
-            scene_3.getCreatorGroup().setObjects(region_0);
-        
-            PrimitiveFieldFunction primitiveFieldFunction_0 =
-              ((PrimitiveFieldFunction) simulation_0.getFieldFunctionManager().getFunction("Velocity"));
-        
-            VectorMagnitudeFieldFunction vectorMagnitudeFieldFunction_0 =
-              ((VectorMagnitudeFieldFunction) primitiveFieldFunction_0.getMagnitudeFunction());
-        
-            ThresholdPart thresholdPart_0 =
-              simulation_0.getPartManager().createThresholdPart(new NeoObjectVector(new Object[] {{region_0}}), new DoubleVector(new double[] {{{speed_of_sound*0.3}, 300.0}}), units_9, vectorMagnitudeFieldFunction_0, 0);
-        
-            scene_3.setTransparencyOverrideMode(SceneTransparencyOverride.USE_DISPLAYER_PROPERTY);
-        
-            thresholdPart_0.setPresentationName("Ma>0.3");
-        
-            thresholdPart_0.setPresentationName("Ma>0.3\u533A\u57DF");
-        
-            simulation_0.getSceneManager().createEmptyScene("\u573A\u666F");
-        
-            Scene scene_4 =
-              simulation_0.getSceneManager().getScene("\u573A\u666F 1");
-        
-            scene_4.initializeAndWait();
-        
-            SceneUpdate sceneUpdate_4 =
-              scene_4.getSceneUpdate();
-        
-            HardcopyProperties hardcopyProperties_8 =
-              sceneUpdate_4.getHardcopyProperties();
-        
-            hardcopyProperties_8.setCurrentResolutionWidth(25);
-        
-            hardcopyProperties_8.setCurrentResolutionHeight(25);
-        
-            SceneUpdate sceneUpdate_3 =
-              scene_3.getSceneUpdate();
-        
-            HardcopyProperties hardcopyProperties_7 =
-              sceneUpdate_3.getHardcopyProperties();
-        
-            hardcopyProperties_7.setCurrentResolutionWidth(760);
-        
-            hardcopyProperties_7.setCurrentResolutionHeight(1192);
-        
-            hardcopyProperties_8.setCurrentResolutionWidth(758);
-        
-            hardcopyProperties_8.setCurrentResolutionHeight(1191);
-        
-            scene_4.resetCamera();
-        
-            scene_4.setPresentationName("Ma>0.3\u533A\u57DF\u56FE");
-        
-            PartDisplayer partDisplayer_1 =
-              scene_4.getDisplayerManager().createPartDisplayer("\u8868\u9762", -1, 1);
-        
-            partDisplayer_1.getInputParts().setQuery(null);
-        
-            Boundary boundary_2 =
-              region_0.getBoundaryManager().getBoundary("Fluid.Faces");
-        
-            Boundary boundary_0 =
-              region_0.getBoundaryManager().getBoundary("Fluid.inlet");
-        
-            Boundary boundary_1 =
-              region_0.getBoundaryManager().getBoundary("Fluid.outlet");
-        
-            FeatureCurve featureCurve_0 =
-              ((FeatureCurve) region_0.getFeatureCurveManager().getObject("Default Feature Curve"));
-        
-            partDisplayer_1.getInputParts().setObjects(boundary_2, boundary_0, boundary_1, featureCurve_0);
-        
-            partDisplayer_1.setOpacity(0.2);
-        
-            PartDisplayer partDisplayer_2 =
-              scene_4.getDisplayerManager().createPartDisplayer("\u8868\u9762", -1, 1);
-        
-            partDisplayer_2.getInputParts().setQuery(null);
-        
-            partDisplayer_2.getInputParts().setObjects(thresholdPart_0);
-        
-            CurrentView currentView_2 =
-              scene_4.getCurrentView();
-        
-            currentView_2.setInput(new DoubleVector(new double[] {{0.0, 0.0, 0.0}}), new DoubleVector(new double[] {{0.0, 0.0, 5.257471861486698}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 1.3724755655678502, 1, 30.0);
-        
-            scene_4.setViewOrientation(new DoubleVector(new double[] {{1.0, 1.0, 1.0}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}));
-        
-            scene_4.resetCamera();
-        
-            //currentView_2.setInput(new DoubleVector(new double[] {{0.006064277158636892, 0.005535606369249629, 0.07199999063106509}}), new DoubleVector(new double[] {{0.2404917268768808, 0.23996305608749355, 0.306427440349309}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 0.06688408114046082, 1, 30.0);
-        
-            scene_4.printAndWait(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_Ma_0.3\u533A\u57DF\u56FE.png"), 2, 1600, 900, true, false);
-            
-            scene_4.printAndWait(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_Ma_0.3\u533A\u57DF\u56FE.png"), 2, 1600, 900, true, false);
-        
-            //currentView_2.setInput(new DoubleVector(new double[] {{0.006064277158636892, 0.005535606369249629, 0.07199999063106509}}), new DoubleVector(new double[] {{0.2404917268768808, 0.23996305608749355, 0.306427440349309}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 0.06688408114046082, 1, 30.0);
-        
-            scene_4.export3DSceneFileAndWait(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_Ma_0.3\u533A\u57DF\u56FE.sce"), "Ma>0.3\u533A\u57DF\u56FE", "", false, SceneFileCompressionLevel.OFF);
-            
-            scene_4.export3DSceneFileAndWait(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_Ma_0.3\u533A\u57DF\u56FE.sce"), "Ma>0.3\u533A\u57DF\u56FE", "", false, SceneFileCompressionLevel.OFF);
-        
-            simulation_0.saveState("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Simulation\\{name}.sim");
-          }}
-        
-          private void execute7() {{
-            Simulation simulation_0 =
-              getActiveSimulation();
-
-            simulation_0.getSceneManager().createGeometryScene("\u51E0\u4F55\u573A\u666F", "\u8F6E\u5ED3", "\u8868\u9762", 1);
-
-            Scene scene_5 =
-              simulation_0.getSceneManager().getScene("\u51E0\u4F55\u573A\u666F 2");
-
-            scene_5.initializeAndWait();
-
-            SceneUpdate sceneUpdate_2 =
-              scene_5.getSceneUpdate();
-
-            HardcopyProperties hardcopyProperties_2 =
-              sceneUpdate_2.getHardcopyProperties();
-
-            hardcopyProperties_2.setCurrentResolutionWidth(25);
-
-            hardcopyProperties_2.setCurrentResolutionHeight(25);
-
-            Scene scene_0 =
-              simulation_0.getSceneManager().getScene("\u51E0\u4F55\u573A\u666F 1");
-
-            SceneUpdate sceneUpdate_0 =
-              scene_0.getSceneUpdate();
-
-            HardcopyProperties hardcopyProperties_0 =
-              sceneUpdate_0.getHardcopyProperties();
-
-            hardcopyProperties_0.setCurrentResolutionWidth(1818);
-
-            hardcopyProperties_0.setCurrentResolutionHeight(856);
-
-            hardcopyProperties_2.setCurrentResolutionWidth(1816);
-
-            hardcopyProperties_2.setCurrentResolutionHeight(855);
-
-            scene_5.resetCamera();
-
-            scene_5.setPresentationName("\u6D41\u4F53\u57DF\u56FE");
-
-            CurrentView currentView_3 =
-              scene_5.getCurrentView();
-
-            //currentView_3.setInput(new DoubleVector(new double[] {{0.0060642761908053285, 0.005535606360364112, 0.07199999063106509}}), new DoubleVector(new double[] {{0.0060642761908053285, 0.005535606360364112, 0.3304198118061474}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 0.06746111050434028, 1, 30.0);
-
-            scene_5.setViewOrientation(new DoubleVector(new double[] {{1.0, 1.0, 1.0}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}));
-
-            scene_5.setTransparencyOverrideMode(SceneTransparencyOverride.MAKE_SCENE_TRANSPARENT);
-
-            scene_5.resetCamera();
-
-            //currentView_3.setInput(new DoubleVector(new double[] {{0.0060642761908053285, 0.005535606360364112, 0.07199999063106509}}), new DoubleVector(new double[] {{0.15526302951017404, 0.1547343596797328, 0.22119874395043382}}), new DoubleVector(new double[] {{0.0, 1.0, 0.0}}), 0.06688397135209896, 1, 30.0);
-
-            scene_5.printAndWait(resolvePath("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u6D41\u4F53\u57DF\u56FE.png"), 2, 1600, 900, true, false);
-            
-            scene_5.printAndWait(resolvePath("D:\\{public_unicode}\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Report\\{name}_\u6D41\u4F53\u57DF\u56FE.png"), 2, 1600, 900, true, false);
-            
-            simulation_0.saveState("D:\\STARCCM Simulation automation\\{datenow}\\{unicode_operator_name}\\{name}_{self.index}\\Simulation\\{name}.sim");
-          }}
-        }}"""
-
-        # 逐行写入文件
-        with open(script_path, "w", encoding="utf-8") as file:
-            for line in file_content.splitlines():
-                file.write(line + "\n")
-
-        # 构建命令
-        command = [
-            starccm_path,
-            "-verbose", # 强制输出详细日志
-            "-np", f"{threads}",  # 使用指定的处理器核心数
-            "-batch",  # 批处理模式
-            # "-new",
-            # "-macro",
-            script_path
-        ]
-
-        # # 执行命令
-        # result = subprocess.run(command, shell=True)
-
-        # 修改原有的subprocess.run调用方式
-        process = subprocess.Popen(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            bufsize=1,
-            encoding='utf-8',
-            errors='replace'
-        )
-        # 实时捕获输出
-        while True:
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
-                break
-            if output:
-                # 同时输出到控制台和文件
-                self.logger.info(output.strip())  # 替换原来的logging.info
-                QApplication.processEvents()  # 保持UI响应
+            if mesh_process is not None:
+                logging.info(f"等待预划分网格完成: {name}_{self.index}")
+                macro_paths.append(job['mesh_macro'])
+                returncode = self.wait_phase(mesh_process)
+                stage_times['mesh'] = mesh_process.elapsed
+                self.stage_timer.feed_file(mesh_process.log_path)
+                self.update_stage_timing_label()
+                used_mesh_np = job['mesh_np']
+            else:
+                macro_paths.append(write_macro(job, 'mesh'))
+                phase_start = time.monotonic()
+                returncode = self.run_starccm_phase(build_starccm_command(starccm_path, threads, macro_paths[-1]))
+                stage_times['mesh'] = time.monotonic() - phase_start
+                used_mesh_np = int(threads)
+            if returncode == 0:
+                # 下一个任务的网格与当前任务的求解同时占用内存，资源不足时不预划分
+                if mesh_np > 0 and not self.wait_for_resources(
+                        next_params, self.estimate_resources(params)['memory_bytes'], wait=False):
+                    logging.warning("资源不足，不为下一个任务预划分网格")
+                    mesh_np = 0
+                if mesh_np > 0:
+                    self.start_premesh(next_params, mesh_np)
+                    self.memory_sampler.mark_overlap()
+                else:
+                    solve_np = int(threads)
+                macro_paths.append(write_macro(job, 'solve'))
+                phase_start = time.monotonic()
+                returncode = self.run_starccm_phase(
+                    build_starccm_command(starccm_path, solve_np, macro_paths[-1],
+                                          job.get('work_sim_path', job['sim_path'])))
+                stage_times['solve'] = time.monotonic() - phase_start
+        post_start = time.monotonic()
+        job['stage_timings'] = self.stage_timer.timings
+        job['cell_count'] = self.stage_timer.cell_count
+        stage_summary = format_stage_summary(self.stage_timer.groups(), self.stage_timer.cell_count,
+                                             self.stage_timer.peak_mem_mb)
+        logging.info(f"阶段用时: {stage_summary}")
+
+        for macro_path in macro_paths:
+            try:
+                os.remove(macro_path)
+            except OSError:
+                pass
 
-        # 获取最终返回码
-        result = process.poll()
+        # 草稿目录模式：结果文件转移到结果目录后再后处理，.sim 在后台继续转移
+        if self.scratch_mover is not None:
+            self.wait_transfer(self.scratch_mover.submit(job))
 
         # 检查命令执行结果
-        if process.returncode == 0:
+        if returncode == 0:
 
             self.process_state = 1
 
@@ -3397,15 +2704,13 @@ class SimulationConfigWindow(QWidget):
             # 压力云图
             pressure_img = os.path.join(report_subfolder_public, f"{name}_压力云图.png")
             if os.path.exists(pressure_img):
-                pixmap = QPixmap(pressure_img).scaled(480, 270, Qt.KeepAspectRatio)
-                self.pressure_label.setPixmap(pixmap)
+                self.thumbnails.load_into(self.pressure_label, pressure_img, (480, 270))
                 self.pressure_label.mouseDoubleClickEvent = lambda e: self.show_image(pressure_img)
 
             # 流线图
             streamline_img = os.path.join(report_subfolder_public, f"{name}_流线图.png")
             if os.path.exists(streamline_img):
-                pixmap = QPixmap(streamline_img).scaled(480, 270, Qt.KeepAspectRatio)
-                self.streamline_label.setPixmap(pixmap)
+                self.thumbnails.load_into(self.streamline_label, streamline_img, (480, 270))
                 self.streamline_label.mouseDoubleClickEvent = lambda e: self.show_image(streamline_img)
 
             model_img=os.path.join(report_subfolder_public, f"{name}_流体域图.png")
@@ -3415,8 +2720,8 @@ class SimulationConfigWindow(QWidget):
             self.layout().addWidget(image_container)
 
             logging.info("仿真成功完成")
-            logging.info(f"报告已保存至 D:\\STARCCM Simulation automation\\{datenow}\\{operator_name}\\{name}_{self.index}\\Report\\{name}_pressure.csv")
-            logging.info(f"报告已保存至 D:\\仿真自动化结果\\{datenow}\\{operator_name}\\{name}_{self.index}\\Report\\{name}_pressure.csv")
+            logging.info(f"报告已保存至 {os.path.join(report_subfolder, f'{name}_pressure.csv')}")
+            logging.info(f"报告已保存至 {os.path.join(report_subfolder_public, f'{name}_pressure.csv')}")
 
             # 仿真完成后恢复按钮状态
             self.run_button.setText('开始运行')
@@ -3427,7 +2732,7 @@ class SimulationConfigWindow(QWidget):
             Ma = 0  # 是否删除Ma>0.3图，0删除
 
             #最大流速读取
-            vmax_file_path = f"D:\\STARCCM Simulation automation\\{datenow}\\{operator_name}\\{name}_{self.index}\\Report\\{name}_V_max.csv"
+            vmax_file_path = os.path.join(report_subfolder, f"{name}_V_max.csv")
             vmax = read_last_row_last_column(vmax_file_path)
             if workingfluid in ["R134a", "R1234yf","R744"]:
                 vmax_float = float(vmax)
@@ -3437,17 +2742,17 @@ class SimulationConfigWindow(QWidget):
                     logging.warning(
                         f"{name}内部最大流速为: {vmax_float:.3g} m/s (Ma={vmax_float / speed_of_sound:.2f}), 内部部分流速马赫数超0.5！")
                     logging.info(
-                        f"Ma>0.3区域图已保存至 D:\\STARCCM Simulation automation\\{datenow}\\{operator_name}\\{name}_{self.index}\\Report\\{name}_Ma_0.3区域图.png")
+                        f"Ma>0.3区域图已保存至 {os.path.join(report_subfolder, f'{name}_Ma_0.3区域图.png')}")
                     logging.info(
-                        f"Ma>0.3区域图已保存至 D:\\仿真自动化结果\\{datenow}\\{operator_name}\\{name}_{self.index}\\Report\\{name}_Ma_0.3区域图.png")
+                        f"Ma>0.3区域图已保存至 {os.path.join(report_subfolder_public, f'{name}_Ma_0.3区域图.png')}")
                 elif vmax_float > speed_of_sound * 0.3:
                     Ma = 1
                     logging.warning(
                         f"{name}内部最大流速为: {vmax_float:.3g} m/s (Ma={vmax_float / speed_of_sound:.2f}), 内部部分流速马赫数超0.3")
                     logging.info(
-                        f"Ma>0.3区域图已保存至 D:\\STARCCM Simulation automation\\{datenow}\\{operator_name}\\{name}_{self.index}\\Report\\{name}_Ma_0.3区域图.png")
+                        f"Ma>0.3区域图已保存至 {os.path.join(report_subfolder, f'{name}_Ma_0.3区域图.png')}")
                     logging.info(
-                        f"Ma>0.3区域图已保存至 D:\\仿真自动化结果\\{datenow}\\{operator_name}\\{name}_{self.index}\\Report\\{name}_Ma_0.3区域图.png")
+                        f"Ma>0.3区域图已保存至 {os.path.join(report_subfolder_public, f'{name}_Ma_0.3区域图.png')}")
                 else:
                     Ma = 0
                     logging.info(
@@ -3469,6 +2774,9 @@ class SimulationConfigWindow(QWidget):
                     task['simulation_date'] = datenow
                     task['Ma'] = Ma
                     task['res_mach_number'] = res_mach_number
+                    task['stage_timings'] = self.stage_timer.groups()
+                    task['cell_count'] = self.stage_timer.cell_count
+                    task['run_record'] = os.path.join(report_subfolder_public, f"{name}{RUN_RECORD_SUFFIX}")
                     # self.save_config()  # 立即保存配置
 
                 # 在成功运行后更新参数记录
@@ -3480,10 +2788,11 @@ class SimulationConfigWindow(QWidget):
             self.res_sce_path2= self.get_scene_path("流线图.sce",current_params)
             self.res_sce_path3= self.get_scene_path("Ma_0.3区域图.sce",current_params)
 
+            # 预览/不出图档位不导出三维场景文件
             self.btn_mach_3d.setVisible(Ma != 0)
-            self.btn_pressure_3d.setEnabled(True)
-            self.btn_streamline_3d.setEnabled(True)
-            self.btn_mach_3d.setEnabled(True if Ma != 0 else False)
+            self.btn_pressure_3d.setEnabled(os.path.exists(self.res_sce_path1))
+            self.btn_streamline_3d.setEnabled(os.path.exists(self.res_sce_path2))
+            self.btn_mach_3d.setEnabled(Ma != 0 and os.path.exists(self.res_sce_path3))
 
             # 刷新界面确保按钮状态更新
             self.btn_pressure_3d.repaint()
@@ -3493,78 +2802,30 @@ class SimulationConfigWindow(QWidget):
             # 计算结果并格式化
             calculated_value = safe_eval(inlet_mass_flow_rate)
             formatted_value = f"{calculated_value:.2f}" if calculated_value is not None else "N/A"
-            csv_file_path = f"D:\\STARCCM Simulation automation\\{datenow}\\{operator_name}\\{name}_{self.index}\\Report\\{name}_average_pressure.csv"
+            csv_file_path = os.path.join(report_subfolder, f"{name}_average_pressure.csv")
             last_value = read_last_row_last_column(csv_file_path)
             output_pptname=f'{datenow}_{operator_name}_{name}_{self.index}.pptx'
             output_pptpath=os.path.join(report_subfolder,output_pptname)
             output_pptpath_public = os.path.join(report_subfolder_public,output_pptname)
 
-            def resource_path(relative_path):
-                if hasattr(sys, '_MEIPASS'):
-                    return os.path.join(sys._MEIPASS, relative_path)
-                return os.path.join(os.path.abspath("."), relative_path)
-
-                # 修改模板加载方式
-
-            #自动输出PPT部分
-            if workingfluid in ["R134a","R1234yf","R744"]:
-                ppt_template = 'Refrigerant_Report.pptx'
-                prs = Presentation(str(resource_path(ppt_template)))
-                slide_1 = prs.slides[0]
-                slide_2 = prs.slides[1]
-                slide_3 = prs.slides[2]
-                slide_4 = prs.slides[3]
-                slide_5 = prs.slides[4]
-                append_text_to_slide(slide_1,"压降仿真_",f'{datenow}_{operator_name}_{name}_{self.index}')
-                modify_table(slide_3,2,1, f'{workingfluid}',0)
-                modify_table(slide_3,2,2, f'{temperature}',0)
-                modify_table(slide_3,2,3, f'{pressure}',0)
-                modify_table(slide_3,2,4, f'{density}',0)
-                modify_table(slide_3,2,5, f'{viscosity}',0)
-                replace_image(slide_3, "",model_img)
-                modify_table(slide_4,2,1, f'{self.index}',0)
-                modify_table(slide_4,2,2, f'{pressure}',0)
-                modify_table(slide_4,2,3, f'{temperature}',0)
-                modify_table(slide_4,2,4, f'{formatted_value}',0)
-                modify_table(slide_4,2,5,  f"{float(last_value)/1000:.2f}",0)
-                replace_image(slide_4, "",pressure_img,0)#替换第一张
-                replace_image(slide_4, "",streamline_img,0)#由于第一张被替换，第二张变成了第一张，所以再次替换
-                replace_image(slide_5, "",Ma_img)
-                if Ma==0:
-                    # del slide_5
-
-                    # 获取要删除的幻灯片
-                    slide_to_remove = prs.slides[4]
-
-                    # 获取所有幻灯片的 XML 元素列表
-                    slides_list = prs.slides._sldIdLst
-
-                    # 找到对应的幻灯片 XML 元素并删除
-                    for elem in slides_list:
-                        if elem.id == slide_to_remove.slide_id:
-                            slides_list.remove(elem)
-                            break
-            else:
-                ppt_template = '50EG_Report.pptx'
-                prs = Presentation(str(resource_path(ppt_template)))
-                slide_1 = prs.slides[0]
-                slide_2 = prs.slides[1]
-                slide_3 = prs.slides[2]
-                slide_4 = prs.slides[3]
-                append_text_to_slide(slide_1, "压降仿真_", f'{datenow}_{operator_name}_{name}_{self.index}')
-                modify_table(slide_3, 2, 1, f'{workingfluid}', 0)
-                modify_table(slide_3, 2, 2, f'{temperature}', 0)
-                modify_table(slide_3, 2, 3, f'{density}', 0)
-                modify_table(slide_3, 2, 4, f'{viscosity}', 0)
-                replace_image(slide_3, "", model_img)
-                modify_table(slide_4, 2, 1, f'{self.index}', 0)
-                modify_table(slide_4, 2, 2, f'{temperature}', 0)
-                modify_table(slide_4, 2, 3, f'{formatted_value}', 0)
-                modify_table(slide_4, 2, 4, f"{float(last_value) / 1000:.2f}", 0)
-                replace_image(slide_4, "", pressure_img, 0)
-                replace_image(slide_4, "", streamline_img, 0)
-            prs.save(output_pptpath)
-            prs.save(output_pptpath_public)
+            #自动输出PPT部分（模板每个进程只解析一次，每个报告复制一份）
+            render_job_report({
+                'title': f'{datenow}_{operator_name}_{name}_{self.index}',
+                'fluid': workingfluid,
+                'temperature': temperature,
+                'pressure': pressure,
+                'density': density,
+                'viscosity': viscosity,
+                'index': self.index,
+                'mass_flow': formatted_value,
+                'dp_kpa': f"{float(last_value) / 1000:.2f}",
+                'mach_level': Ma,
+            }, {
+                'fluid_domain_png': model_img,
+                'pressure_png': pressure_img,
+                'streamline_png': streamline_img,
+                'mach_png': Ma_img,
+            }, [output_pptpath, output_pptpath_public])
 
             if Ma==0:
                 # 定义要删除的文件路径
@@ -3635,8 +2896,6 @@ class SimulationConfigWindow(QWidget):
             # 确保在界面更新后执行
             QApplication.processEvents()
 
-            csv_file_path = f"D:\\STARCCM Simulation automation\\{datenow}\\{operator_name}\\{name}_{self.index}\\Report\\{name}_average_pressure.csv"
-            last_value = read_last_row_last_column(csv_file_path)
             if last_value is not None:
                 # 更新压降显示
                 drop_value = int(round(float(last_value)))
@@ -3741,6 +3000,10 @@ class SimulationConfigWindow(QWidget):
 仿真结束时间: {end_time.strftime('%Y-%m-%d %H:%M:%S')} 
 仿真用时: {duration}
 
+阶段用时
+--------
+{format_stage_summary(self.stage_timer.groups(), self.stage_timer.cell_count, self.stage_timer.peak_mem_mb, separator=chr(10))}
+
 计算结果
 --------
 最大马赫数: {'N/A' if workingfluid == '50EG' else round(float(vmax)/speed_of_sound,3)}
@@ -3757,6 +3020,30 @@ class SimulationConfigWindow(QWidget):
                 f.write(report_content)
             logging.info(f"仿真报告已生成: {report_path_public}")
 
+            stage_times['post'] = time.monotonic() - post_start
+            self.runtime_history.append(make_record(job, stage_times, "已完成", used_mesh_np, solve_np,
+                                                    self.stage_timer.cell_count, self.stage_timer.timings,
+                                                    self.job_resources(job)))
+
+            # 监测曲线列式存储（供跨任务收敛对比与运行时长模型使用）
+            try:
+                store_monitors(job, PUBLIC_ROOT)
+            except Exception as e:
+                logging.error(f"监测曲线列式存储失败: {str(e)}")
+
+            # 结构化运行记录（供结果索引、对比与报告重建使用）
+            results = {
+                'dp_pa': float(last_value) if last_value is not None else None,
+                'v_max': float(vmax) if vmax is not None else None,
+                'mach': res_mach_number if res_mach_number != "N/A" else None,
+                'mach_level': Ma,
+            }
+            run_record = build_run_record(job, "已完成", start_time, datetime.datetime.now(), stage_times,
+                                          self.stage_timer, results, used_mesh_np, solve_np)
+            write_run_record(run_record, [report_subfolder, report_subfolder_public])
+            # 轻量HTML摘要与日期/操作员索引页（不打开PPT即可查看结果）
+            publish_html(run_record, [report_subfolder, report_subfolder_public])
+
 
 
         else:
@@ -3777,7 +3064,15 @@ class SimulationConfigWindow(QWidget):
             logging.info(f'流体工质: {workingfluid}')
             logging.info(f'动力粘度（Pa·s）: {viscosity}')
             logging.info(f'密度（kg/m³）: {density}')
-            logging.error(f"仿真失败，返回码: {process.returncode}")
+            logging.error(f"仿真失败，返回码: {returncode}")
+            self.runtime_history.append(make_record(job, stage_times, "失败", used_mesh_np, solve_np,
+                                                    self.stage_timer.cell_count, self.stage_timer.timings,
+                                                    self.job_resources(job)))
+            run_record = build_run_record(job, "失败", start_time, datetime.datetime.now(), stage_times,
+                                          self.stage_timer, None, used_mesh_np, solve_np)
+            write_run_record(run_record, [report_subfolder, report_subfolder_public])
+            # 轻量HTML摘要与日期/操作员索引页（不打开PPT即可查看结果）
+            publish_html(run_record, [report_subfolder, report_subfolder_public])
             self.pressure_drop_label.setText("压降值获取失败")
             self.pressure_drop_label.setStyleSheet("font-size: 24px; color: #FF0000; font-weight: bold;")
             self.mach_number_label.setText("马赫数获取失败")
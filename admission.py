@@ -0,0 +1,197 @@
+import ctypes
+import logging
+import os
+import shutil
+import statistics
+import sys
+import time
+
+
+# 没有历史数据时的资源模型（STAR-CCM+ 多面体网格 + 分离流求解的经验值）
+DEFAULT_SIM_BYTES_PER_CELL = 1000        # .sim（网格+解）每个网格的大小
+DEFAULT_MEMORY_BYTES_PER_CELL = 1200     # 求解时每个网格占用的内存
+BASE_MEMORY_BYTES = 2 * 1024 ** 3        # 服务端与客户端JVM的固定开销
+DEFAULT_REPORT_BYTES = 50 * 1024 ** 2    # Report 目录（图片、场景、CSV、PPT）
+DEFAULT_CELLS = 2000000                  # 网格数也无法估算时使用
+MIN_RESOURCE_SAMPLES = 3                 # 历史记录少于该数时使用默认模型
+
+# 安全系数与余量
+DISK_SAFETY_FACTOR = 1.5
+DISK_RESERVE_BYTES = 5 * 1024 ** 3       # 输出分区至少保留的空闲空间
+MEMORY_RESERVE_BYTES = 1024 ** 3         # 系统与界面保留的内存
+
+# 资源不足时的等待
+ADMISSION_POLL_SECONDS = 30
+ADMISSION_TIMEOUT_SECONDS = 12 * 3600
+
+
+class _MemoryStatus(ctypes.Structure):
+    _fields_ = [
+        ('dwLength', ctypes.c_ulong),
+        ('dwMemoryLoad', ctypes.c_ulong),
+        ('ullTotalPhys', ctypes.c_ulonglong),
+        ('ullAvailPhys', ctypes.c_ulonglong),
+        ('ullTotalPageFile', ctypes.c_ulonglong),
+        ('ullAvailPageFile', ctypes.c_ulonglong),
+        ('ullTotalVirtual', ctypes.c_ulonglong),
+        ('ullAvailVirtual', ctypes.c_ulonglong),
+        ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+    ]
+
+
+def available_memory():
+    """可用物理内存（字节），无法获取返回None"""
+    if sys.platform == 'win32':
+        status = _MemoryStatus()
+        status.dwLength = ctypes.sizeof(_MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys
+        return None
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _existing_ancestor(path):
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def free_disk(path):
+    """路径所在分区的空闲空间（字节），路径尚未创建时取最近的已存在上级目录"""
+    return shutil.disk_usage(_existing_ancestor(path)).free
+
+
+def volume_of(path):
+    """分区标识（用于判断私有与公开目录是否在同一分区）"""
+    return os.stat(_existing_ancestor(path)).st_dev
+
+
+class MemorySampler:
+    """
+    求解期间采样可用内存，得到任务的内存峰值（开始时可用内存 - 期间最低可用内存）
+
+    采样的是整机可用内存：期间有其他STAR-CCM+进程（下一个任务的网格预划分）时
+    调用 mark_overlap()，该任务不记录内存峰值，避免高估每网格内存。
+    """
+
+    def __init__(self, interval=5.0):
+        self.interval = interval
+        self.baseline = available_memory()
+        self.lowest = self.baseline
+        self.overlapped = False
+        self._last = 0.0
+
+    def mark_overlap(self):
+        self.overlapped = True
+
+    def sample(self):
+        now = time.monotonic()
+        if self.baseline is None or now - self._last < self.interval:
+            return
+        self._last = now
+        current = available_memory()
+        if current is not None:
+            self.lowest = min(self.lowest, current)
+
+    @property
+    def peak_mb(self):
+        if self.baseline is None or self.overlapped:
+            return None
+        return round((self.baseline - self.lowest) / 1024 ** 2)
+
+
+class ResourceEstimator:
+    """由历史记录（.sim 大小、内存峰值与网格数）估算任务的磁盘与内存需求"""
+
+    def __init__(self, history):
+        self.history = history
+
+    def _ratio(self, key, scale, offset=0):
+        ratios = []
+        for record in self.history.load():
+            cells, value = record.get('cell_count'), record.get(key)
+            if record.get('status') == "已完成" and cells and value:
+                ratios.append((value * scale - offset) / cells)
+        ratios = [ratio for ratio in ratios if ratio > 0]
+        return statistics.median(ratios) if len(ratios) >= MIN_RESOURCE_SAMPLES else None
+
+    def _median(self, key):
+        values = [record[key] for record in self.history.load()
+                  if record.get('status') == "已完成" and record.get(key)]
+        return statistics.median(values) if len(values) >= MIN_RESOURCE_SAMPLES else None
+
+    def estimate(self, cells):
+        """
+        :param cells: 估算网格数（None 时取历史中位数或默认值）
+        :return: {'cells', 'sim_bytes', 'report_bytes', 'memory_bytes'}
+        """
+        cells = cells or self._median('cell_count') or DEFAULT_CELLS
+        sim_per_cell = self._ratio('sim_bytes', 1) or DEFAULT_SIM_BYTES_PER_CELL
+        memory_per_cell = self._ratio('memory_peak_mb', 1024 ** 2, BASE_MEMORY_BYTES) or DEFAULT_MEMORY_BYTES_PER_CELL
+        return {
+            'cells': int(cells),
+            'sim_bytes': int(cells * sim_per_cell),
+            'report_bytes': int(self._median('report_bytes') or DEFAULT_REPORT_BYTES),
+            'memory_bytes': int(BASE_MEMORY_BYTES + cells * memory_per_cell),
+        }
+
+
+def check_resources(estimate, sim_root, public_root, reserved_memory=0, scratch_root=None):
+    """
+    检查输出分区空闲空间与可用内存
+
+    :param estimate: ResourceEstimator.estimate 的结果
+    :param reserved_memory: 已启动但尚未占满内存的任务预留（字节）
+    :param scratch_root: 草稿目录（启用时求解结果先完整写入草稿目录）
+    :return: (是否满足, 不满足的原因列表)
+    """
+    reasons = []
+    needs = {}
+    roots = [(sim_root, estimate['sim_bytes'] + estimate['report_bytes']), (public_root, estimate['report_bytes'])]
+    if scratch_root:
+        roots.append((scratch_root, estimate['sim_bytes'] + estimate['report_bytes']))
+    for root, size in roots:
+        try:
+            volume = volume_of(root)
+        except OSError:
+            continue
+        needs.setdefault(volume, [root, 0])[1] += size
+    for root, size in needs.values():
+        need = size * DISK_SAFETY_FACTOR + DISK_RESERVE_BYTES
+        free = free_disk(root)
+        if free < need:
+            reasons.append(f"{root} 空闲 {free / 1024 ** 3:.1f} GB，需要 {need / 1024 ** 3:.1f} GB")
+    memory = available_memory()
+    if memory is not None:
+        need = estimate['memory_bytes'] + reserved_memory + MEMORY_RESERVE_BYTES
+        if memory < need:
+            reasons.append(f"可用内存 {memory / 1024 ** 3:.1f} GB，需要 {need / 1024 ** 3:.1f} GB")
+    return not reasons, reasons
+
+
+def folder_size(folder):
+    """目录内文件总大小（字节）"""
+    total = 0
+    for current, _, files in os.walk(folder):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(current, name))
+            except OSError:
+                continue
+    return total
+
+
+def log_estimate(estimate):
+    logging.info(f"资源估算: 网格 {estimate['cells']:,}，.sim {estimate['sim_bytes'] / 1024 ** 3:.1f} GB，"
+                 f"内存 {estimate['memory_bytes'] / 1024 ** 3:.1f} GB")
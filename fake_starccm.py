@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+starccmw 替身程序（用于无STAR-CCM+环境下测试调度与报告流程）
+
+命令行与 starccmw 一致：fake_starccm.py -verbose -np 8 -batch macro.java [case.sim]
+按宏中 execute() 的调用顺序"执行"各阶段：输出类似 -verbose 的日志与阶段标记，
+并在宏中的输出路径上生成 CSV、PNG、.sce、.sim 文件（路径可由 String 成员变量拼接，
+出图分辨率可为 int 成员变量；成员变量为 false 的 if 块不执行）。
+
+环境变量：
+    FAKE_STARCCM_ROOT   宏中 "D:\\" 映射到的目录（默认当前目录）
+    FAKE_STARCCM_DELAY  每个阶段的模拟耗时（秒，默认0）
+    FAKE_STARCCM_FAIL   在指定阶段失败退出（如 execute4）
+    FAKE_STARCCM_DP     收敛压降（Pa，默认12000）
+    FAKE_STARCCM_VMAX   收敛最大流速（m/s，默认15）
+    FAKE_STARCCM_CELLS  体网格数量（默认500000，体网格生成后随阶段标记输出）
+"""
+import math
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+
+
+_METHOD_PATTERN = re.compile(r"(?:public|private)\s+void\s+(\w+)\s*\(\)\s*\{")
+_CALL_PATTERN = re.compile(r'^\s*(?:marker\("(\w+)",\s*"(\w+)"\)|(\w+)\(\));')
+# Java字符串表达式：字面量与变量用 + 拼接
+_STRING_EXPRESSION = r'(?:"(?:[^"\\]|\\.)*"|\w+)(?:\s*\+\s*(?:"(?:[^"\\]|\\.)*"|\w+))*'
+_OUTPUT_PATTERN = re.compile(
+    r'\.(printAndWait|encode|export3DSceneFileAndWait|export|saveState|importCadPart)\('
+    r'(?:resolvePath\()?(' + _STRING_EXPRESSION + r')\)?(.*)$')
+_FIELD_PATTERN = re.compile(r'^\s*private\s+(?:final\s+)?String\s+(\w+)\s*=\s*(' + _STRING_EXPRESSION + r')\s*;')
+_TOKEN_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"|(\w+)')
+_VALUE_FIELD_PATTERN = re.compile(r'^\s*private\s+(?:final\s+)?(?:int|boolean)\s+(\w+)\s*=\s*(\w+)\s*;')
+_IF_PATTERN = re.compile(r'^\s*if\s*\((\w+(?:\s*&&\s*\w+)*)\)\s*\{\s*$')
+_MAX_STEPS_PATTERN = re.compile(r"getMaximumNumberStepsObject\(\);\s*\w+\.getQuantity\(\)\.setValue\((\d+)\)")
+_UNICODE_ESCAPE = re.compile(r"(?<!\\)((?:\\\\)*)\\u([0-9a-fA-F]{4})")
+
+
+def java_string(literal):
+    """还原Java字符串字面量（\\uXXXX 与 \\\\ 转义）"""
+    text = _UNICODE_ESCAPE.sub(lambda m: m.group(1) + chr(int(m.group(2), 16)), literal)
+    return text.replace("\\\\", "\\")
+
+
+def evaluate_string(expression, fields):
+    """计算Java字符串表达式（字面量与已知的 String 成员变量拼接）"""
+    parts = []
+    for literal, name in _TOKEN_PATTERN.findall(expression):
+        parts.append(fields.get(name, "") if name else java_string(literal))
+    return "".join(parts)
+
+
+def string_fields(source):
+    """宏中的 String、int、boolean 成员变量 {名称: 值}（按声明顺序计算，后声明的可引用先声明的）"""
+    fields = {}
+    for line in source.splitlines():
+        match = _FIELD_PATTERN.match(line)
+        if match:
+            fields[match.group(1)] = evaluate_string(match.group(2), fields)
+            continue
+        match = _VALUE_FIELD_PATTERN.match(line)
+        if match:
+            fields[match.group(1)] = match.group(2)
+    return fields
+
+
+def condition_true(condition, fields):
+    """计算由成员变量与 && 组成的 if 条件（未知的变量视为 true）"""
+    return all(fields.get(name.strip(), "true") != "false" for name in condition.split("&&"))
+
+
+def map_path(path, root):
+    """把宏中的Windows绝对路径映射到本机目录"""
+    if re.match(r"^[A-Za-z]:\\", path):
+        parts = [part for part in path[3:].split("\\") if part]
+        return os.path.join(root, *parts)
+    return path.replace("\\", os.sep)
+
+
+def write_png(path, width, height, color=(52, 152, 219)):
+    """生成纯色PNG"""
+    row = b"\x00" + bytes(color) * width
+    raw = row * height
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw)))
+        f.write(chunk(b"IEND", b""))
+
+
+def monitor_value(final, iteration, steps):
+    """模拟收敛过程中的监测值"""
+    return final * (1.0 + 0.5 * math.exp(-5.0 * iteration / max(steps, 1)))
+
+
+def write_monitor_csv(path, max_steps):
+    """生成监测曲线导出文件（格式同 MonitorPlot.export）"""
+    if path.endswith("_V_max.csv"):
+        header, final = "V_max Monitor: V_max (m/s)", float(os.environ.get("FAKE_STARCCM_VMAX", 15.0))
+    else:
+        header, final = "Pressure Drop Monitor: Pressure Drop (Pa)", float(os.environ.get("FAKE_STARCCM_DP", 12000.0))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(f'"Iteration","{header}"\n')
+        for i in range(1, max_steps + 1):
+            f.write(f"{i},{monitor_value(final, i, max_steps):.6f}\n")
+
+
+def split_methods(source):
+    """按方法名切分宏源码，返回 {方法名: 方法体行列表}"""
+    methods = {}
+    current = None
+    for line in source.splitlines():
+        match = _METHOD_PATTERN.search(line)
+        if match:
+            current = match.group(1)
+            methods[current] = []
+        elif current is not None:
+            methods[current].append(line)
+    return methods
+
+
+def run_stage(stage, lines, root, max_steps, fields=None):
+    """执行一个宏阶段：生成输出文件，求解阶段输出迭代日志"""
+    delay = float(os.environ.get("FAKE_STARCCM_DELAY", 0))
+    fields = fields or {}
+    skip_depth = 0  # 处于条件为 false 的 if 块内时的大括号层数
+    for line in lines:
+        if line.strip().startswith("//"):
+            continue
+        if skip_depth:
+            skip_depth += line.count("{") - line.count("}")
+            continue
+        condition = _IF_PATTERN.match(line)
+        if condition and not condition_true(condition.group(1), fields):
+            skip_depth = 1
+            continue
+        if "getSimulationIterator().run()" in line:
+            dp_final = float(os.environ.get("FAKE_STARCCM_DP", 12000.0))
+            v_final = float(os.environ.get("FAKE_STARCCM_VMAX", 15.0))
+            header = "  Iteration    Continuity    X-momentum    Y-momentum    Z-momentum           Tke           Tdr" \
+                     "    Dp Monitor  A_dp Monitor  V_max Monitor"
+            for i in range(1, max_steps + 1):
+                if i % 100 == 1:
+                    print(header)
+                residual = math.exp(-8.0 * i / max(max_steps, 1))
+                dp = monitor_value(dp_final, i, max_steps)
+                print(f"{i:>11d}  {residual:.6e}  {residual:.6e}  {residual:.6e}  {residual:.6e}  {residual:.6e}  "
+                      f"{residual:.6e}  {dp:.6e}  {dp:.6e}  {monitor_value(v_final, i, max_steps):.6e}")
+            print("Stopping criterion Maximum Steps satisfied.")
+            continue
+        match = _OUTPUT_PATTERN.search(line)
+        if not match:
+            continue
+        action, path, rest = match.group(1), map_path(evaluate_string(match.group(2), fields), root), match.group(3)
+        if action == "importCadPart":
+            if not os.path.exists(path):
+                print(f"error: File {path} does not exist")
+                return False
+            print(f"Importing CAD part: {path}")
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if action in ("printAndWait", "encode"):
+            arguments = [fields.get(token, token) for token in re.findall(r"\b\w+\b", rest)]
+            numbers = [int(n) for n in arguments if re.fullmatch(r"\d{2,5}", n)]
+            width, height = (numbers[0], numbers[1]) if len(numbers) >= 2 else (1600, 900)
+            write_png(path, width, height)
+        elif action == "export":
+            write_monitor_csv(path, max_steps)
+        else:
+            with open(path, "wb") as f:
+                f.write(f"fake {action} {stage}\n".encode("utf-8"))
+        print(f"{action}: {path}")
+    if delay:
+        time.sleep(delay)
+    return True
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if "-batch" not in argv or argv.index("-batch") + 1 >= len(argv):
+        print("error: -batch <macro> is required")
+        return 2
+    position = argv.index("-batch")
+    macro_path = argv[position + 1]
+    sim_path = argv[position + 2] if len(argv) > position + 2 else None
+    np_count = argv[argv.index("-np") + 1] if "-np" in argv else "1"
+    root = os.environ.get("FAKE_STARCCM_ROOT", os.getcwd())
+    fail_stage = os.environ.get("FAKE_STARCCM_FAIL")
+
+    print(f"Starting local server: fake-star-ccm+ -np {np_count} -batch {macro_path}")
+    if sim_path:
+        if not os.path.exists(sim_path):
+            print(f"error: Simulation file {sim_path} not found")
+            return 1
+        print(f"Loading simulation: {sim_path}")
+    with open(macro_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    match = _MAX_STEPS_PATTERN.search(source)
+    max_steps = int(match.group(1)) if match else 100
+    methods = split_methods(source)
+    fields = string_fields(source)
+
+    cells = int(os.environ.get("FAKE_STARCCM_CELLS", 500000))
+    meshed = sim_path is not None
+
+    print(f"Playing macro: {os.path.basename(macro_path)}")
+    for line in methods.get("execute", []):
+        call = _CALL_PATTERN.match(line)
+        if not call:
+            continue
+        if call.group(1):
+            stage, event = call.group(1), call.group(2)
+            meshed = meshed or (stage == "execute2" and event == "end")
+            extra = f" cells={cells}" if meshed and event == "end" else ""
+            print(f"[STAGE] {stage} {event} wall_ms={int(time.time() * 1000)} mem_mb=256{extra}", flush=True)
+            continue
+        stage = call.group(3)
+        if stage == fail_stage:
+            print(f"error: Server Error in {stage}")
+            return 1
+        if not run_stage(stage, methods.get(stage, []), root, max_steps, fields):
+            return 1
+    print(f"Macro {os.path.basename(macro_path)} completed.")
+    print("Server::stop")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,376 @@
+"""
+单任务HTML摘要与按日期/操作员的索引页
+
+由运行记录生成，与PPT报告保存在同一 Report 目录：输入参数、物性、压降、马赫数、用时、
+结果图缩略图（内嵌，点击打开原图）与压降收敛迷你曲线（内嵌SVG）。
+单个文件、无外部资源，通过网络共享打开也只需读取几十KB。
+索引页保存在 {结果根目录}\\{日期}\\{操作员}\\index.html，列出该目录下全部任务。
+各任务的表格行缓存在同一目录的 index_rows.json 中，任务完成后只重新生成该任务的一行；
+命令行对目录重新生成时读取全部运行记录并重建缓存。
+
+用法：
+    python html_report.py "D:\\仿真自动化结果\\2025.3.7"      # 目录下的全部运行记录及其索引页
+"""
+import argparse
+import base64
+import html
+import io
+import json
+import logging
+import os
+import sys
+
+from monitor_reader import read_history
+from run_record import REPORT_ARTIFACTS, RUN_RECORD_SUFFIX, load_run_record
+from stage_markers import STAGE_LABELS, format_duration, group_durations
+from svg_chart import sparkline
+
+
+HTML_REPORT_SUFFIX = "_summary.html"
+INDEX_PAGE = "index.html"
+INDEX_ROWS_FILE = "index_rows.json"
+# 内嵌缩略图尺寸（像素）与 JPEG 质量
+THUMBNAIL_SIZE = (360, 240)
+THUMBNAIL_QUALITY = 80
+
+# 摘要页中的结果图
+HTML_IMAGES = [
+    ('pressure_png', "压力云图"),
+    ('streamline_png', "流线图"),
+    ('mach_png', "Ma>0.3区域图"),
+    ('fluid_domain_png', "流体域图"),
+]
+
+STYLE = """
+body { font-family: "Microsoft YaHei", sans-serif; font-size: 14px; color: #2C3E50; margin: 24px; }
+h1 { font-size: 20px; margin-bottom: 4px; }
+h2 { font-size: 16px; margin: 20px 0 8px; border-bottom: 1px solid #DDDDDD; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #DDDDDD; padding: 4px 10px; text-align: left; }
+th { background: #F4F6F7; font-weight: normal; color: #566573; }
+.key { font-size: 26px; font-weight: bold; color: #3498DB; margin-right: 32px; }
+.failed { color: #E74C3C; }
+figure { display: inline-block; margin: 0 12px 12px 0; }
+figcaption { text-align: center; color: #566573; }
+"""
+
+
+def _text(value, digits=4):
+    if value is None or value == "":
+        return "--"
+    if isinstance(value, float):
+        return f"{value:.{digits}g}"
+    return html.escape(str(value))
+
+
+def _rows(items):
+    return "\n".join(f"<tr><th>{html.escape(label)}</th><td>{_text(value)}</td></tr>" for label, value in items)
+
+
+def thumbnail_data_uri(image_path, size=THUMBNAIL_SIZE):
+    """缩放为 JPEG 缩略图并编码为 data URI，图片无法读取返回None"""
+    from PIL import Image
+    try:
+        with Image.open(image_path) as source:
+            source.draft("RGB", size)
+            image = source.convert("RGB")
+        image.thumbnail(size)
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    except (OSError, ValueError) as e:
+        logging.warning(f"缩略图生成失败: {image_path}, 错误: {str(e)}")
+        return None
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def render_summary(record, report_folder):
+    """
+    单任务HTML摘要
+
+    :param record: 运行记录
+    :param report_folder: 运行记录所在 Report 目录（结果图与监测曲线从这里读取）
+    :return: HTML文本
+    """
+    inputs = record['inputs']
+    properties = record.get('fluid_properties', {})
+    results = record.get('results', {})
+    timings = record.get('timings', {})
+    resources = record.get('resources', {})
+    name = inputs['model_name']
+    title = f"{inputs['date']}_{inputs['operator']}_{name}_{inputs['index']}"
+    dp_pa = results.get('dp_pa')
+
+    parts = [
+        "<!DOCTYPE html>",
+        '<html lang="zh-CN"><head><meta charset="utf-8">',
+        f"<title>{html.escape(title)}</title><style>{STYLE}</style></head><body>",
+        f"<h1>{html.escape(title)}</h1>",
+        f"<p>{html.escape(record.get('status', ''))} · {html.escape(record.get('finished', ''))} · "
+        f"{html.escape(record.get('host', ''))}</p>",
+    ]
+    if record.get('status') == "已完成":
+        parts.append(f'<p><span class="key">压降 {dp_pa / 1000:.2f} kPa</span>' if dp_pa is not None else
+                     '<p><span class="key failed">压降获取失败</span>')
+        parts.append(f'<span class="key">马赫数 {_text(results.get("mach"), 3)}</span></p>')
+    else:
+        parts.append(f'<p><span class="key failed">{html.escape(record.get("status", ""))}</span></p>')
+
+    _, dp_history = read_history(os.path.join(report_folder, REPORT_ARTIFACTS['average_pressure_csv'].format(name=name)))
+    convergence = (record.get('convergence') or {}).get('dp') or {}
+    if dp_history:
+        state = "已收敛" if convergence.get('converged') else "未收敛"
+        parts.append(f"<h2>压降收敛</h2><p>{sparkline(dp_history, 480, 80)}</p>"
+                     f"<p>{convergence.get('iterations', len(dp_history))} 步，{state}"
+                     f"（最后 {convergence.get('window', '--')} 步相对波动 {_text(convergence.get('relative_range'), 3)}）</p>")
+
+    parts.append("<h2>输入参数</h2><table>")
+    parts.append(_rows([
+        ("模型", inputs.get('model_path')), ("工质", inputs.get('fluid')), ("入口温度（°C）", inputs.get('temperature')),
+        ("入口压力（MPa）", inputs.get('pressure')), ("质量流量（kg/s）", inputs.get('mass_flow_value')),
+        ("最大步数", inputs.get('max_steps')), ("线程数", inputs.get('threads')), ("基础尺寸", inputs.get('base_size')),
+        ("目标表面尺寸（%）", inputs.get('target_surface_ratio')), ("最小表面尺寸（%）", inputs.get('min_surface_ratio')),
+        ("棱柱层总厚度（%）", inputs.get('prisma_layer_thickness_ratio')),
+        ("棱柱层层数", inputs.get('prisma_layer_extension')),
+    ]))
+    parts.append("</table><h2>物性与结果</h2><table>")
+    parts.append(_rows([
+        ("密度（kg/m³）", properties.get('density')), ("动力粘度（Pa·s）", properties.get('viscosity')),
+        ("声速（m/s）", properties.get('speed_of_sound')),
+        ("压降（Pa）", dp_pa), ("最大流速（m/s）", results.get('v_max')), ("最大马赫数", results.get('mach')),
+    ]))
+    parts.append("</table><h2>用时</h2><table>")
+    durations = {stage: value['seconds'] for stage, value in timings.get('macro_stages', {}).items()}
+    stage_rows = [(STAGE_LABELS[group], format_duration(seconds))
+                  for group, seconds in group_durations(durations).items()]
+    total = timings.get('total_seconds')
+    parts.append(_rows([("总用时", format_duration(total) if total is not None else None)] + stage_rows + [
+        ("网格数", f"{resources['cell_count']:,}" if resources.get('cell_count') else None),
+        ("求解核数", resources.get('solve_np')),
+        ("客户端内存峰值（MB）", resources.get('peak_client_mem_mb')),
+    ]))
+    parts.append("</table>")
+
+    figures = []
+    for key, label in HTML_IMAGES:
+        file_name = REPORT_ARTIFACTS[key].format(name=name)
+        image_path = os.path.join(report_folder, file_name)
+        if not os.path.exists(image_path):
+            continue
+        data_uri = thumbnail_data_uri(image_path)
+        if data_uri:
+            link = html.escape(file_name, quote=True)
+            figures.append(f'<figure><a href="{link}"><img src="{data_uri}" alt="{html.escape(label)}"></a>'
+                           f"<figcaption>{html.escape(label)}</figcaption></figure>")
+    if figures:
+        parts.append("<h2>结果图</h2>" + "".join(figures))
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def write_summary(record, report_folder):
+    """写入单任务HTML摘要，返回文件路径，失败返回None"""
+    path = os.path.join(report_folder, f"{record['inputs']['model_name']}{HTML_REPORT_SUFFIX}")
+    try:
+        text = render_summary(record, report_folder)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        logging.error(f"HTML摘要生成失败: {path}, 错误: {str(e)}")
+        return None
+
+
+def index_row(operator_folder, record_path, record):
+    """索引页中一个任务的表格行（HTML）"""
+    inputs = record['inputs']
+    results = record.get('results', {})
+    name = inputs['model_name']
+    report_folder = os.path.dirname(record_path)
+    summary = os.path.join(report_folder, f"{name}{HTML_REPORT_SUFFIX}")
+    link = os.path.relpath(summary if os.path.exists(summary) else record_path, operator_folder)
+    link = html.escape(link.replace(os.sep, "/"), quote=True)
+    _, dp_history = read_history(os.path.join(report_folder,
+                                              REPORT_ARTIFACTS['average_pressure_csv'].format(name=name)))
+    dp_pa = results.get('dp_pa')
+    total = record.get('timings', {}).get('total_seconds')
+    status = record.get('status', '')
+    status_class = '' if status == "已完成" else ' class="failed"'
+    return (
+        f'<tr><td><a href="{link}">{html.escape(name)}</a></td><td>{_text(inputs.get("index"))}</td>'
+        f"<td{status_class}>{html.escape(status)}</td>"
+        f"<td>{_text(inputs.get('fluid'))}</td><td>{_text(inputs.get('temperature'))}</td>"
+        f"<td>{_text(inputs.get('pressure'))}</td><td>{_text(inputs.get('mass_flow_value'))}</td>"
+        f"<td>{f'{dp_pa / 1000:.2f}' if dp_pa is not None else '--'}</td><td>{_text(results.get('mach'), 3)}</td>"
+        f"<td>{format_duration(total) if total is not None else '--'}</td>"
+        f"<td>{sparkline(dp_history, 120, 24)}</td></tr>")
+
+
+def _row_entry(operator_folder, record_path, record):
+    """索引行缓存项：{'sort': [模型名, 序号], 'html': 表格行}"""
+    inputs = record['inputs']
+    return {'sort': [inputs['model_name'], inputs.get('index') or 0],
+            'html': index_row(operator_folder, record_path, record)}
+
+
+def _row_key(operator_folder, record_path):
+    return os.path.relpath(os.path.abspath(record_path), os.path.abspath(operator_folder)).replace(os.sep, "/")
+
+
+def render_index_page(operator_folder, rows):
+    """
+    由已生成的表格行组成索引页
+
+    :param rows: 按显示顺序排列的表格行（HTML）
+    :return: HTML文本
+    """
+    title = " / ".join(os.path.normpath(operator_folder).split(os.sep)[-2:])
+    parts = [
+        "<!DOCTYPE html>",
+        '<html lang="zh-CN"><head><meta charset="utf-8">',
+        f"<title>{html.escape(title)}</title><style>{STYLE}</style></head><body>",
+        f"<h1>{html.escape(title)}</h1><p>共 {len(rows)} 个任务</p>",
+        "<table><tr><th>模型</th><th>序号</th><th>状态</th><th>工质</th><th>温度（°C）</th><th>压力（MPa）</th>"
+        "<th>流量（kg/s）</th><th>压降（kPa）</th><th>马赫数</th><th>用时</th><th>压降收敛</th></tr>",
+    ]
+    parts += rows
+    parts.append("</table></body></html>")
+    return "\n".join(parts)
+
+
+def render_index(operator_folder, records):
+    """
+    日期/操作员目录的索引页
+
+    :param records: [(运行记录路径, 运行记录)]
+    :return: HTML文本
+    """
+    return render_index_page(operator_folder, [index_row(operator_folder, record_path, record)
+                                               for record_path, record in records])
+
+
+def operator_records(operator_folder):
+    """日期/操作员目录下各任务的运行记录 [(路径, 记录)]，按模型名与序号排序"""
+    records = []
+    try:
+        job_entries = list(os.scandir(operator_folder))
+    except OSError:
+        return records
+    for job_entry in job_entries:
+        report_folder = os.path.join(job_entry.path, "Report")
+        if not job_entry.is_dir() or not os.path.isdir(report_folder):
+            continue
+        for name in os.listdir(report_folder):
+            if name.endswith(RUN_RECORD_SUFFIX):
+                record_path = os.path.join(report_folder, name)
+                record = load_run_record(record_path)
+                if record and 'inputs' in record:
+                    records.append((record_path, record))
+    records.sort(key=lambda item: (item[1]['inputs']['model_name'], item[1]['inputs'].get('index') or 0))
+    return records
+
+
+def _write_index_files(operator_folder, entries):
+    """写入索引行缓存与索引页，返回索引页路径"""
+    rows = [entry['html'] for entry in sorted(entries.values(), key=lambda entry: entry['sort'])]
+    text = render_index_page(operator_folder, rows)
+    with open(os.path.join(operator_folder, INDEX_ROWS_FILE), 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False)
+    path = os.path.join(operator_folder, INDEX_PAGE)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def write_index(operator_folder):
+    """读取目录下全部运行记录，重新生成日期/操作员目录的索引页，返回文件路径，失败返回None"""
+    path = os.path.join(operator_folder, INDEX_PAGE)
+    try:
+        entries = {_row_key(operator_folder, record_path): _row_entry(operator_folder, record_path, record)
+                   for record_path, record in operator_records(operator_folder)}
+        return _write_index_files(operator_folder, entries)
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        logging.error(f"索引页生成失败: {path}, 错误: {str(e)}")
+        return None
+
+
+def update_index(operator_folder, record_path, record):
+    """
+    只重新生成一个任务在索引页中的行（其余行取自 index_rows.json），返回文件路径，失败返回None
+
+    缓存不存在或无法读取时退回 write_index 全部重新生成。
+    """
+    try:
+        with open(os.path.join(operator_folder, INDEX_ROWS_FILE), 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return write_index(operator_folder)
+    path = os.path.join(operator_folder, INDEX_PAGE)
+    try:
+        entries[_row_key(operator_folder, record_path)] = _row_entry(operator_folder, record_path, record)
+        return _write_index_files(operator_folder, entries)
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        logging.error(f"索引页更新失败: {path}, 错误: {str(e)}")
+        return None
+
+
+def operator_folder_of(report_folder):
+    """Report 目录所在的日期/操作员目录（{操作员目录}\\{模型名_序号}\\Report）"""
+    return os.path.dirname(os.path.dirname(os.path.abspath(report_folder)))
+
+
+def publish_html(record, report_folders):
+    """
+    任务完成后生成HTML摘要，并在所在目录的索引页中更新该任务的一行
+
+    :param report_folders: 私有与公开 Report 目录
+    :return: 写入的文件路径列表
+    """
+    paths = []
+    for report_folder in report_folders:
+        summary = write_summary(record, report_folder)
+        if summary:
+            paths.append(summary)
+        record_path = os.path.join(report_folder, f"{record['inputs']['model_name']}{RUN_RECORD_SUFFIX}")
+        index = update_index(operator_folder_of(report_folder), record_path, record)
+        if index:
+            paths.append(index)
+    return paths
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="由运行记录生成HTML摘要与索引页")
+    parser.add_argument('paths', nargs='+', help="运行记录文件或目录")
+    parser.add_argument('--no-index', action='store_true', help="不更新索引页")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    record_paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            for current, _, files in os.walk(path):
+                record_paths += [os.path.join(current, name) for name in files if name.endswith(RUN_RECORD_SUFFIX)]
+        else:
+            record_paths.append(path)
+    operator_folders = set()
+    written = 0
+    for record_path in sorted(record_paths):
+        record = load_run_record(record_path)
+        if not record or 'inputs' not in record:
+            continue
+        report_folder = os.path.dirname(os.path.abspath(record_path))
+        if write_summary(record, report_folder):
+            written += 1
+        operator_folders.add(operator_folder_of(report_folder))
+    if not args.no_index:
+        for folder in sorted(operator_folders):
+            write_index(folder)
+    print(f"HTML摘要 {written} 个，索引页 {0 if args.no_index else len(operator_folders)} 个")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
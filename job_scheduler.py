@@ -0,0 +1,147 @@
+import datetime
+import logging
+import os
+import shutil
+import subprocess
+import threading
+
+
+# 宏阶段划分（各阶段的内容见 macro_builder.FRAGMENTS）：
+# mesh  —— execute0~execute2（CAD导入、包面/网格与物理设置、体网格生成），结束时保存 .sim
+# solve —— execute3~execute7（报告、求解、导出曲线、场景出图），从网格阶段保存的 .sim 继续
+# full  —— 单个进程内顺序执行全部阶段（原有方式）
+PHASE_STAGES = {
+    'mesh': ["execute0", "execute1", "execute2"],
+    'solve': ["execute3", "execute4", "execute5", "execute6", "execute7"],
+    'full': ["execute0", "execute1", "execute2", "execute3", "execute4", "execute5", "execute6", "execute7"],
+}
+
+# 各阶段加载的 .sim 中已完成的宏阶段（生成宏时据此检查阶段顺序）
+PHASE_COMPLETED = {
+    'mesh': [],
+    'solve': PHASE_STAGES['mesh'],
+    'full': [],
+}
+
+
+def discard_job(job):
+    """
+    删除作废任务（参数已变化的预划分网格任务）的目录（宏文件也在其中），进程须已结束
+
+    私有/公开任务目录都删除，避免之后的任务序号被占用、公开目录留下空任务目录。
+    """
+    for folder in (job['model_folder'], job['model_folder_public'], job.get('scratch_folder')):
+        if folder and os.path.isdir(folder):
+            shutil.rmtree(folder, ignore_errors=True)
+            logging.info(f"已删除作废任务目录: {folder}")
+
+
+def split_cores(total_threads, mesh_threads):
+    """
+    将总核数划分为网格预处理与求解两部分
+
+    :param total_threads: 本机分配给仿真的总核数（线程数输入框）
+    :param mesh_threads: 预划分网格使用的核数（<=0 表示不启用流水线）
+    :return: (mesh_np, solve_np)，mesh_np为0时表示不重叠执行
+    """
+    total_threads = int(total_threads)
+    mesh_threads = int(mesh_threads)
+    if mesh_threads <= 0 or total_threads < 2:
+        return 0, total_threads
+    mesh_np = min(mesh_threads, total_threads - 1)
+    return mesh_np, total_threads - mesh_np
+
+
+def build_starccm_command(starccm_path, np_count, macro_path, sim_path=None):
+    """
+    构建STAR-CCM+批处理命令
+
+    :param starccm_path: starccmw.exe 路径
+    :param np_count: 进程数（-np）
+    :param macro_path: 宏文件路径
+    :param sim_path: 需要加载的 .sim 文件（求解阶段从网格阶段结果继续），None表示新建
+    :return: 命令列表
+    """
+    command = [
+        starccm_path,
+        "-verbose",  # 强制输出详细日志
+        "-np", f"{np_count}",  # 使用指定的处理器核心数
+        "-batch",  # 批处理模式
+        macro_path
+    ]
+    if sim_path:
+        command.append(sim_path)
+    return command
+
+
+class PhaseProcess:
+    """
+    后台运行的STAR-CCM+阶段进程
+
+    输出由独立线程写入日志文件，避免管道写满阻塞求解器，也不占用界面线程。
+    """
+
+    def __init__(self, command, log_path, phase='mesh'):
+        """
+        :param command: build_starccm_command 生成的命令
+        :param log_path: 输出日志文件路径
+        :param phase: 阶段名称（仅用于日志）
+        """
+        self.command = command
+        self.log_path = log_path
+        self.phase = phase
+        self.process = None
+        self.start_time = None
+        self.end_time = None
+        self._reader = None
+
+    def start(self):
+        self.start_time = datetime.datetime.now()
+        self.process = subprocess.Popen(
+            self.command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            bufsize=1,
+            encoding='utf-8',
+            errors='replace'
+        )
+        self._reader = threading.Thread(target=self._drain, daemon=True)
+        self._reader.start()
+        logging.info(f"后台{self.phase}阶段已启动: {' '.join(self.command)}")
+        return self
+
+    def _drain(self):
+        with open(self.log_path, 'a', encoding='utf-8') as log_file:
+            for line in self.process.stdout:
+                log_file.write(f"{datetime.datetime.now().isoformat(sep=' ', timespec='milliseconds')} {line}")
+                log_file.flush()
+
+    def poll(self):
+        """进程结束返回返回码，否则返回None"""
+        if self.process is None:
+            return None
+        result = self.process.poll()
+        if result is not None and self.end_time is None:
+            self._reader.join(timeout=5)
+            self.end_time = datetime.datetime.now()
+        return result
+
+    @property
+    def returncode(self):
+        return self.poll()
+
+    @property
+    def elapsed(self):
+        """已运行（或总运行）时长，秒"""
+        if self.start_time is None:
+            return 0.0
+        end = self.end_time or datetime.datetime.now()
+        return (end - self.start_time).total_seconds()
+
+    def kill(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+            logging.warning(f"后台{self.phase}阶段已终止: {self.log_path}")
+        self.poll()
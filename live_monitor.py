@@ -0,0 +1,185 @@
+import re
+
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QColor, QPainter, QPen, QPixmap
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+
+# 实时曲线显示的监测量：求解日志迭代表中的列名（按顺序取第一个存在的列）
+LIVE_MONITORS = {
+    'dp': ("A_dp Monitor", "Dp Monitor"),
+    'v_max': ("V_max Monitor",),
+}
+# 每条曲线最多保留的点数，超出后隔点抽稀（长时间求解时绘图开销不随步数增长）
+MAX_PLOT_POINTS = 600
+
+_COLUMN_SPLIT = re.compile(r"\s{2,}")
+
+
+class IterationParser:
+    """
+    解析求解日志中的迭代表
+
+    STAR-CCM+ 每隔若干步输出一次表头（Iteration  Continuity ... Dp Monitor  V_max Monitor），
+    之后每步一行数值。表头按两个以上空格分列，数据行按空白分列。
+    """
+
+    def __init__(self, monitors=LIVE_MONITORS):
+        self.monitors = monitors
+        self.columns = {}
+        self.width = 0
+
+    def feed(self, line):
+        """
+        处理一行输出
+
+        :return: (迭代步, {'dp': 值, 'v_max': 值})，不是迭代数据行返回None
+        """
+        text = line.strip()
+        if text.startswith("Iteration"):
+            names = _COLUMN_SPLIT.split(text)
+            self.width = len(names)
+            self.columns = {}
+            for key, candidates in self.monitors.items():
+                for candidate in candidates:
+                    if candidate in names:
+                        self.columns[key] = names.index(candidate)
+                        break
+            return None
+        if not self.columns:
+            return None
+        fields = text.split()
+        if len(fields) != self.width or not fields[0].isdigit():
+            return None
+        try:
+            return int(fields[0]), {key: float(fields[column]) for key, column in self.columns.items()}
+        except ValueError:
+            return None
+
+
+class DownsampledSeries:
+    """按步长抽稀的曲线数据：点数超过上限时步长加倍、已有点隔点保留"""
+
+    def __init__(self, max_points=MAX_PLOT_POINTS):
+        self.max_points = max_points
+        self.stride = 1
+        self.points = []
+
+    def append(self, x, y):
+        """
+        添加一个点
+
+        :return: 'append' 新点已加入；'rebuild' 发生抽稀，需要重画；None 该点被抽稀跳过
+        """
+        if x % self.stride:
+            return None
+        self.points.append((x, y))
+        if len(self.points) <= self.max_points:
+            return 'append'
+        self.stride *= 2
+        self.points = [point for point in self.points if point[0] % self.stride == 0]
+        return 'rebuild'
+
+
+class LivePlot(QWidget):
+    """
+    求解过程中的监测量实时曲线
+
+    曲线画在缓存位图上：新点只画最后一段线，坐标范围变化或抽稀时才整体重画。
+    """
+
+    MARGIN_LEFT = 70
+    MARGIN_RIGHT = 10
+    MARGIN_TOP = 24
+    MARGIN_BOTTOM = 20
+
+    def __init__(self, title, unit, color, max_points=MAX_PLOT_POINTS, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.unit = unit
+        self.color = QColor(color)
+        self.max_points = max_points
+        self.setMinimumHeight(140)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.reset()
+
+    def reset(self, x_max=100):
+        """清空曲线，x_max 为横轴最大迭代步（一般为最大步数）"""
+        self.series = DownsampledSeries(self.max_points)
+        self.x_max = max(int(x_max), 1)
+        self.y_range = None
+        self.latest = None
+        self._canvas = None
+        self.update()
+
+    def add_point(self, x, y):
+        self.latest = (x, y)
+        result = self.series.append(x, y)
+        if x > self.x_max:
+            self.x_max = int(x * 1.5)
+            result = 'rebuild'
+        if result is not None and (self.y_range is None or not self.y_range[0] <= y <= self.y_range[1]):
+            values = [point[1] for point in self.series.points]
+            low, high = min(values), max(values)
+            span = (high - low) or abs(high) or 1.0
+            self.y_range = (low - span * 0.1, high + span * 0.1)
+            result = 'rebuild'
+        if result == 'rebuild' or self._canvas is None:
+            self._redraw()
+        elif result == 'append' and len(self.series.points) > 1:
+            painter = QPainter(self._canvas)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(QPen(self.color, 1.5))
+            painter.drawLine(self._map(*self.series.points[-2]), self._map(*self.series.points[-1]))
+            painter.end()
+        self.update()
+
+    def _plot_rect(self):
+        return QRectF(self.MARGIN_LEFT, self.MARGIN_TOP,
+                      max(self.width() - self.MARGIN_LEFT - self.MARGIN_RIGHT, 1),
+                      max(self.height() - self.MARGIN_TOP - self.MARGIN_BOTTOM, 1))
+
+    def _map(self, x, y):
+        rect = self._plot_rect()
+        low, high = self.y_range or (0.0, 1.0)
+        return QPointF(rect.left() + rect.width() * x / self.x_max,
+                       rect.bottom() - rect.height() * (y - low) / ((high - low) or 1.0))
+
+    def _redraw(self):
+        """整体重画坐标轴与曲线到缓存位图"""
+        self._canvas = QPixmap(self.size())
+        self._canvas.fill(Qt.white)
+        painter = QPainter(self._canvas)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self._plot_rect()
+        painter.setPen(QPen(QColor("#BDC3C7"), 1))
+        painter.drawRect(rect)
+        painter.setPen(QColor("#7F8C8D"))
+        if self.y_range:
+            for fraction in (0.0, 0.5, 1.0):
+                value = self.y_range[0] + (self.y_range[1] - self.y_range[0]) * fraction
+                y = rect.bottom() - rect.height() * fraction
+                painter.drawText(QRectF(0, y - 8, self.MARGIN_LEFT - 6, 16), Qt.AlignRight | Qt.AlignVCenter,
+                                 f"{value:.5g}")
+        painter.drawText(QRectF(rect.left(), rect.bottom() + 2, rect.width(), 16), Qt.AlignRight, str(self.x_max))
+        points = self.series.points
+        if len(points) > 1:
+            painter.setPen(QPen(self.color, 1.5))
+            painter.drawPolyline(*[self._map(x, y) for x, y in points])
+        painter.end()
+
+    def resizeEvent(self, event):
+        self._redraw()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        if self._canvas is None or self._canvas.size() != self.size():
+            self._redraw()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._canvas)
+        text = self.title
+        if self.latest is not None:
+            text += f"   第 {self.latest[0]} 步: {self.latest[1]:.5g} {self.unit}"
+        painter.setPen(QColor("#2C3E50"))
+        painter.drawText(QRectF(self.MARGIN_LEFT, 2, self.width() - self.MARGIN_LEFT, 20), Qt.AlignLeft, text)
+        painter.end()
@@ -0,0 +1,1392 @@
+"""
+STAR-CCM+ 宏生成
+
+宏由各阶段的代码片段组成（每个片段是一个 Java 方法），按任务需要的阶段拼接：
+只划分网格、从网格继续求解、只做后处理，或在已求解的 .sim 上换工况重新计算（多工况共用网格）。
+片段使用 string.Template（$参数），Java 的花括号不需要转义；片段在导入时解析一次，
+生成宏时先按参数表检查任务参数与阶段顺序，不合法时抛出 ValueError，不会生成半个宏。
+各阶段的输出路径都由宏开头的任务目录变量拼接，任务目录由程序按配置的结果根目录计算。
+"""
+import os
+import string
+
+from stage_markers import MARKER_METHOD, marker_calls
+
+
+def change_unicode(han):
+    unicode_str = ''.join(f'\\u{ord(char):04x}' if ord(char) > 127 else char for char in han)
+    return unicode_str
+
+
+def java_string(text):
+    """文本转为Java字符串字面量的内容（转义反斜杠与引号，非ASCII字符转为\\uXXXX）"""
+    return change_unicode(text.replace('\\', '\\\\').replace('"', '\\"'))
+
+
+# 任务参数表：参数 -> 类型
+#   text        非空文本
+#   int         整数（可为数字文本）
+#   number      数值（可为数字文本）
+#   java_string 带双引号的Java字符串字面量（如 "kPa"）
+#   path        绝对路径
+#   profile     渲染档位名（RENDER_PROFILES）
+JOB_PARAMS = {
+    'name': 'text',
+    'index': 'int',
+    'model_folder': 'path',
+    'model_folder_public': 'path',
+    'max_steps': 'int',
+    'x_axis': 'number',
+    'base_size': 'number',
+    'target_surface_ratio': 'number',
+    'min_surface_ratio': 'number',
+    'prisma_layer_thickness_ratio': 'number',
+    'prisma_layer_extension': 'int',
+    'viscosity': 'number',
+    'density': 'number',
+    'pressure': 'number',
+    'speed_of_sound': 'number',
+    'mass_flow': 'text',
+    'dp_unit': 'java_string',
+    'dp_format': 'java_string',
+    'render_profile': 'profile',
+}
+
+# 渲染档位：场景图分辨率与超采样倍数（printAndWait 的放大倍数）、监测曲线图分辨率、
+# 场景/曲线更新的输出分辨率、输出哪些结果图、是否导出三维场景文件（.sce）
+# 扫描工况一般用 preview（报告中的缩略图足够），none 只导出CSV结果
+RENDER_IMAGES = ('convergence', 'pressure', 'streamline', 'mach', 'domain')
+RENDER_PROFILES = {
+    'full': {'image_width': 1600, 'image_height': 900, 'supersampling': 2, 'antialias': True,
+             'plot_width': 3200, 'plot_height': 1800, 'hardcopy_width': 758, 'hardcopy_height': 1191,
+             'images': RENDER_IMAGES, 'export_scenes': True},
+    'preview': {'image_width': 800, 'image_height': 450, 'supersampling': 1, 'antialias': True,
+                'plot_width': 1200, 'plot_height': 675, 'hardcopy_width': 379, 'hardcopy_height': 596,
+                'images': RENDER_IMAGES, 'export_scenes': False},
+    'none': {'image_width': 800, 'image_height': 450, 'supersampling': 1, 'antialias': False,
+             'plot_width': 1200, 'plot_height': 675, 'hardcopy_width': 379, 'hardcopy_height': 596,
+             'images': (), 'export_scenes': False},
+}
+DEFAULT_RENDER_PROFILE = 'full'
+RENDER_PROFILE_LABELS = {'full': "完整", 'preview': "预览", 'none': "不出图"}
+
+# 由任务参数计算的片段参数 -> 依赖的任务参数
+DERIVED_PARAMS = {
+    'job_root': ('model_folder',),
+    'public_job_root': ('model_folder_public',),
+    'mach_speed': ('speed_of_sound',),
+}
+RENDER_PARAMS = ('image_width', 'image_height', 'supersampling', 'antialias', 'plot_width', 'plot_height',
+                 'hardcopy_width', 'hardcopy_height', 'export_scenes') + tuple(f"render_{image}" for image in RENDER_IMAGES)
+DERIVED_PARAMS.update({param: ('render_profile',) for param in RENDER_PARAMS})
+
+
+class MacroFragment:
+    """
+    宏片段：一个 Java 方法（或类成员）
+
+    :param stage: 方法名（同时是阶段标记名）
+    :param label: 说明
+    :param requires: 执行前必须已完成的阶段（同一宏中更早执行，或已包含在加载的 .sim 中）
+    :param text: 方法源码（string.Template）
+    """
+
+    def __init__(self, stage, label, requires, text):
+        self.stage = stage
+        self.label = label
+        self.requires = requires
+        template = string.Template(text)
+        if not template.is_valid():
+            raise ValueError(f"宏片段 {stage} 中有无效的 $ 占位符")
+        # 预先切分为 文本、参数、文本、参数…… 生成时只需拼接
+        self.parts = []
+        literal, last = [], 0
+        for match in template.pattern.finditer(text):
+            literal.append(text[last:match.start()])
+            if match.group('escaped') is not None:
+                literal.append(template.delimiter)
+            else:
+                self.parts += ["".join(literal), match.group('named') or match.group('braced')]
+                literal = []
+            last = match.end()
+        self.parts.append("".join(literal) + text[last:])
+        self.params = set(self.parts[1::2])
+        unknown = self.params - set(JOB_PARAMS) - set(DERIVED_PARAMS)
+        if unknown:
+            raise ValueError(f"宏片段 {stage} 使用了未定义的参数: {', '.join(sorted(unknown))}")
+
+    def job_params(self):
+        """片段需要的任务参数"""
+        needed = set()
+        for param in self.params:
+            needed.update(DERIVED_PARAMS.get(param, (param,)))
+        return needed
+
+    def render(self, values):
+        parts = self.parts[:]
+        parts[1::2] = [values[param] for param in parts[1::2]]
+        return "".join(parts)
+
+
+# 宏文件头（类名、带阶段标记的 execute() 与标记方法）与结尾
+_HEADER = string.Template(r"""// Simcenter STAR-CCM+ macro: ${class_name}.java
+// Written by Simcenter STAR-CCM+ 16.06.008
+package macro;
+
+import java.util.*;
+
+import star.base.neo.*;
+import star.segregatedflow.*;
+import star.turbulence.*;
+import star.flow.*;
+import star.energy.*;
+import star.metrics.*;
+import star.meshing.*;
+import star.common.*;
+import star.material.*;
+import star.keturb.*;
+import star.base.report.*;
+import star.prismmesher.*;
+import star.vis.*;
+import star.surfacewrapper.*;
+
+public class ${class_name} extends StarMacro {
+
+  public void execute() {
+${execute_calls}
+  }
+${marker_method}""")
+
+# 任务目录：由生成程序按配置的结果根目录计算后只在这里出现一次，各阶段的输出路径都由它拼接
+_PATHS = MacroFragment('paths', '任务目录', (), r"""
+  private final String jobRoot = "${job_root}";
+  private final String publicJobRoot = "${public_job_root}";
+  private final String simFile = jobRoot + "\\Simulation\\${name}.sim";
+  private final String reportDir = jobRoot + "\\Report\\";
+  private final String publicReportDir = publicJobRoot + "\\Report\\";
+""")
+
+# 渲染档位：各阶段的出图分辨率与输出内容都由这些成员决定
+_RENDER = MacroFragment('render', '渲染档位', (), r"""
+  private final int imageWidth = ${image_width};
+  private final int imageHeight = ${image_height};
+  private final int supersampling = ${supersampling};
+  private final boolean antialias = ${antialias};
+  private final int plotWidth = ${plot_width};
+  private final int plotHeight = ${plot_height};
+  private final int hardcopyWidth = ${hardcopy_width};
+  private final int hardcopyHeight = ${hardcopy_height};
+  private final boolean exportScenes = ${export_scenes};
+  private final boolean renderConvergence = ${render_convergence};
+  private final boolean renderPressure = ${render_pressure};
+  private final boolean renderStreamline = ${render_streamline};
+  private final boolean renderMach = ${render_mach};
+  private final boolean renderDomain = ${render_domain};
+""")
+
+_FOOTER = "}"
+
+# 宏片段（按完整流程的执行顺序）
+FRAGMENTS = {}
+
+
+def _fragment(stage, label, requires, text):
+    FRAGMENTS[stage] = MacroFragment(stage, label, requires, text)
+
+
+_fragment('execute0', 'CAD导入，保存 .sim', (), r"""  private void execute0() {
+
+    Simulation simulation_0 =
+      getActiveSimulation();
+
+    PartImportManager partImportManager_0 =
+      simulation_0.get(PartImportManager.class);
+
+    partImportManager_0.importCadPart(resolvePath(jobRoot + "\\CacheModels\\CacheModel.STEP"), "SharpEdges", 30.0, 2, true, 1.0E-5, true, false, false, false, true, NeoProperty.fromString("{\'STEP\': 0, \'NX\': 0, \'CATIAV5\': 0, \'SE\': 0, \'JT\': 0}"), true, false);
+
+    simulation_0.getSceneManager().createGeometryScene("\u51E0\u4F55\u573A\u666F", "\u8F6E\u5ED3", "\u8868\u9762", 1);
+
+    Scene scene_0 =
+      simulation_0.getSceneManager().getScene("\u51E0\u4F55\u573A\u666F 1");
+
+    scene_0.initializeAndWait();
+
+    SceneUpdate sceneUpdate_0 =
+      scene_0.getSceneUpdate();
+
+    HardcopyProperties hardcopyProperties_0 =
+      sceneUpdate_0.getHardcopyProperties();
+
+    hardcopyProperties_0.setCurrentResolutionWidth(25);
+
+    hardcopyProperties_0.setCurrentResolutionHeight(25);
+
+    hardcopyProperties_0.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_0.setCurrentResolutionHeight(hardcopyHeight);
+
+    scene_0.resetCamera();
+
+    simulation_0.saveState(simFile);
+  }""")
+
+_fragment('execute1', '包面、自动网格参数、物理模型、边界条件与压降监测', ('execute0',), r"""  private void execute1() {
+
+    Simulation simulation_0 =
+      getActiveSimulation();
+
+    CadPart cadPart_0 =
+      ((CadPart) simulation_0.get(SimulationPartManager.class).getPart("Fluid"));
+
+    SurfaceWrapperAutoMeshOperation surfaceWrapperAutoMeshOperation_0 =
+      (SurfaceWrapperAutoMeshOperation) simulation_0.get(MeshOperationManager.class).createSurfaceWrapperAutoMeshOperation(new NeoObjectVector(new Object[] {cadPart_0}), "\u5305\u9762");
+
+    surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(BaseSize.class).setValue(1.0);
+
+    Units units_0 =
+      ((Units) simulation_0.getUnitsManager().getObject("mm"));
+
+    surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(BaseSize.class).setUnits(units_0);
+
+    surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(BaseSize.class).setValue(1.0);
+
+    surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(BaseSize.class).setUnits(units_0);
+
+    PartsTargetSurfaceSize partsTargetSurfaceSize_0 =
+      surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(PartsTargetSurfaceSize.class);
+
+    partsTargetSurfaceSize_0.getRelativeSizeScalar().setValue(25.0);
+
+    Units units_1 =
+      ((Units) simulation_0.getUnitsManager().getObject(""));
+
+    partsTargetSurfaceSize_0.getRelativeSizeScalar().setUnits(units_1);
+
+    PartsMinimumSurfaceSize partsMinimumSurfaceSize_0 =
+      surfaceWrapperAutoMeshOperation_0.getDefaultValues().get(PartsMinimumSurfaceSize.class);
+
+    partsMinimumSurfaceSize_0.getRelativeSizeScalar().setValue(15.0);
+
+    partsMinimumSurfaceSize_0.getRelativeSizeScalar().setUnits(units_1);
+
+    MeshOperationPart meshOperationPart_0 =
+      ((MeshOperationPart) simulation_0.get(SimulationPartManager.class).getPart("\u5305\u9762"));
+
+    AutoMeshOperation autoMeshOperation_0 =
+      simulation_0.get(MeshOperationManager.class).createAutoMeshOperation(new StringVector(new String[] {"star.resurfacer.ResurfacerAutoMesher", "star.resurfacer.AutomaticSurfaceRepairAutoMesher", "star.dualmesher.DualAutoMesher", "star.prismmesher.PrismAutoMesher"}), new NeoObjectVector(new Object[] {meshOperationPart_0}));
+
+    autoMeshOperation_0.getMesherParallelModeOption().setSelected(MesherParallelModeOption.Type.PARALLEL);
+
+    autoMeshOperation_0.getDefaultValues().get(BaseSize.class).setValue(${base_size});
+
+    autoMeshOperation_0.getDefaultValues().get(BaseSize.class).setUnits(units_0);
+
+    PartsTargetSurfaceSize partsTargetSurfaceSize_1 =
+      autoMeshOperation_0.getDefaultValues().get(PartsTargetSurfaceSize.class);
+
+    partsTargetSurfaceSize_1.getRelativeSizeScalar().setValue(${target_surface_ratio});
+
+    partsTargetSurfaceSize_1.getRelativeSizeScalar().setUnits(units_1);
+
+    PartsMinimumSurfaceSize partsMinimumSurfaceSize_1 =
+      autoMeshOperation_0.getDefaultValues().get(PartsMinimumSurfaceSize.class);
+
+    partsMinimumSurfaceSize_1.getRelativeSizeScalar().setValue(${min_surface_ratio});
+
+    partsMinimumSurfaceSize_1.getRelativeSizeScalar().setUnits(units_1);
+
+    NumPrismLayers numPrismLayers_0 =
+      autoMeshOperation_0.getDefaultValues().get(NumPrismLayers.class);
+
+    IntegerValue integerValue_0 =
+      numPrismLayers_0.getNumLayersValue();
+
+    integerValue_0.getQuantity().setValue(${prisma_layer_extension});
+
+    PrismLayerStretching prismLayerStretching_0 =
+      autoMeshOperation_0.getDefaultValues().get(PrismLayerStretching.class);
+
+    prismLayerStretching_0.getStretchingQuantity().setValue(1.3);
+
+    prismLayerStretching_0.getStretchingQuantity().setUnits(units_1);
+
+    PrismThickness prismThickness_0 =
+      autoMeshOperation_0.getDefaultValues().get(PrismThickness.class);
+
+    prismThickness_0.getRelativeSizeScalar().setValue(${prisma_layer_thickness_ratio});
+
+    prismThickness_0.getRelativeSizeScalar().setUnits(units_1);
+
+    MaximumCellSize maximumCellSize_0 =
+      autoMeshOperation_0.getDefaultValues().get(MaximumCellSize.class);
+
+    maximumCellSize_0.getRelativeSizeScalar().setValue(100.0);
+
+    maximumCellSize_0.getRelativeSizeScalar().setUnits(units_1);
+
+    PhysicsContinuum physicsContinuum_0 =
+      simulation_0.getContinuumManager().createContinuum(PhysicsContinuum.class);
+
+    physicsContinuum_0.enable(ThreeDimensionalModel.class);
+
+    physicsContinuum_0.enable(SingleComponentGasModel.class);
+
+    physicsContinuum_0.enable(SegregatedFlowModel.class);
+
+    physicsContinuum_0.enable(ConstantDensityModel.class);
+
+    physicsContinuum_0.enable(SteadyModel.class);
+
+    physicsContinuum_0.enable(TurbulentModel.class);
+
+    physicsContinuum_0.enable(RansTurbulenceModel.class);
+
+    physicsContinuum_0.enable(KEpsilonTurbulence.class);
+
+    physicsContinuum_0.enable(RkeTwoLayerTurbModel.class);
+
+    physicsContinuum_0.enable(KeTwoLayerAllYplusWallTreatment.class);
+
+    SingleComponentGasModel singleComponentGasModel_0 =
+      physicsContinuum_0.getModelManager().getModel(SingleComponentGasModel.class);
+
+    Gas gas_0 =
+      ((Gas) singleComponentGasModel_0.getMaterial());
+
+    ConstantMaterialPropertyMethod constantMaterialPropertyMethod_0 =
+      ((ConstantMaterialPropertyMethod) gas_0.getMaterialProperties().getMaterialProperty(DynamicViscosityProperty.class).getMethod());
+
+    constantMaterialPropertyMethod_0.getQuantity().setValue(${viscosity});
+
+    Units units_2 =
+      ((Units) simulation_0.getUnitsManager().getObject("Pa-s"));
+
+    constantMaterialPropertyMethod_0.getQuantity().setUnits(units_2);
+
+    ConstantMaterialPropertyMethod constantMaterialPropertyMethod_1 =
+      ((ConstantMaterialPropertyMethod) gas_0.getMaterialProperties().getMaterialProperty(ConstantDensityProperty.class).getMethod());
+
+    constantMaterialPropertyMethod_1.getQuantity().setValue(${density});
+
+    Units units_3 =
+      ((Units) simulation_0.getUnitsManager().getObject("kg/m^3"));
+
+    constantMaterialPropertyMethod_1.getQuantity().setUnits(units_3);
+
+    physicsContinuum_0.getReferenceValues().get(ReferencePressure.class).setValue(0.0);
+
+    Units units_4 =
+      ((Units) simulation_0.getUnitsManager().getObject("Pa"));
+
+    physicsContinuum_0.getReferenceValues().get(ReferencePressure.class).setUnits(units_4);
+
+    InitialPressureProfile initialPressureProfile_0 =
+      physicsContinuum_0.getInitialConditions().get(InitialPressureProfile.class);
+
+    initialPressureProfile_0.getMethod(ConstantScalarProfileMethod.class).getQuantity().setValue(${pressure});
+
+    Units units_5 =
+      ((Units) simulation_0.getUnitsManager().getObject("MPa"));
+
+    initialPressureProfile_0.getMethod(ConstantScalarProfileMethod.class).getQuantity().setUnits(units_5);
+
+    simulation_0.getRegionManager().newRegionsFromParts(new NeoObjectVector(new Object[] {meshOperationPart_0}), "OneRegionPerPart", null, "OneBoundaryPerPartSurface", null, "OneFeatureCurve", null, RegionManager.CreateInterfaceMode.BOUNDARY, "OneEdgeBoundaryPerPart", null);
+
+    Region region_0 =
+      simulation_0.getRegionManager().getRegion("\u5305\u9762");
+
+    Boundary boundary_0 =
+      region_0.getBoundaryManager().getBoundary("Fluid.inlet");
+
+    MassFlowBoundary massFlowBoundary_0 =
+      ((MassFlowBoundary) simulation_0.get(ConditionTypeManager.class).get(MassFlowBoundary.class));
+
+    boundary_0.setBoundaryType(massFlowBoundary_0);
+
+    Boundary boundary_1 =
+      region_0.getBoundaryManager().getBoundary("Fluid.outlet");
+
+    OutletBoundary outletBoundary_0 =
+      ((OutletBoundary) simulation_0.get(ConditionTypeManager.class).get(OutletBoundary.class));
+
+    boundary_1.setBoundaryType(outletBoundary_0);
+
+    Units units_6 =
+      simulation_0.getUnitsManager().getInternalUnits(new IntVector(new int[] {1, 0, -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}));
+
+    MassFlowRateProfile massFlowRateProfile_0 =
+      boundary_0.getValues().get(MassFlowRateProfile.class);
+
+    massFlowRateProfile_0.getMethod(ConstantScalarProfileMethod.class).getQuantity().setDefinition("${mass_flow}");
+
+    massFlowRateProfile_0.getMethod(ConstantScalarProfileMethod.class).getQuantity().setUnits(units_6);
+
+    StepStoppingCriterion stepStoppingCriterion_0 =
+      ((StepStoppingCriterion) simulation_0.getSolverStoppingCriterionManager().getSolverStoppingCriterion("Maximum Steps"));
+
+    IntegerValue integerValue_1 =
+      stepStoppingCriterion_0.getMaximumNumberStepsObject();
+
+    integerValue_1.getQuantity().setValue(${max_steps});
+
+    PressureDropReport pressureDropReport_0 =
+      simulation_0.getReportManager().createReport(PressureDropReport.class);
+
+    pressureDropReport_0.setPresentationName("Dp");
+
+    pressureDropReport_0.getParts().setQuery(null);
+
+    pressureDropReport_0.getParts().setObjects(boundary_0);
+
+    pressureDropReport_0.getLowPressureParts().setQuery(null);
+
+    pressureDropReport_0.getLowPressureParts().setObjects(boundary_1);
+
+    LatestMeshProxyRepresentation latestMeshProxyRepresentation_0 =
+      ((LatestMeshProxyRepresentation) simulation_0.getRepresentationManager().getObject("Latest Surface/Volume"));
+
+    pressureDropReport_0.setRepresentation(latestMeshProxyRepresentation_0);
+
+    simulation_0.getMonitorManager().createMonitorAndPlot(new NeoObjectVector(new Object[] {pressureDropReport_0}), true, "%1$$s \u7ED8\u56FE");
+
+    ReportMonitor reportMonitor_0 =
+      ((ReportMonitor) simulation_0.getMonitorManager().getMonitor("Dp Monitor"));
+
+    MonitorPlot monitorPlot_0 =
+      simulation_0.getPlotManager().createMonitorPlot(new NeoObjectVector(new Object[] {reportMonitor_0}), "Dp Monitor \u7ED8\u56FE");
+
+    monitorPlot_0.open();
+
+    PlotUpdate plotUpdate_0 =
+      monitorPlot_0.getPlotUpdate();
+
+    HardcopyProperties hardcopyProperties_1 =
+      plotUpdate_0.getHardcopyProperties();
+
+    hardcopyProperties_1.setCurrentResolutionWidth(25);
+
+    hardcopyProperties_1.setCurrentResolutionHeight(25);
+
+    Scene scene_0 =
+      simulation_0.getSceneManager().getScene("\u51E0\u4F55\u573A\u666F 1");
+
+    SceneUpdate sceneUpdate_0 =
+      scene_0.getSceneUpdate();
+
+    HardcopyProperties hardcopyProperties_0 =
+      sceneUpdate_0.getHardcopyProperties();
+
+    hardcopyProperties_0.setCurrentResolutionWidth(760);
+
+    hardcopyProperties_0.setCurrentResolutionHeight(1192);
+
+    hardcopyProperties_1.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_1.setCurrentResolutionHeight(hardcopyHeight);
+
+    StatisticsReport statisticsReport_0 =
+      simulation_0.getReportManager().createReport(StatisticsReport.class);
+
+    statisticsReport_0.setPresentationName("A_dp");
+
+    statisticsReport_0.setSampleFilterOption(SampleFilterOption.LastNSamples);
+
+    statisticsReport_0.setMonitor(reportMonitor_0);
+
+    LastNSamplesFilter lastNSamplesFilter_0 =
+      ((LastNSamplesFilter) statisticsReport_0.getSampleFilterManager().getObject("\u6700\u540E N \u4E2A\u6837\u672C"));
+
+    lastNSamplesFilter_0.setNSamples(200);
+
+    simulation_0.getMonitorManager().createMonitorAndPlot(new NeoObjectVector(new Object[] {statisticsReport_0}), true, "%1$$s \u7ED8\u56FE");
+
+    ReportMonitor reportMonitor_1 =
+      ((ReportMonitor) simulation_0.getMonitorManager().getMonitor("A_dp Monitor"));
+
+    MonitorPlot monitorPlot_1 =
+      simulation_0.getPlotManager().createMonitorPlot(new NeoObjectVector(new Object[] {reportMonitor_1}), "A_dp Monitor \u7ED8\u56FE");
+
+    monitorPlot_1.open();
+
+    PlotUpdate plotUpdate_1 =
+      monitorPlot_1.getPlotUpdate();
+
+    HardcopyProperties hardcopyProperties_2 =
+      plotUpdate_1.getHardcopyProperties();
+
+    hardcopyProperties_2.setCurrentResolutionWidth(25);
+
+    hardcopyProperties_2.setCurrentResolutionHeight(25);
+
+    hardcopyProperties_1.setCurrentResolutionWidth(760);
+
+    hardcopyProperties_1.setCurrentResolutionHeight(1192);
+
+    hardcopyProperties_2.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_2.setCurrentResolutionHeight(hardcopyHeight);
+    
+    simulation_0.getMonitorManager().createMonitorAndPlot(new NeoObjectVector(new Object[] {pressureDropReport_0}), true, "%1$$s \u7ED8\u56FE");
+    
+    ReportMonitor reportMonitor_4 = ((ReportMonitor) simulation_0.getMonitorManager().getMonitor("Dp Monitor 2"));
+    
+    MonitorPlot monitorPlot_4 = simulation_0.getPlotManager().createMonitorPlot(new NeoObjectVector(new Object[] {reportMonitor_4}), "Dp Monitor 2 \u7ED8\u56FE");
+    
+    monitorPlot_4.open();
+    
+    PlotUpdate plotUpdate_4 = monitorPlot_4.getPlotUpdate();
+    
+    HardcopyProperties hardcopyProperties_9 = plotUpdate_4.getHardcopyProperties();
+           
+    IterationUpdateFrequency iterationUpdateFrequency_0 = plotUpdate_4.getIterationUpdateFrequency();
+    
+    iterationUpdateFrequency_0.setStart(500);
+    
+    StarUpdate starUpdate_0 = reportMonitor_4.getStarUpdate();
+
+    IterationUpdateFrequency iterationUpdateFrequency_1 = starUpdate_0.getIterationUpdateFrequency();
+
+    iterationUpdateFrequency_1.setStart(500);
+
+    simulation_0.saveState(simFile);
+  }""")
+
+_fragment('execute2', '生成体网格', ('execute1',), r"""  private void execute2() {
+
+    Simulation simulation_0 =
+      getActiveSimulation();
+
+    MeshPipelineController meshPipelineController_0 =
+      simulation_0.get(MeshPipelineController.class);
+
+    meshPipelineController_0.generateVolumeMesh();
+
+    simulation_0.saveState(simFile);
+  }""")
+
+_fragment('execute3', '最大流速报告与监测曲线设置', ('execute2',), r"""  private void execute3() {
+
+    Simulation simulation_0 =
+      getActiveSimulation();
+
+    MaxReport maxReport_0 =
+      simulation_0.getReportManager().createReport(MaxReport.class);
+
+    maxReport_0.setPresentationName("V_max");
+
+    PrimitiveFieldFunction primitiveFieldFunction_0 =
+      ((PrimitiveFieldFunction) simulation_0.getFieldFunctionManager().getFunction("Velocity"));
+
+    VectorMagnitudeFieldFunction vectorMagnitudeFieldFunction_0 =
+      ((VectorMagnitudeFieldFunction) primitiveFieldFunction_0.getMagnitudeFunction());
+
+    maxReport_0.setFieldFunction(vectorMagnitudeFieldFunction_0);
+
+    maxReport_0.getParts().setQuery(null);
+
+    Region region_0 =
+      simulation_0.getRegionManager().getRegion("\u5305\u9762");
+
+    maxReport_0.getParts().setObjects(region_0);
+
+    simulation_0.getMonitorManager().createMonitorAndPlot(new NeoObjectVector(new Object[] {maxReport_0}), true, "%1$$s \u7ED8\u56FE");
+
+    ReportMonitor reportMonitor_2 =
+      ((ReportMonitor) simulation_0.getMonitorManager().getMonitor("V_max Monitor"));
+
+    MonitorPlot monitorPlot_2 =
+      simulation_0.getPlotManager().createMonitorPlot(new NeoObjectVector(new Object[] {reportMonitor_2}), "V_max Monitor \u7ED8\u56FE");
+
+    monitorPlot_2.open();
+
+    PlotUpdate plotUpdate_2 =
+      monitorPlot_2.getPlotUpdate();
+
+    HardcopyProperties hardcopyProperties_3 =
+      plotUpdate_2.getHardcopyProperties();
+
+    hardcopyProperties_3.setCurrentResolutionWidth(25);
+
+    hardcopyProperties_3.setCurrentResolutionHeight(25);
+
+    MonitorPlot monitorPlot_1 =
+      ((MonitorPlot) simulation_0.getPlotManager().getPlot("A_dp Monitor \u7ED8\u56FE"));
+
+    PlotUpdate plotUpdate_1 =
+      monitorPlot_1.getPlotUpdate();
+
+    HardcopyProperties hardcopyProperties_2 =
+      plotUpdate_1.getHardcopyProperties();
+
+    hardcopyProperties_2.setCurrentResolutionWidth(760);
+
+    hardcopyProperties_2.setCurrentResolutionHeight(1192);
+
+    hardcopyProperties_3.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_3.setCurrentResolutionHeight(hardcopyHeight);
+
+    simulation_0.saveState(simFile);
+  }""")
+
+_fragment('execute4', '求解', ('execute3',), r"""  private void execute4() {
+
+    Simulation simulation_0 =
+      getActiveSimulation();
+
+    ResidualPlot residualPlot_0 =
+      ((ResidualPlot) simulation_0.getPlotManager().getPlot("Residuals"));
+
+    residualPlot_0.open();
+
+    PlotUpdate plotUpdate_3 =
+      residualPlot_0.getPlotUpdate();
+
+    HardcopyProperties hardcopyProperties_4 =
+      plotUpdate_3.getHardcopyProperties();
+
+    hardcopyProperties_4.setCurrentResolutionWidth(25);
+
+    hardcopyProperties_4.setCurrentResolutionHeight(25);
+
+    simulation_0.getSimulationIterator().run();
+
+    MonitorPlot monitorPlot_2 =
+      ((MonitorPlot) simulation_0.getPlotManager().getPlot("V_max Monitor \u7ED8\u56FE"));
+
+    PlotUpdate plotUpdate_2 =
+      monitorPlot_2.getPlotUpdate();
+
+    HardcopyProperties hardcopyProperties_3 =
+      plotUpdate_2.getHardcopyProperties();
+
+    hardcopyProperties_3.setCurrentResolutionWidth(760);
+
+    hardcopyProperties_3.setCurrentResolutionHeight(1192);
+
+    hardcopyProperties_4.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_4.setCurrentResolutionHeight(hardcopyHeight);
+
+    MonitorPlot monitorPlot_0 =
+      ((MonitorPlot) simulation_0.getPlotManager().getPlot("Dp Monitor \u7ED8\u56FE"));
+
+    PlotUpdate plotUpdate_0 =
+      monitorPlot_0.getPlotUpdate();
+
+    HardcopyProperties hardcopyProperties_1 =
+      plotUpdate_0.getHardcopyProperties();
+
+    hardcopyProperties_1.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_1.setCurrentResolutionHeight(hardcopyHeight);
+
+    simulation_0.saveState(simFile);
+  }""")
+
+_fragment('execute5', '导出监测曲线CSV、收敛曲线图与压力云图', ('execute4',), r"""  private void execute5() {
+
+    Simulation simulation_0 =
+      getActiveSimulation();
+
+    MonitorPlot monitorPlot_0 =
+      ((MonitorPlot) simulation_0.getPlotManager().getPlot("Dp Monitor \u7ED8\u56FE"));
+
+    Cartesian2DAxisManager cartesian2DAxisManager_0 =
+      ((Cartesian2DAxisManager) monitorPlot_0.getAxisManager());
+
+    cartesian2DAxisManager_0.setAxesBounds(new Vector(Arrays.<AxisManager.AxisBounds>asList(new AxisManager.AxisBounds("Left Axis", -737733.1683996408, false, 102205.11569759721, false), new AxisManager.AxisBounds("Bottom Axis", 1.0, false, ${max_steps}, false))));
+
+    monitorPlot_0.export(resolvePath(reportDir + "${name}_pressure.csv"), ",");
+    
+    monitorPlot_0.export(resolvePath(publicReportDir + "${name}_pressure.csv"), ",");
+    
+    Cartesian2DAxis cartesian2DAxis_0 = 
+      ((Cartesian2DAxis) cartesian2DAxisManager_0.getAxis("Bottom Axis"));
+
+    cartesian2DAxis_0.setMinimum(${x_axis});
+
+    cartesian2DAxisManager_0.setAxesBounds(new Vector(Arrays.<AxisManager.AxisBounds>asList(new AxisManager.AxisBounds("Bottom Axis", ${x_axis}, true, ${max_steps}, false))));
+
+    //monitorPlot_0.encode(resolvePath(reportDir + "${name}_\u538B\u964D\u6536\u655B\u66F2\u7EBF\u56FE.png"), "png", 3200, 1800, true, false);
+    
+    //monitorPlot_0.encode(resolvePath(publicReportDir + "${name}_\u538B\u964D\u6536\u655B\u66F2\u7EBF\u56FE.png"), "png", 3200, 1800, true, false);            
+
+    MonitorPlot monitorPlot_4 =
+          ((MonitorPlot) simulation_0.getPlotManager().getPlot("Dp Monitor 2 \u7ED8\u56FE"));
+          
+    monitorPlot_4.open();
+
+    PlotUpdate plotUpdate_4 = 
+      monitorPlot_4.getPlotUpdate();
+
+    HardcopyProperties hardcopyProperties_9 = 
+      plotUpdate_4.getHardcopyProperties();
+      
+    hardcopyProperties_9.setCurrentResolutionWidth(25);
+
+    hardcopyProperties_9.setCurrentResolutionHeight(25);  
+      
+    Cartesian2DAxisManager cartesian2DAxisManager_4 = 
+      ((Cartesian2DAxisManager) monitorPlot_4.getAxisManager());
+
+    cartesian2DAxisManager_4.setAxesBounds(new Vector(Arrays.<AxisManager.AxisBounds>asList(new AxisManager.AxisBounds("Left Axis", 11820.766587826656, false, 12006.159462910786, false), new AxisManager.AxisBounds("Bottom Axis", ${x_axis}, true, ${max_steps}, false))));      
+                  
+    if (renderConvergence) {
+      monitorPlot_4.encode(resolvePath(reportDir + "${name}_\u538B\u964D\u6536\u655B\u66F2\u7EBF\u56FE.png"), "png", plotWidth, plotHeight, antialias, false);
+
+      monitorPlot_4.encode(resolvePath(publicReportDir + "${name}_\u538B\u964D\u6536\u655B\u66F2\u7EBF\u56FE.png"), "png", plotWidth, plotHeight, antialias, false);
+    }
+
+    MonitorPlot monitorPlot_1 =
+      ((MonitorPlot) simulation_0.getPlotManager().getPlot("A_dp Monitor \u7ED8\u56FE"));
+
+    PlotUpdate plotUpdate_1 =
+      monitorPlot_1.getPlotUpdate();
+
+    HardcopyProperties hardcopyProperties_2 =
+      plotUpdate_1.getHardcopyProperties();
+
+    hardcopyProperties_2.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_2.setCurrentResolutionHeight(hardcopyHeight);
+
+    Cartesian2DAxisManager cartesian2DAxisManager_1 =
+      ((Cartesian2DAxisManager) monitorPlot_1.getAxisManager());
+
+    cartesian2DAxisManager_1.setAxesBounds(new Vector(Arrays.<AxisManager.AxisBounds>asList(new AxisManager.AxisBounds("Left Axis", -480055.1526588006, false, 31154.726553345095, false), new AxisManager.AxisBounds("Bottom Axis", 1.0, false, ${max_steps}, false))));
+
+    monitorPlot_1.export(resolvePath(reportDir + "${name}_average_pressure.csv"), ",");
+    
+    monitorPlot_1.export(resolvePath(publicReportDir + "${name}_average_pressure.csv"), ",");
+
+    MonitorPlot monitorPlot_2 =
+      ((MonitorPlot) simulation_0.getPlotManager().getPlot("V_max Monitor \u7ED8\u56FE"));
+
+    PlotUpdate plotUpdate_2 =
+      monitorPlot_2.getPlotUpdate();
+
+    HardcopyProperties hardcopyProperties_3 =
+      plotUpdate_2.getHardcopyProperties();
+
+    hardcopyProperties_3.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_3.setCurrentResolutionHeight(hardcopyHeight);
+
+    Cartesian2DAxisManager cartesian2DAxisManager_2 =
+      ((Cartesian2DAxisManager) monitorPlot_2.getAxisManager());
+
+    cartesian2DAxisManager_2.setAxesBounds(new Vector(Arrays.<AxisManager.AxisBounds>asList(new AxisManager.AxisBounds("Left Axis", 80.78857937401325, false, 1560.7257699953568, false), new AxisManager.AxisBounds("Bottom Axis", 1.0, false, 101.0, false))));
+
+    monitorPlot_2.export(resolvePath(reportDir + "${name}_V_max.csv"), ",");
+    
+    monitorPlot_2.export(resolvePath(publicReportDir + "${name}_V_max.csv"), ",");
+
+    simulation_0.getSceneManager().createScalarScene("\u6807\u91CF\u573A\u666F", "\u8F6E\u5ED3", "\u6807\u91CF");
+
+    Scene scene_1 =
+      simulation_0.getSceneManager().getScene("\u6807\u91CF\u573A\u666F 1");
+
+    scene_1.initializeAndWait();
+
+    ScalarDisplayer scalarDisplayer_0 =
+      ((ScalarDisplayer) scene_1.getDisplayerManager().getObject("\u6807\u91CF 1"));
+
+    Legend legend_0 =
+      scalarDisplayer_0.getLegend();
+
+    PredefinedLookupTable predefinedLookupTable_0 =
+      ((PredefinedLookupTable) simulation_0.get(LookupTableManager.class).getObject("blue-yellow-red"));
+
+    legend_0.setLookupTable(predefinedLookupTable_0);
+
+    SceneUpdate sceneUpdate_1 =
+      scene_1.getSceneUpdate();
+
+    HardcopyProperties hardcopyProperties_5 =
+      sceneUpdate_1.getHardcopyProperties();
+
+    hardcopyProperties_5.setCurrentResolutionWidth(25);
+
+    hardcopyProperties_5.setCurrentResolutionHeight(25);
+
+    hardcopyProperties_3.setCurrentResolutionWidth(760);
+
+    hardcopyProperties_3.setCurrentResolutionHeight(1192);
+
+    ResidualPlot residualPlot_0 =
+      ((ResidualPlot) simulation_0.getPlotManager().getPlot("Residuals"));
+
+    PlotUpdate plotUpdate_3 =
+      residualPlot_0.getPlotUpdate();
+
+    HardcopyProperties hardcopyProperties_4 =
+      plotUpdate_3.getHardcopyProperties();
+
+    hardcopyProperties_4.setCurrentResolutionWidth(760);
+
+    hardcopyProperties_4.setCurrentResolutionHeight(1192);
+
+    hardcopyProperties_5.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_5.setCurrentResolutionHeight(hardcopyHeight);
+
+    scene_1.resetCamera();
+
+    scene_1.setPresentationName("\u538B\u529B\u4E91\u56FE");
+
+    LogoAnnotation logoAnnotation_0 =
+      ((LogoAnnotation) simulation_0.getAnnotationManager().getObject("Logo"));
+
+    logoAnnotation_0.setOpacity(0.0);
+
+    scalarDisplayer_0.getInputParts().setQuery(null);
+
+    Region region_0 =
+      simulation_0.getRegionManager().getRegion("\u5305\u9762");
+
+    Boundary boundary_2 =
+      region_0.getBoundaryManager().getBoundary("Fluid.Faces");
+
+    Boundary boundary_0 =
+      region_0.getBoundaryManager().getBoundary("Fluid.inlet");
+
+    Boundary boundary_1 =
+      region_0.getBoundaryManager().getBoundary("Fluid.outlet");
+
+    scalarDisplayer_0.getInputParts().setObjects(boundary_2, boundary_0, boundary_1);
+
+    PrimitiveFieldFunction primitiveFieldFunction_1 =
+      ((PrimitiveFieldFunction) simulation_0.getFieldFunctionManager().getFunction("AbsolutePressure"));
+
+    scalarDisplayer_0.getScalarDisplayQuantity().setFieldFunction(primitiveFieldFunction_1);
+
+    scalarDisplayer_0.setFillMode(ScalarFillMode.NODE_FILLED);
+
+    BlueRedLookupTable blueRedLookupTable_0 =
+      ((BlueRedLookupTable) simulation_0.get(LookupTableManager.class).getObject("blue-red"));
+
+    legend_0.setLookupTable(blueRedLookupTable_0);
+
+    legend_0.setTitleHeight(0.035);
+
+    legend_0.setLabelHeight(0.035);
+
+    legend_0.setWidth(0.35);
+
+    legend_0.setPositionCoordinate(new DoubleVector(new double[] {0.4, 0.08}));
+
+    legend_0.setLabelFormat(${dp_format});
+
+    legend_0.setNumberOfLabels(5);
+
+    Units units_7 =
+      ((Units) simulation_0.getUnitsManager().getObject(${dp_unit}));
+
+    scalarDisplayer_0.getScalarDisplayQuantity().setUnits(units_7);
+
+    CurrentView currentView_0 =
+      scene_1.getCurrentView();
+
+    currentView_0.setInput(new DoubleVector(new double[] {0.006064277158636892, 0.005535606369249629, 0.07199999063106509}), new DoubleVector(new double[] {0.006064277158636892, 0.005535606369249629, 0.47804024423186187}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 0.10599777638115217, 1, 30.0);
+
+    scene_1.setViewOrientation(new DoubleVector(new double[] {1.0, 1.0, 1.0}), new DoubleVector(new double[] {0.0, 1.0, 0.0}));
+
+    scene_1.resetCamera();
+
+    //currentView_0.setInput(new DoubleVector(new double[] {0.006064277158636892, 0.005535606369249629, 0.07199999063106509}), new DoubleVector(new double[] {0.24049172687688083, 0.23996305608749355, 0.306427440349309}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 0.06688408114046082, 1, 30.0);
+
+    if (renderPressure) {
+      scene_1.printAndWait(resolvePath(reportDir + "${name}_\u538B\u529B\u4E91\u56FE.png"), supersampling, imageWidth, imageHeight, antialias, false);
+
+      scene_1.printAndWait(resolvePath(publicReportDir + "${name}_\u538B\u529B\u4E91\u56FE.png"), supersampling, imageWidth, imageHeight, antialias, false);
+    }
+
+    //currentView_0.setInput(new DoubleVector(new double[] {0.006064277158636892, 0.005535606369249629, 0.07199999063106509}), new DoubleVector(new double[] {0.24049172687688083, 0.23996305608749355, 0.306427440349309}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 0.06688408114046082, 1, 30.0);
+
+    if (renderPressure && exportScenes) {
+      scene_1.export3DSceneFileAndWait(resolvePath(reportDir + "${name}_\u538B\u529B\u4E91\u56FE.sce"), "\u538B\u529B\u4E91\u56FE", "", false, SceneFileCompressionLevel.OFF);
+
+      scene_1.export3DSceneFileAndWait(resolvePath(publicReportDir + "${name}_\u538B\u529B\u4E91\u56FE.sce"), "\u538B\u529B\u4E91\u56FE", "", false, SceneFileCompressionLevel.OFF);
+    }
+
+    Units units_8 =
+      simulation_0.getUnitsManager().getPreferredUnits(Dimensions.Builder().length(1).build());
+
+    scene_1.setTransparencyOverrideMode(SceneTransparencyOverride.MAKE_SCENE_TRANSPARENT);
+
+    scene_1.getCreatorGroup().setQuery(null);
+
+    scene_1.getCreatorGroup().setObjects(region_0);
+
+    scene_1.getCreatorGroup().setQuery(null);
+
+    scene_1.getCreatorGroup().setObjects(region_0);
+
+    scene_1.getCreatorGroup().setQuery(null);
+
+    scene_1.getCreatorGroup().setObjects(region_0);
+
+    PrimitiveFieldFunction primitiveFieldFunction_0 =
+      ((PrimitiveFieldFunction) simulation_0.getFieldFunctionManager().getFunction("Velocity"));
+
+    StreamPart streamPart_0 =
+      simulation_0.getPartManager().createStreamPart(new NeoObjectVector(new Object[] {region_0}), new NeoObjectVector(new Object[] {boundary_2, boundary_0, boundary_1}), primitiveFieldFunction_0, 8, 8, 2);
+
+    scene_1.setTransparencyOverrideMode(SceneTransparencyOverride.USE_DISPLAYER_PROPERTY);
+
+    simulation_0.getSceneManager().createEmptyScene("\u573A\u666F");
+
+    Scene scene_2 =
+      simulation_0.getSceneManager().getScene("\u573A\u666F 1");
+
+    scene_2.initializeAndWait();
+
+    SceneUpdate sceneUpdate_2 =
+      scene_2.getSceneUpdate();
+
+    HardcopyProperties hardcopyProperties_6 =
+      sceneUpdate_2.getHardcopyProperties();
+
+    hardcopyProperties_6.setCurrentResolutionWidth(25);
+
+    hardcopyProperties_6.setCurrentResolutionHeight(25);
+
+    hardcopyProperties_5.setCurrentResolutionWidth(760);
+
+    hardcopyProperties_5.setCurrentResolutionHeight(1192);
+
+    hardcopyProperties_6.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_6.setCurrentResolutionHeight(hardcopyHeight);
+
+    scene_2.resetCamera();
+
+    scene_2.setPresentationName("\u6D41\u7EBF\u56FE");
+
+    ScalarDisplayer scalarDisplayer_1 =
+      scene_2.getDisplayerManager().createScalarDisplayer("\u6807\u91CF");
+
+    Legend legend_1 =
+      scalarDisplayer_1.getLegend();
+
+    legend_1.setLookupTable(predefinedLookupTable_0);
+
+    simulation_0.getSceneManager().deleteScenes(new NeoObjectVector(new Object[] {scene_2}));
+
+    hardcopyProperties_5.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_5.setCurrentResolutionHeight(hardcopyHeight);
+
+    simulation_0.getSceneManager().createEmptyScene("\u573A\u666F");
+
+    Scene scene_3 =
+      simulation_0.getSceneManager().getScene("\u573A\u666F 1");
+
+    scene_3.initializeAndWait();
+
+    SceneUpdate sceneUpdate_3 =
+      scene_3.getSceneUpdate();
+
+    HardcopyProperties hardcopyProperties_7 =
+      sceneUpdate_3.getHardcopyProperties();
+
+    hardcopyProperties_7.setCurrentResolutionWidth(25);
+
+    hardcopyProperties_7.setCurrentResolutionHeight(25);
+
+    hardcopyProperties_5.setCurrentResolutionWidth(760);
+
+    hardcopyProperties_5.setCurrentResolutionHeight(1192);
+
+    hardcopyProperties_7.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_7.setCurrentResolutionHeight(hardcopyHeight);
+
+    scene_3.resetCamera();
+
+    scene_3.setPresentationName("\u6D41\u7EBF\u56FE");
+
+    StreamDisplayer streamDisplayer_0 =
+      scene_3.getDisplayerManager().createStreamDisplayer("\u6D41\u7EBF");
+
+    Legend legend_2 =
+      streamDisplayer_0.getLegend();
+
+    legend_2.setLookupTable(predefinedLookupTable_0);
+
+    streamDisplayer_0.getInputParts().setQuery(null);
+
+    streamDisplayer_0.getInputParts().setObjects(streamPart_0);
+
+    VectorMagnitudeFieldFunction vectorMagnitudeFieldFunction_0 =
+      ((VectorMagnitudeFieldFunction) primitiveFieldFunction_0.getMagnitudeFunction());
+
+    streamDisplayer_0.getScalarDisplayQuantity().setFieldFunction(vectorMagnitudeFieldFunction_0);
+
+    streamDisplayer_0.setMode(StreamDisplayerMode.LINES);
+
+    legend_2.setLookupTable(blueRedLookupTable_0);
+
+    legend_2.setTitleHeight(0.035);
+
+    legend_2.setLabelHeight(0.035);
+
+    legend_2.setPositionCoordinate(new DoubleVector(new double[] {0.4, 0.08}));
+
+    legend_2.setLabelFormat("%-6.2f");
+
+    legend_2.setNumberOfLabels(5);
+
+    legend_2.setWidth(0.35);
+
+    PartDisplayer partDisplayer_0 =
+      scene_3.getDisplayerManager().createPartDisplayer("\u8868\u9762", -1, 1);
+
+    partDisplayer_0.getInputParts().setQuery(null);
+
+    FeatureCurve featureCurve_0 =
+      ((FeatureCurve) region_0.getFeatureCurveManager().getObject("Default Feature Curve"));
+
+    partDisplayer_0.getInputParts().setObjects(boundary_2, boundary_0, boundary_1, featureCurve_0);
+
+    partDisplayer_0.setOpacity(0.2);
+
+    scene_3.setViewOrientation(new DoubleVector(new double[] {1.0, 1.0, 1.0}), new DoubleVector(new double[] {0.0, 1.0, 0.0}));
+
+    CurrentView currentView_1 =
+      scene_3.getCurrentView();
+
+    currentView_1.setInput(new DoubleVector(new double[] {0.0, 0.0, 0.0}), new DoubleVector(new double[] {3.0354027944862283, 3.0354027944862283, 3.0354027944862283}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 1.3724755655678504, 1, 30.0);
+
+    scene_3.resetCamera();
+
+    //currentView_1.setInput(new DoubleVector(new double[] {0.006064277158636892, 0.005535606369249629, 0.07199999063106509}), new DoubleVector(new double[] {0.2404917268768808, 0.23996305608749355, 0.306427440349309}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 0.06688408114046082, 1, 30.0);
+
+    simulation_0.saveState(simFile);
+  }""")
+
+_fragment('execute6', '流线图与 Ma>0.3 区域图', ('execute4',), r"""  private void execute6() {
+
+    Simulation simulation_0 =
+      getActiveSimulation();
+
+    Scene scene_3 =
+      simulation_0.getSceneManager().getScene("\u6D41\u7EBF\u56FE");
+
+    CurrentView currentView_1 =
+      scene_3.getCurrentView();
+
+    currentView_1.setInput(new DoubleVector(new double[] {0.006064277158636892, 0.005535606369249629, 0.07199999063106509}), new DoubleVector(new double[] {0.2404917268768808, 0.23996305608749355, 0.306427440349309}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 0.06688408114046082, 1, 30.0);
+
+    scene_3.resetCamera();
+
+    if (renderStreamline) {
+      scene_3.printAndWait(resolvePath(reportDir + "${name}_\u6D41\u7EBF\u56FE.png"), supersampling, imageWidth, imageHeight, antialias, false);
+
+      scene_3.printAndWait(resolvePath(publicReportDir + "${name}_\u6D41\u7EBF\u56FE.png"), supersampling, imageWidth, imageHeight, antialias, false);
+    }
+
+    //currentView_1.setInput(new DoubleVector(new double[] {0.006064277158636892, 0.005535606369249629, 0.07199999063106509}), new DoubleVector(new double[] {0.2404917268768808, 0.23996305608749355, 0.306427440349309}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 0.06688408114046082, 1, 30.0);
+
+    if (renderStreamline && exportScenes) {
+      scene_3.export3DSceneFileAndWait(resolvePath(reportDir + "${name}_\u6D41\u7EBF\u56FE.sce"), "\u6D41\u7EBF\u56FE", "", false, SceneFileCompressionLevel.OFF);
+
+      scene_3.export3DSceneFileAndWait(resolvePath(publicReportDir + "${name}_\u6D41\u7EBF\u56FE.sce"), "\u6D41\u7EBF\u56FE", "", false, SceneFileCompressionLevel.OFF);
+    }
+
+    Units units_1 =
+      simulation_0.getUnitsManager().getPreferredUnits(Dimensions.Builder().build());
+
+    scene_3.setTransparencyOverrideMode(SceneTransparencyOverride.MAKE_SCENE_TRANSPARENT);
+
+    scene_3.getCreatorGroup().setQuery(null);
+
+    Region region_0 =
+      simulation_0.getRegionManager().getRegion("\u5305\u9762");
+
+    scene_3.getCreatorGroup().setObjects(region_0);
+
+    Units units_9 =
+      simulation_0.getUnitsManager().getPreferredUnits(Dimensions.Builder().velocity(1).build());
+
+    scene_3.getCreatorGroup().setQuery(null);
+
+    scene_3.getCreatorGroup().setObjects(region_0);
+
+    PrimitiveFieldFunction primitiveFieldFunction_0 =
+      ((PrimitiveFieldFunction) simulation_0.getFieldFunctionManager().getFunction("Velocity"));
+
+    VectorMagnitudeFieldFunction vectorMagnitudeFieldFunction_0 =
+      ((VectorMagnitudeFieldFunction) primitiveFieldFunction_0.getMagnitudeFunction());
+
+    ThresholdPart thresholdPart_0 =
+      simulation_0.getPartManager().createThresholdPart(new NeoObjectVector(new Object[] {region_0}), new DoubleVector(new double[] {${mach_speed}, 300.0}), units_9, vectorMagnitudeFieldFunction_0, 0);
+
+    scene_3.setTransparencyOverrideMode(SceneTransparencyOverride.USE_DISPLAYER_PROPERTY);
+
+    thresholdPart_0.setPresentationName("Ma>0.3");
+
+    thresholdPart_0.setPresentationName("Ma>0.3\u533A\u57DF");
+
+    simulation_0.getSceneManager().createEmptyScene("\u573A\u666F");
+
+    Scene scene_4 =
+      simulation_0.getSceneManager().getScene("\u573A\u666F 1");
+
+    scene_4.initializeAndWait();
+
+    SceneUpdate sceneUpdate_4 =
+      scene_4.getSceneUpdate();
+
+    HardcopyProperties hardcopyProperties_8 =
+      sceneUpdate_4.getHardcopyProperties();
+
+    hardcopyProperties_8.setCurrentResolutionWidth(25);
+
+    hardcopyProperties_8.setCurrentResolutionHeight(25);
+
+    SceneUpdate sceneUpdate_3 =
+      scene_3.getSceneUpdate();
+
+    HardcopyProperties hardcopyProperties_7 =
+      sceneUpdate_3.getHardcopyProperties();
+
+    hardcopyProperties_7.setCurrentResolutionWidth(760);
+
+    hardcopyProperties_7.setCurrentResolutionHeight(1192);
+
+    hardcopyProperties_8.setCurrentResolutionWidth(hardcopyWidth);
+
+    hardcopyProperties_8.setCurrentResolutionHeight(hardcopyHeight);
+
+    scene_4.resetCamera();
+
+    scene_4.setPresentationName("Ma>0.3\u533A\u57DF\u56FE");
+
+    PartDisplayer partDisplayer_1 =
+      scene_4.getDisplayerManager().createPartDisplayer("\u8868\u9762", -1, 1);
+
+    partDisplayer_1.getInputParts().setQuery(null);
+
+    Boundary boundary_2 =
+      region_0.getBoundaryManager().getBoundary("Fluid.Faces");
+
+    Boundary boundary_0 =
+      region_0.getBoundaryManager().getBoundary("Fluid.inlet");
+
+    Boundary boundary_1 =
+      region_0.getBoundaryManager().getBoundary("Fluid.outlet");
+
+    FeatureCurve featureCurve_0 =
+      ((FeatureCurve) region_0.getFeatureCurveManager().getObject("Default Feature Curve"));
+
+    partDisplayer_1.getInputParts().setObjects(boundary_2, boundary_0, boundary_1, featureCurve_0);
+
+    partDisplayer_1.setOpacity(0.2);
+
+    PartDisplayer partDisplayer_2 =
+      scene_4.getDisplayerManager().createPartDisplayer("\u8868\u9762", -1, 1);
+
+    partDisplayer_2.getInputParts().setQuery(null);
+
+    partDisplayer_2.getInputParts().setObjects(thresholdPart_0);
+
+    CurrentView currentView_2 =
+      scene_4.getCurrentView();
+
+    currentView_2.setInput(new DoubleVector(new double[] {0.0, 0.0, 0.0}), new DoubleVector(new double[] {0.0, 0.0, 5.257471861486698}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 1.3724755655678502, 1, 30.0);
+
+    scene_4.setViewOrientation(new DoubleVector(new double[] {1.0, 1.0, 1.0}), new DoubleVector(new double[] {0.0, 1.0, 0.0}));
+
+    scene_4.resetCamera();
+
+    //currentView_2.setInput(new DoubleVector(new double[] {0.006064277158636892, 0.005535606369249629, 0.07199999063106509}), new DoubleVector(new double[] {0.2404917268768808, 0.23996305608749355, 0.306427440349309}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 0.06688408114046082, 1, 30.0);
+
+    if (renderMach) {
+      scene_4.printAndWait(resolvePath(reportDir + "${name}_Ma_0.3\u533A\u57DF\u56FE.png"), supersampling, imageWidth, imageHeight, antialias, false);
+
+      scene_4.printAndWait(resolvePath(publicReportDir + "${name}_Ma_0.3\u533A\u57DF\u56FE.png"), supersampling, imageWidth, imageHeight, antialias, false);
+    }
+
+    //currentView_2.setInput(new DoubleVector(new double[] {0.006064277158636892, 0.005535606369249629, 0.07199999063106509}), new DoubleVector(new double[] {0.2404917268768808, 0.23996305608749355, 0.306427440349309}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 0.06688408114046082, 1, 30.0);
+
+    if (renderMach && exportScenes) {
+      scene_4.export3DSceneFileAndWait(resolvePath(reportDir + "${name}_Ma_0.3\u533A\u57DF\u56FE.sce"), "Ma>0.3\u533A\u57DF\u56FE", "", false, SceneFileCompressionLevel.OFF);
+
+      scene_4.export3DSceneFileAndWait(resolvePath(publicReportDir + "${name}_Ma_0.3\u533A\u57DF\u56FE.sce"), "Ma>0.3\u533A\u57DF\u56FE", "", false, SceneFileCompressionLevel.OFF);
+    }
+
+    simulation_0.saveState(simFile);
+  }""")
+
+_fragment('execute7', '流体域图', ('execute1',), r"""  private void execute7() {
+    Simulation simulation_0 =
+      getActiveSimulation();
+
+    simulation_0.getSceneManager().createGeometryScene("\u51E0\u4F55\u573A\u666F", "\u8F6E\u5ED3", "\u8868\u9762", 1);
+
+    Scene scene_5 =
+      simulation_0.getSceneManager().getScene("\u51E0\u4F55\u573A\u666F 2");
+
+    scene_5.initializeAndWait();
+
+    SceneUpdate sceneUpdate_2 =
+      scene_5.getSceneUpdate();
+
+    HardcopyProperties hardcopyProperties_2 =
+      sceneUpdate_2.getHardcopyProperties();
+
+    hardcopyProperties_2.setCurrentResolutionWidth(25);
+
+    hardcopyProperties_2.setCurrentResolutionHeight(25);
+
+    Scene scene_0 =
+      simulation_0.getSceneManager().getScene("\u51E0\u4F55\u573A\u666F 1");
+
+    SceneUpdate sceneUpdate_0 =
+      scene_0.getSceneUpdate();
+
+    HardcopyProperties hardcopyProperties_0 =
+      sceneUpdate_0.getHardcopyProperties();
+
+    hardcopyProperties_0.setCurrentResolutionWidth(1818);
+
+    hardcopyProperties_0.setCurrentResolutionHeight(856);
+
+    hardcopyProperties_2.setCurrentResolutionWidth(1816);
+
+    hardcopyProperties_2.setCurrentResolutionHeight(855);
+
+    scene_5.resetCamera();
+
+    scene_5.setPresentationName("\u6D41\u4F53\u57DF\u56FE");
+
+    CurrentView currentView_3 =
+      scene_5.getCurrentView();
+
+    //currentView_3.setInput(new DoubleVector(new double[] {0.0060642761908053285, 0.005535606360364112, 0.07199999063106509}), new DoubleVector(new double[] {0.0060642761908053285, 0.005535606360364112, 0.3304198118061474}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 0.06746111050434028, 1, 30.0);
+
+    scene_5.setViewOrientation(new DoubleVector(new double[] {1.0, 1.0, 1.0}), new DoubleVector(new double[] {0.0, 1.0, 0.0}));
+
+    scene_5.setTransparencyOverrideMode(SceneTransparencyOverride.MAKE_SCENE_TRANSPARENT);
+
+    scene_5.resetCamera();
+
+    //currentView_3.setInput(new DoubleVector(new double[] {0.0060642761908053285, 0.005535606360364112, 0.07199999063106509}), new DoubleVector(new double[] {0.15526302951017404, 0.1547343596797328, 0.22119874395043382}), new DoubleVector(new double[] {0.0, 1.0, 0.0}), 0.06688397135209896, 1, 30.0);
+
+    if (renderDomain) {
+      scene_5.printAndWait(resolvePath(reportDir + "${name}_\u6D41\u4F53\u57DF\u56FE.png"), supersampling, imageWidth, imageHeight, antialias, false);
+
+      scene_5.printAndWait(resolvePath(publicReportDir + "${name}_\u6D41\u4F53\u57DF\u56FE.png"), supersampling, imageWidth, imageHeight, antialias, false);
+    }
+    
+    simulation_0.saveState(simFile);
+  }""")
+
+
+def validate_stages(stages, completed=()):
+    """
+    检查阶段列表：阶段存在、不重复，且每个阶段需要的前置阶段已完成
+
+    :param stages: 要执行的阶段
+    :param completed: 加载的 .sim 中已完成的阶段（新建时为空）
+    """
+    done = set(completed)
+    if len(set(stages)) != len(stages):
+        raise ValueError(f"宏阶段重复: {', '.join(stages)}")
+    for stage in stages:
+        fragment = FRAGMENTS.get(stage)
+        if fragment is None:
+            raise ValueError(f"未知的宏阶段: {stage}，可用: {', '.join(FRAGMENTS)}")
+        missing = [required for required in fragment.requires if required not in done]
+        if missing:
+            raise ValueError(f"宏阶段 {stage}（{fragment.label}）需要先完成: {', '.join(missing)}")
+        done.add(stage)
+
+
+def _check_param(param, kind, value):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return "为空"
+    try:
+        if kind == 'int':
+            int(str(value))
+        elif kind == 'number':
+            float(value)
+        elif kind == 'java_string' and not (isinstance(value, str) and len(value) >= 2
+                                            and value[0] == value[-1] == '"'):
+            return "应为带双引号的字符串"
+        elif kind == 'path' and not os.path.isabs(value):
+            return "应为绝对路径"
+        elif kind == 'profile' and value not in RENDER_PROFILES:
+            return f"应为 {' / '.join(RENDER_PROFILES)}"
+    except (TypeError, ValueError):
+        return f"应为{'整数' if kind == 'int' else '数值'}"
+    return None
+
+
+def macro_params(job, fragments):
+    """
+    检查并计算片段参数
+
+    :param job: prepare_job 返回的任务字典
+    :param fragments: 要生成的片段
+    :return: {参数: 文本}
+    """
+    needed = set()
+    for fragment in fragments:
+        needed.update(fragment.job_params())
+    errors = []
+    for param in sorted(needed):
+        if param not in job:
+            errors.append(f"{param} 缺失")
+            continue
+        error = _check_param(param, JOB_PARAMS[param], job[param])
+        if error:
+            errors.append(f"{param}={job[param]!r} {error}")
+    if errors:
+        raise ValueError(f"宏参数无效: {'; '.join(errors)}")
+    # 启用草稿目录时求解器只在任务的草稿工作目录中读写（见 scratch_stage）
+    scratch_folder = job.get('scratch_folder')
+    if scratch_folder:
+        error = _check_param('scratch_folder', 'path', scratch_folder)
+        if error:
+            raise ValueError(f"宏参数无效: scratch_folder={scratch_folder!r} {error}")
+    values = {param: str(job[param]) for param in needed}
+    values['job_root'] = java_string(scratch_folder or job['model_folder'])
+    values['public_job_root'] = java_string(scratch_folder or job['model_folder_public'])
+    if 'speed_of_sound' in needed:
+        values['mach_speed'] = str(float(job['speed_of_sound']) * 0.3)
+    if 'render_profile' in needed:
+        values.update(render_params(job['render_profile']))
+    return values
+
+
+def render_params(profile):
+    """渲染档位对应的宏成员取值（Java字面量）"""
+    settings = RENDER_PROFILES[profile]
+    values = {param: str(settings[param]) for param in RENDER_PARAMS if param in settings}
+    values['antialias'] = 'true' if settings['antialias'] else 'false'
+    values['export_scenes'] = 'true' if settings['export_scenes'] else 'false'
+    for image in RENDER_IMAGES:
+        values[f"render_{image}"] = 'true' if image in settings['images'] else 'false'
+    return values
+
+
+def build_macro(job, class_name, stages, completed=()):
+    """
+    根据任务参数生成STAR-CCM+宏文件内容
+
+    :param job: prepare_job 返回的任务字典
+    :param class_name: 宏类名（须与宏文件名一致）
+    :param stages: 需要执行的阶段列表，见 job_scheduler.PHASE_STAGES
+    :param completed: 加载的 .sim 中已完成的阶段，见 job_scheduler.PHASE_COMPLETED
+    :return: Java宏文件内容
+    """
+    validate_stages(stages, completed)
+    fragments = [FRAGMENTS[stage] for stage in stages]
+    values = macro_params(job, [_PATHS, _RENDER] + fragments)
+    methods = [fragment.render(values) for fragment in fragments]
+    header = _HEADER.substitute(class_name=class_name, execute_calls=marker_calls(stages), marker_method=MARKER_METHOD)
+    header += _PATHS.render(values) + _RENDER.render(values)
+    return header + "\n" + "\n\n".join(methods) + "\n" + _FOOTER
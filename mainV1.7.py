@@ -1,11 +1,9 @@
+import importlib
+import multiprocessing
 import sys
 import logging
-from PyQt5.QtWidgets import QApplication, QMessageBox
 from license_validator import LicenseValidator
 
-# 延迟导入主程序模块
-from STARCCM_Simulation_automation_V7_2 import SimulationConfigWindow
-
 
 def setup_logging():
     """配置日志记录"""
@@ -19,8 +17,47 @@ def setup_logging():
     )
 
 
+# 命令行子命令：mainV1.7.exe benchmark --step ref.STEP --starccm starccmw.exe ...
+#               mainV1.7.exe index query --model CV --fluid R1234yf
+#               mainV1.7.exe monitors summary --month 2025-03
+#               mainV1.7.exe retention --apply
+#               mainV1.7.exe sweep --model CV --fluid R134a --output CV_sweep.pptx
+#               mainV1.7.exe rerender --date-from 2025-03-01 --workers 4
+#               mainV1.7.exe html "D:\仿真自动化结果\2025.3.7"
+SUBCOMMANDS = {
+    'benchmark': 'starccm_benchmark',
+    'index': 'results_index',
+    'monitors': 'monitor_store',
+    'retention': 'retention',
+    'sweep': 'sweep_report',
+    'rerender': 'rerender_reports',
+    'html': 'html_report',
+}
+
+
+def run_subcommand(command, argv):
+    """运行命令行子命令（不启动界面）"""
+    validator = LicenseValidator(
+        license_path="license.dat",
+        key_path="license_secret.key"
+    )
+    valid, message = validator.validate()
+    if not valid:
+        logging.error(f"许可证验证失败: {message}")
+        sys.exit(101)
+    module = importlib.import_module(SUBCOMMANDS[command])
+    sys.exit(module.main(argv))
+
+
 def main():
     setup_logging()
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        run_subcommand(sys.argv[1], sys.argv[2:])
+
+    # 延迟导入界面与主程序模块：命令行子命令（及 rerender 的子进程）不加载
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    from STARCCM_Simulation_automation_V7_2 import SimulationConfigWindow
+
     app = QApplication(sys.argv)
 
     try:
@@ -90,7 +127,9 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后报告重建等子命令使用进程池，子进程启动时在此返回
+    multiprocessing.freeze_support()
     main()
 
 
-#打包命令  pyinstaller --windowed --console --add-data "logo_SANHUA.png;." --add-data "50EG_Report.pptx;." --add-data "Refrigerant_Report.pptx;." --add-data "SanHua_Logo.ico;." --icon=SanHua_Logo.ico mainV1.7.py
+#打包命令  pyinstaller --windowed --console --add-data "logo_SANHUA.png;." --add-data "50EG_Report.pptx;." --add-data "Refrigerant_Report.pptx;." --add-data "50EG_Report.map.json;." --add-data "Refrigerant_Report.map.json;." --add-data "SanHua_Logo.ico;." --hidden-import retention --hidden-import rerender_reports --hidden-import starccm_benchmark --icon=SanHua_Logo.ico mainV1.7.py
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+
+# 模型库目录名（位于私有结果根目录下，与任务目录同一分区才能建立硬链接）
+MODEL_STORE_FOLDER = "ModelStore"
+HASH_CACHE_FILE = "hash_cache.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ModelStore:
+    """
+    按内容寻址的模型库
+
+    同一个STEP文件只在库中保存一份（objects/前两位哈希/哈希.扩展名），
+    各任务的 CacheModels 目录中建立硬链接；无法建立硬链接时（跨分区、文件系统不支持）退回复制。
+    文件哈希按 (路径, 大小, 修改时间) 缓存，源文件未变化时不重新计算。
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.cache_path = os.path.join(root, HASH_CACHE_FILE)
+        self._hashes = None
+
+    def _load_cache(self):
+        if self._hashes is None:
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    self._hashes = json.load(f)
+            except (OSError, ValueError):
+                self._hashes = {}
+        return self._hashes
+
+    def _save_cache(self):
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._hashes, f, ensure_ascii=False)
+        os.replace(temp_path, self.cache_path)
+
+    def file_hash(self, path):
+        """文件 SHA-256（按路径、大小与修改时间缓存）"""
+        path = os.path.normpath(os.path.abspath(path))
+        stat = os.stat(path)
+        hashes = self._load_cache()
+        cached = hashes.get(path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        hashes[path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        try:
+            self._save_cache()
+        except OSError as e:
+            logging.warning(f"模型哈希缓存写入失败: {str(e)}")
+        return hashes[path][2]
+
+    def object_path(self, digest, extension):
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}{extension.lower()}")
+
+    def add(self, source_path):
+        """把源文件加入模型库（已存在则不复制），返回库中文件路径"""
+        digest = self.file_hash(source_path)
+        object_path = self.object_path(digest, os.path.splitext(source_path)[1])
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            temp_path = f"{object_path}.{os.getpid()}.tmp"
+            shutil.copy2(source_path, temp_path)
+            os.replace(temp_path, object_path)
+            logging.info(f"模型已加入模型库: {source_path} -> {object_path}")
+        return object_path
+
+    def materialize(self, source_path, destination_path):
+        """
+        在任务目录中放置模型文件：优先硬链接到模型库中的同内容文件
+
+        :return: 'link' 或 'copy'
+        """
+        object_path = self.add(source_path)
+        if os.path.exists(destination_path):
+            os.remove(destination_path)
+        try:
+            os.link(object_path, destination_path)
+            return 'link'
+        except OSError as e:
+            logging.info(f"无法建立硬链接，改为复制: {destination_path}, 原因: {str(e)}")
+            shutil.copy2(object_path, destination_path)
+            return 'copy'
+
+    def unreferenced(self):
+        """
+        没有任务引用的模型（硬链接数为1，引用的任务目录已删除）
+
+        :return: [(库中文件路径, 字节数)]
+        """
+        found = []
+        for folder, _, files in os.walk(os.path.join(self.root, "objects")):
+            for name in files:
+                path = os.path.join(folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if stat.st_nlink <= 1:
+                    found.append((path, stat.st_size))
+        return found
+
+    @staticmethod
+    def remove_unreferenced(path):
+        """删除库中文件（删除前重新检查仍没有任务引用），返回释放的字节数"""
+        stat = os.stat(path)
+        if stat.st_nlink > 1:
+            return 0
+        os.remove(path)
+        return stat.st_size
+
+    def prune(self):
+        """
+        删除没有任务引用的模型
+
+        :return: (删除的文件数, 释放的字节数)
+        """
+        removed, freed = 0, 0
+        for path, _ in self.unreferenced():
+            try:
+                size = self.remove_unreferenced(path)
+            except OSError:
+                continue
+            if size:
+                removed += 1
+                freed += size
+        return removed, freed
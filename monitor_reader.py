@@ -0,0 +1,104 @@
+import collections
+import csv
+import io
+import os
+
+
+# 缓存的文件数上限（浏览历史结果时按最近使用淘汰）
+MAX_CACHE_ENTRIES = 256
+# 从文件末尾向前读取的块大小（字节）
+TAIL_BLOCK_SIZE = 4096
+
+# {绝对路径: {'key': (mtime_ns, size), 'last': 最后一个值, 'history': (迭代步, 监测值), 'arrays': ...}}
+_cache = collections.OrderedDict()
+
+
+def _entry(path):
+    """按 (路径, 修改时间, 大小) 取缓存项，文件变化后自动失效；文件不存在抛出 OSError"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    entry = _cache.get(path)
+    if entry is None or entry['key'] != key:
+        entry = {'key': key}
+        _cache[path] = entry
+        while len(_cache) > MAX_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(path)
+    return entry
+
+
+def _tail_line(path, block_size=TAIL_BLOCK_SIZE):
+    """从文件末尾向前读取，返回最后一个非空行（空文件返回None）"""
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+            stripped = data.rstrip(b"\r\n")
+            newline = stripped.rfind(b"\n")
+            if newline >= 0:
+                return stripped[newline + 1:].decode('utf-8-sig')
+        stripped = data.rstrip(b"\r\n")
+        return stripped.decode('utf-8-sig') if stripped else None
+
+
+def read_last_value(csv_path):
+    """
+    监测曲线导出文件最后一行最后一列（字符串）
+
+    只读取文件末尾，结果按路径与修改时间缓存。
+
+    :return: 最后一个值，文件为空返回None；文件不存在抛出 FileNotFoundError
+    """
+    entry = _entry(csv_path)
+    if 'last' not in entry:
+        line = _tail_line(csv_path)
+        row = next(csv.reader(io.StringIO(line)), None) if line else None
+        entry['last'] = row[-1] if row else None
+    return entry['last']
+
+
+def read_history(csv_path, as_array=False):
+    """
+    读取监测曲线导出文件的完整历史（跳过表头与无法解析的行）
+
+    :param as_array: True 时返回 NumPy 数组（需要安装 numpy）
+    :return: (迭代步, 监测值)，文件不存在或无数据返回空序列；返回的是缓存对象，调用方不要修改
+    """
+    try:
+        entry = _entry(csv_path)
+    except OSError:
+        return ([], []) if not as_array else _to_arrays(([], []))
+    if 'history' not in entry:
+        iterations, values = [], []
+        with open(csv_path, 'r', newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                try:
+                    iterations.append(float(row[0]))
+                    values.append(float(row[-1]))
+                except (ValueError, IndexError):
+                    continue
+        entry['history'] = (iterations, values)
+    if not as_array:
+        return entry['history']
+    if 'arrays' not in entry:
+        entry['arrays'] = _to_arrays(entry['history'])
+    return entry['arrays']
+
+
+def _to_arrays(history):
+    # numpy 只在需要数组时导入（不是程序的必需依赖）
+    import numpy
+    return numpy.asarray(history[0], dtype=float), numpy.asarray(history[1], dtype=float)
+
+
+def clear_cache():
+    """清空读取缓存"""
+    _cache.clear()
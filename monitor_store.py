@@ -0,0 +1,291 @@
+"""
+监测曲线列式存储
+
+每个任务的监测曲线（压降、平均压降、最大流速）合并保存为一个压缩 NPZ 文件，
+同时按月追加到结果根目录下的分区数据集：
+
+    {结果根目录}\\_monitor_dataset\\month=2025-03\\part-20250307153000123456-1a2b3c4d.npz   每个任务一个分片
+    {结果根目录}\\_monitor_dataset\\month=2025-03\\monitors.npz                              rebuild 合并后的文件
+
+任务完成时只新增分片文件，不改写已有文件（多台机器同时写共享目录也不会丢数据）；
+读取时合并月目录中的全部文件。文件为长表格式，列为 job（任务编号）、monitor（监测量编号）、
+iteration、value，另存 jobs / monitors 两个名称表。跨任务对比收敛过程或拟合运行时长模型时，
+一次读取分区即可得到全部数据，不需要逐个解析CSV。
+
+需要 numpy（不是主程序的必需依赖，未安装时跳过写入）。
+
+用法：
+    python monitor_store.py rebuild [--root 目录]     由历史CSV重建数据集
+    python monitor_store.py summary [--month 2025-03]  各任务监测量最终值
+"""
+import argparse
+import datetime
+import logging
+import os
+import platform
+import shutil
+import sys
+import uuid
+
+from monitor_reader import read_history
+
+
+# 监测量 -> 导出文件名（{name} 替换为模型名）
+MONITORS = {
+    'dp': "{name}_pressure.csv",
+    'dp_average': "{name}_average_pressure.csv",
+    'v_max': "{name}_V_max.csv",
+}
+MONITOR_STORE_SUFFIX = "_monitors.npz"
+DATASET_FOLDER = "_monitor_dataset"
+PARTITION_FILE = "monitors.npz"
+PART_PREFIX = "part-"
+
+
+def _numpy():
+    import numpy
+    return numpy
+
+
+def read_job_monitors(report_folder, name):
+    """读取 Report 目录下的监测曲线CSV，返回 {监测量: (迭代步, 监测值)}（只包含有数据的监测量）"""
+    monitors = {}
+    for monitor, pattern in MONITORS.items():
+        iterations, values = read_history(os.path.join(report_folder, pattern.format(name=name)), as_array=True)
+        if len(values):
+            monitors[monitor] = (iterations, values)
+    return monitors
+
+
+def write_job_store(report_folder, name, monitors):
+    """
+    写入单个任务的监测曲线NPZ
+
+    :param monitors: read_job_monitors 的结果
+    :return: 文件路径，无数据返回None
+    """
+    if not monitors:
+        return None
+    numpy = _numpy()
+    arrays = {}
+    for monitor, (iterations, values) in monitors.items():
+        arrays[f"{monitor}_iteration"] = iterations.astype(numpy.int32)
+        arrays[f"{monitor}_value"] = values
+    path = os.path.join(report_folder, f"{name}{MONITOR_STORE_SUFFIX}")
+    numpy.savez_compressed(path, **arrays)
+    return path
+
+
+def load_job_store(path):
+    """读取单个任务的监测曲线NPZ，返回 {监测量: (迭代步, 监测值)}"""
+    numpy = _numpy()
+    with numpy.load(path) as data:
+        return {monitor: (data[f"{monitor}_iteration"], data[f"{monitor}_value"])
+                for monitor in MONITORS if f"{monitor}_value" in data}
+
+
+def partition_folder(root, month):
+    """分区目录，month 为 YYYY-MM"""
+    return os.path.join(root, DATASET_FOLDER, f"month={month}")
+
+
+def _load_partition(path):
+    numpy = _numpy()
+    with numpy.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def _save_partition(path, partition):
+    """先写临时文件（文件名含主机与进程，多台机器同时写入互不覆盖）再改名，避免中断时留下损坏的文件"""
+    numpy = _numpy()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{platform.node()}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        numpy.savez_compressed(f, **partition)
+    os.replace(temp_path, path)
+
+
+def encode_jobs(jobs):
+    """
+    把若干任务的监测曲线编码为长表
+
+    :param jobs: {任务标识: read_job_monitors 的结果}
+    :return: {'job', 'monitor', 'iteration', 'value', 'jobs', 'monitors'} 数组
+    """
+    numpy = _numpy()
+    names = list(MONITORS)
+    columns = {'job': [], 'monitor': [], 'iteration': [], 'value': []}
+    for code, monitors in enumerate(jobs.values()):
+        for monitor, (iterations, values) in monitors.items():
+            columns['job'].append(numpy.full(len(values), code, dtype=numpy.int32))
+            columns['monitor'].append(numpy.full(len(values), names.index(monitor), dtype=numpy.int8))
+            columns['iteration'].append(numpy.asarray(iterations, dtype=numpy.int32))
+            columns['value'].append(numpy.asarray(values, dtype=float))
+    dtypes = {'job': numpy.int32, 'monitor': numpy.int8, 'iteration': numpy.int32, 'value': float}
+    partition = {key: numpy.concatenate(parts) if parts else numpy.zeros(0, dtype=dtypes[key])
+                 for key, parts in columns.items()}
+    partition['jobs'] = numpy.array(list(jobs), dtype=str)
+    partition['monitors'] = numpy.array(names, dtype=str)
+    return partition
+
+
+def append_jobs(root, month, jobs):
+    """
+    把若干任务的监测曲线追加到月分区：每次写入一个新的分片文件，不读取、不改写已有文件
+
+    同一任务在多个文件中出现时，读取时以最新的分片为准。
+    :param root: 结果根目录
+    :param month: YYYY-MM
+    :param jobs: {任务标识: read_job_monitors 的结果}
+    :return: 分片文件路径
+    """
+    name = f"{PART_PREFIX}{datetime.datetime.now():%Y%m%d%H%M%S%f}-{uuid.uuid4().hex[:8]}.npz"
+    path = os.path.join(partition_folder(root, month), name)
+    _save_partition(path, encode_jobs(jobs))
+    return path
+
+
+def partition_files(folder):
+    """分区目录中的数据文件：合并文件在前，分片按写入时间排序"""
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return []
+    parts = sorted(name for name in names if name.startswith(PART_PREFIX) and name.endswith(".npz"))
+    return [os.path.join(folder, name) for name in ([PARTITION_FILE] if PARTITION_FILE in names else []) + parts]
+
+
+def store_job(job, root):
+    """
+    任务完成后保存监测曲线：Report 目录写NPZ，并追加到结果根目录的月分区
+
+    :param job: prepare_job 返回的任务字典
+    :param root: 结果根目录（公开目录）
+    :return: 公开 Report 目录下的NPZ路径，numpy 未安装或无数据返回None
+    """
+    from results_index import iso_date
+    from run_record import job_key
+    try:
+        monitors = read_job_monitors(job['report_subfolder'], job['name'])
+    except ImportError:
+        logging.warning("未安装 numpy，跳过监测曲线列式存储")
+        return None
+    if not monitors:
+        return None
+    write_job_store(job['report_subfolder'], job['name'], monitors)
+    path = write_job_store(job['report_subfolder_public'], job['name'], monitors)
+    month = (iso_date(job['datenow']) or "unknown")[:7]
+    append_jobs(root, month, {job_key(job): monitors})
+    logging.info(f"监测曲线已保存: {path}")
+    return path
+
+
+def load_dataset(root, months=None, monitors=None):
+    """
+    读取分区数据集
+
+    :param months: 月份列表（YYYY-MM），None 表示全部
+    :param monitors: 监测量列表，None 表示全部
+    :return: {'job': 任务标识数组, 'monitor': 监测量名数组, 'iteration': ..., 'value': ...}
+             job / monitor 为 numpy 字符串数组，可直接用于向量化筛选
+    """
+    numpy = _numpy()
+    folder = os.path.join(root, DATASET_FOLDER)
+    partitions = []
+    for entry in sorted(os.listdir(folder)) if os.path.isdir(folder) else []:
+        if not entry.startswith("month=") or (months and entry[6:] not in months):
+            continue
+        partitions += [_load_partition(path) for path in partition_files(os.path.join(folder, entry))]
+    parts = {'job': [], 'monitor': [], 'iteration': [], 'value': []}
+    # 同一任务以最后写入的文件为准：从新到旧处理，跳过已出现的任务
+    seen = set()
+    for partition in reversed(partitions):
+        newer = [i for i, job in enumerate(partition['jobs']) if str(job) in seen]
+        seen.update(str(job) for job in partition['jobs'])
+        mask = ~numpy.isin(partition['job'], newer)
+        if monitors:
+            codes = [i for i, name in enumerate(partition['monitors']) if name in monitors]
+            mask &= numpy.isin(partition['monitor'], codes)
+        parts['job'].append(partition['jobs'][partition['job'][mask]])
+        parts['monitor'].append(partition['monitors'][partition['monitor'][mask]])
+        parts['iteration'].append(partition['iteration'][mask])
+        parts['value'].append(partition['value'][mask])
+    parts = {key: values[::-1] for key, values in parts.items()}
+    if not parts['value']:
+        return {'job': numpy.zeros(0, dtype=str), 'monitor': numpy.zeros(0, dtype=str),
+                'iteration': numpy.zeros(0, dtype=numpy.int32), 'value': numpy.zeros(0)}
+    return {key: numpy.concatenate(values) for key, values in parts.items()}
+
+
+def final_values(dataset, monitor):
+    """
+    各任务某监测量的最后一个值
+
+    :return: (任务标识数组, 最终值数组)
+    """
+    numpy = _numpy()
+    mask = dataset['monitor'] == monitor
+    jobs, iterations, values = dataset['job'][mask], dataset['iteration'][mask], dataset['value'][mask]
+    if not len(values):
+        return jobs, values
+    order = numpy.lexsort((iterations, jobs))
+    jobs, values = jobs[order], values[order]
+    last = numpy.append(jobs[1:] != jobs[:-1], True)
+    return jobs[last], values[last]
+
+
+def rebuild(root, index_path=None):
+    """
+    由结果目录中的历史CSV重建全部分区（用于补录功能上线前的任务），
+    每个月合并为一个文件（同时清除该月的分片）
+
+    :return: 写入的任务数
+    """
+    from results_index import INDEX_FILE, ResultsIndex
+    index = ResultsIndex(index_path or INDEX_FILE)
+    try:
+        index.scan(root)
+        rows = index.query(limit=-1)
+    finally:
+        index.close()
+    by_month = {}
+    for row in rows:
+        monitors = read_job_monitors(row['report_folder'], row['model_name'])
+        if monitors:
+            by_month.setdefault(row['date'][:7], {})[row['job']] = monitors
+    shutil.rmtree(os.path.join(root, DATASET_FOLDER), ignore_errors=True)
+    for month, jobs in by_month.items():
+        _save_partition(os.path.join(partition_folder(root, month), PARTITION_FILE), encode_jobs(jobs))
+        logging.info(f"分区 {month}: {len(jobs)} 个任务")
+    return sum(len(jobs) for jobs in by_month.values())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="监测曲线列式存储")
+    parser.add_argument('--root', default=None, help="结果根目录（默认公开结果目录）")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('rebuild', help="由历史CSV重建分区数据集")
+    summary = sub.add_parser('summary', help="各任务监测量最终值")
+    summary.add_argument('--month', action='append', help="月份 YYYY-MM，可重复")
+    summary.add_argument('--monitor', default='dp_average', choices=list(MONITORS))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.root is None:
+        from sim_settings import PUBLIC_ROOT
+        args.root = PUBLIC_ROOT
+    if args.command == 'rebuild':
+        print(f"已写入 {rebuild(args.root)} 个任务")
+        return 0
+    dataset = load_dataset(args.root, args.month, [args.monitor])
+    for job, value in zip(*final_values(dataset, args.monitor)):
+        print(f"{job}\t{value:.6g}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
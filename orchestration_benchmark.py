@@ -0,0 +1,208 @@
+"""
+调度流程开销基准测试（不需要STAR-CCM+与REFPROP，可在Linux CI上运行）
+
+用 fake_starccm.py 代替 starccmw，在离屏界面中按队列任务方式完整运行若干任务：
+建目录、复制STEP、生成宏、物性计算（50EG预设值）、日志输出、读取结果CSV、
+生成PPT报告与加载图片，统计每个任务的时延、各环节用时与吞吐量。
+
+用法：
+    python orchestration_benchmark.py --jobs 5 --max-steps 500 --max-latency 20 --json result.json
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FAKE_STARCCM = os.path.join(HERE, "fake_starccm.py")
+TEMPLATES = ["Refrigerant_Report.pptx", "50EG_Report.pptx"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="调度流程开销基准测试")
+    parser.add_argument('--jobs', type=int, default=5, help="任务数")
+    parser.add_argument('--max-steps', type=int, default=500, help="模拟求解步数（影响日志行数与CSV行数）")
+    parser.add_argument('--step', help="参考STEP模型（默认生成一个长方体）")
+    parser.add_argument('--max-latency', type=float, help="单任务时延P95上限（秒），超出时返回非零退出码")
+    parser.add_argument('--json', help="结果输出JSON文件")
+    parser.add_argument('--keep', action='store_true', help="保留临时目录")
+    parser.add_argument('--render-profile', default='full', help="渲染档位 full / preview / none")
+    parser.add_argument('--scratch', action='store_true', help="启用草稿目录模式（求解器写临时目录下的 scratch，结果后台转移）")
+    return parser.parse_args(argv)
+
+
+def write_reference_step(path, size=(120.0, 40.0, 30.0)):
+    """生成只含包围盒顶点的最小STEP文件"""
+    lines = ["ISO-10303-21;", "HEADER;", "ENDSEC;", "DATA;",
+             "#1=(LENGTH_UNIT()NAMED_UNIT(*)SI_UNIT(.MILLI.,.METRE.));"]
+    number = 2
+    for x in (0.0, size[0]):
+        for y in (0.0, size[1]):
+            for z in (0.0, size[2]):
+                lines.append(f"#{number}=CARTESIAN_POINT('',({x},{y},{z}));")
+                number += 1
+    lines += ["ENDSEC;", "END-ISO-10303-21;"]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    if not values:
+        return None
+    position = min(int(round(fraction * (len(values) - 1))), len(values) - 1)
+    return values[position]
+
+
+def timed(function, repeat):
+    """重复执行，返回单次平均用时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def micro_benchmarks(app_module, job, record, repeat=20):
+    """
+    流程中各环节的单独用时（毫秒）
+
+    :param job: prepare_job 返回的任务字典（用于生成宏）
+    :param record: 已完成任务的运行时长记录（读取其结果文件）
+    """
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QPixmap
+    from pptx import Presentation
+    from html_report import render_summary
+    from monitor_reader import clear_cache, read_history
+    from report_engine import load_template
+    from report_images import prepare_image
+    from run_record import RUN_RECORD_SUFFIX, load_run_record
+    from thumbnail_cache import load_thumbnail
+
+    job_folder = os.path.join(*record['job'].split("/"))
+    name = record['model_name']
+    csv_path = os.path.join(app_module.SIM_ROOT, job_folder, "Report", f"{name}_average_pressure.csv")
+    image_path = os.path.join(app_module.PUBLIC_ROOT, job_folder, "Report", f"{name}_压力云图.png")
+    report_folder = os.path.join(app_module.PUBLIC_ROOT, job_folder, "Report")
+    run_record = load_run_record(os.path.join(report_folder, f"{name}{RUN_RECORD_SUFFIX}"))
+    results = {
+        'build_macro_ms': timed(lambda: app_module.build_macro(job, "Bench", app_module.PHASE_STAGES['full']), repeat),
+        'read_csv_ms': timed(lambda: app_module.read_last_row_last_column(csv_path), repeat),
+        'read_csv_cold_ms': timed(lambda: (clear_cache(), app_module.read_last_row_last_column(csv_path)), repeat),
+        'read_history_cold_ms': timed(lambda: (clear_cache(), read_history(csv_path)), repeat),
+        'load_template_ms': timed(lambda: Presentation(TEMPLATES[1]), repeat),
+        'clone_template_ms': timed(lambda: load_template(TEMPLATES[1]).new_report(), repeat),
+        'html_summary_ms': timed(lambda: render_summary(run_record, report_folder), repeat),
+    }
+    # 渲染档位 none 不输出结果图，跳过图片相关的计时
+    if os.path.exists(image_path):
+        results.update({
+            'prepare_image_cached_ms': timed(lambda: prepare_image(image_path, 5760000, 3240000), repeat),
+            'load_pixmap_ms': timed(lambda: QPixmap(image_path).scaled(480, 270, Qt.KeepAspectRatio), repeat),
+            'load_thumbnail_cached_ms': timed(lambda: load_thumbnail(image_path, (480, 270)), repeat),
+        })
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start_dir = os.getcwd()
+    json_path = os.path.abspath(args.json) if args.json else None
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    work_dir = tempfile.mkdtemp(prefix="orchestration_benchmark_")
+    for template in TEMPLATES:
+        shutil.copy2(os.path.join(HERE, template), work_dir)
+        shutil.copy2(os.path.join(HERE, os.path.splitext(template)[0] + ".map.json"), work_dir)
+    step_path = os.path.abspath(args.step) if args.step else os.path.join(work_dir, "Reference.STEP")
+    if not args.step:
+        write_reference_step(step_path)
+    # 配置文件、运行时长历史与报告模板均按当前目录读写，切换到临时目录避免影响本机配置
+    os.chdir(work_dir)
+    os.environ['FAKE_STARCCM_ROOT'] = work_dir
+    # 报告图片与缩略图缓存也放在临时目录，不使用本机缓存
+    with open("sim_config.json", 'w', encoding='utf-8') as f:
+        json.dump({'cache_root': os.path.join(work_dir, "cache")}, f)
+
+    sys.path.insert(0, HERE)
+    from PyQt5.QtWidgets import QApplication
+    import STARCCM_Simulation_automation_V7_2 as app_module
+    from runtime_history import RuntimeHistory
+
+    app_module.SIM_ROOT = os.path.join(work_dir, "STARCCM Simulation automation")
+    app_module.PUBLIC_ROOT = os.path.join(work_dir, "仿真自动化结果")
+    if args.scratch:
+        app_module.SCRATCH_ROOT = os.path.join(work_dir, "scratch")
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = app_module.SimulationConfigWindow(None)
+    window.operator_name_input.setText("benchmark")
+    params = {
+        'model_import_path': step_path,
+        'starccm_path': FAKE_STARCCM,
+        'starccmview_path': "",
+        'refprp64dll': "",
+        'threads': "4",
+        'max_steps': str(args.max_steps),
+        'temperature': "20",
+        'pressure': "1",
+        'mass_flow': "0.05",
+        'workingfluid_index': 3,  # 50EG，使用预设物性，不需要REFPROP
+        'operator_name': "benchmark",
+        'render_profile': args.render_profile,
+    }
+
+    latencies = []
+    bench_start = time.perf_counter()
+    for _ in range(args.jobs):
+        start = time.perf_counter()
+        window.on_run_button_clicked(params, is_queue_task=True)
+        latencies.append(time.perf_counter() - start)
+    if window.scratch_mover is not None:
+        window.scratch_mover.wait_idle()
+    wall = time.perf_counter() - bench_start
+
+    records = RuntimeHistory().load()
+    failed = [r for r in records if r.get('status') != "已完成"]
+    stage_means = {}
+    for record in records:
+        for stage, seconds in record.get('stages', {}).items():
+            stage_means.setdefault(stage, []).append(seconds)
+    stage_means = {stage: statistics.mean(values) for stage, values in stage_means.items()}
+
+    job = window.prepare_job(params)
+    result = {
+        'jobs': args.jobs,
+        'failed': len(failed) + (args.jobs - len(records)),
+        'throughput_jobs_per_min': args.jobs / wall * 60 if wall else None,
+        'latency_mean_s': statistics.mean(latencies),
+        'latency_p50_s': percentile(latencies, 0.5),
+        'latency_p95_s': percentile(latencies, 0.95),
+        'stage_mean_s': stage_means,
+        'micro': micro_benchmarks(app_module, job, records[-1]) if job and records else {},
+    }
+    window.close()
+    app.processEvents()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    os.chdir(start_dir)
+    if not args.keep:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    else:
+        logging.info(f"临时目录已保留: {work_dir}")
+
+    if result['failed']:
+        return 1
+    if args.max_latency is not None and result['latency_p95_s'] > args.max_latency:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,524 @@
+import copy
+import io
+import json
+import os
+import string
+import sys
+import threading
+
+from pptx import Presentation
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+from pptx.parts.presentation import PresentationPart
+from pptx.parts.slide import SlidePart
+
+from report_images import REPORT_IMAGE_DPI, prepare_image
+
+
+# 报告模板（与程序一起打包）
+REFRIGERANT_TEMPLATE = 'Refrigerant_Report.pptx'
+EG_TEMPLATE = '50EG_Report.pptx'
+REFRIGERANT_FLUIDS = ("R134a", "R1234yf", "R744")
+# 字段映射文件（与模板同名，一起打包）
+MAPPING_SUFFIX = ".map.json"
+
+# 映射文件中可用的报告字段与结果图片
+REPORT_FIELDS = ('title', 'fluid', 'temperature', 'pressure', 'density', 'viscosity', 'index', 'mass_flow', 'dp_kpa',
+                 'mach_level')
+REPORT_IMAGES = ('fluid_domain_png', 'pressure_png', 'streamline_png', 'mach_png')
+
+_PICTURE = 13
+
+
+def resource_path(relative_path):
+    """打包后从 _MEIPASS 读取资源，否则从当前目录读取"""
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+
+def template_for(workingfluid):
+    """工质对应的报告模板"""
+    return REFRIGERANT_TEMPLATE if workingfluid in REFRIGERANT_FLUIDS else EG_TEMPLATE
+
+
+def set_cell_text(cell, new_text):
+    """替换表格单元格文本，保留原有字体、字号与颜色"""
+    # 清空单元格内容但保留格式
+    for paragraph in cell.text_frame.paragraphs:
+        for run in paragraph.runs:
+            run.text = ""
+
+    # 获取基准格式（使用第一个存在的run）
+    base_run = None
+    if cell.text_frame.paragraphs:
+        paragraph = cell.text_frame.paragraphs[0]
+        if paragraph.runs:
+            base_run = paragraph.runs[0]
+        else:
+            base_run = paragraph.add_run()
+
+    # 添加新内容
+    new_run = cell.text_frame.paragraphs[0].add_run()
+    new_run.text = new_text
+
+    # 安全继承格式
+    if base_run:
+        new_run.font.bold = base_run.font.bold
+        new_run.font.italic = base_run.font.italic
+        new_run.font.size = base_run.font.size
+        new_run.font.name = base_run.font.name
+
+        # 颜色继承处理
+        try:
+            if base_run.font.color.rgb:
+                new_run.font.color.rgb = base_run.font.color.rgb
+            elif base_run.font.color.theme_color:
+                new_run.font.color.theme_color = base_run.font.color.theme_color
+            else:
+                new_run.font.color.auto = True
+        except AttributeError:
+            new_run.font.color.auto = True
+
+
+def _table_cell(table, row, col):
+    # 行列索引为1-based
+    adj_row = row - 1
+    adj_col = col - 1
+    if adj_row >= len(table.rows) or adj_col >= len(table.columns):
+        raise IndexError(f"无效坐标({row},{col})，表格尺寸{len(table.rows)}x{len(table.columns)}")
+    return table.cell(adj_row, adj_col)
+
+
+def replace_image(slide, original_img_desc, new_img_path, target_index=None):
+    """
+    增强版图片替换函数（支持定位替换）
+    :param original_img_desc: 要匹配的图片特征（支持部分文件名）
+    :param new_img_path: 新图片完整路径
+    :param target_index: 要替换的图片序号（从0开始，None表示替换全部）
+    :return: 替换成功的图片数量
+    """
+    replaced_count = 0
+    # 收集所有匹配图片
+    targets = []
+    for shape in slide.shapes:
+        if shape.shape_type == _PICTURE and original_img_desc in shape.image.filename:
+            targets.append(shape)
+
+    # 处理索引有效性
+    if target_index is not None:
+        if target_index >= len(targets) or target_index < 0:
+            raise IndexError(f"无效索引：{target_index}，共找到{len(targets)}张匹配图片")
+        targets = [targets[target_index]]  # 只保留指定索引的图片
+
+    # 替换目标图片
+    for shape in targets:
+        left = shape.left
+        top = shape.top
+        width = shape.width
+        height = shape.height
+
+        slide.shapes.add_picture(new_img_path, left, top, width, height)
+        slide.shapes._spTree.remove(shape._element)
+        replaced_count += 1
+
+    return replaced_count
+
+
+def modify_table(slide, row, col, new_text, table_index=0):
+    """
+        通用表格修改函数
+        :param slide: 幻灯片对象
+        :param row: 目标行号（从1开始）
+        :param col: 目标列号（从1开始）
+        :param new_text: 要更新的文本内容
+        :param table_index: 表格索引（默认第1个表格）
+        """
+    tables = [shape for shape in slide.shapes if shape.has_table]
+    if not tables:
+        raise ValueError("幻灯片中未找到表格")
+    set_cell_text(_table_cell(tables[table_index].table, row, col), new_text)
+
+
+def append_text_to_slide(slide, target_text="压降仿真_", additional_text="（2024年最新数据）"):
+    """
+    安全颜色继承版本（支持所有颜色类型）
+    """
+    for shape in slide.shapes:
+        if not (shape.has_text_frame and target_text in shape.text):
+            continue
+
+        text_frame = shape.text_frame
+        for paragraph in text_frame.paragraphs:
+            if target_text not in paragraph.text:
+                continue
+
+            if paragraph.runs:
+                last_run = paragraph.runs[-1]
+                new_run = paragraph.add_run()
+                new_run.text = additional_text
+
+                # 字体基础属性继承
+                new_run.font.bold = last_run.font.bold
+                new_run.font.italic = last_run.font.italic
+                new_run.font.size = last_run.font.size
+                new_run.font.name = last_run.font.name
+
+                # 安全颜色继承（关键修改部分）
+                try:
+                    # 优先继承RGB颜色
+                    if last_run.font.color.rgb is not None:
+                        new_run.font.color.rgb = last_run.font.color.rgb
+                    # 其次继承主题颜色
+                    elif last_run.font.color.theme_color is not None:
+                        new_run.font.color.theme_color = last_run.font.color.theme_color
+                    # 最后保持自动颜色
+                    else:
+                        new_run.font.color.auto = True
+                except AttributeError as e:
+                    # print(f"颜色继承异常: {str(e)}，已设为自动颜色")
+                    new_run.font.color.auto = True
+            else:
+                new_run = paragraph.add_run()
+                new_run.text = target_text + additional_text
+            break
+        break
+
+
+class ReportTemplate:
+    """
+    解析一次的报告模板
+
+    保留一份未修改的演示文稿，每个报告从它复制一份（不再重新读取与解析zip/XML）：
+    只深拷贝会被修改的幻灯片与演示文稿部件，母版、版式、主题与图片等只读部件各报告共用。
+    各页表格与图片在形状列表中的位置预先算好，修改时不再遍历形状。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # 原始副本不访问幻灯片：幻灯片与形状对象会缓存XML子元素，深拷贝后这些子元素与文档脱离
+        self.presentation = Presentation(path)
+        self.layout = []  # 每页 {'tables': [形状序号], 'pictures': [形状序号]}
+        self.shape_names = []  # 每页 {'tables': {名称: 表格序号}, 'pictures': {名称或替代文字: 图片序号}}
+        for slide in Presentation(path).slides:
+            shapes = list(slide.shapes)
+            tables = [i for i, shape in enumerate(shapes) if shape.has_table]
+            pictures = [i for i, shape in enumerate(shapes) if shape.shape_type == _PICTURE]
+            self.layout.append({'tables': tables, 'pictures': pictures})
+            picture_names = {}
+            for number, i in enumerate(pictures):
+                picture_names[shapes[i].name] = number
+                for description in shapes[i]._element.xpath('./p:nvPicPr/p:cNvPr/@descr'):
+                    picture_names[description] = number
+            self.shape_names.append({'tables': {shapes[i].name: number for number, i in enumerate(tables)},
+                                     'pictures': picture_names})
+        mapping_path = os.path.splitext(path)[0] + MAPPING_SUFFIX
+        self.plan = None
+        if os.path.exists(mapping_path):
+            try:
+                self.plan = ReportPlan(load_mapping(mapping_path), self)
+            except (KeyError, ValueError) as e:
+                raise ValueError(f"字段映射文件有误 {mapping_path}: {str(e)}") from e
+        self.shared_parts = [part for part in self.presentation.part.package.iter_parts()
+                             if not isinstance(part, (SlidePart, PresentationPart))]
+        self._lock = threading.Lock()
+
+    def new_report(self, image_dpi=REPORT_IMAGE_DPI):
+        """
+        复制一份模板，返回 ReportDocument
+
+        :param image_dpi: 嵌入图片的分辨率（按图片框尺寸缩放），None 表示嵌入原图
+        """
+        memo = {id(part): part for part in self.shared_parts}
+        with self._lock:
+            presentation = copy.deepcopy(self.presentation, memo)
+        return ReportDocument(presentation, self.layout, image_dpi)
+
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def load_template(template_name):
+    """读取报告模板（每个进程每个模板只解析一次）"""
+    path = resource_path(template_name)
+    with _templates_lock:
+        template = _templates.get(path)
+        if template is None:
+            template = _templates[path] = ReportTemplate(path)
+    return template
+
+
+def clear_templates():
+    """清空模板缓存（模板文件更新后使用）"""
+    with _templates_lock:
+        _templates.clear()
+
+
+class ReportDocument:
+    """由模板复制出的单个报告，按页号与序号修改表格与图片"""
+
+    def __init__(self, presentation, layout, image_dpi=REPORT_IMAGE_DPI):
+        self.presentation = presentation
+        self.image_dpi = image_dpi
+        self.slides = list(presentation.slides)
+        self.tables = []
+        self.pictures = []
+        for slide, slide_layout in zip(self.slides, layout):
+            shapes = list(slide.shapes)
+            self.tables.append([shapes[i].table for i in slide_layout['tables']])
+            self.pictures.append([shapes[i] for i in slide_layout['pictures']])
+
+    def _append_slide(self, slide):
+        shapes = list(slide.shapes)
+        self.slides.append(slide)
+        self.tables.append([shape.table for shape in shapes if shape.has_table])
+        self.pictures.append([shape for shape in shapes if shape.shape_type == _PICTURE])
+        return len(self.slides) - 1
+
+    def duplicate_slide(self, slide_index):
+        """
+        复制一页追加到末尾，返回新页号
+
+        图片与原页共用同一图片部件（文件中只保存一份）。
+        """
+        source = self.slides[slide_index]
+        slide = self.presentation.slides.add_slide(source.slide_layout)
+        for placeholder in list(slide.placeholders):
+            placeholder._element.getparent().remove(placeholder._element)
+        for element in source.shapes._spTree.iter_shape_elms():
+            new_element = copy.deepcopy(element)
+            for blip in new_element.xpath('.//a:blip[@r:embed]'):
+                image_part = source.part.related_part(blip.get(qn('r:embed')))
+                blip.set(qn('r:embed'), slide.part.relate_to(image_part, RT.IMAGE))
+            slide.shapes._spTree.insert_element_before(new_element, 'p:extLst')
+        return self._append_slide(slide)
+
+    def add_slide(self, layout_slide_index, title=None):
+        """
+        按某页的版式新建一页（只保留标题占位符），返回 (新页号, 内容区域(left, top, width, height))
+        """
+        slide = self.presentation.slides.add_slide(self.slides[layout_slide_index].slide_layout)
+        area = None
+        for placeholder in list(slide.placeholders):
+            if placeholder.placeholder_format.type == PP_PLACEHOLDER.TITLE and title is not None:
+                placeholder.text = title
+                continue
+            if area is None and placeholder.placeholder_format.idx == 1:
+                area = (placeholder.left, placeholder.top, placeholder.width, placeholder.height)
+            placeholder._element.getparent().remove(placeholder._element)
+        if area is None:
+            width, height = self.presentation.slide_width, self.presentation.slide_height
+            area = (width // 20, height // 5, width * 9 // 10, height * 3 // 4)
+        return self._append_slide(slide), area
+
+    def set_cell(self, slide_index, row, col, new_text, table_index=0):
+        """修改表格单元格（页号从0开始，行列号从1开始）"""
+        tables = self.tables[slide_index]
+        if not tables:
+            raise ValueError(f"第{slide_index + 1}页中未找到表格")
+        set_cell_text(_table_cell(tables[table_index], row, col), new_text)
+
+    def set_row(self, slide_index, row, values, table_index=0):
+        """从第1列开始依次填写一行"""
+        for col, value in enumerate(values, start=1):
+            self.set_cell(slide_index, row, col, f"{value}", table_index)
+
+    def set_rows(self, slide_index, first_row, rows, table_index=0):
+        """从 first_row 开始填写多行，行数不够时复制最后一行（保留格式）"""
+        table = self.tables[slide_index][table_index]
+        tbl = table._tbl
+        while len(table.rows) < first_row + len(rows) - 1:
+            tbl.append(copy.deepcopy(tbl.tr_lst[-1]))
+        for offset, values in enumerate(rows):
+            self.set_row(slide_index, first_row + offset, values, table_index)
+
+    def replace_picture(self, slide_index, picture_index, image_path):
+        """
+        按位置替换图片（页号、图片序号从0开始）
+
+        新图片保持原图片的位置、大小与层次，替换后序号不变；
+        图片先按图片框尺寸与 image_dpi 缩放并重新压缩。
+        """
+        old = self.pictures[slide_index][picture_index]
+        slide = self.slides[slide_index]
+        image_path = prepare_image(image_path, old.width, old.height, self.image_dpi)
+        new = slide.shapes.add_picture(image_path, old.left, old.top, old.width, old.height)
+        old._element.addprevious(new._element)
+        self._remove_picture_element(slide, old)
+        self.pictures[slide_index][picture_index] = new
+        return new
+
+    def remove_picture(self, slide_index, picture_index):
+        """删除图片（结果图缺失时不保留模板示例图），之后的图片序号不变"""
+        picture = self.pictures[slide_index][picture_index]
+        if picture is not None:
+            self._remove_picture_element(self.slides[slide_index], picture)
+            self.pictures[slide_index][picture_index] = None
+
+    @staticmethod
+    def _remove_picture_element(slide, picture):
+        """删除图片形状，并去掉不再被引用的图片关系（模板示例图不再保存到报告中）"""
+        rId = picture._element.blip_rId
+        picture._element.getparent().remove(picture._element)
+        if rId and not slide._element.xpath(f'.//a:blip[@r:embed="{rId}"]'):
+            slide.part.rels.pop(rId)
+
+    def append_text(self, slide_index, target_text, additional_text):
+        append_text_to_slide(self.slides[slide_index], target_text, additional_text)
+
+    def remove_slide(self, slide_index):
+        """删除一页（后续页的页号不变，仍按模板页号访问）"""
+        slide_id = self.slides[slide_index].slide_id
+        slide_list = self.presentation.slides._sldIdLst
+        for element in slide_list:
+            if element.id == slide_id:
+                slide_list.remove(element)
+                # 同时去掉关系，被删除的页及其图片不再保存到文件中
+                self.presentation.part.drop_rel(element.rId)
+                break
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        self.presentation.save(buffer)
+        return buffer.getvalue()
+
+    def save(self, *paths):
+        """保存到一个或多个路径（只序列化一次）"""
+        data = self.to_bytes()
+        for path in paths:
+            with open(path, 'wb') as f:
+                f.write(data)
+
+
+# 模板页号（两个模板一致；马赫数页只有制冷剂模板有），扫描汇总报告按页复用
+MATERIAL_SLIDE = 2
+RESULT_SLIDE = 3
+MACH_SLIDE = 4
+
+
+def load_mapping(mapping_path):
+    """读取字段映射文件"""
+    with open(mapping_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _check_fields(template_text, where):
+    for _, field, _, _ in string.Formatter().parse(template_text):
+        if field is not None and field not in REPORT_FIELDS:
+            raise ValueError(f"{where}: 未知字段 {{{field}}}，可用字段: {', '.join(REPORT_FIELDS)}")
+
+
+class ReportPlan:
+    """
+    字段映射编译后的填充计划
+
+    映射文件中的页号与形状名称在编译时一次解析为 ReportDocument 中的表格/图片序号，
+    名称或字段写错时立即报错；填充时按页一次完成，不再查找形状。
+    """
+
+    def __init__(self, mapping, template):
+        self.steps = {}  # {页号: [(类型, 参数...)]}
+        self.removals = []  # [(页号, 字段, 值)]
+        slide_count = len(template.layout)
+
+        def slide_of(entry, kind):
+            number = entry['slide']
+            if not 1 <= number <= slide_count:
+                raise ValueError(f"{kind}: 第{number}页不存在（模板共{slide_count}页）")
+            return number - 1
+
+        def shape_of(slide_index, entry, kind):
+            names = template.shape_names[slide_index][kind]
+            if entry['shape'] not in names:
+                raise ValueError(f"第{slide_index + 1}页没有名为 {entry['shape']} 的"
+                                 f"{'表格' if kind == 'tables' else '图片'}，可用: {', '.join(names)}")
+            return names[entry['shape']]
+
+        for entry in mapping.get('text', []):
+            slide_index = slide_of(entry, 'text')
+            _check_fields(entry['value'], f"第{entry['slide']}页文本")
+            self.steps.setdefault(slide_index, []).append(('text', entry['after'], entry['value']))
+        for entry in mapping.get('tables', []):
+            slide_index = slide_of(entry, 'tables')
+            for value in entry['values']:
+                _check_fields(value, f"第{entry['slide']}页 {entry['shape']}")
+            self.steps.setdefault(slide_index, []).append(
+                ('row', shape_of(slide_index, entry, 'tables'), entry['row'], entry['values']))
+        for entry in mapping.get('pictures', []):
+            slide_index = slide_of(entry, 'pictures')
+            if entry['image'] not in REPORT_IMAGES:
+                raise ValueError(f"第{entry['slide']}页 {entry['shape']}: 未知图片 {entry['image']}，"
+                                 f"可用: {', '.join(REPORT_IMAGES)}")
+            self.steps.setdefault(slide_index, []).append(
+                ('picture', shape_of(slide_index, entry, 'pictures'), entry['image']))
+        for entry in mapping.get('remove_slides', []):
+            if entry['field'] not in REPORT_FIELDS:
+                raise ValueError(f"删除第{entry['slide']}页的条件: 未知字段 {entry['field']}")
+            self.removals.append((slide_of(entry, 'remove_slides'), entry['field'], entry['equals']))
+
+    def apply(self, report, fields, images):
+        """按映射填充报告（满足条件的页先删除，不再填充）"""
+        removed = set()
+        for slide_index, field, value in self.removals:
+            if fields.get(field) == value:
+                report.remove_slide(slide_index)
+                removed.add(slide_index)
+        for slide_index in sorted(self.steps):
+            if slide_index not in removed:
+                self.apply_slide(report, slide_index, slide_index, fields, images)
+
+    def apply_slide(self, report, source_index, target_index, fields, images):
+        """
+        按模板第 source_index 页的映射填充报告第 target_index 页（复制出的页使用原页的映射）
+        """
+        for step in self.steps.get(source_index, []):
+            if step[0] == 'text':
+                report.append_text(target_index, step[1], step[2].format_map(fields))
+            elif step[0] == 'row':
+                report.set_row(target_index, step[2], [value.format_map(fields) for value in step[3]], step[1])
+            else:
+                image_path = images.get(step[2])
+                if image_path and os.path.exists(image_path):
+                    report.replace_picture(target_index, step[1], image_path)
+                else:
+                    report.remove_picture(target_index, step[1])
+
+
+def record_fields(record):
+    """运行记录中的报告字段（与运行完成时生成报告使用的字段一致）"""
+    inputs = record['inputs']
+    properties = record.get('fluid_properties', {})
+    results = record.get('results', {})
+    mass_flow = inputs.get('mass_flow_value')
+    dp_pa = results.get('dp_pa')
+    return {
+        'title': f"{inputs['date']}_{inputs['operator']}_{inputs['model_name']}_{inputs['index']}",
+        'fluid': inputs['fluid'],
+        'temperature': inputs['temperature'],
+        'pressure': inputs['pressure'],
+        'density': properties.get('density'),
+        'viscosity': properties.get('viscosity'),
+        'index': inputs['index'],
+        'mass_flow': f"{mass_flow:.2f}" if mass_flow is not None else "N/A",
+        'dp_kpa': f"{dp_pa / 1000:.2f}" if dp_pa is not None else "N/A",
+        'mach_level': results.get('mach_level') or 0,
+    }
+
+
+def render_job_report(fields, images, output_paths):
+    """
+    按模板的字段映射生成单个任务的PPT报告
+
+    :param fields: 报告字段（REPORT_FIELDS；mass_flow 与 dp_kpa 为已格式化文本）
+    :param images: 结果图片路径（REPORT_IMAGES），缺失的图片从报告中删除
+    :param output_paths: 输出路径列表（只序列化一次）
+    """
+    template = load_template(template_for(fields['fluid']))
+    if template.plan is None:
+        raise FileNotFoundError(f"报告模板缺少字段映射文件: {os.path.splitext(template.path)[0]}{MAPPING_SUFFIX}")
+    report = template.new_report()
+    template.plan.apply(report, fields, images)
+    report.save(*output_paths)
+    return output_paths
@@ -0,0 +1,111 @@
+import hashlib
+import io
+import logging
+import os
+
+from PIL import Image
+
+from sim_settings import CACHE_ROOT
+
+
+# 报告图片缓存目录（本机；同一张结果图再次生成报告时直接使用）
+REPORT_IMAGE_DIR = os.path.join(CACHE_ROOT, "report_image_cache")
+# 缓存目录总大小上限，超出后按最近访问时间淘汰
+MAX_CACHE_BYTES = 500 * 1024 * 1024
+# 嵌入报告的图片分辨率（按图片框的实际尺寸换算像素，投影与屏幕查看足够）
+REPORT_IMAGE_DPI = 150
+# JPEG 质量（云图颜色渐变多，JPEG 通常明显小于 PNG）
+JPEG_QUALITY = 90
+
+EMU_PER_INCH = 914400
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def target_pixels(width_emu, height_emu, dpi=REPORT_IMAGE_DPI):
+    """图片框（EMU）在给定DPI下的像素尺寸"""
+    return max(1, round(width_emu / EMU_PER_INCH * dpi)), max(1, round(height_emu / EMU_PER_INCH * dpi))
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _encode(image):
+    """分别编码为优化PNG与JPEG，返回较小的 (扩展名, 数据)；带透明通道的图片只用PNG"""
+    candidates = []
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", optimize=True)
+    candidates.append((".png", buffer.getvalue()))
+    if image.mode in ("RGB", "L"):
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, subsampling=0)
+        candidates.append((".jpg", buffer.getvalue()))
+    return min(candidates, key=lambda candidate: len(candidate[1]))
+
+
+def prepare_image(image_path, width_emu, height_emu, dpi=REPORT_IMAGE_DPI, cache_dir=REPORT_IMAGE_DIR):
+    """
+    把结果图片缩放到图片框尺寸并重新压缩，返回嵌入报告用的图片路径
+
+    按源图片内容哈希与目标尺寸缓存；源图片已不大于目标尺寸时只重新压缩。
+    处理失败时返回原图路径。
+
+    :param width_emu: 图片框宽度（EMU）
+    :param height_emu: 图片框高度（EMU）
+    :param dpi: 目标分辨率，None 表示不处理
+    """
+    if dpi is None:
+        return image_path
+    try:
+        width, height = target_pixels(width_emu, height_emu, dpi)
+        key = f"{_file_hash(image_path)}_{width}x{height}"
+        for extension in (".png", ".jpg"):
+            cached = os.path.join(cache_dir, key + extension)
+            if os.path.exists(cached):
+                os.utime(cached)  # 记录访问时间，供LRU淘汰
+                return cached
+        with Image.open(image_path) as source:
+            image = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+        # 图片在框内拉伸显示：两个方向都不低于目标像素
+        scale = min(1.0, max(width / image.width, height / image.height))
+        if scale < 1.0:
+            image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                                 Image.LANCZOS)
+        extension, data = _encode(image)
+        if len(data) >= os.path.getsize(image_path):
+            return image_path
+        os.makedirs(cache_dir, exist_ok=True)
+        cached = os.path.join(cache_dir, key + extension)
+        temp_path = f"{cached}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, cached)
+        return cached
+    except (OSError, ValueError) as e:
+        logging.warning(f"报告图片压缩失败，使用原图: {image_path}, 错误: {str(e)}")
+        return image_path
+
+
+def evict_report_images(cache_dir=REPORT_IMAGE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """缓存目录超过上限时按访问时间从旧到新删除，返回删除的文件数"""
+    try:
+        entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith((".png", ".jpg"))]
+    except OSError:
+        return 0
+    stats = sorted((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries)
+    total = sum(size for _, size, _ in stats)
+    removed = 0
+    for _, size, path in stats:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    return removed
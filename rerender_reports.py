@@ -0,0 +1,168 @@
+"""
+批量重新生成PPT报告（模板更新后或补生成历史报告）
+
+从运行记录读取报告字段与结果图片，不重新运行仿真；多个任务在进程池中并行生成，
+每个进程的模板只解析一次。
+
+用法：
+    python rerender_reports.py --model Valve --date-from 2025-03-01 --workers 4
+    python rerender_reports.py "D:\\仿真自动化结果\\2025.3.7"      # 目录下的全部运行记录
+"""
+import argparse
+import concurrent.futures
+import logging
+import os
+import sys
+import time
+
+from report_engine import REPORT_IMAGES, record_fields, render_job_report
+from report_images import evict_report_images
+from results_index import INDEX_FILE, ResultsIndex
+from run_record import REPORT_ARTIFACTS, RUN_RECORD_SUFFIX, load_run_record
+
+
+# 默认并行进程数（报告生成以单核计算与读写为主）
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def report_images(record, report_folder):
+    """结果图片路径：优先取运行记录所在 Report 目录，其次取记录中的文件清单"""
+    name = record['inputs']['model_name']
+    artifacts = record.get('artifacts', {})
+    images = {}
+    for key in REPORT_IMAGES:
+        candidates = [os.path.join(report_folder, REPORT_ARTIFACTS[key].format(name=name))]
+        candidates += [path for path in artifacts.get(key, {}).values()]
+        images[key] = next((path for path in candidates if os.path.exists(path)), None)
+    return images
+
+
+def report_outputs(record, report_folder):
+    """报告输出路径：运行记录所在目录，以及记录中原报告所在的其他目录（仍存在时）"""
+    inputs = record['inputs']
+    ppt_name = f"{inputs['date']}_{inputs['operator']}_{inputs['model_name']}_{inputs['index']}.pptx"
+    folders = [report_folder] + [os.path.dirname(path)
+                                 for path in record.get('artifacts', {}).get('ppt_report', {}).values()]
+    outputs, seen = [], set()
+    for folder in folders:
+        key = os.path.normcase(os.path.abspath(folder))
+        if key not in seen and os.path.isdir(folder):
+            seen.add(key)
+            outputs.append(os.path.join(folder, ppt_name))
+    return outputs
+
+
+def rerender_record(record_path):
+    """
+    按运行记录重新生成一个报告（在进程池中执行）
+
+    :return: (记录路径, 输出路径列表, 错误信息或None)
+    """
+    try:
+        record = load_run_record(record_path)
+        if record is None:
+            return record_path, [], "运行记录无法读取"
+        if record.get('status') != "已完成":
+            return record_path, [], "任务未完成，跳过"
+        folder = os.path.dirname(os.path.abspath(record_path))
+        outputs = report_outputs(record, folder)
+        render_job_report(record_fields(record), report_images(record, folder), outputs)
+        return record_path, outputs, None
+    except Exception as e:
+        return record_path, [], f"{type(e).__name__}: {str(e)}"
+
+
+def find_records(paths):
+    """命令行给出的运行记录文件，或目录下的全部运行记录"""
+    records = []
+    for path in paths:
+        if os.path.isdir(path):
+            for current, _, files in os.walk(path):
+                records += [os.path.join(current, name) for name in files if name.endswith(RUN_RECORD_SUFFIX)]
+        else:
+            records.append(path)
+    return sorted(records)
+
+
+def rerender(record_paths, workers=DEFAULT_WORKERS, on_done=None):
+    """
+    并行重新生成报告
+
+    :param on_done: 每个任务完成后回调 on_done(记录路径, 输出路径列表, 错误信息)
+    :return: [(记录路径, 输出路径列表, 错误信息)]
+    """
+    results = []
+    if workers <= 1 or len(record_paths) <= 1:
+        for path in record_paths:
+            result = rerender_record(path)
+            results.append(result)
+            if on_done:
+                on_done(*result)
+        return results
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(rerender_record, path) for path in record_paths]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_done:
+                on_done(*result)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="批量重新生成PPT报告（从运行记录，不重新仿真）")
+    parser.add_argument('paths', nargs='*', help="运行记录文件或目录（不指定时按条件查询结果索引）")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="并行进程数")
+    parser.add_argument('--db', default=INDEX_FILE, help="索引数据库文件")
+    parser.add_argument('--root', default=None, help="结果根目录（默认公开结果目录）")
+    parser.add_argument('--model', help="模型名，可用 * 通配")
+    parser.add_argument('--fluid', help="工质")
+    parser.add_argument('--operator', help="操作员")
+    parser.add_argument('--date-from', help="起始日期 YYYY-MM-DD")
+    parser.add_argument('--date-to', help="结束日期 YYYY-MM-DD")
+    parser.add_argument('--dry-run', action='store_true', help="只列出要重新生成的任务")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.paths:
+        record_paths = find_records(args.paths)
+    else:
+        if args.root is None:
+            from sim_settings import PUBLIC_ROOT
+            args.root = PUBLIC_ROOT
+        index = ResultsIndex(args.db)
+        try:
+            index.scan(args.root)
+            rows = index.query(args.model, args.fluid, args.operator, args.date_from, args.date_to,
+                               status="已完成", limit=100000)
+        finally:
+            index.close()
+        record_paths = [row['record_path'] for row in rows if row.get('record_path')]
+    if args.dry_run:
+        for path in record_paths:
+            print(path)
+        print(f"共 {len(record_paths)} 个任务")
+        return 0
+
+    start = time.perf_counter()
+
+    def report(record_path, outputs, error):
+        if error:
+            logging.error(f"报告生成失败: {record_path}, {error}")
+        else:
+            logging.info(f"报告已重新生成: {', '.join(outputs)}")
+
+    results = rerender(record_paths, args.workers, report)
+    evict_report_images()
+    failed = sum(1 for _, _, error in results if error)
+    print(f"共 {len(results)} 个任务，失败 {failed} 个，用时 {time.perf_counter() - start:.1f} 秒"
+          f"（{args.workers} 个进程）")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
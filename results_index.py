@@ -0,0 +1,361 @@
+"""
+历史仿真结果索引
+
+增量扫描结果目录（日期/操作员/模型名_序号/Report），把运行记录中的关键指标写入
+SQLite 数据库，支持按模型、工质、操作员、日期与工况范围查询。
+
+用法：
+    python results_index.py scan [--root 目录]
+    python results_index.py query --model CV --fluid R1234yf --temperature 20 40 --date-from 2025-01-01
+    mainV1.7.exe index query --operator 张三
+"""
+import argparse
+import csv
+import datetime
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+
+from monitor_reader import read_last_value
+from run_record import RUN_RECORD_SUFFIX, load_run_record
+
+
+INDEX_FILE = "results_index.db"
+
+# 查询结果列（与 runs 表字段一致）
+RESULT_COLUMNS = ['job', 'date', 'operator', 'model_name', 'sim_index', 'fluid', 'temperature', 'pressure',
+                  'mass_flow', 'status', 'dp_pa', 'v_max', 'mach', 'mach_level', 'cell_count', 'total_seconds',
+                  'converged', 'model_path', 'report_folder', 'record_path']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    job TEXT PRIMARY KEY,
+    date TEXT,
+    date_folder TEXT,
+    operator TEXT,
+    model_name TEXT COLLATE NOCASE,
+    sim_index INTEGER,
+    fluid TEXT COLLATE NOCASE,
+    temperature REAL,
+    pressure REAL,
+    mass_flow REAL,
+    status TEXT,
+    dp_pa REAL,
+    v_max REAL,
+    mach REAL,
+    mach_level INTEGER,
+    cell_count INTEGER,
+    total_seconds REAL,
+    converged INTEGER,
+    model_path TEXT,
+    report_folder TEXT,
+    record_path TEXT,
+    source_mtime REAL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_model ON runs(model_name);
+CREATE INDEX IF NOT EXISTS idx_runs_fluid ON runs(fluid);
+CREATE INDEX IF NOT EXISTS idx_runs_operator ON runs(operator);
+CREATE INDEX IF NOT EXISTS idx_runs_date ON runs(date);
+CREATE INDEX IF NOT EXISTS idx_runs_condition ON runs(fluid, temperature, pressure);
+"""
+
+_DATE_FOLDER = re.compile(r"^(\d{4})\.(\d{1,2})\.(\d{1,2})$")
+_JOB_FOLDER = re.compile(r"^(.+)_(\d+)$")
+
+# 旧任务没有运行记录，从文本报告中提取
+_TEXT_FIELDS = {
+    'fluid': re.compile(r"流体工质:\s*(\S+)"),
+    'temperature': re.compile(r"入口温度:\s*([-\d.]+)"),
+    'pressure': re.compile(r"入口绝对压力:\s*([-\d.]+)"),
+    'mass_flow': re.compile(r"入口质量流量:\s*([-\d.eE]+)"),
+    'model_path': re.compile(r"导入数模路径:\s*(.+)"),
+    'mach': re.compile(r"最大马赫数:\s*([\d.]+)"),
+}
+
+
+def iso_date(date_folder):
+    """日期目录名（2025.3.7）转为 2025-03-07，无法识别返回None"""
+    match = _DATE_FOLDER.match(date_folder)
+    if not match:
+        return None
+    return f"{int(match.group(1)):04d}-{int(match.group(2)):02d}-{int(match.group(3)):02d}"
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _last_value(csv_path):
+    """监测曲线导出文件最后一行最后一列"""
+    try:
+        return _float(read_last_value(csv_path))
+    except OSError:
+        return None
+
+
+def row_from_record(record):
+    """运行记录 -> 索引行"""
+    inputs = record.get('inputs', {})
+    results = record.get('results', {})
+    convergence = (record.get('convergence') or {}).get('dp') or {}
+    return {
+        'status': record.get('status'),
+        'fluid': inputs.get('fluid'),
+        'temperature': _float(inputs.get('temperature')),
+        'pressure': _float(inputs.get('pressure')),
+        'mass_flow': _float(inputs.get('mass_flow_value', inputs.get('mass_flow'))),
+        'model_path': inputs.get('model_path'),
+        'dp_pa': results.get('dp_pa'),
+        'v_max': results.get('v_max'),
+        'mach': results.get('mach'),
+        'mach_level': results.get('mach_level'),
+        'cell_count': (record.get('resources') or {}).get('cell_count'),
+        'total_seconds': (record.get('timings') or {}).get('total_seconds'),
+        'converged': None if not convergence else int(bool(convergence.get('converged'))),
+    }
+
+
+def row_from_text_report(report_folder, name, text_path):
+    """旧任务：由文本报告与压降CSV提取索引行"""
+    try:
+        with open(text_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return None
+    values = {}
+    for key, pattern in _TEXT_FIELDS.items():
+        match = pattern.search(text)
+        values[key] = match.group(1).strip() if match else None
+    return {
+        'status': "已完成",
+        'fluid': values['fluid'],
+        'temperature': _float(values['temperature']),
+        'pressure': _float(values['pressure']),
+        'mass_flow': _float(values['mass_flow']),
+        'model_path': values['model_path'],
+        'dp_pa': _last_value(os.path.join(report_folder, f"{name}_average_pressure.csv")),
+        'v_max': _last_value(os.path.join(report_folder, f"{name}_V_max.csv")),
+        'mach': _float(values['mach']),
+        'mach_level': None,
+        'cell_count': None,
+        'total_seconds': None,
+        'converged': None,
+    }
+
+
+class ResultsIndex:
+    """结果索引数据库"""
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _known_mtimes(self):
+        return {row['job']: row['source_mtime'] for row in
+                self.connection.execute("SELECT job, source_mtime FROM runs")}
+
+    def scan(self, root):
+        """
+        增量扫描结果目录：只重新读取运行记录（或文本报告）修改时间变化的任务
+
+        :param root: 结果根目录（如 D:\\仿真自动化结果）
+        :return: (新增或更新的任务数, 删除的任务数)
+        """
+        known = self._known_mtimes()
+        seen = set()
+        updated = 0
+        for date_entry in _scandir(root):
+            date = iso_date(date_entry.name)
+            if date is None or not date_entry.is_dir():
+                continue
+            for operator_entry in _scandir(date_entry.path):
+                if not operator_entry.is_dir():
+                    continue
+                for job_entry in _scandir(operator_entry.path):
+                    match = _JOB_FOLDER.match(job_entry.name)
+                    if not match or not job_entry.is_dir():
+                        continue
+                    name, index = match.group(1), int(match.group(2))
+                    job = f"{date_entry.name}/{operator_entry.name}/{job_entry.name}"
+                    report_folder = os.path.join(job_entry.path, "Report")
+                    record_path = os.path.join(report_folder, f"{name}{RUN_RECORD_SUFFIX}")
+                    source = record_path
+                    try:
+                        mtime = os.stat(record_path).st_mtime
+                    except OSError:
+                        source = os.path.join(report_folder, f"{name}_仿真报告.txt")
+                        try:
+                            mtime = os.stat(source).st_mtime
+                        except OSError:
+                            continue  # 未完成或失败且无记录的任务
+                    seen.add(job)
+                    if known.get(job) == mtime:
+                        continue
+                    if source == record_path:
+                        record = load_run_record(record_path)
+                        row = row_from_record(record) if record else None
+                    else:
+                        row = row_from_text_report(report_folder, name, source)
+                        record_path = None
+                    if row is None:
+                        continue
+                    row.update({
+                        'job': job, 'date': date, 'date_folder': date_entry.name, 'operator': operator_entry.name,
+                        'model_name': name, 'sim_index': index, 'report_folder': report_folder,
+                        'record_path': record_path, 'source_mtime': mtime,
+                    })
+                    columns = list(row)
+                    self.connection.execute(
+                        f"INSERT OR REPLACE INTO runs ({', '.join(columns)}) "
+                        f"VALUES ({', '.join('?' for _ in columns)})", [row[c] for c in columns])
+                    updated += 1
+        removed = [job for job in known if job not in seen]
+        self.connection.executemany("DELETE FROM runs WHERE job = ?", [(job,) for job in removed])
+        self.connection.commit()
+        logging.info(f"结果索引已更新: 新增/更新 {updated} 条，删除 {len(removed)} 条")
+        return updated, len(removed)
+
+    def query(self, model=None, fluid=None, operator=None, date_from=None, date_to=None,
+              temperature=None, pressure=None, mass_flow=None, status=None, limit=1000):
+        """
+        查询历史结果
+
+        :param model: 模型名（不含扩展名，不区分大小写，可用 * 通配）
+        :param fluid: 工质
+        :param operator: 操作员
+        :param date_from: 起始日期（YYYY-MM-DD，含）
+        :param date_to: 结束日期（YYYY-MM-DD，含）
+        :param temperature: (下限, 上限)，任一端为None表示不限
+        :param pressure: (下限, 上限)
+        :param mass_flow: (下限, 上限)
+        :param status: 任务状态
+        :param limit: 最多返回条数
+        :return: 结果字典列表（按日期倒序，同一日期按模型名、序号倒序）
+        """
+        clauses, args = [], []
+        if model:
+            model = os.path.splitext(os.path.basename(model))[0] if '*' not in model else model
+            if '*' in model:
+                # 模型名中常有 _，需转义后再把 * 换成通配符 %
+                clauses.append("model_name LIKE ? ESCAPE '\\'")
+                args.append(model.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_').replace('*', '%'))
+            else:
+                clauses.append("model_name = ?")
+                args.append(model)
+        for column, value in (('fluid', fluid), ('operator', operator), ('status', status)):
+            if value:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if date_from:
+            clauses.append("date >= ?")
+            args.append(date_from)
+        if date_to:
+            clauses.append("date <= ?")
+            args.append(date_to)
+        for column, bounds in (('temperature', temperature), ('pressure', pressure), ('mass_flow', mass_flow)):
+            if not bounds:
+                continue
+            low, high = bounds
+            if low is not None:
+                clauses.append(f"{column} >= ?")
+                args.append(low)
+            if high is not None:
+                clauses.append(f"{column} <= ?")
+                args.append(high)
+        sql = f"SELECT {', '.join(RESULT_COLUMNS + ['date_folder'])} FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY date DESC, model_name, sim_index DESC LIMIT ?"
+        args.append(limit)
+        return [dict(row) for row in self.connection.execute(sql, args)]
+
+    def distinct(self, column):
+        """某一列的全部取值（用于界面下拉框）"""
+        if column not in ('fluid', 'operator', 'model_name'):
+            raise ValueError(f"不支持的列: {column}")
+        return [row[0] for row in self.connection.execute(
+            f"SELECT DISTINCT {column} FROM runs WHERE {column} IS NOT NULL ORDER BY {column}")]
+
+
+def _scandir(path):
+    try:
+        return list(os.scandir(path))
+    except OSError:
+        return []
+
+
+def _range(values):
+    return (values[0], values[1]) if values else None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="历史仿真结果索引")
+    parser.add_argument('--db', default=INDEX_FILE, help="索引数据库文件")
+    parser.add_argument('--root', default=None, help="结果根目录（默认公开结果目录）")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('scan', help="增量扫描结果目录")
+    query = sub.add_parser('query', help="查询（查询前自动增量扫描）")
+    query.add_argument('--model', help="模型名，可用 * 通配")
+    query.add_argument('--fluid', help="工质")
+    query.add_argument('--operator', help="操作员")
+    query.add_argument('--date-from', help="起始日期 YYYY-MM-DD")
+    query.add_argument('--date-to', help="结束日期 YYYY-MM-DD")
+    query.add_argument('--temperature', type=float, nargs=2, metavar=('MIN', 'MAX'), help="入口温度范围（°C）")
+    query.add_argument('--pressure', type=float, nargs=2, metavar=('MIN', 'MAX'), help="入口压力范围（MPa）")
+    query.add_argument('--mass-flow', type=float, nargs=2, metavar=('MIN', 'MAX'), help="质量流量范围（kg/s）")
+    query.add_argument('--status', help="任务状态，如 已完成")
+    query.add_argument('--limit', type=int, default=1000)
+    query.add_argument('--format', choices=['table', 'csv', 'json'], default='table')
+    query.add_argument('--no-scan', action='store_true', help="不扫描，直接查询已有索引")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.root is None:
+        from sim_settings import PUBLIC_ROOT
+        args.root = PUBLIC_ROOT
+    index = ResultsIndex(args.db)
+    try:
+        if args.command == 'scan' or not args.no_scan:
+            index.scan(args.root)
+        if args.command == 'scan':
+            return 0
+        rows = index.query(args.model, args.fluid, args.operator, args.date_from, args.date_to,
+                           _range(args.temperature), _range(args.pressure), _range(args.mass_flow),
+                           args.status, args.limit)
+    finally:
+        index.close()
+
+    if args.format == 'json':
+        json.dump(rows, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    elif args.format == 'csv':
+        writer = csv.DictWriter(sys.stdout, fieldnames=RESULT_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        columns = ['job', 'fluid', 'temperature', 'pressure', 'mass_flow', 'dp_pa', 'mach', 'status']
+        print("\t".join(columns))
+        for row in rows:
+            print("\t".join("" if row[c] is None else f"{row[c]:.4g}" if isinstance(row[c], float) else str(row[c])
+                            for c in columns))
+        print(f"共 {len(rows)} 条 ({datetime.datetime.now():%Y-%m-%d %H:%M})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,374 @@
+"""
+仿真结果保留与压缩策略
+
+按任务时间分级处理私有结果目录中的 .sim 文件：
+    超过 strip_after_days      清除求解数据，只保留网格（需要 STAR-CCM+，未指定时跳过）
+    超过 compress_after_days   压缩为 .sim.gz
+    超过 delete_after_days     删除 .sim，只保留 Report 中的结果
+私有与公开 Report 目录中内容相同的文件（.sce、图片、CSV等）改为硬链接，只占一份空间；
+按操作员与日期检查配额，超出时从最旧的任务开始删除 .sim。
+模型库（ModelStore）中已没有任务引用的模型文件一并删除。
+
+默认只输出清理计划（dry-run），加 --apply 才执行。可用 Windows 计划任务在后台定期运行：
+    schtasks /create /sc daily /st 02:00 /tn 仿真结果清理 /tr "mainV1.7.exe retention --apply"
+"""
+import argparse
+import datetime
+import filecmp
+import gzip
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from job_scheduler import build_starccm_command
+from model_store import MODEL_STORE_FOLDER, ModelStore
+from results_index import iso_date
+
+
+RETENTION_POLICY = {
+    'min_age_days': 2,             # 不处理更新的任务（可能仍在计算或查看）
+    'strip_after_days': 14,
+    'compress_after_days': 30,
+    'delete_after_days': 180,
+    'operator_quota_gb': 500,      # 每个操作员（私有+公开目录）配额，None 表示不限
+    'date_quota_gb': 200,          # 每个日期目录配额，None 表示不限
+    'dedup_reports': True,
+}
+RETENTION_STATE_FILE = "retention_state.json"
+# 计划阶段无法得知实际压缩与清除效果，按经验比例估算释放空间
+STRIP_RECLAIM_ESTIMATE = 0.5
+COMPRESS_RECLAIM_ESTIMATE = 0.3
+
+# 清除求解数据后保存（保留网格与设置）
+STRIP_MACRO = """import star.common.*;
+
+public class RetentionStripSolution extends StarMacro {
+  public void execute() {
+    Simulation simulation_0 = getActiveSimulation();
+    simulation_0.getSolution().clearSolution(Solution.Clear.History, Solution.Clear.Fields);
+    simulation_0.saveState(simulation_0.getSessionPath());
+  }
+}
+"""
+
+ACTION_LABELS = {
+    'strip': "清除求解数据",
+    'compress': "压缩",
+    'delete': "删除",
+    'link': "硬链接去重",
+    'prune': "删除无引用模型",
+}
+
+
+def iter_jobs(root):
+    """遍历结果目录下的任务：产出 (日期目录, 操作员, 任务目录名, 任务目录路径)"""
+    for date_entry in _scandir(root):
+        if not date_entry.is_dir() or iso_date(date_entry.name) is None:
+            continue
+        for operator_entry in _scandir(date_entry.path):
+            if not operator_entry.is_dir():
+                continue
+            for job_entry in _scandir(operator_entry.path):
+                if job_entry.is_dir():
+                    yield date_entry.name, operator_entry.name, job_entry.name, job_entry.path
+
+
+def _scandir(path):
+    try:
+        return sorted(os.scandir(path), key=lambda entry: entry.name)
+    except OSError:
+        return []
+
+
+def folder_usage(folder, seen_inodes):
+    """目录占用字节数，已统计过的硬链接文件不重复计算"""
+    total = 0
+    for current, _, files in os.walk(folder):
+        for name in files:
+            try:
+                stat = os.stat(os.path.join(current, name))
+            except OSError:
+                continue
+            inode = (stat.st_dev, stat.st_ino)
+            if stat.st_ino and inode in seen_inodes:
+                continue
+            seen_inodes.add(inode)
+            total += stat.st_size
+    return total
+
+
+def _sim_files(job_folder):
+    folder = os.path.join(job_folder, "Simulation")
+    return [entry.path for entry in _scandir(folder)
+            if entry.is_file() and (entry.name.endswith(".sim") or entry.name.endswith(".sim.gz"))]
+
+
+class RetentionManager:
+    """生成并执行清理计划"""
+
+    def __init__(self, sim_root, public_root, policy=None, starccm_path=None, now=None):
+        self.sim_root = sim_root
+        self.public_root = public_root
+        self.policy = dict(RETENTION_POLICY, **(policy or {}))
+        self.starccm_path = starccm_path
+        self.now = now or datetime.datetime.now()
+        self.state_path = os.path.join(sim_root, RETENTION_STATE_FILE)
+        self.state = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'stripped': []}
+
+    def _save_state(self):
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+
+    def _age_days(self, path):
+        modified = datetime.datetime.fromtimestamp(os.stat(path).st_mtime)
+        return (self.now - modified).total_seconds() / 86400
+
+    def _relative(self, path):
+        return os.path.relpath(path, self.sim_root)
+
+    def _sim_actions(self, sim_path, age):
+        """单个 .sim 文件按时间分级的处理"""
+        policy = self.policy
+        size = os.path.getsize(sim_path)
+        compressed = sim_path.endswith(".gz")
+        if age >= policy['delete_after_days']:
+            return [{'action': 'delete', 'path': sim_path, 'bytes': size, 'estimated': False,
+                     'reason': f"超过 {policy['delete_after_days']} 天"}]
+        actions = []
+        stripped = self._relative(sim_path) in self.state['stripped']
+        if not compressed and not stripped and self.starccm_path and age >= policy['strip_after_days']:
+            reclaim = int(size * STRIP_RECLAIM_ESTIMATE)
+            actions.append({'action': 'strip', 'path': sim_path, 'bytes': reclaim, 'estimated': True,
+                            'reason': f"超过 {policy['strip_after_days']} 天"})
+            size -= reclaim
+        if not compressed and age >= policy['compress_after_days']:
+            actions.append({'action': 'compress', 'path': sim_path, 'bytes': int(size * COMPRESS_RECLAIM_ESTIMATE),
+                            'estimated': True, 'reason': f"超过 {policy['compress_after_days']} 天"})
+        return actions
+
+    def _dedup_actions(self, job_folder, public_folder):
+        """私有与公开 Report 中内容相同的文件"""
+        actions = []
+        private_report = os.path.join(job_folder, "Report")
+        public_report = os.path.join(public_folder, "Report")
+        for entry in _scandir(private_report):
+            public_path = os.path.join(public_report, entry.name)
+            if not entry.is_file() or not os.path.isfile(public_path):
+                continue
+            try:
+                if os.path.samefile(entry.path, public_path):
+                    continue
+                if os.path.getsize(entry.path) != os.path.getsize(public_path) or \
+                        not filecmp.cmp(entry.path, public_path, shallow=False):
+                    continue
+            except OSError:
+                continue
+            actions.append({'action': 'link', 'path': public_path, 'source': entry.path,
+                            'bytes': os.path.getsize(public_path), 'estimated': False, 'reason': "与私有目录内容相同"})
+        return actions
+
+    def plan(self):
+        """
+        生成清理计划
+
+        :return: 动作列表，每项 {'action', 'path', 'bytes', 'estimated', 'reason', 'job'}
+        """
+        policy = self.policy
+        actions = []
+        jobs = []
+        seen_inodes = set()
+        for date_folder, operator, job_name, job_folder in iter_jobs(self.sim_root):
+            job = f"{date_folder}/{operator}/{job_name}"
+            public_folder = os.path.join(self.public_root, date_folder, operator, job_name)
+            usage = folder_usage(job_folder, seen_inodes) + folder_usage(public_folder, seen_inodes)
+            sims = _sim_files(job_folder)
+            ages = [self._age_days(path) for path in sims]
+            age = max(ages) if ages else self._age_days(job_folder)
+            job_actions = []
+            if age >= policy['min_age_days']:
+                for sim_path, sim_age in zip(sims, ages):
+                    job_actions += self._sim_actions(sim_path, sim_age)
+                if policy['dedup_reports']:
+                    job_actions += self._dedup_actions(job_folder, public_folder)
+            for action in job_actions:
+                action['job'] = job
+            actions += job_actions
+            jobs.append({'job': job, 'date': date_folder, 'operator': operator, 'age': age, 'usage': usage,
+                         'sims': sims, 'reclaim': sum(action['bytes'] for action in job_actions)})
+        actions += self._quota_actions(jobs, actions)
+        actions += self._prune_actions()
+        return actions
+
+    def _prune_actions(self):
+        """模型库中没有任务引用的模型（任务目录已删除）"""
+        store = ModelStore(os.path.join(self.sim_root, MODEL_STORE_FOLDER))
+        return [{'action': 'prune', 'path': path, 'bytes': size, 'estimated': False, 'reason': "没有任务引用",
+                 'job': None} for path, size in store.unreferenced()]
+
+    def _quota_actions(self, jobs, actions):
+        """配额检查：超出时从最旧的任务开始删除 .sim（替换该文件已有的压缩/清除动作）"""
+        extra = []
+        for key, quota_gb in (('operator', self.policy['operator_quota_gb']), ('date', self.policy['date_quota_gb'])):
+            if not quota_gb:
+                continue
+            quota = quota_gb * 1024 ** 3
+            groups = {}
+            for job in jobs:
+                groups.setdefault(job[key], []).append(job)
+            for group, group_jobs in groups.items():
+                usage = sum(job['usage'] - job['reclaim'] for job in group_jobs)
+                for job in sorted(group_jobs, key=lambda item: -item['age']):
+                    if usage <= quota:
+                        break
+                    if job['age'] < self.policy['min_age_days']:
+                        continue
+                    for sim_path in job['sims']:
+                        if any(a['action'] == 'delete' and a['path'] == sim_path for a in actions + extra):
+                            continue
+                        planned = [a for a in actions if a['path'] == sim_path]
+                        for action in planned:
+                            actions.remove(action)
+                        size = os.path.getsize(sim_path)
+                        usage -= size - sum(action['bytes'] for action in planned)
+                        job['reclaim'] += size - sum(action['bytes'] for action in planned)
+                        extra.append({'action': 'delete', 'path': sim_path, 'bytes': size, 'estimated': False,
+                                      'reason': f"{'操作员' if key == 'operator' else '日期'} {group} 超出配额 {quota_gb} GB",
+                                      'job': job['job']})
+                if usage > quota:
+                    logging.warning(f"{group} 删除全部可删除的 .sim 后仍超出配额: {format_bytes(usage)}")
+        return extra
+
+    def apply(self, actions):
+        """
+        执行清理计划
+
+        :return: 实际释放的字节数
+        """
+        reclaimed = 0
+        for action in actions:
+            path = action['path']
+            try:
+                if action['action'] == 'delete':
+                    if not os.path.exists(path):
+                        continue
+                    size = os.path.getsize(path)
+                    os.remove(path)
+                    reclaimed += size
+                elif action['action'] == 'strip':
+                    reclaimed += self._strip(path)
+                elif action['action'] == 'compress':
+                    if os.path.exists(path):
+                        reclaimed += self._compress(path)
+                elif action['action'] == 'link':
+                    size = os.path.getsize(path)
+                    temp_path = f"{path}.{os.getpid()}.link"
+                    os.link(action['source'], temp_path)
+                    os.replace(temp_path, path)
+                    reclaimed += size
+                elif action['action'] == 'prune':
+                    if os.path.exists(path):
+                        reclaimed += ModelStore.remove_unreferenced(path)
+                logging.info(f"{ACTION_LABELS[action['action']]}: {path}")
+            except (OSError, subprocess.SubprocessError) as e:
+                logging.error(f"{ACTION_LABELS[action['action']]}失败: {path}, 错误: {str(e)}")
+        self._save_state()
+        return reclaimed
+
+    def _strip(self, sim_path):
+        """用 STAR-CCM+ 清除求解数据并保存，返回释放的字节数"""
+        stat = os.stat(sim_path)
+        macro_dir = tempfile.mkdtemp(prefix="retention_")
+        macro_path = os.path.join(macro_dir, "RetentionStripSolution.java")
+        with open(macro_path, 'w', encoding='utf-8') as f:
+            f.write(STRIP_MACRO)
+        try:
+            result = subprocess.run(build_starccm_command(self.starccm_path, 1, macro_path, sim_path),
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        finally:
+            shutil.rmtree(macro_dir, ignore_errors=True)
+        if result.returncode != 0:
+            raise subprocess.SubprocessError(f"STAR-CCM+ 返回码 {result.returncode}")
+        # 保留原修改时间，后续分级仍按任务完成时间计算
+        os.utime(sim_path, (stat.st_atime, stat.st_mtime))
+        self.state['stripped'].append(self._relative(sim_path))
+        return max(stat.st_size - os.path.getsize(sim_path), 0)
+
+    @staticmethod
+    def _compress(path):
+        """压缩为 .gz（保留修改时间），返回释放的字节数"""
+        before = os.path.getsize(path)
+        temp_path = f"{path}.gz.tmp"
+        with open(path, 'rb') as source, gzip.open(temp_path, 'wb', compresslevel=6) as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        shutil.copystat(path, temp_path)
+        os.replace(temp_path, f"{path}.gz")
+        os.remove(path)
+        return before - os.path.getsize(f"{path}.gz")
+
+
+def format_bytes(size):
+    if size >= 1024 ** 3:
+        return f"{size / 1024 ** 3:,.2f} GB"
+    return f"{size / 1024 ** 2:,.1f} MB"
+
+
+def format_report(actions):
+    """清理计划文本报告"""
+    lines = []
+    totals = {}
+    for action in actions:
+        label = ACTION_LABELS[action['action']]
+        size = f"{'≈' if action['estimated'] else ''}{format_bytes(action['bytes'])}"
+        lines.append(f"{label}\t{size}\t{action['reason']}\t{action['path']}")
+        totals[label] = totals.get(label, 0) + action['bytes']
+    lines.append("")
+    for label, size in totals.items():
+        lines.append(f"{label}: {format_bytes(size)}")
+    lines.append(f"预计共释放: {format_bytes(sum(totals.values()))}（≈ 为估算值）")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="仿真结果保留与压缩策略")
+    parser.add_argument('--sim-root', help="私有结果根目录（默认程序设置）")
+    parser.add_argument('--public-root', help="公开结果根目录（默认程序设置）")
+    parser.add_argument('--policy', help="策略JSON文件，覆盖默认策略中的同名项")
+    parser.add_argument('--starccm', help="starccmw 路径（指定后才清除旧 .sim 的求解数据）")
+    parser.add_argument('--apply', action='store_true', help="执行清理（默认只输出计划）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.sim_root is None or args.public_root is None:
+        from sim_settings import PUBLIC_ROOT, SIM_ROOT
+        args.sim_root = args.sim_root or SIM_ROOT
+        args.public_root = args.public_root or PUBLIC_ROOT
+    policy = None
+    if args.policy:
+        with open(args.policy, 'r', encoding='utf-8') as f:
+            policy = json.load(f)
+    manager = RetentionManager(args.sim_root, args.public_root, policy, args.starccm)
+    actions = manager.plan()
+    print(format_report(actions))
+    if args.apply:
+        reclaimed = manager.apply(actions)
+        print(f"实际释放: {format_bytes(reclaimed)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
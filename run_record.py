@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import platform
+
+from monitor_reader import read_history
+
+
+# 运行记录文件名后缀（与报告一起保存在 Report 目录）
+RUN_RECORD_SUFFIX = "_run_record.json"
+RUN_RECORD_VERSION = 1
+
+# 收敛判断：最后一段迭代中监测值的相对波动不超过该值视为收敛
+CONVERGENCE_WINDOW = 0.1
+CONVERGENCE_TOLERANCE = 0.01
+
+# Report 目录中的结果文件（{name} 替换为模型名）
+REPORT_ARTIFACTS = {
+    'pressure_csv': "{name}_pressure.csv",
+    'average_pressure_csv': "{name}_average_pressure.csv",
+    'v_max_csv': "{name}_V_max.csv",
+    'pressure_png': "{name}_压力云图.png",
+    'pressure_sce': "{name}_压力云图.sce",
+    'streamline_png': "{name}_流线图.png",
+    'streamline_sce': "{name}_流线图.sce",
+    'mach_png': "{name}_Ma_0.3区域图.png",
+    'mach_sce': "{name}_Ma_0.3区域图.sce",
+    'fluid_domain_png': "{name}_流体域图.png",
+    'convergence_png': "{name}_压降收敛曲线图.png",
+    'text_report': "{name}_仿真报告.txt",
+    'monitor_store': "{name}_monitors.npz",
+}
+
+
+def job_key(job):
+    """任务标识：日期/操作员/模型名_序号"""
+    return f"{job['datenow']}/{job['operator_name']}/{job['name']}_{job['index']}"
+
+
+def read_monitor_history(csv_path):
+    """
+    读取监测曲线导出文件
+
+    :return: (迭代步列表, 监测值列表)，文件不存在或无数据返回 ([], [])
+    """
+    return read_history(csv_path)
+
+
+def convergence_stats(values, window=CONVERGENCE_WINDOW, tolerance=CONVERGENCE_TOLERANCE):
+    """
+    监测值收敛统计
+
+    :param values: 监测值历史
+    :param window: 统计最后多少比例的迭代（至少10步）
+    :param tolerance: 收敛判断的相对波动
+    :return: 统计字典，无数据返回None
+    """
+    if not values:
+        return None
+    count = max(int(len(values) * window), min(10, len(values)))
+    tail = values[-count:]
+    mean = sum(tail) / len(tail)
+    std = (sum((v - mean) ** 2 for v in tail) / len(tail)) ** 0.5
+    final = values[-1]
+    relative_range = (max(tail) - min(tail)) / abs(final) if final else None
+    return {
+        'iterations': len(values),
+        'final': final,
+        'window': count,
+        'mean': mean,
+        'std': std,
+        'relative_range': relative_range,
+        'converged': relative_range is not None and relative_range <= tolerance,
+    }
+
+
+def collect_artifacts(job):
+    """收集任务生成的文件路径（只包含实际存在的文件）"""
+    name = job['name']
+    artifacts = {}
+    for key, pattern in REPORT_ARTIFACTS.items():
+        for scope, folder in (('private', job['report_subfolder']), ('public', job['report_subfolder_public'])):
+            path = os.path.join(folder, pattern.format(name=name))
+            if os.path.exists(path):
+                artifacts.setdefault(key, {})[scope] = path
+    ppt_name = f"{job['datenow']}_{job['operator_name']}_{name}_{job['index']}.pptx"
+    for scope, folder in (('private', job['report_subfolder']), ('public', job['report_subfolder_public'])):
+        if os.path.exists(os.path.join(folder, ppt_name)):
+            artifacts.setdefault('ppt_report', {})[scope] = os.path.join(folder, ppt_name)
+    # 启用草稿目录时 .sim 可能仍在后台转移中，记录最终路径
+    if os.path.exists(job['sim_path']) or os.path.exists(job.get('work_sim_path', "")):
+        artifacts['simulation'] = {'private': job['sim_path']}
+    log_path = os.path.join(job['log_folder'], f"{name}.log")
+    if os.path.exists(log_path):
+        artifacts['log'] = {'private': log_path}
+    return artifacts
+
+
+def build_run_record(job, status, started, finished, stage_times, stage_timer=None, results=None,
+                     mesh_np=None, solve_np=None):
+    """
+    生成任务运行记录
+
+    :param job: prepare_job 返回的任务字典
+    :param status: "已完成" / "失败"
+    :param started: 开始时间（datetime）
+    :param finished: 结束时间（datetime）
+    :param stage_times: 各进程阶段用时（秒）
+    :param stage_timer: stage_markers.StageTimer 实例
+    :param results: 计算结果 {'dp_pa', 'v_max', 'mach', 'mach_level'}
+    :param mesh_np: 网格阶段核数
+    :param solve_np: 求解阶段核数
+    :return: 记录字典
+    """
+    _, dp_history = read_monitor_history(os.path.join(job['report_subfolder'], f"{job['name']}_average_pressure.csv"))
+    _, v_history = read_monitor_history(os.path.join(job['report_subfolder'], f"{job['name']}_V_max.csv"))
+    return {
+        'version': RUN_RECORD_VERSION,
+        'job': job_key(job),
+        'status': status,
+        'host': platform.node(),
+        'started': started.strftime("%Y-%m-%d %H:%M:%S"),
+        'finished': finished.strftime("%Y-%m-%d %H:%M:%S"),
+        'inputs': {
+            'model_name': job['name'],
+            'model_path': job['model_import_path'],
+            'index': job['index'],
+            'date': job['datenow'],
+            'operator': job['operator_name'],
+            'fluid': job['workingfluid'],
+            'temperature': job['temperature'],
+            'pressure': job['pressure'],
+            'mass_flow': job['mass_flow'],
+            'mass_flow_value': job.get('mass_flow_value'),
+            'max_steps': int(job['max_steps']),
+            'threads': int(job['threads']),
+            'base_size': job['base_size'],
+            'target_surface_ratio': job['target_surface_ratio'],
+            'min_surface_ratio': job['min_surface_ratio'],
+            'prisma_layer_thickness_ratio': job['prisma_layer_thickness_ratio'],
+            'prisma_layer_extension': job['prisma_layer_extension'],
+            'render_profile': job.get('render_profile'),
+        },
+        'fluid_properties': {
+            'density': job['density'],
+            'viscosity': job['viscosity'],
+            'speed_of_sound': job['speed_of_sound'],
+        },
+        'timings': {
+            'total_seconds': round((finished - started).total_seconds(), 1),
+            'stages': {k: round(v, 1) for k, v in stage_times.items()},
+            'macro_stages': {k: dict(v, seconds=round(v['seconds'], 1))
+                             for k, v in (stage_timer.timings if stage_timer else {}).items()},
+        },
+        'resources': {
+            'mesh_np': mesh_np,
+            'solve_np': solve_np,
+            'cell_count': stage_timer.cell_count if stage_timer else None,
+            'estimated_cells': job.get('estimated_cells'),
+            'peak_client_mem_mb': stage_timer.peak_mem_mb if stage_timer else None,
+        },
+        'results': results or {},
+        'convergence': {
+            'dp': convergence_stats(dp_history),
+            'v_max': convergence_stats(v_history),
+        },
+        'artifacts': collect_artifacts(job),
+    }
+
+
+def write_run_record(record, folders):
+    """
+    写入运行记录（私有与公开 Report 目录各一份）
+
+    :return: 写入的文件路径列表
+    """
+    name = record['inputs']['model_name']
+    paths = []
+    for folder in folders:
+        path = os.path.join(folder, f"{name}{RUN_RECORD_SUFFIX}")
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(record, f, ensure_ascii=False, indent=2)
+            paths.append(path)
+        except OSError as e:
+            logging.error(f"写入运行记录失败: {path}, 错误: {str(e)}")
+    return paths
+
+
+def load_run_record(path):
+    """读取运行记录，失败返回None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"读取运行记录失败: {path}, 错误: {str(e)}")
+        return None
+
+
+def find_run_record(report_folder, name):
+    """Report 目录下的运行记录路径，不存在返回None"""
+    path = os.path.join(report_folder, f"{name}{RUN_RECORD_SUFFIX}")
+    return path if os.path.exists(path) else None
+
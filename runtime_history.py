@@ -0,0 +1,284 @@
+import datetime
+import json
+import logging
+import os
+import platform
+
+
+# 运行时长历史记录文件（与 sim_config.json 同目录，每行一条JSON记录）
+HISTORY_FILE = "runtime_history.jsonl"
+
+# 队列执行顺序策略
+ORDER_POLICIES = {
+    'fifo': "提交顺序",
+    'sjf': "最短优先",
+    'deadline': "截止时间优先",
+}
+
+DEADLINE_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def model_size_mb(model_path):
+    """模型文件大小（MB），文件不存在返回None"""
+    try:
+        return os.path.getsize(model_path) / (1024 * 1024)
+    except OSError:
+        return None
+
+
+def make_record(job, stages, status, mesh_np=None, solve_np=None, cell_count=None, macro_stages=None,
+                resources=None):
+    """
+    根据任务字典生成一条运行时长记录
+
+    :param job: prepare_job 返回的任务字典
+    :param stages: 各阶段用时（秒），如 {'prepare': 3.1, 'mesh': 620.0, 'solve': 2400.0, 'post': 12.5}
+    :param status: 任务状态（"已完成" / "失败"）
+    :param mesh_np: 网格阶段核数
+    :param solve_np: 求解阶段核数
+    :param cell_count: 体网格数量（未知为None）
+    :param macro_stages: 宏阶段标记汇总（StageTimer.timings）
+    :param resources: 资源占用 {'sim_bytes', 'report_bytes', 'memory_peak_mb'}（供准入控制估算）
+    :return: 记录字典
+    """
+    record = {
+        'time': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'host': platform.node(),
+        'job': f"{job['datenow']}/{job['operator_name']}/{job['name']}_{job['index']}",
+        'model_name': job['name'],
+        'model_path': job['model_import_path'],
+        'model_size_mb': model_size_mb(job['model_import_path']),
+        'fluid': job['workingfluid'],
+        'temperature': job['temperature'],
+        'pressure': job['pressure'],
+        'mass_flow': job['mass_flow'],
+        'max_steps': int(job['max_steps']),
+        'threads': int(job['threads']),
+        'mesh_np': mesh_np,
+        'solve_np': solve_np,
+        'cell_count': cell_count,
+        'estimated_cells': job.get('estimated_cells'),
+        'bbox_volume_mm3': job.get('bbox_volume_mm3'),
+        'base_size': job.get('base_size'),
+        'stages': {k: round(v, 1) for k, v in stages.items()},
+        'macro_stages': {k: dict(v, seconds=round(v['seconds'], 1)) for k, v in (macro_stages or {}).items()},
+        'total_seconds': round(sum(stages.values()), 1),
+        'status': status,
+    }
+    record.update(resources or {})
+    return record
+
+
+class RuntimeHistory:
+    """仿真运行时长历史记录（JSON Lines）"""
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self._records = []
+        self._mtime = None
+
+    def append(self, record):
+        """追加一条记录"""
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logging.error(f"写入运行时长记录失败: {str(e)}")
+
+    def load(self):
+        """读取全部记录（文件未变化时直接返回缓存）"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return []
+        if mtime == self._mtime:
+            return self._records
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logging.warning(f"跳过损坏的运行时长记录: {line[:80]}")
+        self._records = records
+        self._mtime = mtime
+        return records
+
+
+def _fit_line(xs, ys):
+    """一元最小二乘拟合 y = a + b*x，返回 (a, b)；样本不足返回None"""
+    n = len(xs)
+    if n < 3:
+        return None
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx <= 0:
+        return None
+    b = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    if b <= 0:
+        return None
+    return mean_y - b * mean_x, b
+
+
+def _median(values):
+    values = sorted(values)
+    if not values:
+        return None
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+class RuntimePredictor:
+    """
+    基于历史记录的运行时长预测器
+
+    预测顺序：
+    1. 同一模型、同一工质的历史记录，按 最大步数/线程数 线性换算；
+    2. 全部记录上拟合 用时 = a + b * 规模 * 最大步数 / 线程数，规模优先取网格数，否则取模型文件大小；
+    3. 全部记录用时的中位数。
+    """
+
+    def __init__(self, history, task_estimator=None):
+        """
+        :param history: RuntimeHistory 实例
+        :param task_estimator: 可选，task_estimator(params) -> (线程数, 估算网格数)，
+                               用于解析自动线程数并提供网格规模
+        """
+        self.history = history
+        self.task_estimator = task_estimator
+        self._fits = {}
+        self._median = None
+        self._records = None
+
+    def _samples(self):
+        records = self.history.load()
+        if records is not self._records:
+            self._records = records
+            self._refit(records)
+        return [r for r in records if r.get('status') == "已完成" and r.get('total_seconds')]
+
+    def _refit(self, records):
+        done = [r for r in records if r.get('status') == "已完成" and r.get('total_seconds')]
+        self._fits = {}
+        for scale_key in ('cell_count', 'model_size_mb'):
+            xs, ys = [], []
+            for r in done:
+                if r.get(scale_key):
+                    xs.append(r[scale_key] * r['max_steps'] / max(r['threads'], 1))
+                    ys.append(r['total_seconds'])
+            self._fits[scale_key] = _fit_line(xs, ys)
+        self._median = _median([r['total_seconds'] for r in done])
+
+    def predict(self, params, cell_count=None):
+        """
+        预测任务总用时（秒）
+
+        :param params: 任务参数（队列任务字典或 get_task_params 结果）
+        :param cell_count: 已知或估算的网格数量
+        :return: 预测用时（秒），无历史数据时返回None
+        """
+        samples = self._samples()
+        if not samples:
+            return None
+        try:
+            max_steps = int(params['max_steps'])
+            if self.task_estimator is not None:
+                threads, estimated_cells = self.task_estimator(params)
+                cell_count = cell_count or estimated_cells
+            else:
+                threads = int(params['threads'])
+        except (KeyError, ValueError):
+            return self._median
+        name = os.path.splitext(os.path.basename(params['model_import_path']))[0]
+        fluid = params.get('workingfluid') or ["R134a", "R1234yf", "R744", "50EG"][params['workingfluid_index']]
+
+        same_model = [r for r in samples if r['model_name'] == name and r['fluid'] == fluid]
+        if same_model:
+            estimates = [r['total_seconds'] * (max_steps / r['max_steps']) * (r['threads'] / threads)
+                         for r in same_model]
+            return _median(estimates)
+
+        for scale_key, scale in (('cell_count', cell_count),
+                                 ('model_size_mb', model_size_mb(params['model_import_path']))):
+            fit = self._fits.get(scale_key)
+            if fit and scale:
+                a, b = fit
+                return max(a + b * scale * max_steps / threads, 0.0)
+        return self._median
+
+
+def format_seconds(seconds):
+    """秒数格式化为 x小时x分"""
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}小时{(seconds // 60) % 60}分"
+    return f"{max(seconds // 60, 1)}分"
+
+
+def parse_deadline(text):
+    """解析截止时间输入，空或格式错误返回None"""
+    text = (text or "").strip()
+    if not text:
+        return None
+    try:
+        return datetime.datetime.strptime(text, DEADLINE_FORMAT)
+    except ValueError:
+        return None
+
+
+def order_tasks(tasks, predictor, policy='fifo'):
+    """
+    按策略对待计算任务排序
+
+    :param tasks: 待计算的队列任务列表
+    :param predictor: RuntimePredictor 实例
+    :param policy: 'fifo' 提交顺序 / 'sjf' 最短优先 / 'deadline' 截止时间优先（无截止时间的任务排在后面，按最短优先）
+    :return: 排序后的新列表
+    """
+    if policy == 'fifo':
+        return list(tasks)
+
+    def predicted(task):
+        value = predictor.predict(task)
+        return value if value is not None else float('inf')
+
+    if policy == 'sjf':
+        return sorted(tasks, key=predicted)
+    if policy == 'deadline':
+        def key(task):
+            deadline = parse_deadline(task.get('deadline'))
+            return (deadline is None, deadline or datetime.datetime.max, predicted(task))
+        return sorted(tasks, key=key)
+    raise ValueError(f"未知的排序策略: {policy}")
+
+
+def queue_eta(tasks, predictor, now=None, running_elapsed=0.0):
+    """
+    计算队列中每个任务的预计用时与预计完成时间
+
+    :param tasks: 按执行顺序排列的任务列表（第一个可以是正在计算的任务）
+    :param predictor: RuntimePredictor 实例
+    :param now: 当前时间
+    :param running_elapsed: 正在计算的任务已运行秒数
+    :return: ([(预计用时秒, 预计完成时间), ...], 队列剩余总秒数)；无法预测的任务为 (None, None)
+    """
+    now = now or datetime.datetime.now()
+    clock = 0.0
+    result = []
+    for task in tasks:
+        predicted = predictor.predict(task)
+        if predicted is None:
+            result.append((None, None))
+            continue
+        remaining = predicted
+        if task.get('status') == "计算中":
+            remaining = max(predicted - running_elapsed, 0.0)
+        clock += remaining
+        result.append((predicted, now + datetime.timedelta(seconds=clock)))
+    return result, clock
@@ -0,0 +1,199 @@
+import logging
+import math
+import os
+import platform
+import re
+
+
+# 线程数输入框中表示自动选择的取值
+AUTO_THREADS = ("auto", "自动")
+
+# 无历史数据时的经验值：每个进程约5万网格，包围盒中流体网格的折算系数
+DEFAULT_CELLS_PER_RANK = 50000
+DEFAULT_CELL_FACTOR = 0.05
+MIN_RANKS = 2
+
+# 拟合的最少样本数
+MIN_SCALING_SAMPLES = 4
+# 只含迭代求解的宏阶段（不含JVM启动、网格划分与出图），用于拟合单步用时
+ITERATION_STAGE = 'execute4'
+
+_POINT_PATTERN = re.compile(
+    r"CARTESIAN_POINT\s*\(\s*'[^']*'\s*,\s*\(\s*([-+0-9.EeDd]+)\s*,\s*([-+0-9.EeDd]+)\s*,\s*([-+0-9.EeDd]+)\s*\)")
+
+
+def is_auto_threads(threads):
+    """线程数输入是否为自动模式"""
+    return str(threads).strip().lower() in AUTO_THREADS
+
+
+def step_bounding_box_volume(step_path):
+    """
+    解析STEP文件中的CARTESIAN_POINT，估算模型包围盒体积
+
+    :param step_path: STEP文件路径
+    :return: 包围盒体积（mm³），解析失败返回None
+    """
+    lo = [math.inf] * 3
+    hi = [-math.inf] * 3
+    scale = 1.0
+    try:
+        with open(step_path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                if 'CARTESIAN_POINT' in line:
+                    match = _POINT_PATTERN.search(line)
+                    if match:
+                        for axis in range(3):
+                            value = float(match.group(axis + 1).replace('D', 'E').replace('d', 'e'))
+                            if value < lo[axis]:
+                                lo[axis] = value
+                            if value > hi[axis]:
+                                hi[axis] = value
+                elif 'SI_UNIT' in line and 'METRE' in line and '.MILLI.' not in line:
+                    # 长度单位为米时换算到毫米
+                    scale = 1000.0
+    except OSError as e:
+        logging.error(f"读取STEP文件失败: {str(e)}")
+        return None
+    if lo[0] == math.inf:
+        return None
+    volume = 1.0
+    for axis in range(3):
+        volume *= max(hi[axis] - lo[axis], 1e-6) * scale
+    return volume
+
+
+def _solve_normal_equations(rows, ys):
+    """最小二乘求解 rows·x = ys（高斯消元），奇异时返回None"""
+    n = len(rows[0])
+    a = [[sum(r[i] * r[j] for r in rows) for j in range(n)] + [sum(r[i] * y for r, y in zip(rows, ys))]
+         for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda k: abs(a[k][col]))
+        if abs(a[pivot][col]) < 1e-12:
+            return None
+        a[col], a[pivot] = a[pivot], a[col]
+        for k in range(n):
+            if k != col:
+                factor = a[k][col] / a[col][col]
+                a[k] = [vk - factor * vc for vk, vc in zip(a[k], a[col])]
+    return [a[i][n] / a[i][i] for i in range(n)]
+
+
+class ThreadSelector:
+    """
+    根据本机历史运行数据自动选择 -np
+
+    单步用时模型：t = α + β·N/np + γ·log2(np)
+    其中N为网格数，β·N/np 为并行计算部分，γ·log2(np) 为通信开销。
+    """
+
+    def __init__(self, history, host=None):
+        """
+        :param history: runtime_history.RuntimeHistory 实例
+        :param host: 主机名（默认本机），只使用本机的历史数据
+        """
+        self.history = history
+        self.host = host or platform.node()
+        self._volume_cache = {}
+
+    def geometry_volume(self, model_path):
+        """模型包围盒体积（按路径、大小、修改时间缓存）"""
+        try:
+            stat = os.stat(model_path)
+        except OSError:
+            return None
+        key = (os.path.normcase(os.path.abspath(model_path)), stat.st_size, stat.st_mtime)
+        if key not in self._volume_cache:
+            self._volume_cache[key] = step_bounding_box_volume(model_path)
+        return self._volume_cache[key]
+
+    def cell_factor(self):
+        """由历史记录标定 网格数 / (包围盒体积/基础尺寸³) 的系数"""
+        ratios = []
+        for r in self.history.load():
+            if r.get('cell_count') and r.get('bbox_volume_mm3') and r.get('base_size'):
+                ratios.append(r['cell_count'] / (r['bbox_volume_mm3'] / r['base_size'] ** 3))
+        if not ratios:
+            return DEFAULT_CELL_FACTOR
+        ratios.sort()
+        return ratios[len(ratios) // 2]
+
+    def estimate_cells(self, model_path, base_size):
+        """
+        由几何与网格设置估算网格数量
+
+        :param model_path: STEP文件路径
+        :param base_size: 体网格基础尺寸（mm）
+        :return: 估算网格数，无法估算返回None
+        """
+        volume = self.geometry_volume(model_path)
+        if not volume:
+            return None
+        return int(self.cell_factor() * volume / base_size ** 3)
+
+    def fit(self):
+        """
+        拟合本机的单步用时模型
+
+        只用宏阶段标记中的迭代求解用时（ITERATION_STAGE），不含网格划分与出图；
+        没有该阶段标记的记录跳过。
+        :return: (α, β, γ)，样本不足返回None
+        """
+        rows, ys = [], []
+        for r in self.history.load():
+            if r.get('host') != self.host or r.get('status') != "已完成":
+                continue
+            cells = r.get('cell_count') or r.get('estimated_cells')
+            solve_seconds = (r.get('macro_stages') or {}).get(ITERATION_STAGE, {}).get('seconds')
+            ranks = r.get('solve_np') or r.get('threads')
+            if not cells or not solve_seconds or not ranks or not r.get('max_steps'):
+                continue
+            rows.append([1.0, cells / ranks, math.log2(ranks)])
+            ys.append(solve_seconds / r['max_steps'])
+        if len(rows) < MIN_SCALING_SAMPLES or len({row[2] for row in rows}) < 2:
+            return None
+        coefficients = _solve_normal_equations(rows, ys)
+        if coefficients is None or coefficients[1] <= 0:
+            return None
+        coefficients[2] = max(coefficients[2], 0.0)
+        return tuple(coefficients)
+
+    def candidates(self, max_threads):
+        """候选进程数：2的幂次及上限本身"""
+        values = []
+        ranks = MIN_RANKS
+        while ranks < max_threads:
+            values.append(ranks)
+            ranks *= 2
+        values.append(max_threads)
+        return values
+
+    def choose(self, model_path, base_size, max_threads=None):
+        """
+        选择吞吐量最高的进程数
+
+        队列按顺序执行，单个任务用时最短即队列吞吐量最高；预测用时相差5%以内时
+        取较少的进程数，把空闲核留给下一个任务的网格预划分。
+        :param model_path: STEP文件路径
+        :param base_size: 体网格基础尺寸（mm）
+        :param max_threads: 可用核数上限（默认本机逻辑核数）
+        :return: (进程数, 估算网格数)
+        """
+        max_threads = max(int(max_threads or os.cpu_count() or MIN_RANKS), MIN_RANKS)
+        cells = self.estimate_cells(model_path, base_size)
+        if cells is None:
+            return max_threads, None
+
+        coefficients = self.fit()
+        if coefficients is None:
+            # 无足够历史数据：按每进程网格数经验值取最近的2的幂次
+            target = max(cells / DEFAULT_CELLS_PER_RANK, MIN_RANKS)
+            ranks = min(self.candidates(max_threads), key=lambda n: abs(math.log2(n) - math.log2(target)))
+            return ranks, cells
+
+        alpha, beta, gamma = coefficients
+        predicted = {n: alpha + beta * cells / n + gamma * math.log2(n) for n in self.candidates(max_threads)}
+        best = min(predicted.values())
+        ranks = min(n for n, t in predicted.items() if t <= best * 1.05)
+        return ranks, cells
@@ -0,0 +1,266 @@
+"""
+本机高速草稿目录（scratch）：求解器只在草稿目录中读写，任务结束后后台转移结果
+
+启用后（sim_config.json 中配置 scratch_root），每个任务在草稿目录下建立独立的工作目录，
+宏中的 jobRoot / publicJobRoot 都指向该目录，saveState、CSV导出、printAndWait、
+export3DSceneFileAndWait 都只写本机高速盘。任务结束后：
+    Report 中的结果文件  -> 私有与公开 Report 目录（后处理前完成，界面等待）
+    .sim 文件            -> 私有 Simulation 目录（后台转移，不阻塞下一个任务）
+每个文件复制时计算 SHA-256，复制后重新读取目标文件校验，不一致时重试。
+转移完成后在工作目录写入校验清单；草稿目录超过配额时从最早完成转移的任务开始删除，
+未完成转移的工作目录只在超过 STALE_DAYS 天无变化后删除。
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+
+
+# 草稿目录总大小上限（GB），超出后删除已转移的任务工作目录
+DEFAULT_QUOTA_GB = 200
+# 未完成转移（任务中断、转移失败）的工作目录保留天数
+STALE_DAYS = 7
+# 转移清单（提交转移时写入，程序退出后重启可继续转移）与完成标记（含校验和）
+TRANSFER_FILE = "transfer.json"
+PUBLISHED_FILE = "published.json"
+# 单个文件校验失败时的重试次数
+COPY_RETRIES = 2
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def stage_job(job, scratch_root):
+    """
+    为任务建立草稿工作目录并复制缓存模型，修改任务字典
+
+    添加 scratch_folder（宏的工作根目录）与 work_sim_path（求解阶段加载的 .sim），
+    model_folder / sim_path 等仍为最终结果路径。
+    """
+    folder = os.path.join(os.path.abspath(scratch_root),
+                          f"{job['datenow']}_{job['operator_name']}_{job['name']}_{job['index']}_{job['uid']}")
+    for sub in ("CacheModels", "Simulation", "Report"):
+        os.makedirs(os.path.join(folder, sub), exist_ok=True)
+    shutil.copy2(os.path.join(job['model_folder'], "CacheModels", "CacheModel.STEP"),
+                 os.path.join(folder, "CacheModels", "CacheModel.STEP"))
+    job['scratch_folder'] = folder
+    job['work_sim_path'] = os.path.join(folder, "Simulation", os.path.basename(job['sim_path']))
+    logging.info(f"草稿工作目录: {folder}")
+    return job
+
+
+def transfer_plan(job):
+    """
+    任务需要转移的文件
+
+    :return: {'report': [(源文件, [目标文件])], 'simulation': [(源文件, [目标文件])]}
+    """
+    folder = job['scratch_folder']
+    report_folder = os.path.join(folder, "Report")
+    report = []
+    for entry in sorted(os.scandir(report_folder), key=lambda entry: entry.name) if os.path.isdir(report_folder) else []:
+        if entry.is_file():
+            report.append((entry.path, [os.path.join(job['report_subfolder'], entry.name),
+                                        os.path.join(job['report_subfolder_public'], entry.name)]))
+    simulation = []
+    if os.path.exists(job['work_sim_path']):
+        simulation.append((job['work_sim_path'], [job['sim_path']]))
+    return {'report': report, 'simulation': simulation}
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_verified(source, destination):
+    """
+    复制文件并校验：复制时计算源文件SHA-256，复制完成后重新读取目标文件比对
+
+    先写入临时文件，校验通过后再改名，目标目录中不会出现不完整的文件。
+    :return: 源文件SHA-256
+    :raises OSError: 多次重试后仍校验失败
+    """
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    temp_path = f"{destination}.{os.getpid()}.part"
+    for attempt in range(COPY_RETRIES + 1):
+        digest = hashlib.sha256()
+        with open(source, 'rb') as src, open(temp_path, 'wb') as dst:
+            for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+        shutil.copystat(source, temp_path)
+        if file_hash(temp_path) == digest.hexdigest():
+            os.replace(temp_path, destination)
+            return digest.hexdigest()
+        logging.warning(f"校验不一致，重新复制（第 {attempt + 1} 次）: {source} -> {destination}")
+    os.remove(temp_path)
+    raise OSError(f"复制后校验失败: {source} -> {destination}")
+
+
+class Transfer:
+    """一个任务的转移状态（report_done: 结果文件已转移；done: 全部完成）"""
+
+    def __init__(self, folder, plan):
+        self.folder = folder
+        self.plan = plan
+        self.report_done = threading.Event()
+        self.done = threading.Event()
+        self.checksums = {}
+        self.errors = []
+
+
+class ScratchMover:
+    """
+    后台转移线程：按提交顺序逐个任务转移，每个任务先转移结果文件再转移 .sim
+
+    每个任务转移完成后按配额清理草稿目录。
+    """
+
+    def __init__(self, scratch_root, quota_gb=DEFAULT_QUOTA_GB):
+        self.scratch_root = os.path.abspath(scratch_root)
+        self.quota_bytes = int(float(quota_gb) * 1024 ** 3)
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="scratch-mover", daemon=True)
+        self.thread.start()
+
+    def submit(self, job):
+        """提交任务的结果转移，返回 Transfer（清单同时写入工作目录，程序重启后可继续）"""
+        plan = transfer_plan(job)
+        with open(os.path.join(job['scratch_folder'], TRANSFER_FILE), 'w', encoding='utf-8') as f:
+            json.dump(plan, f, ensure_ascii=False, indent=2)
+        transfer = Transfer(job['scratch_folder'], plan)
+        self.pending.put(transfer)
+        return transfer
+
+    def resume(self):
+        """重新提交上次退出时未完成的转移，返回提交的任务数"""
+        count = 0
+        for entry in _job_folders(self.scratch_root):
+            transfer_path = os.path.join(entry.path, TRANSFER_FILE)
+            if os.path.exists(transfer_path) and not os.path.exists(os.path.join(entry.path, PUBLISHED_FILE)):
+                try:
+                    with open(transfer_path, 'r', encoding='utf-8') as f:
+                        plan = json.load(f)
+                except (OSError, ValueError) as e:
+                    logging.warning(f"转移清单无法读取: {transfer_path}, 错误: {str(e)}")
+                    continue
+                self.pending.put(Transfer(entry.path, plan))
+                count += 1
+        if count:
+            logging.info(f"继续上次未完成的结果转移: {count} 个任务")
+        return count
+
+    def wait_idle(self, timeout=None):
+        """等待已提交的转移全部完成（程序退出前调用），超时返回False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.1)
+        return True
+
+    def _run(self):
+        while True:
+            transfer = self.pending.get()
+            try:
+                self._transfer(transfer)
+            except Exception as e:
+                transfer.errors.append(f"{type(e).__name__}: {str(e)}")
+                logging.error(f"结果转移失败: {transfer.folder}, 错误: {str(e)}")
+            finally:
+                transfer.report_done.set()
+                transfer.done.set()
+                self.pending.task_done()
+            try:
+                cleanup_scratch(self.scratch_root, self.quota_bytes)
+            except OSError as e:
+                logging.warning(f"草稿目录清理失败: {str(e)}")
+
+    def _transfer(self, transfer):
+        start = time.monotonic()
+        total = 0
+        for group in ('report', 'simulation'):
+            for source, destinations in transfer.plan[group]:
+                if not os.path.exists(source):
+                    transfer.errors.append(f"源文件不存在: {source}")
+                    continue
+                for destination in destinations:
+                    try:
+                        transfer.checksums[destination] = copy_verified(source, destination)
+                        total += os.path.getsize(destination)
+                    except OSError as e:
+                        transfer.errors.append(str(e))
+                        logging.error(f"结果转移失败: {source} -> {destination}, 错误: {str(e)}")
+            if group == 'report':
+                transfer.report_done.set()
+        if transfer.errors:
+            return
+        with open(os.path.join(transfer.folder, PUBLISHED_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'published': time.time(), 'sha256': transfer.checksums}, f, ensure_ascii=False, indent=2)
+        elapsed = time.monotonic() - start
+        logging.info(f"结果已转移并校验: {total / 1024 ** 2:.1f} MB，用时 {elapsed:.1f} 秒，{transfer.folder}")
+
+
+def _job_folders(scratch_root):
+    try:
+        return [entry for entry in os.scandir(scratch_root) if entry.is_dir()]
+    except OSError:
+        return []
+
+
+def _folder_size(folder):
+    total = 0
+    for current, _, files in os.walk(folder):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(current, name))
+            except OSError:
+                pass
+    return total
+
+
+def cleanup_scratch(scratch_root, quota_bytes, stale_days=STALE_DAYS):
+    """
+    清理草稿目录：超过配额时按完成转移的先后删除已转移的任务工作目录，
+    并删除超过 stale_days 天无变化的未转移工作目录
+
+    :return: 删除的工作目录数
+    """
+    published, total = [], 0
+    removed = 0
+    stale_before = time.time() - stale_days * 86400
+    for entry in _job_folders(scratch_root):
+        size = _folder_size(entry.path)
+        marker = os.path.join(entry.path, PUBLISHED_FILE)
+        if os.path.exists(marker):
+            published.append((os.path.getmtime(marker), size, entry.path))
+        elif entry.stat().st_mtime < stale_before and _latest_change(entry.path) < stale_before:
+            logging.warning(f"删除长期未转移的草稿工作目录: {entry.path}")
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+            continue
+        total += size
+    for _, size, path in sorted(published):
+        if total <= quota_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def _latest_change(folder):
+    latest = os.path.getmtime(folder)
+    for current, _, files in os.walk(folder):
+        for name in files:
+            try:
+                latest = max(latest, os.path.getmtime(os.path.join(current, name)))
+            except OSError:
+                pass
+    return latest
@@ -0,0 +1,31 @@
+"""
+sim_config.json 中的结果根目录等设置
+
+命令行子命令（index / monitors / retention / sweep / rerender）只需要结果根目录，
+从这里读取，不必导入界面模块（PyQt5）。
+"""
+import json
+import os
+
+
+CONFIG_FILE = "sim_config.json"
+
+
+def configured_setting(key, default):
+    """sim_config.json 中的目录等设置（需在界面创建前确定），未配置时使用默认值"""
+    try:
+        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get(key) or default
+    except (OSError, ValueError):
+        return default
+
+
+# 结果根目录：私有目录保存完整仿真文件，公开目录保存报告与日志
+# 可在 sim_config.json 中用 sim_root / public_root 修改（如私有目录放在本机高速盘、公开目录放在共享存储）
+SIM_ROOT = configured_setting('sim_root', "D:\\STARCCM Simulation automation")
+PUBLIC_ROOT = configured_setting('public_root', "D:\\仿真自动化结果")
+
+# 本机缓存目录（报告图片、缩略图），默认在当前用户的 %LOCALAPPDATA% 下，
+# 界面、命令行子命令与基准测试共用，与启动时的当前目录无关；可用 cache_root 修改
+CACHE_ROOT = configured_setting('cache_root', os.path.join(
+    os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser("~"), ".cache"), "STARCCM Simulation automation"))
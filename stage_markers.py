@@ -0,0 +1,222 @@
+import datetime
+import re
+
+
+# 宏阶段标记：宏在每个阶段前后输出一行
+#   [STAGE] execute2 end wall_ms=1718000000000 mem_mb=812 cells=1534822
+# wall_ms 为宏所在JVM的系统时间（毫秒），mem_mb 为STAR-CCM+客户端JVM已用内存，
+# cells 为体网格数量（生成体网格后才有）。Python 侧从标准输出解析。
+STAGE_MARKER = "[STAGE]"
+
+# 宏阶段与统计阶段的对应关系
+STAGE_GROUPS = {
+    'import': ["execute0"],                            # CAD导入
+    'wrap': ["execute1"],                              # 包面、面网格与物理设置
+    'mesh': ["execute2"],                              # 体网格生成
+    'solve': ["execute3", "execute4"],                 # 报告设置与求解
+    'post': ["execute5", "execute6", "execute7"],      # 导出曲线与场景出图
+}
+
+STAGE_LABELS = {
+    'import': "导入",
+    'wrap': "包面",
+    'mesh': "体网格",
+    'solve': "求解",
+    'post': "后处理",
+}
+
+# 宏中输出标记的方法
+MARKER_METHOD = r"""
+      private void marker(String stage, String event) {
+        Runtime runtime = Runtime.getRuntime();
+        long memoryMb = (runtime.totalMemory() - runtime.freeMemory()) / (1024 * 1024);
+        String cells = event.equals("end") ? markerCells() : "";
+        getActiveSimulation().println("[STAGE] " + stage + " " + event + " wall_ms=" + System.currentTimeMillis() + " mem_mb=" + memoryMb + cells);
+      }
+
+      private String markerCells() {
+        Simulation simulation_0 = getActiveSimulation();
+        Collection<Region> regions = simulation_0.getRegionManager().getRegions();
+        if (regions.isEmpty()) {
+          return "";
+        }
+        try {
+          Report existing = null;
+          try {
+            existing = simulation_0.getReportManager().getReport("Cell Count");
+          } catch (Exception e) {
+            existing = null;
+          }
+          ElementCountReport report = existing instanceof ElementCountReport ? (ElementCountReport) existing : simulation_0.getReportManager().createReport(ElementCountReport.class);
+          report.setPresentationName("Cell Count");
+          report.getParts().setObjects(regions);
+          return " cells=" + (long) report.getReportMonitorValue();
+        } catch (Exception e) {
+          return "";
+        }
+      }
+"""
+
+_MARKER_PATTERN = re.compile(r"\[STAGE\]\s+(\w+)\s+(start|end)((?:\s+\w+=-?[\d.]+)*)")
+_TIMESTAMP_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:[.,](\d{1,6}))?")
+
+
+def marker_calls(stages):
+    """
+    生成宏 execute() 中带阶段标记的调用语句
+
+    :param stages: 阶段列表，如 ["execute0", "execute1"]
+    :return: Java代码行（已缩进）
+    """
+    lines = []
+    for stage in stages:
+        lines.append(f'        marker("{stage}", "start");')
+        lines.append(f"        {stage}();")
+        lines.append(f'        marker("{stage}", "end");')
+    return "\n".join(lines)
+
+
+def parse_marker(line):
+    """
+    解析一行输出中的阶段标记
+
+    :param line: 标准输出行或带时间戳的日志行
+    :return: {'stage', 'event', 'time', 'mem_mb', 'cells'}，不是标记行返回None；
+             time 为秒（优先取 wall_ms，其次取日志行时间戳，都没有为None）
+    """
+    match = _MARKER_PATTERN.search(line)
+    if not match:
+        return None
+    fields = dict(item.split("=", 1) for item in match.group(3).split())
+    moment = None
+    if 'wall_ms' in fields:
+        moment = int(fields['wall_ms']) / 1000.0
+    else:
+        stamp = _TIMESTAMP_PATTERN.match(line)
+        if stamp:
+            timestamp = datetime.datetime.strptime(stamp.group(1), "%Y-%m-%d %H:%M:%S")
+            if stamp.group(2):
+                timestamp += datetime.timedelta(seconds=float("0." + stamp.group(2)))
+            moment = timestamp.timestamp()
+    return {
+        'stage': match.group(1),
+        'event': match.group(2),
+        'time': moment,
+        'mem_mb': int(fields['mem_mb']) if 'mem_mb' in fields else None,
+        'cells': int(fields['cells']) if int(fields.get('cells', 0)) > 0 else None,
+    }
+
+
+class StageTimer:
+    """
+    汇总阶段标记，得到各宏阶段的用时、内存与网格数
+
+    timings 结构：{'execute2': {'seconds': 812.4, 'mem_mb': 905, 'cells': 1534822}, ...}
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.cell_count = None
+        self.peak_mem_mb = None
+        self._starts = {}
+
+    def feed(self, line):
+        """处理一行输出，是阶段标记时返回解析结果，否则返回None"""
+        marker = parse_marker(line)
+        if marker is None:
+            return None
+        if marker['mem_mb'] is not None:
+            self.peak_mem_mb = max(self.peak_mem_mb or 0, marker['mem_mb'])
+        if marker['event'] == 'start':
+            self._starts[marker['stage']] = marker['time']
+            return marker
+        start = self._starts.pop(marker['stage'], None)
+        entry = self.timings.setdefault(marker['stage'], {'seconds': 0.0})
+        if start is not None and marker['time'] is not None:
+            entry['seconds'] += marker['time'] - start
+        if marker['mem_mb'] is not None:
+            entry['mem_mb'] = marker['mem_mb']
+        if marker['cells']:
+            entry['cells'] = marker['cells']
+            self.cell_count = marker['cells']
+        return marker
+
+    def feed_file(self, log_path):
+        """读取日志文件中的阶段标记（后台阶段进程的输出写在日志文件中）"""
+        try:
+            with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    self.feed(line)
+        except OSError:
+            pass
+
+    def durations(self):
+        """{'execute0': 秒, ...}"""
+        return {stage: entry['seconds'] for stage, entry in self.timings.items()}
+
+    def groups(self):
+        """按 STAGE_GROUPS 汇总的用时"""
+        return group_durations(self.durations())
+
+
+def stage_durations(lines):
+    """
+    由输出行计算各宏阶段用时
+
+    :param lines: 输出行（可迭代）
+    :return: {'execute0': 秒, ...}，只包含已结束的阶段
+    """
+    timer = StageTimer()
+    for line in lines:
+        timer.feed(line)
+    return timer.durations()
+
+
+def stage_durations_from_log(log_path):
+    """读取日志文件计算各宏阶段用时，文件不存在返回空字典"""
+    timer = StageTimer()
+    timer.feed_file(log_path)
+    return timer.durations()
+
+
+def group_durations(durations):
+    """
+    按 STAGE_GROUPS 汇总阶段用时
+
+    :param durations: stage_durations 的结果
+    :return: {'import': 秒, 'wrap': 秒, ...}，没有数据的统计阶段不出现
+    """
+    groups = {}
+    for group, stages in STAGE_GROUPS.items():
+        values = [durations[stage] for stage in stages if stage in durations]
+        if values:
+            groups[group] = sum(values)
+    return groups
+
+
+def format_duration(seconds):
+    """阶段用时格式化：不足1分钟显示秒"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}秒"
+    if seconds < 3600:
+        return f"{seconds // 60}分{seconds % 60}秒"
+    return f"{seconds // 3600}小时{(seconds // 60) % 60}分"
+
+
+def format_stage_summary(groups, cell_count=None, peak_mem_mb=None, separator=" | "):
+    """
+    阶段用时摘要文本
+
+    :param groups: StageTimer.groups() 的结果
+    :param cell_count: 体网格数量
+    :param peak_mem_mb: 客户端内存峰值（MB）
+    :param separator: 各项之间的分隔符
+    :return: 如 "导入 12秒 | 体网格 13分32秒 | 网格数 1,534,822"
+    """
+    items = [f"{STAGE_LABELS[group]} {format_duration(groups[group])}" for group in STAGE_GROUPS if group in groups]
+    if cell_count:
+        items.append(f"网格数 {cell_count:,}")
+    if peak_mem_mb:
+        items.append(f"客户端内存峰值 {peak_mem_mb:,} MB")
+    return separator.join(items) if items else "--"
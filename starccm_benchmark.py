@@ -0,0 +1,220 @@
+"""
+STAR-CCM+ 并行扩展性基准测试
+
+用参考STEP模型按不同 -np 与网格基础尺寸运行完整宏，由日志中的阶段标记
+统计各阶段（导入、包面、体网格、求解、后处理）用时，输出扩展性表格与曲线图，
+并写入运行时长历史供自动线程数选择使用。
+
+用法：
+    python starccm_benchmark.py --step ref.STEP --starccm "C:\\...\\starccmw.exe" --np 4 8 16 32 --base-size 0.5 0.3
+    mainV1.7.exe benchmark --step ref.STEP --starccm ...
+"""
+import argparse
+import csv
+import logging
+import os
+import time
+import uuid
+
+from job_scheduler import PhaseProcess, build_starccm_command
+from macro_builder import DEFAULT_RENDER_PROFILE, RENDER_PROFILES
+from runtime_history import RuntimeHistory, make_record
+from scaling_model import ThreadSelector
+from stage_markers import STAGE_GROUPS, StageTimer
+from svg_chart import line_chart
+from STARCCM_Simulation_automation_V7_2 import MESH_SETTINGS, PUBLIC_ROOT, SIM_ROOT, extract_model_name, \
+    get_formatted_date, rename_and_save_step_file, write_macro
+
+# 未指定REFPROP时使用的R134a物性（25℃、1MPa液相）
+DEFAULT_PROPERTIES = {'density': 1206.7, 'viscosity': 0.00019489, 'speed_of_sound': 508.0}
+
+TABLE_COLUMNS = ['np', 'base_size', 'estimated_cells', 'cells', 'peak_mem_mb', 'returncode'] + list(STAGE_GROUPS) + \
+                ['total', 'speedup', 'efficiency', 'slots', 'jobs_per_hour']
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="STAR-CCM+ 并行扩展性基准测试")
+    parser.add_argument('--step', required=True, help="参考STEP模型")
+    parser.add_argument('--starccm', required=True, help="starccmw.exe 路径")
+    parser.add_argument('--np', type=int, nargs='+', default=[4, 8, 16, 32], help="测试的进程数")
+    parser.add_argument('--base-size', type=float, nargs='+', default=[MESH_SETTINGS['base_size']],
+                        help="测试的体网格基础尺寸（mm），对应不同网格密度")
+    parser.add_argument('--max-steps', type=int, default=200, help="求解步数")
+    parser.add_argument('--operator', default="benchmark", help="结果目录中的操作员名")
+    parser.add_argument('--fluid', default="R134a", help="工质名称（仅用于记录与压降单位）")
+    parser.add_argument('--temperature', type=float, default=25.0, help="入口温度（°C）")
+    parser.add_argument('--pressure', type=float, default=1.0, help="入口绝对压力（MPa）")
+    parser.add_argument('--mass-flow', type=float, default=0.05, help="入口质量流量（kg/s）")
+    parser.add_argument('--refprop', help="REFPROP DLL路径，指定时按温度压力计算物性")
+    parser.add_argument('--out', default=None, help="结果输出目录（默认 benchmark_日期）")
+    parser.add_argument('--render-profile', default=DEFAULT_RENDER_PROFILE, choices=list(RENDER_PROFILES),
+                        help="渲染档位（出图分辨率、是否导出三维场景）")
+    parser.add_argument('--no-history', action='store_true', help="不写入运行时长历史")
+    return parser.parse_args(argv)
+
+
+def fluid_properties(args):
+    """获取基准测试使用的物性"""
+    if not args.refprop:
+        return DEFAULT_PROPERTIES
+    from STARCCM_Simulation_automation_V7_2 import get_fluid_properties
+    fluname = 'CO2' if args.fluid == 'R744' else args.fluid
+    density, viscosity, speed_of_sound = get_fluid_properties(args.refprop, args.temperature, args.pressure, fluname)
+    return {'density': density, 'viscosity': viscosity, 'speed_of_sound': speed_of_sound}
+
+
+def prepare_benchmark_job(args, properties, np_count, base_size, selector):
+    """创建一次测试的任务目录并返回任务字典（结构与 prepare_job 一致）"""
+    datenow = get_formatted_date()
+    name = extract_model_name(args.step)
+    operator_folder = os.path.join(SIM_ROOT, datenow, args.operator)
+    index = 1
+    while os.path.exists(os.path.join(operator_folder, f"{name}_{index}")):
+        index += 1
+    model_folder = os.path.join(operator_folder, f"{name}_{index}")
+    model_folder_public = os.path.join(PUBLIC_ROOT, datenow, args.operator, f"{name}_{index}")
+    for folder in (os.path.join(model_folder, sub) for sub in ("CacheModels", "Simulation", "Report", "Log")):
+        os.makedirs(folder, exist_ok=True)
+    for folder in (os.path.join(model_folder_public, sub) for sub in ("Report", "Log")):
+        os.makedirs(folder, exist_ok=True)
+    rename_and_save_step_file(args.step, os.path.join(model_folder, "CacheModels"), "CacheModel.STEP")
+
+    refrigerant = args.fluid in ["R134a", "R1234yf", "R744"]
+    return {
+        'uid': uuid.uuid4().hex[:8],
+        'name': name,
+        'index': index,
+        'datenow': datenow,
+        'operator_name': args.operator,
+        'model_import_path': args.step,
+        'starccm_path': args.starccm,
+        'threads': np_count,
+        'estimated_cells': selector.estimate_cells(args.step, base_size),
+        'bbox_volume_mm3': selector.geometry_volume(args.step),
+        'max_steps': args.max_steps,
+        'x_axis': 500 if args.max_steps > 500 else 0,
+        'base_size': base_size,
+        'target_surface_ratio': MESH_SETTINGS['target_surface_ratio'],
+        'min_surface_ratio': MESH_SETTINGS['min_surface_ratio'],
+        'prisma_layer_thickness_ratio': MESH_SETTINGS['prisma_layer_thickness_ratio'],
+        'prisma_layer_extension': MESH_SETTINGS['prisma_layer_extension'],
+        'temperature': args.temperature,
+        'pressure': args.pressure,
+        'mass_flow': args.mass_flow,
+        'workingfluid': args.fluid,
+        'density': properties['density'],
+        'viscosity': properties['viscosity'],
+        'speed_of_sound': properties['speed_of_sound'],
+        'dp_unit': '"bar"' if refrigerant else '"Pa"',
+        'dp_format': '"%-6.2f"' if refrigerant else '"%-6.0f"',
+        'render_profile': args.render_profile,
+        'model_folder': model_folder,
+        'model_folder_public': model_folder_public,
+        'log_folder': os.path.join(model_folder, "Log"),
+    }
+
+
+def run_case(args, properties, np_count, base_size, selector):
+    """
+    运行一次测试
+
+    :return: 结果行（各阶段用时为秒）
+    """
+    job = prepare_benchmark_job(args, properties, np_count, base_size, selector)
+    macro_path = write_macro(job, 'full')
+    log_path = os.path.join(job['log_folder'], f"{job['name']}_benchmark.log")
+    process = PhaseProcess(build_starccm_command(args.starccm, np_count, macro_path), log_path,
+                           phase=f"基准测试 np={np_count} base_size={base_size}").start()
+    while process.poll() is None:
+        time.sleep(1)
+    try:
+        os.remove(macro_path)
+    except OSError:
+        pass
+
+    timer = StageTimer()
+    timer.feed_file(log_path)
+    stages = timer.groups()
+    row = {'np': np_count, 'base_size': base_size, 'estimated_cells': job['estimated_cells'],
+           'cells': timer.cell_count, 'peak_mem_mb': timer.peak_mem_mb,
+           'returncode': process.returncode, 'total': process.elapsed}
+    row.update(stages)
+    logging.info(f"np={np_count} base_size={base_size} 返回码={process.returncode} "
+                 f"总用时={process.elapsed:.1f}s 阶段用时={stages}")
+    if not args.no_history:
+        status = "已完成" if process.returncode == 0 else "失败"
+        # 与界面任务相同的阶段定义（单进程完成全部阶段记为 full，含进程启动与许可证签出），
+        # 宏阶段用时只写入 macro_stages
+        RuntimeHistory().append(make_record(job, {'full': process.elapsed}, status, np_count, np_count,
+                                            timer.cell_count, timer.timings))
+    return row
+
+
+def add_scaling_columns(rows):
+    """按网格尺寸分组，以最小进程数为基准计算加速比、并行效率与单节点吞吐量"""
+    cpu_count = os.cpu_count() or 1
+    for base_size in {row['base_size'] for row in rows}:
+        group = sorted((row for row in rows if row['base_size'] == base_size and row['returncode'] == 0),
+                       key=lambda row: row['np'])
+        if not group:
+            continue
+        reference = group[0]
+        for row in group:
+            row['speedup'] = reference['total'] / row['total']
+            row['efficiency'] = row['speedup'] * reference['np'] / row['np']
+            row['slots'] = max(cpu_count // row['np'], 1)
+            row['jobs_per_hour'] = row['slots'] * 3600 / row['total']
+
+
+def write_table(rows, path):
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=TABLE_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: (f"{v:.3f}" if isinstance(v, float) else v) for k, v in row.items()})
+
+
+def write_plots(rows, out_dir):
+    """输出加速比曲线与各阶段用时曲线（SVG）"""
+    base_sizes = sorted({row['base_size'] for row in rows})
+    np_values = sorted({row['np'] for row in rows})
+    series = []
+    for base_size in base_sizes:
+        data = [(row['np'], row.get('speedup')) for row in rows if row['base_size'] == base_size]
+        series.append((f"基础尺寸 {base_size:g} mm", data, False))
+    series.append(("理想加速比", [(n, n / np_values[0]) for n in np_values], True))
+    with open(os.path.join(out_dir, "scaling_speedup.svg"), 'w', encoding='utf-8') as f:
+        f.write(line_chart(series, "并行加速比", "进程数 -np", "加速比", log2_x=True))
+
+    for base_size in base_sizes:
+        group = [row for row in rows if row['base_size'] == base_size and row['returncode'] == 0]
+        series = [(stage, [(row['np'], row.get(stage)) for row in group], False) for stage in STAGE_GROUPS]
+        with open(os.path.join(out_dir, f"stage_times_{base_size:g}.svg"), 'w', encoding='utf-8') as f:
+            f.write(line_chart(series, f"各阶段用时（基础尺寸 {base_size:g} mm）", "进程数 -np", "用时（秒）",
+                               log2_x=True))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    out_dir = args.out or f"benchmark_{get_formatted_date()}"
+    os.makedirs(out_dir, exist_ok=True)
+
+    properties = fluid_properties(args)
+    selector = ThreadSelector(RuntimeHistory())
+    rows = []
+    for base_size in args.base_size:
+        for np_count in sorted(args.np):
+            rows.append(run_case(args, properties, np_count, base_size, selector))
+
+    add_scaling_columns(rows)
+    table_path = os.path.join(out_dir, "scaling_table.csv")
+    write_table(rows, table_path)
+    write_plots(rows, out_dir)
+    logging.info(f"扩展性表格已保存至 {table_path}")
+    return 0 if all(row['returncode'] == 0 for row in rows) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
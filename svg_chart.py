@@ -0,0 +1,117 @@
+import math
+from xml.sax.saxutils import escape
+
+
+# 曲线颜色（依次使用）
+SERIES_COLORS = ["#3498DB", "#E74C3C", "#27AE60", "#F39C12", "#8E44AD", "#16A085", "#2C3E50"]
+
+
+def _ticks(lo, hi, count=5):
+    """生成坐标轴刻度"""
+    if hi <= lo:
+        return [lo]
+    step = (hi - lo) / count
+    magnitude = 10 ** math.floor(math.log10(step))
+    for factor in (1, 2, 5, 10):
+        if step <= factor * magnitude:
+            step = factor * magnitude
+            break
+    start = math.floor(lo / step) * step
+    values = []
+    value = start
+    while value <= hi + step * 1e-9:
+        if value >= lo - step * 1e-9:
+            values.append(round(value, 10))
+        value += step
+    return values
+
+
+def line_chart(series, title="", x_label="", y_label="", width=640, height=400, log2_x=False):
+    """
+    生成折线图SVG（不依赖绘图库）
+
+    :param series: [(名称, [(x, y), ...], 是否虚线), ...]
+    :param title: 标题
+    :param x_label: x轴名称
+    :param y_label: y轴名称
+    :param width: 图宽（像素）
+    :param height: 图高（像素）
+    :param log2_x: x轴按log2刻度（进程数）
+    :return: SVG文本
+    """
+    left, right, top, bottom = 70, 150, 40, 50
+    points = [(x, y) for _, data, _ in series for x, y in data if y is not None]
+    if not points:
+        return f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}"></svg>'
+
+    def fx(x):
+        return math.log2(x) if log2_x else x
+
+    x_values = sorted({x for x, _ in points})
+    x_lo, x_hi = fx(x_values[0]), fx(x_values[-1])
+    if x_hi == x_lo:
+        x_lo, x_hi = x_lo - 1, x_hi + 1
+    y_lo = min(0.0, min(y for _, y in points))
+    y_hi = max(y for _, y in points) * 1.05 or 1.0
+
+    def px(x):
+        return left + (fx(x) - x_lo) / (x_hi - x_lo) * (width - left - right)
+
+    def py(y):
+        return height - bottom - (y - y_lo) / (y_hi - y_lo) * (height - top - bottom)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="Microsoft YaHei, sans-serif" font-size="12">',
+        f'<rect width="{width}" height="{height}" fill="white"/>',
+        f'<text x="{width / 2:.1f}" y="22" text-anchor="middle" font-size="15" font-weight="bold">{escape(title)}</text>',
+        f'<line x1="{left}" y1="{height - bottom}" x2="{width - right}" y2="{height - bottom}" stroke="black"/>',
+        f'<line x1="{left}" y1="{top}" x2="{left}" y2="{height - bottom}" stroke="black"/>',
+    ]
+    for x in (x_values if log2_x else _ticks(x_values[0], x_values[-1])):
+        parts.append(f'<text x="{px(x):.1f}" y="{height - bottom + 16}" text-anchor="middle">{x:g}</text>')
+    for y in _ticks(y_lo, y_hi):
+        parts.append(f'<line x1="{left}" y1="{py(y):.1f}" x2="{width - right}" y2="{py(y):.1f}" stroke="#DDDDDD"/>')
+        parts.append(f'<text x="{left - 6}" y="{py(y) + 4:.1f}" text-anchor="end">{y:g}</text>')
+    parts.append(f'<text x="{(left + width - right) / 2:.1f}" y="{height - 12}" text-anchor="middle">{escape(x_label)}</text>')
+    parts.append(f'<text x="16" y="{(top + height - bottom) / 2:.1f}" text-anchor="middle" '
+                 f'transform="rotate(-90 16 {(top + height - bottom) / 2:.1f})">{escape(y_label)}</text>')
+
+    for i, (label, data, dashed) in enumerate(series):
+        color = SERIES_COLORS[i % len(SERIES_COLORS)]
+        coords = " ".join(f"{px(x):.1f},{py(y):.1f}" for x, y in sorted(data) if y is not None)
+        dash = ' stroke-dasharray="6,4"' if dashed else ''
+        parts.append(f'<polyline points="{coords}" fill="none" stroke="{color}" stroke-width="2"{dash}/>')
+        for x, y in data:
+            if y is not None:
+                parts.append(f'<circle cx="{px(x):.1f}" cy="{py(y):.1f}" r="3" fill="{color}"/>')
+        legend_y = top + 18 * i
+        parts.append(f'<line x1="{width - right + 10}" y1="{legend_y}" x2="{width - right + 30}" y2="{legend_y}" '
+                     f'stroke="{color}" stroke-width="2"{dash}/>')
+        parts.append(f'<text x="{width - right + 34}" y="{legend_y + 4}">{escape(label)}</text>')
+    parts.append('</svg>')
+    return "\n".join(parts)
+
+
+def sparkline(values, width=240, height=48, color=SERIES_COLORS[0], max_points=200):
+    """
+    生成迷你曲线SVG（无坐标轴，用于表格与摘要页内嵌）
+
+    :param values: 数值序列（过长时等间隔抽取 max_points 个点）
+    :return: SVG文本，无数据返回空字符串
+    """
+    values = [v for v in values if v is not None]
+    if not values:
+        return ""
+    if len(values) > max_points:
+        step = (len(values) - 1) / (max_points - 1)
+        values = [values[round(i * step)] for i in range(max_points)]
+    lo, hi = min(values), max(values)
+    span = (hi - lo) or 1.0
+    x_step = (width - 4) / max(1, len(values) - 1)
+    coords = " ".join(f"{2 + i * x_step:.1f},{height - 2 - (v - lo) / span * (height - 4):.1f}"
+                      for i, v in enumerate(values))
+    last_x, last_y = coords.rsplit(" ", 1)[-1].split(",")
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">'
+            f'<polyline points="{coords}" fill="none" stroke="{color}" stroke-width="1.5"/>'
+            f'<circle cx="{last_x}" cy="{last_y}" r="2.5" fill="{color}"/></svg>')
@@ -0,0 +1,256 @@
+"""
+扫描汇总报告：把一组已完成任务合并为一个PPT
+
+汇总表（各工况压降）、压降-流量与压降-温度趋势图（PPT原生图表）以及每个工况一页结果图，
+全部在同一个演示文稿中：母版、版式与模板图片只保存一份，流体域图只放一次，
+相同内容的图片由 python-pptx 按哈希自动合并。
+
+用法：
+    python sweep_report.py --model Valve --fluid R134a --output Valve_sweep.pptx
+"""
+import argparse
+import logging
+import os
+import sys
+
+from pptx.chart.data import XyChartData
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.util import Pt
+
+from report_engine import MACH_SLIDE, MATERIAL_SLIDE, REFRIGERANT_FLUIDS, REFRIGERANT_TEMPLATE, RESULT_SLIDE, \
+    load_template, template_for
+from results_index import INDEX_FILE, ResultsIndex
+from run_record import REPORT_ARTIFACTS, load_run_record
+
+
+# 汇总表每页行数（不含表头）
+SUMMARY_ROWS_PER_SLIDE = 14
+
+
+def _number(value, digits=4):
+    if value is None:
+        return ""
+    return f"{value:.{digits}g}" if isinstance(value, float) else str(value)
+
+
+def _dp_kpa(run):
+    return f"{run['dp_pa'] / 1000:.2f}"
+
+
+def sweep_runs(rows):
+    """
+    从结果索引查询结果中取出可汇总的任务（已完成且有压降），按工况排序
+
+    :param rows: ResultsIndex.query 返回的行
+    :return: 任务列表（行字典，补充 record 与 images）
+    """
+    runs = []
+    for row in rows:
+        if row.get('status') not in (None, "已完成") or row.get('dp_pa') is None:
+            continue
+        run = dict(row)
+        run['record'] = load_run_record(row['record_path']) if row.get('record_path') else None
+        folder = row.get('report_folder') or ""
+        run['images'] = {}
+        for key in ('pressure_png', 'streamline_png', 'fluid_domain_png'):
+            path = os.path.join(folder, REPORT_ARTIFACTS[key].format(name=row['model_name']))
+            if os.path.exists(path):
+                run['images'][key] = path
+        runs.append(run)
+    runs.sort(key=lambda run: (run['fluid'] or "", run['temperature'] or 0, run['pressure'] or 0,
+                               run['mass_flow'] or 0, run['date'] or "", run['sim_index'] or 0))
+    return runs
+
+
+def trend_series(runs, x_key, group_keys):
+    """
+    趋势曲线数据：按 group_keys 分组，每组为 [(x, 压降kPa)]
+
+    只保留至少有两个不同 x 值的分组。
+    :return: [(分组名称, 点列表)]
+    """
+    groups = {}
+    for run in runs:
+        if run.get(x_key) is None:
+            continue
+        key = tuple(run.get(k) for k in group_keys)
+        groups.setdefault(key, {})[run[x_key]] = run['dp_pa'] / 1000
+    labels = {'fluid': "", 'temperature': "°C", 'pressure': "MPa", 'mass_flow': "kg/s"}
+    series = []
+    for key, points in sorted(groups.items(), key=lambda item: tuple(str(v) for v in item[0])):
+        if len(points) < 2:
+            continue
+        name = " / ".join(f"{_number(value)}{labels[k]}" for k, value in zip(group_keys, key) if value is not None)
+        series.append((name, sorted(points.items())))
+    return series
+
+
+def _add_summary_slides(report, runs, with_pressure):
+    columns = ["模型", "序号", "工质", "温度(°C)"] + (["压力(MPa)"] if with_pressure else []) + \
+              ["流量(kg/s)", "压降(kPa)", "V_max(m/s)", "马赫数", "收敛"]
+    for start in range(0, len(runs), SUMMARY_ROWS_PER_SLIDE):
+        chunk = runs[start:start + SUMMARY_ROWS_PER_SLIDE]
+        title = "工况汇总" if len(runs) <= SUMMARY_ROWS_PER_SLIDE else \
+            f"工况汇总（{start + 1}-{start + len(chunk)}）"
+        slide_index, (left, top, width, height) = report.add_slide(RESULT_SLIDE, title)
+        row_height = min(height // (len(chunk) + 1), Pt(26))
+        shape = report.slides[slide_index].shapes.add_table(
+            len(chunk) + 1, len(columns), left, top, width, row_height * (len(chunk) + 1))
+        table = shape.table
+        for col, text in enumerate(columns):
+            table.cell(0, col).text = text
+        for row_number, run in enumerate(chunk, start=1):
+            converged = run.get('converged')
+            values = [run['model_name'], run['sim_index'], run['fluid'], _number(run['temperature'])] + \
+                     ([_number(run['pressure'])] if with_pressure else []) + \
+                     [_number(run['mass_flow']), _dp_kpa(run), _number(run.get('v_max')), _number(run.get('mach'), 3),
+                      "" if converged is None else ("是" if converged else "否")]
+            for col, value in enumerate(values):
+                table.cell(row_number, col).text = str(value)
+        for row in table.rows:
+            for cell in row.cells:
+                for paragraph in cell.text_frame.paragraphs:
+                    for run_text in paragraph.runs:
+                        run_text.font.size = Pt(11)
+
+
+def _add_trend_slide(report, title, x_title, series):
+    slide_index, (left, top, width, height) = report.add_slide(RESULT_SLIDE, title)
+    chart_data = XyChartData()
+    for name, points in series:
+        data = chart_data.add_series(name)
+        for x, y in points:
+            data.add_data_point(x, y)
+    chart = report.slides[slide_index].shapes.add_chart(
+        XL_CHART_TYPE.XY_SCATTER_LINES, left, top, width, height, chart_data).chart
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.RIGHT
+    chart.legend.include_in_layout = False
+    chart.category_axis.has_title = True
+    chart.category_axis.axis_title.text_frame.text = x_title
+    chart.value_axis.has_title = True
+    chart.value_axis.axis_title.text_frame.text = "压降 (kPa)"
+
+
+def _fill_model_slide(report, runs, with_pressure):
+    """几何模型与材料属性页：流体域图只放一次，材料表每个工况条件一行"""
+    conditions = {}
+    for run in runs:
+        key = (run['fluid'], run['temperature'], run['pressure'] if with_pressure else None)
+        properties = (run['record'] or {}).get('fluid_properties', {})
+        conditions.setdefault(key, [run['fluid'], _number(run['temperature'])] +
+                              ([_number(run['pressure'])] if with_pressure else []) +
+                              [_number(properties.get('density')), _number(properties.get('viscosity'))])
+    report.set_rows(MATERIAL_SLIDE, 2, list(conditions.values()))
+    domain = next((run['images']['fluid_domain_png'] for run in runs if 'fluid_domain_png' in run['images']), None)
+    if domain:
+        report.replace_picture(MATERIAL_SLIDE, 0, domain)
+    else:
+        report.remove_picture(MATERIAL_SLIDE, 0)
+
+
+def _run_fields(run):
+    """按模板字段映射填写单工况结果页用的字段（取自结果索引行）"""
+    properties = (run['record'] or {}).get('fluid_properties', {})
+    return {
+        'title': f"{run['model_name']}_{run['sim_index']}",
+        'fluid': run['fluid'],
+        'temperature': _number(run['temperature']),
+        'pressure': _number(run['pressure']),
+        'density': _number(properties.get('density')),
+        'viscosity': _number(properties.get('viscosity')),
+        'index': run['sim_index'],
+        'mass_flow': f"{run['mass_flow']:.2f}" if run['mass_flow'] is not None else "",
+        'dp_kpa': _dp_kpa(run),
+        'mach_level': 0,
+    }
+
+
+def _add_run_slide(report, plan, run):
+    slide_index = report.duplicate_slide(RESULT_SLIDE)
+    report.append_text(slide_index, "结果分析", f"：{run['model_name']}_{run['sim_index']}")
+    plan.apply_slide(report, RESULT_SLIDE, slide_index, _run_fields(run), run['images'])
+
+
+def build_sweep_report(runs, output_path, title=None):
+    """
+    生成扫描汇总报告
+
+    :param runs: sweep_runs 的结果
+    :param output_path: 输出PPT路径
+    :param title: 标题页文字（默认 模型名_扫描汇总_N个工况）
+    :return: 输出路径
+    """
+    if not runs:
+        raise ValueError("没有可汇总的已完成任务")
+    # 含制冷剂时使用制冷剂模板（带压力列）
+    refrigerant = [run for run in runs if run['fluid'] in REFRIGERANT_FLUIDS]
+    template = template_for(refrigerant[0]['fluid'] if refrigerant else runs[0]['fluid'])
+    with_pressure = bool(refrigerant)
+    report_template = load_template(template)
+    if report_template.plan is None:
+        raise FileNotFoundError(f"报告模板缺少字段映射文件: {template}")
+    report = report_template.new_report()
+
+    models = sorted({run['model_name'] for run in runs})
+    report.append_text(0, "压降仿真_", title or f"{'_'.join(models)}_扫描汇总_{len(runs)}个工况")
+    _fill_model_slide(report, runs, with_pressure)
+    _add_summary_slides(report, runs, with_pressure)
+    flow_series = trend_series(runs, 'mass_flow', ('fluid', 'temperature', 'pressure'))
+    if flow_series:
+        _add_trend_slide(report, "压降-流量", "质量流量 (kg/s)", flow_series)
+    temperature_series = trend_series(runs, 'temperature', ('fluid', 'mass_flow', 'pressure'))
+    if temperature_series:
+        _add_trend_slide(report, "压降-温度", "入口温度 (°C)", temperature_series)
+    for run in runs:
+        _add_run_slide(report, report_template.plan, run)
+    # 模板的单工况结果页与马赫数页不再需要
+    report.remove_slide(RESULT_SLIDE)
+    if template == REFRIGERANT_TEMPLATE:
+        report.remove_slide(MACH_SLIDE)
+    report.save(output_path)
+    logging.info(f"扫描汇总报告已生成: {output_path}（{len(runs)} 个工况）")
+    return output_path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="扫描汇总报告（多个工况合并为一个PPT）")
+    parser.add_argument('--output', required=True, help="输出PPT路径")
+    parser.add_argument('--db', default=INDEX_FILE, help="索引数据库文件")
+    parser.add_argument('--root', default=None, help="结果根目录（默认公开结果目录）")
+    parser.add_argument('--model', help="模型名，可用 * 通配")
+    parser.add_argument('--fluid', help="工质")
+    parser.add_argument('--operator', help="操作员")
+    parser.add_argument('--date-from', help="起始日期 YYYY-MM-DD")
+    parser.add_argument('--date-to', help="结束日期 YYYY-MM-DD")
+    parser.add_argument('--title', help="标题页文字")
+    parser.add_argument('--no-scan', action='store_true', help="不扫描，直接查询已有索引")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.root is None:
+        from sim_settings import PUBLIC_ROOT
+        args.root = PUBLIC_ROOT
+    index = ResultsIndex(args.db)
+    try:
+        if not args.no_scan:
+            index.scan(args.root)
+        rows = index.query(args.model, args.fluid, args.operator, args.date_from, args.date_to,
+                           status="已完成", limit=100000)
+    finally:
+        index.close()
+    runs = sweep_runs(rows)
+    if not runs:
+        print("没有符合条件的已完成任务")
+        return 1
+    build_sweep_report(runs, args.output, args.title)
+    print(f"{args.output}: {len(runs)} 个工况")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
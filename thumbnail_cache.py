@@ -0,0 +1,162 @@
+import collections
+import hashlib
+import logging
+import os
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+from sim_settings import CACHE_ROOT
+
+
+# 缩略图缓存目录（本机，避免每次从网络共享读取原图）
+THUMBNAIL_DIR = os.path.join(CACHE_ROOT, "thumbnail_cache")
+# 缓存目录总大小上限，超出后按最近访问时间淘汰
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+# 内存中保留的缩略图数
+MEMORY_CACHE_SIZE = 64
+# 后台生成缩略图的线程数
+THUMBNAIL_THREADS = 2
+
+
+def thumbnail_key(image_path, size):
+    """缩略图缓存键：原图路径、修改时间、大小与目标尺寸，原图不存在抛出 OSError"""
+    stat = os.stat(image_path)
+    text = f"{os.path.abspath(image_path)}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}"
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def load_thumbnail(image_path, size, cache_dir=THUMBNAIL_DIR):
+    """
+    读取缩略图：缓存目录中已有时直接读取，否则读取原图缩放后写入缓存
+
+    可在后台线程调用（只使用 QImage）。
+
+    :param size: (宽, 高)，按比例缩放到该范围内
+    :return: (缓存键, QImage)，原图不存在或无法读取返回 (None, None)
+    """
+    try:
+        key = thumbnail_key(image_path, size)
+    except OSError:
+        return None, None
+    cache_path = os.path.join(cache_dir, f"{key}.png")
+    image = QImage(cache_path)
+    if not image.isNull():
+        try:
+            os.utime(cache_path)  # 记录访问时间，供LRU淘汰
+        except OSError:
+            pass
+        return key, image
+    image = QImage(image_path)
+    if image.isNull():
+        return None, None
+    image = image.scaled(size[0], size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        if image.save(temp_path, "PNG"):
+            os.replace(temp_path, cache_path)
+    except OSError as e:
+        logging.warning(f"缩略图缓存写入失败: {cache_path}, 错误: {str(e)}")
+    return key, image
+
+
+def evict_thumbnails(cache_dir=THUMBNAIL_DIR, max_bytes=MAX_CACHE_BYTES):
+    """缓存目录超过上限时按访问时间从旧到新删除，返回删除的文件数"""
+    try:
+        entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(".png")]
+    except OSError:
+        return 0
+    stats = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries))
+    total = sum(size for _, size, _ in stats)
+    removed = 0
+    for _, size, path in stats:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, service, token, image_path, size):
+        super().__init__()
+        self.service = service
+        self.token = token
+        self.image_path = image_path
+        self.size = size
+
+    def run(self):
+        key, image = load_thumbnail(self.image_path, self.size, self.service.cache_dir)
+        self.service.loaded.emit(self.token, key or "", image if image is not None else QImage())
+
+
+class ThumbnailService(QObject):
+    """
+    结果图片缩略图服务
+
+    在线程池中生成缩略图并缓存到本机目录，界面线程只把结果设置到标签上；
+    原图只在查看大图时读取。
+    """
+
+    loaded = pyqtSignal(str, str, QImage)
+
+    def __init__(self, cache_dir=THUMBNAIL_DIR, threads=THUMBNAIL_THREADS, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(threads)
+        self.memory = collections.OrderedDict()  # {缓存键: QPixmap}
+        self.pending = {}  # {请求标识: [(标签, 回调)]}
+        self.loaded.connect(self._on_loaded)
+        evict_thumbnails(cache_dir)
+
+    def load_into(self, label, image_path, size, on_loaded=None):
+        """
+        异步加载缩略图到 QLabel
+
+        标签随后又请求了其他图片时，旧请求的结果被丢弃。
+
+        :param on_loaded: 加载完成后的回调 on_loaded(成功与否)
+        """
+        token = f"{image_path}|{size[0]}x{size[1]}"
+        label.setProperty('thumbnail_request', token)
+        try:
+            key = thumbnail_key(image_path, size)
+        except OSError:
+            key = None
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            label.setPixmap(self.memory[key])
+            if on_loaded:
+                on_loaded(True)
+            return
+        waiting = self.pending.setdefault(token, [])
+        waiting.append((label, on_loaded))
+        if len(waiting) == 1:
+            self.pool.start(_ThumbnailTask(self, token, image_path, size))
+
+    def _on_loaded(self, token, key, image):
+        pixmap = None
+        if key and not image.isNull():
+            pixmap = QPixmap.fromImage(image)
+            self.memory[key] = pixmap
+            while len(self.memory) > MEMORY_CACHE_SIZE:
+                self.memory.popitem(last=False)
+        for label, on_loaded in self.pending.pop(token, []):
+            if label.property('thumbnail_request') != token:
+                continue
+            if pixmap is not None:
+                label.setPixmap(pixmap)
+            else:
+                label.setText("图片加载失败")
+            if on_loaded:
+                on_loaded(pixmap is not None)
+
+    def wait(self, timeout_ms=-1):
+        """等待后台任务完成（退出或测试时使用）"""
+        return self.pool.waitForDone(timeout_ms)